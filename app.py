@@ -1,13 +1,19 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import math
+import datetime
+import time
 import pandas as pd
-from io import BytesIO
-import base64
+import json
+from functools import partial
+from listrik import core
+from listrik.assets import THEMES, Assets, minify_html
+from listrik.circuit import junction_circuit, loop_circuit, parse_netlist
+from listrik.depgraph import DependencyGraph
+from listrik.figcache import FigureCache
+from listrik.network import LEAF, SERIES, parse_definitions, parse_expression
+from listrik.profiling import Tracer, span
+from listrik.synthesis import synthesize
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -17,98 +23,37 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load CSS
-def load_css():
-    with open('physics_listrik.css') as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-
-# Fungsi untuk memuat CSS jika file ada, jika tidak gunakan CSS inline
-try:
-    load_css()
-except FileNotFoundError:
-    # CSS inline sebagai fallback
-    st.markdown("""
-    <style>
-    /* Dark/Light Mode Variables */
-    :root {
-        --primary-color: #2E86AB;
-        --secondary-color: #A23B72;
-        --accent-color: #F18F01;
-        --background-light: #F8F9FA;
-        --background-dark: #1E1E1E;
-        --text-light: #2D3748;
-        --text-dark: #E2E8F0;
-        --card-light: #FFFFFF;
-        --card-dark: #2D3748;
-    }
-    
-    .main-header {
-        text-align: center;
-        background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-        color: white;
-        padding: 20px;
-        border-radius: 15px;
-        margin-bottom: 30px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    
-    .physics-card {
-        background: var(--card-light);
-        padding: 20px;
-        border-radius: 15px;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        margin: 15px 0;
-        border-left: 4px solid var(--accent-color);
-    }
-    
-    .result-box {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 20px;
-        border-radius: 15px;
-        margin: 15px 0;
-        text-align: center;
-    }
-    
-    .formula-box {
-        background: #f8f9fa;
-        border: 2px solid var(--primary-color);
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-        font-family: 'Courier New', monospace;
-        text-align: center;
-    }
-    
-    .watermark {
-        position: fixed;
-        bottom: 10px;
-        right: 10px;
-        font-size: 10px;
-        color: rgba(0,0,0,0.3);
-        z-index: 999;
-    }
-    
-    .stSelectbox > div > div {
-        border-radius: 10px;
-    }
-    
-    .stNumberInput > div > div > input {
-        border-radius: 10px;
-    }
-    
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, var(--primary-color) 0%, var(--secondary-color) 100%);
-    }
-    
-    [data-testid="stSidebar"] .stSelectbox label,
-    [data-testid="stSidebar"] .stNumberInput label,
-    [data-testid="stSidebar"] .stRadio label {
-        color: white !important;
-        font-weight: bold;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+# Instrumentasi waktu rerun ini; cProfile hanya bila diminta untuk satu rerun
+rerun_tracer = Tracer(profile=st.session_state.pop("profile_next_rerun", False)).start()
+
+# Aset statis (CSS terminifikasi dan templat kartu) dimuat sekali per proses
+@st.cache_resource
+def get_assets():
+    return Assets("physics_listrik.css")
+
+def load_assets():
+    assets = get_assets()
+    # Berkas CSS berubah → muat ulang; versi (hash) baru membatalkan cache di frontend
+    if assets.stale():
+        get_assets.clear()
+        assets = get_assets()
+    return assets
+
+with span("load_css"):
+    assets = load_assets()
+    st.markdown(assets.style_tag, unsafe_allow_html=True)
+    # Slot tema: hanya blok variabel kecil yang berubah saat tema diganti
+    theme_slot = st.empty()
+
+def result_box(body, tag="h4"):
+    st.markdown(assets.render("result_box", tag=tag, body=body), unsafe_allow_html=True)
+
+def formula_box(body):
+    st.markdown(assets.render("formula_box", body=minify_html(body)), unsafe_allow_html=True)
+
+def physics_card(body, style=None):
+    attrs = f' style="{style}"' if style else ""
+    st.markdown(assets.render("physics_card", attrs=attrs, body=minify_html(body)), unsafe_allow_html=True)
 
 # Watermark
 st.markdown("""
@@ -129,7 +74,8 @@ st.markdown("""
 st.sidebar.markdown("### ⚙️ Panel Kontrol")
 
 # Mode tema
-theme_mode = st.sidebar.radio("🎨 Pilih Tema:", ["Light Mode", "Dark Mode"])
+theme_mode = st.sidebar.radio("🎨 Pilih Tema:", list(THEMES))
+theme_slot.markdown(assets.theme_tag(theme_mode), unsafe_allow_html=True)
 
 # Pilihan kalkulator
 calc_type = st.sidebar.selectbox(
@@ -138,6 +84,7 @@ calc_type = st.sidebar.selectbox(
         "Hukum Ohm (V = I × R)",
         "Hambatan Seri",
         "Hambatan Paralel", 
+        "Jaringan Seri-Paralel",
         "GGL dan Tegangan Jepit",
         "Daya dan Energi Listrik",
         "Hukum Kirchhoff I (KCL)",
@@ -152,12 +99,10 @@ def ohm_law_calculator():
     st.subheader("⚡ Hukum Ohm Calculator")
     
     # Formula display
-    st.markdown("""
-    <div class="formula-box">
-        <strong>V = I × R</strong><br>
-        V = Tegangan (Volt), I = Arus (Ampere), R = Hambatan (Ohm)
-    </div>
-    """, unsafe_allow_html=True)
+    formula_box("""
+    <strong>V = I × R</strong><br>
+    V = Tegangan (Volt), I = Arus (Ampere), R = Hambatan (Ohm)
+    """)
     
     col1, col2 = st.columns(2)
     
@@ -166,28 +111,46 @@ def ohm_law_calculator():
         
     with col2:
         if calc_what == "Tegangan (V)":
-            I = st.number_input("Arus (A):", value=1.0, step=0.1)
-            R = st.number_input("Hambatan (Ω):", value=10.0, step=0.1)
-            V = I * R
-            result = f"Tegangan = {V:.2f} Volt"
+            x = st.number_input("Arus (A):", value=1.0, step=0.1)
+            y = st.number_input("Hambatan (Ω):", value=10.0, step=0.1)
             
         elif calc_what == "Arus (I)":
-            V = st.number_input("Tegangan (V):", value=12.0, step=0.1)
-            R = st.number_input("Hambatan (Ω):", value=10.0, step=0.1)
-            I = V / R if R != 0 else 0
-            result = f"Arus = {I:.2f} Ampere"
+            x = st.number_input("Tegangan (V):", value=12.0, step=0.1)
+            y = st.number_input("Hambatan (Ω):", value=10.0, step=0.1)
             
         else:  # Hambatan
-            V = st.number_input("Tegangan (V):", value=12.0, step=0.1)
-            I = st.number_input("Arus (A):", value=1.0, step=0.1)
-            R = V / I if I != 0 else 0
-            result = f"Hambatan = {R:.2f} Ohm"
+            x = st.number_input("Tegangan (V):", value=12.0, step=0.1)
+            y = st.number_input("Arus (A):", value=1.0, step=0.1)
+    
+    graph = get_graph()
+    graph.set_inputs("ohm", mode=calc_what, x=x, y=y)
+    graph.define("ohm.point", ohm_operating_point, "ohm.mode", "ohm.x", "ohm.y")
+    graph.define("ohm.R", lambda point: point["R"], "ohm.point")
+    point = graph.get("ohm.point")
+    V, I, R = point["V"], point["I"], point["R"]
+    publish_operating_point("Hukum Ohm", point["P"], V, I)
+    record_report("Hukum Ohm", [("Mode", calc_what, "")],
+                  [("Tegangan V", V, "V"), ("Arus I", I, "A"), ("Hambatan R", R, "Ω"), ("Daya P", point["P"], "W")])
     
-    st.markdown(f'<div class="result-box"><h3>{result}</h3></div>', unsafe_allow_html=True)
+    if calc_what == "Tegangan (V)":
+        result = f"Tegangan = {V:.2f} Volt"
+    elif calc_what == "Arus (I)":
+        result = f"Arus = {I:.2f} Ampere"
+    else:
+        result = f"Hambatan = {R:.2f} Ohm"
+    result_box(result, "h3")
     
     # Grafik V vs I
     if calc_what == "Tegangan (V)":
-        create_vi_graph(R, "ohm")
+        create_vi_graph()
+    
+    with st.expander("🧭 Sapuan Parameter"):
+        if calc_what == "Tegangan (V)":
+            parameter_sweep("ohm_v", {"I": I, "R": R}, ["I", "R"])
+        elif calc_what == "Arus (I)":
+            parameter_sweep("ohm_i", {"V": V, "R": R}, ["R"], "I")
+        else:
+            parameter_sweep("ohm_r", {"V": V, "I": I}, ["I"])
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -195,11 +158,7 @@ def series_resistance():
     st.markdown('<div class="physics-card">', unsafe_allow_html=True)
     st.subheader("🔗 Hambatan Seri")
     
-    st.markdown("""
-    <div class="formula-box">
-        <strong>R_total = R₁ + R₂ + R₃ + ... + Rₙ</strong>
-    </div>
-    """, unsafe_allow_html=True)
+    formula_box("<strong>R_total = R₁ + R₂ + R₃ + ... + Rₙ</strong>")
     
     num_resistors = st.slider("Jumlah Hambatan:", 2, 5, 3)
     resistors = []
@@ -210,12 +169,23 @@ def series_resistance():
             r = st.number_input(f"R{i+1} (Ω):", value=10.0*(i+1), step=0.1, key=f"series_r{i}")
             resistors.append(r)
     
-    R_total = sum(resistors)
+    graph = get_graph()
+    graph.set_input("series.resistors", tuple(resistors))
+    graph.define("series.total", core.series_resistance, "series.resistors")
+    R_total = graph.get("series.total")
+    record_report("Hambatan Seri", [(f"R{i + 1}", r, "Ω") for i, r in enumerate(resistors)],
+                  [("R_total", R_total, "Ω")])
     
-    st.markdown(f'<div class="result-box"><h3>R_total = {R_total:.2f} Ω</h3></div>', unsafe_allow_html=True)
+    result_box(f'R_total = {R_total:.2f} Ω', "h3")
     
     # Visualisasi rangkaian seri
-    create_series_circuit_diagram(resistors)
+    create_series_circuit_diagram()
+    
+    with st.expander("🎲 Analisis Toleransi (Monte Carlo)"):
+        tolerance_analysis("series", tuple(resistors))
+    
+    with st.expander("🧭 Sapuan Parameter"):
+        parameter_sweep(f"series:{num_resistors}", {f"R{i + 1}": r for i, r in enumerate(resistors)}, ["R1", "R2"])
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -223,11 +193,7 @@ def parallel_resistance():
     st.markdown('<div class="physics-card">', unsafe_allow_html=True)
     st.subheader("⚡ Hambatan Paralel")
     
-    st.markdown("""
-    <div class="formula-box">
-        <strong>1/R_total = 1/R₁ + 1/R₂ + 1/R₃ + ... + 1/Rₙ</strong>
-    </div>
-    """, unsafe_allow_html=True)
+    formula_box("<strong>1/R_total = 1/R₁ + 1/R₂ + 1/R₃ + ... + 1/Rₙ</strong>")
     
     num_resistors = st.slider("Jumlah Hambatan:", 2, 5, 3)
     resistors = []
@@ -239,13 +205,290 @@ def parallel_resistance():
             resistors.append(r)
     
     # Perhitungan paralel
-    reciprocal_sum = sum(1/r for r in resistors if r != 0)
-    R_total = 1/reciprocal_sum if reciprocal_sum != 0 else 0
+    graph = get_graph()
+    graph.set_input("parallel.resistors", tuple(resistors))
+    graph.define("parallel.total", core.parallel_resistance, "parallel.resistors")
+    R_total = graph.get("parallel.total")
+    record_report("Hambatan Paralel", [(f"R{i + 1}", r, "Ω") for i, r in enumerate(resistors)],
+                  [("R_total", R_total, "Ω")])
     
-    st.markdown(f'<div class="result-box"><h3>R_total = {R_total:.2f} Ω</h3></div>', unsafe_allow_html=True)
+    result_box(f'R_total = {R_total:.2f} Ω', "h3")
     
     # Visualisasi rangkaian paralel
-    create_parallel_circuit_diagram(resistors)
+    create_parallel_circuit_diagram()
+    
+    with st.expander("🎲 Analisis Toleransi (Monte Carlo)"):
+        tolerance_analysis("parallel", tuple(resistors))
+    
+    with st.expander("🧭 Sapuan Parameter"):
+        parameter_sweep(f"parallel:{num_resistors}", {f"R{i + 1}": r for i, r in enumerate(resistors)}, ["R1", "R2"])
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def get_sweep_calculator(key):
+    from listrik import sweep
+    if ":" in key:
+        kind, count = key.split(":")
+        return sweep.resistor_calculator(kind, int(count))
+    return sweep.CALCULATORS[key]
+
+@st.cache_data(max_entries=16)
+def run_sweep(key, fixed, axes, output, adaptive, tol, level):
+    """Sapuan di-cache per input; ``axes`` berupa tuple ``(nama, min, maks, log)``"""
+    from listrik import sweep
+    calculator = get_sweep_calculator(key)
+    axes = [sweep.Axis(*axis) for axis in axes]
+    if adaptive:
+        return sweep.adaptive(calculator, dict(fixed), axes, output, tol=tol, level=level)
+    return sweep.grid(calculator, dict(fixed), axes, points=1001 if len(axes) == 1 else 201)
+
+def parameter_sweep(key, current, default, output=None):
+    """Sapu satu atau dua masukan kalkulator; titik operasi saat ini ditandai"""
+    from listrik.figures import sweep_figure
+
+    calculator = get_sweep_calculator(key)
+    names = st.multiselect("Masukan yang disapu (maks. 2):", list(calculator.inputs), default=default,
+                           max_selections=2, format_func=calculator.inputs.get, key=f"{key}_sweep_inputs")
+    if not names:
+        st.info("Pilih satu atau dua masukan untuk disapu.")
+        return
+    
+    axes = []
+    for name in names:
+        value = float(current[name])
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            lo = st.number_input(f"{calculator.inputs[name]} min:", value=value / 10 if value > 0 else 0.0,
+                                 key=f"{key}_{name}_lo")
+        with col2:
+            hi = st.number_input(f"{calculator.inputs[name]} maks:", value=value * 3 if value > 0 else 10.0,
+                                 key=f"{key}_{name}_hi")
+        with col3:
+            log = st.checkbox("Log", value=False, key=f"{key}_{name}_log")
+        axes.append((name, lo, hi, log))
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        outputs = list(calculator.outputs)
+        output = st.selectbox("Keluaran:", outputs, index=outputs.index(output) if output else 0,
+                              format_func=calculator.outputs.get, key=f"{key}_sweep_output")
+        kind = st.radio("Tampilan:", ["contour", "surface"], horizontal=True, key=f"{key}_sweep_kind",
+                        format_func=lambda k: "Kontur" if k == "contour" else "Permukaan 3D") if len(axes) == 2 else "line"
+    with col2:
+        adaptive = st.toggle("Penghalusan adaptif", value=True, key=f"{key}_sweep_adaptive")
+        tol = st.select_slider("Toleransi galat:", [0.02, 0.01, 0.005, 0.002, 0.001], value=0.005,
+                               format_func=lambda t: f"{t * 100:g}%", key=f"{key}_sweep_tol", disabled=not adaptive)
+    with col3:
+        mark = st.checkbox("Level yang diminati", key=f"{key}_sweep_mark")
+        level = st.number_input("Nilai level:", value=0.0, key=f"{key}_sweep_level", disabled=not mark)
+    
+    fixed = tuple(sorted((name, float(value)) for name, value in current.items() if name not in names))
+    try:
+        result = run_sweep(key, fixed, tuple(axes), output, adaptive, tol, level if mark else None)
+    except ValueError as e:
+        st.error(f"Sapuan tidak valid: {e}")
+        return
+    
+    labels = {**calculator.inputs, **calculator.outputs}
+    st.session_state.setdefault("report_sweeps", {})[f"Sapuan {calculator.title} {output}"] = result
+    show_figure(f"sapuan_{key}_{output}", sweep_figure(result, output, labels, kind, level if mark else None,
+                                                       {name: current[name] for name in names}, show_grid=adaptive))
+    st.caption(f"{result.evaluations:,} evaluasi pada grid {' × '.join(str(n) for n in reversed(result.shape))}"
+               + (f" (grid seragam setara: {result.uniform_equivalent:,} titik)" if adaptive else ""))
+
+def tolerance_analysis(kind, inputs, network=None):
+    """Monte Carlo toleransi; tanpa ``network`` hambatan ``inputs`` dirangkai seri/paralel"""
+    from listrik import tolerance
+    from listrik.figures import tolerance_histogram_figure
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        percent = st.selectbox("Toleransi:", [1, 2, 5, 10, 20], index=2, format_func=lambda p: f"±{p}%",
+                               key=f"{kind}_tol")
+        series = st.selectbox("Bulatkan ke deret:", ["Tidak"] + list(tolerance.E_SERIES), key=f"{kind}_eseries")
+    with col2:
+        distribution = st.radio("Distribusi:", tolerance.DISTRIBUTIONS, horizontal=True, key=f"{kind}_dist",
+                                format_func=lambda d: "Seragam" if d == "uniform" else "Normal (3σ)")
+        trials = st.select_slider("Jumlah percobaan:", [10_000, 100_000, 1_000_000, 10_000_000],
+                                  value=1_000_000, key=f"{kind}_trials")
+    with col3:
+        V = st.number_input("Tegangan sumber (V):", value=12.0, step=1.0, key=f"{kind}_mc_v")
+        spec = st.number_input("Spesifikasi R_total (±%):", value=2.0, min_value=0.0, step=0.5, key=f"{kind}_spec")
+    seeded = st.checkbox("Mode reprodusibel (seed tetap)", value=True, key=f"{kind}_seeded")
+    seed = st.number_input("Seed:", value=2024, step=1, key=f"{kind}_seed") if seeded else None
+    
+    # Hasil disimpan per hash input: mengganti besaran histogram atau kembali ke halaman ini tidak menjalankan ulang
+    args = (kind, inputs, network, percent / 100, V, trials, distribution,
+            None if series == "Tidak" else series, seed, spec / 100)
+    state_key = f"{kind}_tolerance_job"
+    if st.button("🎲 Jalankan Monte Carlo", key=f"{kind}_run"):
+        run_job(state_key, "tolerance", monte_carlo_job, *args)
+    job = job_result(state_key, "Analisis toleransi")
+    result = get_job_runner().cached("tolerance", *args)
+    if result is None:
+        if job is None:
+            return
+        result = job.result
+        st.caption("⚠️ Input berubah — jalankan ulang untuk memperbarui hasil.")
+    
+    p1, p50, p99 = result.percentile([1, 50, 99])[0]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        result_box(f'Yield<br>{result.yield_fraction * 100:.2f}%')
+    with col2:
+        result_box(f'R_total p50<br>{p50:.3f} Ω')
+    with col3:
+        result_box(f'p1 – p99<br>{p1:.3f} – {p99:.3f} Ω')
+    with col4:
+        result_box(f'σ R_total<br>{result.std[0]:.4f} Ω')
+    
+    name = st.selectbox("Besaran:", result.names, key=f"{kind}_quantity")
+    k = result.index(name)
+    edges, counts = result.histogram(name)
+    percentiles = dict(zip((1, 50, 99), result.percentile([1, 50, 99])[k]))
+    show_figure(f"toleransi_{kind}_{name}", tolerance_histogram_figure(edges, counts, name, result.nominal[k],
+                                                                       percentiles, result.spec if k == 0 else None))
+    st.dataframe(result.summary().rename(columns={
+        "nominal": "Nominal", "mean": "Rata-rata", "std": "σ", "min": "Min", "max": "Maks",
+        "worst_low": "Terburuk (min)", "worst_high": "Terburuk (maks)",
+    }), use_container_width=True)
+    st.caption(f"{result.trials:,} percobaan; yield = R_total di dalam ±{spec:g}% dari nominal.")
+
+def monte_carlo_job(kind, inputs, network, tolerance, V, trials, distribution, series, seed, spec, progress):
+    """Badan job latar Monte Carlo; tanpa ``network`` hambatan ``inputs`` dirangkai seri/paralel"""
+    from listrik import tolerance as tol
+    
+    if network is None:
+        network = (tol.series_network if kind == "series" else tol.parallel_network)(inputs)
+    return tol.monte_carlo(network, tolerance, V, trials, distribution, series=series, seed=seed, spec=spec,
+                           progress=lambda fraction: progress(fraction, f"{fraction * trials:,.0f} percobaan"))
+
+@st.cache_resource(max_entries=8)
+def load_network(expression, values):
+    """Parse dan reduksi jaringan sekali per ekspresi (hasil tidak diubah)"""
+    return parse_expression(expression, dict(values))
+
+def open_subnetwork(node):
+    st.session_state.network_path.append(node)
+
+def close_subnetwork():
+    st.session_state.network_path.pop()
+
+@st.cache_data(max_entries=64)
+def run_synthesis(target, series, max_parts, tolerance):
+    result = synthesize(target, series, max_parts, tolerance)
+    return result.best, result.candidates, result.elapsed, result.within_tolerance
+
+def synthesis_panel():
+    """Cari kombinasi resistor deret E untuk hambatan target"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        target = st.number_input("R target (Ω):", min_value=0.01, value=1234.0, step=1.0, key="synth_target")
+    with col2:
+        series = st.selectbox("Deret:", ["E12", "E24", "E96"], index=1, key="synth_series")
+    with col3:
+        max_parts = st.slider("Komponen maks.:", 1, 4, 3, key="synth_parts")
+    with col4:
+        tol = st.number_input("Galat diterima (%):", min_value=0.0, value=0.5, step=0.1, key="synth_tol")
+    
+    best, candidates, elapsed, within = run_synthesis(target, series, max_parts, tol / 100 if tol > 0 else None)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        result_box(f'R hasil<br>{best.value:.4g} Ω')
+    with col2:
+        result_box(f'Galat<br>{best.error_percent:+.3f}%')
+    with col3:
+        result_box(f'Komponen<br>{best.count}')
+    st.write(f"**Rangkaian:** `{best.expression}`")
+    if tol > 0 and not within:
+        st.warning(f"Tidak ada kombinasi hingga {max_parts} komponen dalam ±{tol:g}%")
+    st.dataframe(pd.DataFrame({
+        "Rangkaian": [c.expression for c in candidates],
+        "Topologi": [c.topology for c in candidates],
+        "Komponen": [c.count for c in candidates],
+        "R (Ω)": [c.value for c in candidates],
+        "Galat (%)": [c.error_percent for c in candidates],
+    }), hide_index=True, use_container_width=True)
+    st.caption(f"⏱️ Pencarian {elapsed * 1000:.1f} ms · ekspresi dapat ditempel ke kolom Ekspresi di atas")
+
+def series_parallel_network():
+    st.markdown('<div class="physics-card">', unsafe_allow_html=True)
+    st.subheader("🌳 Jaringan Seri-Paralel Bertingkat")
+    
+    formula_box("""
+    <strong>A + B</strong> = seri, <strong>A || B</strong> = paralel<br>
+    Contoh: (R1 + (R2 || R3 || R4)) || R5
+    """)
+    
+    uploaded = st.file_uploader("Unggah berkas ekspresi (baris `R1 = 10` dan satu ekspresi):", type=["txt"])
+    col1, col2 = st.columns(2)
+    with col1:
+        V_source = st.number_input("Tegangan Sumber (V):", value=12.0, step=0.1, key="network_v")
+        if uploaded is None:
+            expression = st.text_input("Ekspresi:", value="(R1 + (R2 || R3 || R4)) || R5")
+    with col2:
+        if uploaded is None:
+            definitions = st.text_area("Nilai hambatan (Ω):", value="R1 = 10\nR2 = 20\nR3 = 30\nR4 = 40\nR5 = 50")
+            _, values = parse_definitions(definitions)
+        else:
+            expression, values = parse_definitions(uploaded.getvalue().decode("utf-8"))
+    
+    try:
+        network = load_network(expression, tuple(sorted(values.items())))
+    except ValueError as e:
+        st.error(f"Ekspresi tidak valid: {e}")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    analysis = network.analyze(voltage=V_source)
+    root = network.root
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        result_box(f'R_total<br>{network.equivalent_resistance:.3f} Ω')
+    with col2:
+        result_box(f'Arus Total<br>{analysis["current"][root]:.3f} A')
+    with col3:
+        result_box(f'Daya Total<br>{analysis["power"][root]:.2f} W')
+    with col4:
+        result_box(f'Jumlah Hambatan<br>{network.n_leaves}')
+    
+    # Penelusuran sub-rangkaian: hanya anak dari node yang dibuka yang ditampilkan
+    if st.session_state.get("network_key") != (expression, tuple(sorted(values.items()))):
+        st.session_state.network_key = (expression, tuple(sorted(values.items())))
+        st.session_state.network_path = []
+    path = st.session_state.network_path
+    node = path[-1] if path else root
+    
+    st.write(f"**Sub-rangkaian:** `{network.describe(node)}`")
+    children = network.child_nodes(node)[:200]
+    kinds = {LEAF: "Hambatan", SERIES: "Seri"}
+    st.dataframe(pd.DataFrame({
+        "Elemen": [network.describe(child, 40) for child in children],
+        "Jenis": [kinds.get(network.kind[child], "Paralel") for child in children],
+        "R (Ω)": network.resistance[children],
+        "Arus (A)": analysis["current"][children],
+        "Tegangan (V)": analysis["voltage"][children],
+        "Daya (W)": analysis["power"][children]
+    }), use_container_width=True)
+    if network.child_nodes(node).size > children.size:
+        st.caption(f"Menampilkan 200 dari {network.child_nodes(node).size} cabang")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        internal = [child for child in children.tolist() if network.kind[child] != LEAF]
+        if internal:
+            target = st.selectbox("Sub-rangkaian:", internal, format_func=lambda n: network.describe(n, 40))
+            st.button("🔍 Buka", on_click=open_subnetwork, args=(target,))
+    with col2:
+        if path:
+            st.button("⬆️ Kembali", on_click=close_subnetwork)
+    
+    with st.expander("🎲 Analisis Toleransi (Monte Carlo)"):
+        tolerance_analysis("network", st.session_state.network_key, network)
+    
+    with st.expander("🎯 Sintesis Nilai Standar"):
+        synthesis_panel()
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -253,12 +496,10 @@ def emf_terminal_voltage():
     st.markdown('<div class="physics-card">', unsafe_allow_html=True)
     st.subheader("🔋 GGL dan Tegangan Jepit")
     
-    st.markdown("""
-    <div class="formula-box">
-        <strong>V_terminal = ε - I × r</strong><br>
-        ε = GGL (Volt), r = hambatan dalam (Ω), I = Arus (A)
-    </div>
-    """, unsafe_allow_html=True)
+    formula_box("""
+    <strong>V_terminal = ε - I × r</strong><br>
+    ε = GGL (Volt), r = hambatan dalam (Ω), I = Arus (A)
+    """)
     
     col1, col2 = st.columns(2)
     
@@ -269,34 +510,137 @@ def emf_terminal_voltage():
     with col2:
         current = st.number_input("Arus - I (A):", value=2.0, step=0.1)
         
-    v_terminal = emf - (current * internal_r)
-    power_loss = current**2 * internal_r
-    efficiency = (v_terminal / emf) * 100 if emf != 0 else 0
+    graph = get_graph()
+    graph.set_inputs("emf", emf=emf, r=internal_r, I=current)
+    graph.define("emf.results", emf_results, "emf.emf", "emf.r", "emf.I")
+    results = graph.get("emf.results")
+    v_terminal, power_loss, efficiency = results["V_terminal"], results["P_loss"], results["efficiency"]
+    publish_operating_point("GGL dan Tegangan Jepit", v_terminal * current, v_terminal, current)
+    record_report("GGL dan Tegangan Jepit", [("GGL ε", emf, "V"), ("Hambatan dalam r", internal_r, "Ω"),
+                                             ("Arus I", current, "A")],
+                  [("V_terminal", v_terminal, "V"), ("Rugi daya", power_loss, "W"),
+                   ("Daya beban", v_terminal * current, "W"), ("Efisiensi", efficiency, "%")])
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.markdown(f'<div class="result-box"><h4>V_terminal<br>{v_terminal:.2f} V</h4></div>', unsafe_allow_html=True)
+        result_box(f'V_terminal<br>{v_terminal:.2f} V')
     with col2:
-        st.markdown(f'<div class="result-box"><h4>Rugi Daya<br>{power_loss:.2f} W</h4></div>', unsafe_allow_html=True)
+        result_box(f'Rugi Daya<br>{power_loss:.2f} W')
     with col3:
-        st.markdown(f'<div class="result-box"><h4>Efisiensi<br>{efficiency:.1f}%</h4></div>', unsafe_allow_html=True)
+        result_box(f'Efisiensi<br>{efficiency:.1f}%')
     
     # Grafik V_terminal vs I
-    create_emf_graph(emf, internal_r)
+    create_emf_graph()
+    
+    with st.expander("🧭 Sapuan Parameter"):
+        parameter_sweep("emf", {"emf": emf, "r": internal_r, "I": current}, ["r", "I"], "P_load")
+    
+    with st.expander("🔋 Paket Baterai sSpP"):
+        battery_pack()
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+def battery_pack():
+    """Paket S seri × P paralel dengan sebaran GGL/r, pembagian arus, dan simulasi pengosongan"""
+    from listrik.battery import CHEMISTRY, Pack
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        series = st.number_input("Sel seri (S):", min_value=1, max_value=500, value=100, key="pack_s")
+        parallel = st.number_input("Sel paralel (P):", min_value=1, max_value=100, value=10, key="pack_p")
+    with col2:
+        chemistry = st.selectbox("Kimia sel:", list(CHEMISTRY), key="pack_chem")
+        capacity = st.number_input("Kapasitas sel (Ah):", min_value=0.1, value=3.0, step=0.1, key="pack_c")
+    with col3:
+        cell_r = st.number_input("r sel (mΩ):", min_value=0.1, value=50.0, step=1.0, key="pack_r") / 1000
+        emf_spread = st.number_input("Sebaran GGL σ (mV):", min_value=0.0, value=10.0, key="pack_de") / 1000
+    with col4:
+        r_spread = st.number_input("Sebaran r σ (%):", min_value=0.0, value=10.0, key="pack_dr") / 100
+        seed = st.number_input("Seed:", min_value=0, value=1, key="pack_seed")
+    
+    try:
+        pack = Pack.random(int(series), int(parallel), capacity, cell_r, emf_spread, r_spread, seed=int(seed),
+                           chemistry=chemistry)
+    except ValueError as e:
+        st.error(f"Paket tidak valid: {e}")
+        return
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        result_box(f'GGL Paket<br>{pack.emf:.2f} V')
+    with col2:
+        result_box(f'r Paket<br>{pack.internal_resistance * 1000:.1f} mΩ')
+    with col3:
+        result_box(f'Kapasitas<br>{pack.capacity_ah:.2f} Ah')
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        mode = st.radio("Mode:", ["Arus tetap", "Daya tetap"], key="pack_mode")
+    with col2:
+        unit = "A" if mode == "Arus tetap" else "W"
+        value = st.number_input(f"Beban ({unit}):", min_value=0.0,
+                                value=float(parallel) * capacity if unit == "A" else pack.emf * parallel * capacity,
+                                key=f"pack_load_{unit}")
+    with col3:
+        dt = st.number_input("Langkah waktu (s):", min_value=0.01, value=1.0, key="pack_dt")
+    with col4:
+        steps = st.number_input("Jumlah langkah:", min_value=10, max_value=100_000, value=10_000, step=1000,
+                                key="pack_steps")
+    
+    cells, group_v = pack.share(value if unit == "A" else value / pack.emf)
+    st.caption(f"Pembagian arus awal: sel {cells.min():.3f} – {cells.max():.3f} A, "
+               f"tegangan grup {group_v.min():.3f} – {group_v.max():.3f} V")
+    
+    args = (int(series), int(parallel), capacity, cell_r, emf_spread, r_spread, int(seed), chemistry, value,
+            "current" if unit == "A" else "power", dt, int(steps))
+    if st.button("▶️ Simulasikan Pengosongan", key="pack_run"):
+        run_job("pack_job", "battery", pack_discharge_job, *args)
+    job_result("pack_job", "Simulasi pengosongan")
+    stored = get_job_runner().cached("battery", *args)
+    if stored is not None:
+        show_pack_discharge(*stored)
+
+def pack_discharge_job(series, parallel, capacity, cell_r, emf_spread, r_spread, seed, chemistry, value, mode, dt,
+                       steps, progress):
+    """Badan job latar simulasi paket; hasil ``(Discharge, detik)``"""
+    from listrik.battery import Pack
+    
+    started = time.perf_counter()
+    pack = Pack.random(series, parallel, capacity, cell_r, emf_spread, r_spread, seed=seed, chemistry=chemistry)
+    # Cache hanya menyimpan selubung min/rata-rata/maks, bukan matriks langkah × sel
+    result = pack.discharge(value, mode, dt, steps, progress=progress).drop_cells()
+    return result, time.perf_counter() - started
+
+def show_pack_discharge(result, elapsed):
+    from listrik.figures import pack_cells_figure, pack_discharge_figure, waveform_figure
+    
+    summary = result.summary()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        result_box(f'Durasi<br>{summary["duration_s"] / 3600:.2f} jam')
+    with col2:
+        result_box(f'Energi<br>{summary["energy_wh"]:.1f} Wh')
+    with col3:
+        result_box(f'Muatan<br>{summary["charge_ah"]:.2f} Ah')
+    with col4:
+        result_box(f'SoC Sel Min<br>{summary["min_soc"] * 100:.1f}%')
+    st.caption(f"Berhenti: {summary['reason']} · {result.time.size:,} langkah × "
+               f"{result.pack.cells:,} sel dalam {elapsed:.2f} s")
+    
+    time_h = result.time / 3600
+    show_figure("paket_baterai", pack_discharge_figure(time_h, result.voltage, result.current))
+    show_figure("arus_sel", waveform_figure(time_h, result.cell_envelope("current"),
+                                            ["Arus sel min", "Arus sel rata-rata", "Arus sel maks"], unit="jam"))
+    show_figure("soc_sel", pack_cells_figure(result.final_soc))
+
 def power_energy_calculator():
     st.markdown('<div class="physics-card">', unsafe_allow_html=True)
     st.subheader("⚡ Daya dan Energi Listrik")
     
-    st.markdown("""
-    <div class="formula-box">
-        <strong>P = V × I = I² × R = V²/R</strong><br>
-        <strong>W = P × t</strong><br>
-        P = Daya (Watt), W = Energi (Joule), t = waktu (detik)
-    </div>
-    """, unsafe_allow_html=True)
+    formula_box("""
+    <strong>P = V × I = I² × R = V²/R</strong><br>
+    <strong>W = P × t</strong><br>
+    P = Daya (Watt), W = Energi (Joule), t = waktu (detik)
+    """)
     
     col1, col2 = st.columns(2)
     
@@ -308,45 +652,142 @@ def power_energy_calculator():
         R = st.number_input("Hambatan (Ω):", value=44.0, step=0.1)
         t_hours = st.number_input("Waktu (jam):", value=1.0, step=0.1)
     
-    # Perhitungan daya (3 cara)
-    P1 = V * I
-    P2 = I**2 * R
-    P3 = V**2 / R if R != 0 else 0
-    
-    # Energi
-    t_seconds = t_hours * 3600
-    W_joules = P1 * t_seconds
-    W_kwh = (P1 * t_hours) / 1000
-    
-    # Biaya listrik (asumsi Rp 1.500/kWh)
-    cost = W_kwh * 1500
+    tariff, start = select_tariff()
+    
+    # Perhitungan daya (3 cara), energi, dan biaya sesuai golongan tarif
+    graph = get_graph()
+    graph.set_inputs("power", V=V, I=I, R=R, t_hours=t_hours, tariff=tariff, start=start)
+    graph.define("power.results", core.power_energy, "power.V", "power.I", "power.R", "power.t_hours")
+    graph.define("power.P", lambda results: float(results["P_vi"]), "power.results")
+    graph.define("power.cost", lambda P, hours, tariff, start: tariff.cost_for_load(P, hours, start),
+                 "power.P", "power.t_hours", "power.tariff", "power.start")
+    results = graph.get("power.results")
+    P1, P2, P3 = results["P_vi"], results["P_i2r"], results["P_v2r"]
+    W_joules = results["energy_j"]
+    W_kwh = results["energy_kwh"]
+    cost = graph.get("power.cost")
+    publish_operating_point("Daya dan Energi Listrik", P1, V, I)
+    record_report("Daya dan Energi Listrik", [("Tegangan V", V, "V"), ("Arus I", I, "A"), ("Hambatan R", R, "Ω"),
+                                              ("Lama pemakaian", t_hours, "jam"), ("Golongan tarif", tariff.name, "")],
+                  [("P = V × I", P1, "W"), ("P = I² × R", P2, "W"), ("P = V² / R", P3, "W"),
+                   ("Energi", W_joules, "J"), ("Energi", W_kwh, "kWh"), ("Biaya", cost, "Rp")])
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.markdown(f'<div class="result-box"><h4>Daya<br>{P1:.1f} W</h4></div>', unsafe_allow_html=True)
+        result_box(f'Daya<br>{P1:.1f} W')
     with col2:
-        st.markdown(f'<div class="result-box"><h4>Energi<br>{W_kwh:.2f} kWh</h4></div>', unsafe_allow_html=True)
+        result_box(f'Energi<br>{W_kwh:.2f} kWh')
     with col3:
-        st.markdown(f'<div class="result-box"><h4>Biaya<br>Rp {cost:.0f}</h4></div>', unsafe_allow_html=True)
+        result_box(f'Biaya<br>Rp {cost:.0f}')
     with col4:
-        efficiency_rating = "Efisien" if P1 < 100 else "Sedang" if P1 < 500 else "Tinggi"
-        st.markdown(f'<div class="result-box"><h4>Rating<br>{efficiency_rating}</h4></div>', unsafe_allow_html=True)
+        efficiency_rating = core.power_rating(P1)
+        result_box(f'Rating<br>{efficiency_rating}')
     
     # Grafik konsumsi energi vs waktu
-    create_power_time_graph(P1)
+    create_power_time_graph()
+    
+    with st.expander("🧭 Sapuan Parameter"):
+        parameter_sweep("power", {"V": V, "I": I, "R": R, "t_hours": t_hours}, ["R"], "P_v2r")
+    
+    # Rekap tagihan dari log meter besar
+    with st.expander("📂 Rekap Log Meter (CSV/Excel)"):
+        meter_log_report(tariff)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+@st.cache_resource(max_entries=8)
+def load_tariff_classes(text=None, suffix=".json"):
+    from listrik import tariff
+
+    if text is None:
+        return tariff.default_tariffs()
+    return {**tariff.default_tariffs(), **tariff.loads_tariffs(text, suffix)}
+
+def select_tariff():
+    from listrik.tariff import DEFAULT_TARIFF
+
+    with st.expander("🏷️ Golongan Tarif dari Berkas (JSON/YAML)"):
+        st.write("Format: `{nama: {rate | tiers: [{up_to, rate}], blocks: [{name, start, end, multiplier, days}], fixed_charge}}`")
+        uploaded = st.file_uploader("Unggah tarif:", type=["json", "yaml", "yml"], key="tariff_file")
+    classes = load_tariff_classes()
+    if uploaded is not None:
+        suffix = "." + uploaded.name.rsplit(".", 1)[-1]
+        try:
+            classes = load_tariff_classes(uploaded.getvalue().decode("utf-8"), suffix)
+        except (ValueError, TypeError, KeyError, ImportError) as e:
+            st.error(f"Berkas tarif tidak valid: {e}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        names = list(classes)
+        name = st.selectbox("Golongan tarif:", names, index=names.index(DEFAULT_TARIFF))
+    with col2:
+        start = st.time_input("Mulai pemakaian:", value=datetime.time(18, 0), step=900)
+    return classes[name], start.strftime("%H:%M")
+
+def meter_log_report(tariff):
+    from listrik import metering
+
+    st.write("Kolom: `timestamp`, `V`, `I`, dan opsional `device` — berkas dibaca bertahap sehingga ukuran GB tetap aman.")
+    uploaded = st.file_uploader("Unggah log meter:", type=["csv", "txt", "xlsx"], key="meter_log")
+    interval = st.selectbox("Selang beban puncak:", ["15min", "30min", "1h"], index=0)
+    st.caption(f"Biaya dihitung dengan golongan tarif **{tariff.name}**.")
+    if uploaded is None:
+        return
+    
+    # Hasil disimpan per berkas dan opsi agar tombol unduh tidak memicu proses ulang
+    key = (uploaded.name, uploaded.size, interval, repr(tariff))
+    if st.session_state.get("meter_report_key") != key:
+        bar = st.progress(0.0, text="Memproses log...")
+        try:
+            report = metering.process_meter_log(
+                uploaded, uploaded.name, demand_interval=interval, tariff=tariff,
+                progress=lambda fraction, rows: bar.progress(fraction, text=f"{rows:,} baris diproses"),
+            )
+        except (ValueError, KeyError) as e:
+            bar.empty()
+            st.error(f"Log tidak dapat diproses: {e}")
+            return
+        bar.empty()
+        st.session_state.meter_report_key = key
+        st.session_state.meter_report = report
+    report = st.session_state.meter_report
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        result_box(f'Energi<br>{report["energy_kwh"].sum():.2f} kWh')
+    with col2:
+        result_box(f'Biaya<br>Rp {report["cost"].sum():,.0f}')
+    with col3:
+        result_box(f'Beban Puncak<br>{report["peak_demand_w"].max():.1f} W')
+    
+    st.dataframe(report.rename(columns={
+        "readings": "Pembacaan",
+        "energy_kwh": "Energi (kWh)",
+        "cost": "Biaya (Rp)",
+        "peak_power_w": "Daya Puncak (W)",
+        "peak_demand_w": f"Beban Puncak {interval} (W)",
+        "first": "Awal",
+        "last": "Akhir",
+    }), use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("📥 Unduh CSV", report.to_csv().encode("utf-8"),
+                           file_name="rekap_meter.csv", mime="text/csv")
+    with col2:
+        st.download_button("📥 Unduh Excel", metering.to_excel_bytes({"Rekap": report}),
+                           file_name="rekap_meter.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
 def kirchhoff_current_law():
     st.markdown('<div class="physics-card">', unsafe_allow_html=True)
     st.subheader("🔄 Hukum Kirchhoff I (KCL)")
     
-    st.markdown("""
-    <div class="formula-box">
-        <strong>ΣI_masuk = ΣI_keluar</strong><br>
-        Jumlah arus yang masuk = Jumlah arus yang keluar dari titik cabang
-    </div>
-    """, unsafe_allow_html=True)
+    formula_box("""
+    <strong>ΣI_masuk = ΣI_keluar</strong><br>
+    Jumlah arus yang masuk = Jumlah arus yang keluar dari titik cabang
+    """)
     
     st.write("**Contoh: Titik cabang dengan 3 arus**")
     
@@ -358,13 +799,19 @@ def kirchhoff_current_law():
     with col3:
         I3 = st.number_input("I₃ keluar (A):", value=0.0, step=0.1, disabled=True)
     
-    # Aplikasi KCL: I1 = I2 + I3
-    I3_calculated = I1 - I2
+    # Aplikasi KCL: I1 = I2 + I3 (diselesaikan oleh mesin MNA)
+    graph = get_graph()
+    graph.set_inputs("kcl", I1=I1, I2=I2)
+    graph.define("kcl.I3", lambda I1, I2: junction_circuit([I1], [I2]).solve().current("I_sisa"),
+                 "kcl.I1", "kcl.I2")
+    I3_calculated = graph.get("kcl.I3")
+    record_report("Hukum Kirchhoff I (KCL)", [("I₁ masuk", I1, "A"), ("I₂ keluar", I2, "A")],
+                  [("I₃ keluar", I3_calculated, "A")])
     
-    st.markdown(f'<div class="result-box"><h3>I₃ = {I3_calculated:.2f} A</h3></div>', unsafe_allow_html=True)
+    result_box(f'I₃ = {I3_calculated:.2f} A', "h3")
     
     # Visualisasi titik cabang
-    create_kcl_diagram(I1, I2, I3_calculated)
+    create_kcl_diagram()
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -372,12 +819,10 @@ def kirchhoff_voltage_law():
     st.markdown('<div class="physics-card">', unsafe_allow_html=True)
     st.subheader("🔄 Hukum Kirchhoff II (KVL)")
     
-    st.markdown("""
-    <div class="formula-box">
-        <strong>ΣV = 0</strong><br>
-        Jumlah algebrais tegangan dalam loop tertutup = 0
-    </div>
-    """, unsafe_allow_html=True)
+    formula_box("""
+    <strong>ΣV = 0</strong><br>
+    Jumlah algebrais tegangan dalam loop tertutup = 0
+    """)
     
     st.write("**Analisis Loop Sederhana**")
     
@@ -390,30 +835,68 @@ def kirchhoff_voltage_law():
         R2 = st.number_input("R₂ (Ω):", value=6.0, step=0.1)
         R3 = st.number_input("R₃ (Ω):", value=2.0, step=0.1)
     
-    # Analisis loop
-    R_total = R1 + R2 + R3
-    I_loop = V_source / R_total if R_total != 0 else 0
-    
-    V1 = I_loop * R1
-    V2 = I_loop * R2  
-    V3 = I_loop * R3
+    # Analisis loop dengan mesin MNA
+    graph = get_graph()
+    graph.set_inputs("kvl", V=V_source, resistors=(R1, R2, R3))
+    graph.define("kvl.solution", kvl_loop, "kvl.V", "kvl.resistors")
+    graph.define("kvl.voltages", lambda solution: solution[1:], "kvl.solution")
+    I_loop, V1, V2, V3 = graph.get("kvl.solution")
+    publish_operating_point("Hukum Kirchhoff II (KVL)", V_source * I_loop, V_source, I_loop)
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.markdown(f'<div class="result-box"><h4>Arus Loop<br>{I_loop:.2f} A</h4></div>', unsafe_allow_html=True)
+        result_box(f'Arus Loop<br>{I_loop:.2f} A')
     with col2:
-        st.markdown(f'<div class="result-box"><h4>V₁<br>{V1:.2f} V</h4></div>', unsafe_allow_html=True)
+        result_box(f'V₁<br>{V1:.2f} V')
     with col3:
-        st.markdown(f'<div class="result-box"><h4>V₂<br>{V2:.2f} V</h4></div>', unsafe_allow_html=True)
+        result_box(f'V₂<br>{V2:.2f} V')
     with col4:
-        st.markdown(f'<div class="result-box"><h4>V₃<br>{V3:.2f} V</h4></div>', unsafe_allow_html=True)
+        result_box(f'V₃<br>{V3:.2f} V')
     
     # Verifikasi KVL
     kvl_check = V_source - (V1 + V2 + V3)
+    record_report("Hukum Kirchhoff II (KVL)", [("Tegangan sumber", V_source, "V"), ("R₁", R1, "Ω"), ("R₂", R2, "Ω"),
+                                               ("R₃", R3, "Ω")],
+                  [("R_total", R1 + R2 + R3, "Ω"), ("I_loop", I_loop, "A"), ("V₁", V1, "V"), ("V₂", V2, "V"),
+                   ("V₃", V3, "V"), ("Cek KVL (ΣV)", kvl_check, "V"), ("Daya sumber", V_source * I_loop, "W")])
     st.write(f"**Verifikasi KVL:** {V_source:.2f} - ({V1:.2f} + {V2:.2f} + {V3:.2f}) = {kvl_check:.3f} ≈ 0 ✓")
     
     # Visualisasi loop
-    create_kvl_diagram(V_source, [V1, V2, V3], [R1, R2, R3])
+    create_kvl_diagram()
+    
+    with st.expander("🧭 Sapuan Parameter"):
+        parameter_sweep("kvl", {"V": V_source, "R1": R1, "R2": R2, "R3": R3}, ["R1", "V"])
+    
+    # Analisis rangkaian bebas dari netlist
+    with st.expander("📄 Analisis Netlist (Rangkaian Bebas)"):
+        st.write("Format gaya SPICE: `R1 n1 n2 4.7k`, `V1 n1 0 12`, `I1 0 n2 0.5` (node `0` = ground)")
+        uploaded = st.file_uploader("Unggah netlist:", type=["cir", "net", "txt"])
+        if uploaded is not None:
+            netlist = uploaded.getvalue().decode("utf-8")
+        else:
+            netlist = st.text_area("Netlist:", value="V1 n1 0 12\nR1 n1 n2 4\nR2 n2 0 6\nR3 n2 0 2", height=150)
+        
+        try:
+            circuit = parse_netlist(netlist)
+            solution = circuit.solve()
+        except (ValueError, np.linalg.LinAlgError) as e:
+            st.error(f"Netlist tidak dapat dianalisis: {e}")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Tegangan Node**")
+                st.dataframe(pd.DataFrame({
+                    "Node": circuit.nodes,
+                    "Tegangan (V)": solution.node_voltages
+                }), use_container_width=True)
+            with col2:
+                st.write("**Arus Hambatan**")
+                st.dataframe(pd.DataFrame({
+                    "Hambatan": [r[0] for r in circuit.resistors],
+                    "Tegangan (V)": solution.resistor_voltages,
+                    "Arus (A)": solution.resistor_currents
+                }), use_container_width=True)
+            st.write(f"**Residu KCL maksimum:** {np.abs(solution.kcl_residual()).max(initial=0):.2e} A")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -449,484 +932,782 @@ def dc_vs_ac_analysis():
     frequency = st.slider("Frekuensi AC (Hz):", 1, 100, 50)
     amplitude = st.slider("Amplitudo (V):", 1, 50, 12)
     dc_voltage = st.slider("Tegangan DC (V):", 1, 50, 12)
+    window_name = st.selectbox("Jendela FFT:", list(SPECTRUM_WINDOWS), index=1,
+                               format_func=SPECTRUM_WINDOWS.get)
     
     # Grafik perbandingan DC vs AC
-    create_dc_vs_ac_graph(frequency, amplitude, dc_voltage)
+    graph = get_graph()
+    graph.set_inputs("acdc", frequency=frequency, amplitude=amplitude, dc_voltage=dc_voltage, window=window_name)
+    create_dc_vs_ac_graph()
     
     # Analisis daya
     st.subheader("📊 Perbandingan Daya")
     col1, col2, col3 = st.columns(3)
     
-    rms_voltage = amplitude / math.sqrt(2)
+    # RMS dan THD dihitung dari spektrum sinyal AC (Parseval), bukan rumus A/√2
+    graph.define("acdc.spectrum", lambda f, a, window: ac_spectrum_summary(f, a, window),
+                 "acdc.frequency", "acdc.amplitude", "acdc.window")
+    ac_summary = graph.get("acdc.spectrum")
+    rms_voltage = ac_summary["rms"]
     peak_power_ac = amplitude**2 / 10  # Asumsi R = 10Ω
     avg_power_ac = rms_voltage**2 / 10
     dc_power = dc_voltage**2 / 10
+    publish_operating_point("Analisis DC vs AC", dc_power, dc_voltage, dc_voltage / 10)
+    record_report("Analisis DC vs AC", [("Frekuensi", frequency, "Hz"), ("Amplitudo", amplitude, "V"),
+                                        ("Tegangan DC", dc_voltage, "V"), ("Jendela FFT", window_name, "")],
+                  [("V_rms (spektrum)", rms_voltage, "V"), ("THD", ac_summary["thd"], "%"),
+                   ("Daya DC", dc_power, "W"), ("Daya AC (RMS)", avg_power_ac, "W"), ("Daya AC (Peak)", peak_power_ac, "W")])
     
     with col1:
-        st.markdown(f'<div class="result-box"><h4>Daya DC<br>{dc_power:.1f} W</h4></div>', unsafe_allow_html=True)
+        result_box(f'Daya DC<br>{dc_power:.1f} W')
     with col2:
-        st.markdown(f'<div class="result-box"><h4>Daya AC (RMS)<br>{avg_power_ac:.1f} W</h4></div>', unsafe_allow_html=True)
+        result_box(f'Daya AC (RMS)<br>{avg_power_ac:.1f} W')
     with col3:
-        st.markdown(f'<div class="result-box"><h4>Daya AC (Peak)<br>{peak_power_ac:.1f} W</h4></div>', unsafe_allow_html=True)
+        result_box(f'Daya AC (Peak)<br>{peak_power_ac:.1f} W')
+    st.caption(f"Dari spektrum: V_rms = {rms_voltage:.3f} V (teori A/√2 = {amplitude / math.sqrt(2):.3f} V), "
+               f"fundamental {ac_summary['fundamental']:.2f} Hz, THD {ac_summary['thd']:.3f}%.")
+    
+    # Rekaman osiloskop: spektrum Welch bertahap
+    with st.expander("📡 Spektrum Rekaman Osiloskop (CSV/NPY)"):
+        capture_spectrum(window_name)
+    
+    # Respons DC saat saklar ditutup
+    with st.expander("⏱️ Simulasi Transien (Saklar Ditutup)"):
+        transient_simulation()
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-# Fungsi untuk membuat grafik
-def create_vi_graph(R, type_calc):
-    fig = go.Figure()
-    
-    I_range = np.linspace(0, 5, 100)
-    V_range = I_range * R
-    
-    fig.add_trace(go.Scatter(
-        x=I_range, 
-        y=V_range,
-        mode='lines',
-        name=f'V = I × {R}Ω',
-        line=dict(color='#2E86AB', width=3)
-    ))
-    
-    fig.update_layout(
-        title="📈 Grafik Tegangan vs Arus (Hukum Ohm)",
-        xaxis_title="Arus (A)",
-        yaxis_title="Tegangan (V)",
-        template="plotly_white",
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-def create_series_circuit_diagram(resistors):
-    fig, ax = plt.subplots(figsize=(12, 4))
-    
-    # Gambar rangkaian seri sederhana
-    y_pos = 0.5
-    x_positions = np.linspace(0.1, 0.9, len(resistors))
-    
-    # Garis penghubung
-    ax.plot([0, 1], [y_pos, y_pos], 'k-', linewidth=2)
-    ax.plot([0, 0], [0.3, 0.7], 'k-', linewidth=2)
-    ax.plot([1, 1], [0.3, 0.7], 'k-', linewidth=2)
-    ax.plot([0, 1], [0.3, 0.3], 'k-', linewidth=2)
-    ax.plot([0, 1], [0.7, 0.7], 'k-', linewidth=2)
-    
-    # Hambatan
-    for i, (x, r) in enumerate(zip(x_positions, resistors)):
-        # Kotak hambatan
-        rect = plt.Rectangle((x-0.05, y_pos-0.05), 0.1, 0.1, 
-                           fill=True, facecolor='lightblue', edgecolor='blue', linewidth=2)
-        ax.add_patch(rect)
-        ax.text(x, y_pos+0.15, f'R{i+1}\n{r}Ω', ha='center', va='center', fontsize=10, weight='bold')
-    
-    # Sumber tegangan
-    circle = plt.Circle((0.05, 0.5), 0.03, fill=True, facecolor='red', edgecolor='darkred')
-    ax.add_patch(circle)
-    ax.text(0.05, 0.35, '+', ha='center', va='center', fontsize=12, weight='bold')
-    ax.text(0.05, 0.65, '−', ha='center', va='center', fontsize=12, weight='bold')
-    
-    ax.set_xlim(-0.1, 1.1)
-    ax.set_ylim(0, 1)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('🔗 Rangkaian Hambatan Seri', fontsize=14, weight='bold')
-    
-    st.pyplot(fig)
-
-def create_parallel_circuit_diagram(resistors):
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Garis utama
-    ax.plot([0.1, 0.9], [0.5, 0.5], 'k-', linewidth=3)  # Garis horizontal utama
-    
-    # Cabang paralel
-    y_positions = np.linspace(0.7, 0.3, len(resistors))
-    
-    for i, (y, r) in enumerate(zip(y_positions, resistors)):
-        # Garis vertikal penghubung
-        ax.plot([0.3, 0.3], [0.5, y], 'k-', linewidth=2)
-        ax.plot([0.7, 0.7], [0.5, y], 'k-', linewidth=2)
-        # Garis horizontal cabang
-        ax.plot([0.3, 0.7], [y, y], 'k-', linewidth=2)
+SPECTRUM_WINDOWS = {
+    "rectangular": "Persegi (Rectangular)",
+    "hann": "Hann",
+    "hamming": "Hamming",
+    "blackman": "Blackman",
+    "flattop": "Flat-top",
+}
+
+@st.cache_data(max_entries=64)
+def ac_spectrum_summary(frequency, amplitude, window_name):
+    from listrik import spectrum
+
+    # 16 periode penuh dengan 256 sampel per periode (sampling koheren)
+    fs = 256 * frequency
+    t = np.arange(16 * 256) / fs
+    return spectrum.periodogram(amplitude * np.sin(2 * np.pi * frequency * t), fs, window_name).summary()
+
+def capture_spectrum(window_name):
+    from listrik import spectrum
+    from listrik.figures import spectrum_figure
+
+    st.write("Kolom pertama waktu (s) dan kolom terakhir tegangan, atau `.npy` satu kolom dengan fs diisi manual. "
+             "Rekaman dibaca per potongan dan dirata-rata dengan metode Welch sehingga memori tetap kecil.")
+    uploaded = st.file_uploader("Unggah rekaman:", type=["csv", "txt", "npy"], key="scope_capture")
+    col1, col2 = st.columns(2)
+    with col1:
+        fs = st.number_input("Laju sampel (Hz, 0 = dari kolom waktu):", value=0.0, min_value=0.0, step=1000.0)
+    with col2:
+        nperseg = st.select_slider("Panjang segmen FFT:", [1024, 4096, 16384, 65536, 262144], value=16384)
+    if uploaded is None:
+        return
+    
+    # Hasil disimpan per berkas dan opsi agar interaksi lain tidak memicu proses ulang
+    key = (uploaded.name, uploaded.size, fs, window_name, nperseg)
+    if st.session_state.get("capture_spectrum_key") != key:
+        bar = st.progress(0.0, text="Menghitung spektrum...")
+        try:
+            rate, chunks = spectrum.read_capture(uploaded, uploaded.name, fs or None)
+            result = spectrum.welch(
+                chunks, rate, nperseg, window_name,
+                progress=lambda fraction, samples: bar.progress(fraction or 0.0, text=f"{samples:,} sampel"),
+            )
+        except (ValueError, KeyError) as e:
+            bar.empty()
+            st.error(f"Rekaman tidak dapat dianalisis: {e}")
+            return
+        bar.empty()
+        st.session_state.capture_spectrum_key = key
+        st.session_state.capture_spectrum = result
+    result = st.session_state.capture_spectrum
+    summary = result.summary()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        result_box(f'RMS<br>{summary["rms"]:.4g} V')
+    with col2:
+        result_box(f'DC<br>{summary["dc"]:.4g} V')
+    with col3:
+        result_box(f'Fundamental<br>{summary["fundamental"]:.2f} Hz')
+    with col4:
+        result_box(f'THD<br>{summary["thd"]:.2f}%')
+    st.caption(f"{summary['samples']:,} sampel, {summary['segments']:,} segmen; RMS domain waktu "
+               f"{summary['time_rms']:.4g} V, resolusi {result.df:.3g} Hz.")
+    show_figure("spektrum_rekaman", spectrum_figure(result, result.harmonics(summary["fundamental"])))
+
+# Lebar (piksel) grafik streaming; data dijarangkan ke lebar ini
+TRANSIENT_DISPLAY_POINTS = 1200
+
+def transient_simulation():
+    from listrik.transient import rc_circuit, rl_circuit
+
+    kind = st.radio("Rangkaian:", ["RC", "RL", "Netlist"], horizontal=True)
+    col1, col2, col3 = st.columns(3)
+    tau = None
+    if kind == "Netlist":
+        with col1:
+            netlist = st.text_area("Netlist:", value="V1 a 0 12\nR1 a b 10\nL1 b c 10m\nC1 c 0 100u", height=120)
+        with col2:
+            t_stop = st.number_input("Durasi (ms):", value=50.0, min_value=0.001) / 1000
+    else:
+        with col1:
+            V = st.number_input("Tegangan sumber (V):", value=12.0, step=1.0, key="tr_v")
+            R = st.number_input("Hambatan (Ω):", value=1000.0, min_value=0.001, step=100.0, key="tr_r")
+        with col2:
+            if kind == "RC":
+                C = st.number_input("Kapasitansi (µF):", value=10.0, min_value=1e-6, step=1.0) * 1e-6
+                tau = R * C
+            else:
+                L = st.number_input("Induktansi (mH):", value=100.0, min_value=1e-6, step=10.0) * 1e-3
+                tau = L / R
+            n_tau = st.slider("Durasi (× τ):", 1, 10, 5)
+            t_stop = n_tau * tau
+    with col3:
+        points = st.select_slider("Jumlah titik waktu:", [1_000, 10_000, 100_000, 1_000_000], value=100_000)
+        method = st.radio("Metode:", ["trap", "be"], horizontal=True,
+                          format_func=lambda m: "Trapesium" if m == "trap" else "Backward Euler")
+    
+    if st.button("▶️ Jalankan Simulasi"):
+        try:
+            if kind == "RC":
+                circuit = rc_circuit(V, R, C)
+            elif kind == "RL":
+                circuit = rl_circuit(V, R, L)
+            else:
+                circuit = parse_netlist(netlist)
+        except ValueError as e:
+            st.error(f"Simulasi gagal: {e}")
+        else:
+            run_transient(circuit, t_stop, points, method, tau)
+    if "transient_result" in st.session_state:
+        show_transient_result(st.session_state.transient_result)
+
+def run_transient(circuit, t_stop, points, method, tau):
+    from listrik.decimate import decimate_columns
+    from listrik.transient import TransientAnalysis
+
+    try:
+        analysis = TransientAnalysis(circuit, method=method)
+        chunks = analysis.iter_chunks(t_stop, points)
         
-        # Kotak hambatan
-        rect = plt.Rectangle((0.45, y-0.03), 0.1, 0.06, 
-                           fill=True, facecolor='lightgreen', edgecolor='green', linewidth=2)
-        ax.add_patch(rect)
-        ax.text(0.5, y+0.1, f'R{i+1} = {r}Ω', ha='center', va='center', fontsize=10, weight='bold')
-    
-    # Sumber tegangan
-    circle = plt.Circle((0.15, 0.5), 0.04, fill=True, facecolor='red', edgecolor='darkred')
-    ax.add_patch(circle)
-    ax.text(0.15, 0.45, '+', ha='center', va='center', fontsize=12, weight='bold', color='white')
-    ax.text(0.15, 0.55, '−', ha='center', va='center', fontsize=12, weight='bold', color='white')
-    
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0.2, 0.8)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('⚡ Rangkaian Hambatan Paralel', fontsize=14, weight='bold')
-    
-    st.pyplot(fig)
-
-def create_emf_graph(emf, internal_r):
-    fig = go.Figure()
-    
-    I_range = np.linspace(0, emf/internal_r, 100)
-    V_terminal = emf - (I_range * internal_r)
-    
-    fig.add_trace(go.Scatter(
-        x=I_range,
-        y=V_terminal,
-        mode='lines',
-        name=f'V = {emf} - {internal_r}×I',
-        line=dict(color='#A23B72', width=3)
-    ))
-    
-    # Titik operasi
-    fig.add_trace(go.Scatter(
-        x=[I_range[50]],
-        y=[V_terminal[50]], 
-        mode='markers',
-        name='Titik Operasi',
-        marker=dict(size=10, color='red')
-    ))
-    
-    fig.update_layout(
-        title="🔋 Karakteristik GGL vs Tegangan Terminal",
-        xaxis_title="Arus (A)",
-        yaxis_title="Tegangan (V)",
-        template="plotly_white",
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-def create_power_time_graph(power):
-    fig = make_subplots(
-        rows=2, cols=1,
-        subplot_titles=('Konsumsi Energi vs Waktu', 'Estimasi Biaya vs Waktu'),
-        vertical_spacing=0.1
-    )
-    
-    time_hours = np.linspace(0, 24, 100)
-    energy_kwh = (power * time_hours) / 1000
-    cost = energy_kwh * 1500  # Rp/kWh
-    
-    # Grafik energi
-    fig.add_trace(
-        go.Scatter(x=time_hours, y=energy_kwh, mode='lines', name='Energi (kWh)',
-                  line=dict(color='#2E86AB', width=3)),
-        row=1, col=1
-    )
-    
-    # Grafik biaya
-    fig.add_trace(
-        go.Scatter(x=time_hours, y=cost, mode='lines', name='Biaya (Rp)',
-                  line=dict(color='#A23B72', width=3)),
-        row=2, col=1
-    )
-    
-    fig.update_layout(
-        title="📊 Analisis Konsumsi Energi dan Biaya",
-        height=500,
-        template="plotly_white"
-    )
-    
-    fig.update_xaxes(title_text="Waktu (jam)", row=2, col=1)
-    fig.update_yaxes(title_text="Energi (kWh)", row=1, col=1)
-    fig.update_yaxes(title_text="Biaya (Rp)", row=2, col=1)
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-def create_kcl_diagram(I1, I2, I3):
-    fig, ax = plt.subplots(figsize=(8, 6))
-    
-    # Titik cabang
-    center = (0.5, 0.5)
-    ax.plot(center[0], center[1], 'ko', markersize=15)
-    ax.text(center[0], center[1]-0.1, 'Node', ha='center', va='top', fontsize=12, weight='bold')
-    
-    # Arus masuk (I1)
-    ax.arrow(0.2, 0.5, 0.25, 0, head_width=0.03, head_length=0.03, fc='green', ec='green', linewidth=3)
-    ax.text(0.32, 0.55, f'I₁ = {I1:.1f}A', ha='center', va='bottom', fontsize=11, weight='bold', color='green')
-    
-    # Arus keluar (I2)
-    ax.arrow(0.55, 0.5, 0.25, 0, head_width=0.03, head_length=0.03, fc='red', ec='red', linewidth=3)
-    ax.text(0.67, 0.55, f'I₂ = {I2:.1f}A', ha='center', va='bottom', fontsize=11, weight='bold', color='red')
-    
-    # Arus keluar (I3)
-    ax.arrow(0.5, 0.45, 0, -0.25, head_width=0.03, head_length=0.03, fc='blue', ec='blue', linewidth=3)
-    ax.text(0.55, 0.32, f'I₃ = {I3:.1f}A', ha='left', va='center', fontsize=11, weight='bold', color='blue')
-    
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('🔄 Hukum Kirchhoff I (KCL) - Titik Cabang', fontsize=14, weight='bold')
-    
-    # Verifikasi KCL
-    kcl_text = f'Verifikasi: {I1:.1f} = {I2:.1f} + {I3:.1f} ✓'
-    ax.text(0.5, 0.1, kcl_text, ha='center', va='center', fontsize=12, 
-            bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgreen"))
-    
-    st.pyplot(fig)
-
-def create_kvl_diagram(V_source, voltages, resistances):
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Kotak untuk representasi loop
-    loop_x = [0.2, 0.8, 0.8, 0.2, 0.2]
-    loop_y = [0.3, 0.3, 0.7, 0.7, 0.3]
-    ax.plot(loop_x, loop_y, 'k-', linewidth=3)
-    
-    # Sumber tegangan
-    ax.add_patch(plt.Circle((0.2, 0.5), 0.05, fill=True, facecolor='red', edgecolor='darkred'))
-    ax.text(0.1, 0.5, f'+\n{V_source:.1f}V\n−', ha='center', va='center', fontsize=10, weight='bold')
-    
-    # Hambatan dan tegangan
-    positions = [(0.5, 0.7), (0.8, 0.5), (0.5, 0.3)]
-    labels = ['R₁', 'R₂', 'R₃']
-    
-    for i, ((x, y), label, V, R) in enumerate(zip(positions, labels, voltages, resistances)):
-        # Hambatan
-        rect = plt.Rectangle((x-0.05, y-0.03), 0.1, 0.06, 
-                           fill=True, facecolor='lightblue', edgecolor='blue', linewidth=2)
-        ax.add_patch(rect)
-        ax.text(x, y+0.1, f'{label}\n{R:.1f}Ω', ha='center', va='center', fontsize=10, weight='bold')
-        ax.text(x, y-0.1, f'{V:.1f}V', ha='center', va='center', fontsize=10, weight='bold', color='red')
-    
-    # Panah arah loop
-    ax.annotate('', xy=(0.4, 0.6), xytext=(0.35, 0.65),
-                arrowprops=dict(arrowstyle='->', lw=2, color='purple'))
-    ax.text(0.25, 0.6, 'Arah Loop', ha='center', va='center', fontsize=10, weight='bold', color='purple')
-    
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0.1, 0.9)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('🔄 Hukum Kirchhoff II (KVL) - Analisis Loop', fontsize=14, weight='bold')
-    
-    st.pyplot(fig)
-
-def create_dc_vs_ac_graph(frequency, amplitude, dc_voltage):
-    fig = make_subplots(
-        rows=2, cols=2,
-        subplot_titles=('Sinyal DC', 'Sinyal AC', 'Perbandingan Amplitudo', 'Spektrum Frekuensi'),
-        specs=[[{"secondary_y": False}, {"secondary_y": False}],
-               [{"secondary_y": False}, {"secondary_y": False}]]
-    )
-    
-    # Parameter waktu
-    t = np.linspace(0, 4/frequency, 1000)
-    
-    # Sinyal DC
-    dc_signal = np.full_like(t, dc_voltage)
-    fig.add_trace(
-        go.Scatter(x=t, y=dc_signal, mode='lines', name='DC Signal', 
-                  line=dict(color='red', width=3)),
-        row=1, col=1
-    )
-    
-    # Sinyal AC
-    ac_signal = amplitude * np.sin(2 * np.pi * frequency * t)
-    fig.add_trace(
-        go.Scatter(x=t, y=ac_signal, mode='lines', name='AC Signal',
-                  line=dict(color='blue', width=3)),
-        row=1, col=2
-    )
-    
-    # Perbandingan pada grafik yang sama
-    fig.add_trace(
-        go.Scatter(x=t, y=dc_signal, mode='lines', name='DC',
-                  line=dict(color='red', width=2, dash='dash')),
-        row=2, col=1
-    )
-    fig.add_trace(
-        go.Scatter(x=t, y=ac_signal, mode='lines', name='AC',
-                  line=dict(color='blue', width=2)),
-        row=2, col=1
-    )
-    
-    # Spektrum frekuensi (simplified)
-    freqs = [0, frequency]
-    dc_spectrum = [dc_voltage, 0]
-    ac_spectrum = [0, amplitude/2]
-    
-    fig.add_trace(
-        go.Bar(x=freqs, y=dc_spectrum, name='DC Spectrum', marker_color='red', opacity=0.7),
-        row=2, col=2
-    )
-    fig.add_trace(
-        go.Bar(x=freqs, y=ac_spectrum, name='AC Spectrum', marker_color='blue', opacity=0.7),
-        row=2, col=2
-    )
-    
-    fig.update_layout(
-        title="⚡ Perbandingan Karakteristik DC vs AC",
-        height=600,
-        template="plotly_white",
-        showlegend=True
-    )
-    
-    # Update axes labels
-    fig.update_xaxes(title_text="Waktu (s)", row=1, col=1)
-    fig.update_xaxes(title_text="Waktu (s)", row=1, col=2)
-    fig.update_xaxes(title_text="Waktu (s)", row=2, col=1)
-    fig.update_xaxes(title_text="Frekuensi (Hz)", row=2, col=2)
-    
-    fig.update_yaxes(title_text="Tegangan (V)", row=1, col=1)
-    fig.update_yaxes(title_text="Tegangan (V)", row=1, col=2)
-    fig.update_yaxes(title_text="Tegangan (V)", row=2, col=1)
-    fig.update_yaxes(title_text="Amplitudo (V)", row=2, col=2)
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-def analyze_circuit_efficiency(power, voltage, current):
-    """Analisis efisiensi dan rekomendasi"""
+        # Grafik langsung menampilkan hasil yang dijarangkan (min-max/LTTB) per blok
+        bar = st.progress(0.0, text="Simulasi berjalan...")
+        chart = st.empty()
+        time_blocks, value_blocks = [], []
+        start = last_draw = time.perf_counter()
+        for times, values in chunks:
+            time_blocks.append(times)
+            value_blocks.append(values)
+            # Gambar ulang paling sering 5× per detik
+            if time.perf_counter() - last_draw > 0.2:
+                x, columns = decimate_columns(np.concatenate(time_blocks), np.concatenate(value_blocks),
+                                              TRANSIENT_DISPLAY_POINTS)
+                chart.line_chart(pd.DataFrame(columns, columns=analysis.names,
+                                              index=pd.Index(x * 1000, name="t (ms)")))
+                bar.progress(min(float(times[-1] / t_stop), 1.0), text=f"t = {times[-1] * 1000:.3f} ms")
+                last_draw = time.perf_counter()
+        elapsed = time.perf_counter() - start
+        chart.empty()
+        bar.empty()
+    except (ValueError, KeyError, np.linalg.LinAlgError) as e:
+        st.error(f"Simulasi gagal: {e}")
+        return
+    
+    # Disimpan agar zoom (rerun) menjarangkan ulang data penuh tanpa simulasi ulang
+    st.session_state.transient_result = {
+        "time": np.concatenate(time_blocks),
+        "values": np.concatenate(value_blocks),
+        "names": analysis.names,
+        "stats": analysis.stats(),
+        "elapsed": elapsed,
+        "tau": tau,
+    }
+
+def show_transient_result(result):
+    from listrik.figures import waveform_figure
+
+    stats = result["stats"]
+    count = result["time"].size
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        result_box(f'Titik<br>{count:,}')
+    with col2:
+        result_box(f'Ditolak<br>{stats["rejected"]} blok')
+    with col3:
+        result_box(f'Faktorisasi<br>{stats["factorizations"]}')
+    with col4:
+        result_box(f'Waktu<br>{result["elapsed"] * 1000:.0f} ms')
+    
+    # Zoom memotong rentang waktu lalu menjarangkan ulang dengan resolusi penuh lebar grafik
+    t_ms = result["time"] * 1000
+    t_end = float(t_ms[-1])
+    zoom = st.slider("Perbesar rentang waktu (ms):", 0.0, t_end, (0.0, t_end), step=t_end / 1000 or 1.0,
+                     key="transient_zoom")
+    x_range = None if zoom == (0.0, t_end) else zoom
+    show_figure("transien", waveform_figure(t_ms, result["values"], result["names"], x_range, unit="ms"))
+    if result["tau"] is not None:
+        st.info(f"Konstanta waktu τ = {result['tau'] * 1000:.3f} ms; setelah 1τ besaran mencapai 63,2% nilai akhir.")
+
+# Fungsi untuk membuat grafik
+@st.cache_resource
+def get_figure_cache():
+    """Cache grafik bersama untuk semua sesi dalam satu proses server"""
+    return FigureCache(maxsize=256)
+
+@st.cache_resource
+def get_diagram_renderer():
+    """Kerangka diagram rangkaian bersama untuk semua sesi"""
+    # matplotlib baru dimuat saat diagram pertama kali dibutuhkan
+    from listrik.diagrams import DiagramRenderer
+    return DiagramRenderer()
+
+def get_graph():
+    """Graf dependensi milik sesi; bertahan antar-rerun di session_state"""
+    if "graph" not in st.session_state:
+        st.session_state.graph = DependencyGraph()
+    return st.session_state.graph
+
+def record_report(page, inputs, results):
+    """Simpan masukan dan hasil halaman (``(besaran, nilai, satuan)``) untuk laporan"""
+    st.session_state.setdefault("report_values", {})[page] = (inputs, results)
+
+def publish_operating_point(page, power, voltage, current):
+    """Catat titik kerja terakhir yang dihitung untuk panel analisis otomatis"""
+    get_graph().set_input("op.point", (page, float(power), float(voltage), float(current)))
+
+def ohm_operating_point(mode, x, y):
+    if mode == "Tegangan (V)":
+        I, R = x, y
+        V = core.voltage(I, R)
+    elif mode == "Arus (I)":
+        V, R = x, y
+        I = core.current(V, R)
+    else:
+        V, I = x, y
+        R = core.resistance(V, I)
+    return {"V": V, "I": I, "R": R, "P": V * I}
+
+def emf_results(emf, internal_r, current):
+    return {
+        "V_terminal": core.terminal_voltage(emf, internal_r, current),
+        "P_loss": core.internal_power_loss(current, internal_r),
+        "efficiency": core.source_efficiency(emf, internal_r, current),
+    }
+
+def kvl_loop(V_source, resistors):
+    """``(I_loop, V1, V2, V3)`` dari mesin MNA; nol bila semua hambatan nol"""
+    if sum(resistors) == 0:
+        return (0.0, 0.0, 0.0, 0.0)
+    solution = loop_circuit(V_source, list(resistors)).solve()
+    return (-solution.current("V"), *solution.resistor_voltages)
+
+def build_figure(builder_name, *args):
+    """Grafik dari cache bersama; plotly baru dimuat saat grafik dibutuhkan"""
+    from listrik import figures
+    with span(builder_name, "grafik"):
+        return get_figure_cache().get(getattr(figures, builder_name), *args)
+
+def render_diagram(kind, *args):
+    with span(f"diagram {kind}", "diagram"):
+        return getattr(get_diagram_renderer(), kind)(*args)
+
+def show_figure(name, fig):
+    """Tampilkan grafik dan catat di daftar grafik sesi untuk ekspor massal"""
+    st.session_state.setdefault("session_figures", {})[name] = fig
+    with span("st.plotly_chart", "streamlit", figure=name):
+        st.plotly_chart(fig, use_container_width=True)
+
+def show_graph_figure(name, builder_name, *deps):
+    """Grafik sebagai node graf: dibangun ulang hanya bila node ``deps`` berubah"""
+    graph = get_graph()
+    graph.define(name, partial(build_figure, builder_name), *deps, cutoff=False)
+    show_figure(name, graph.get(name))
+
+def show_graph_diagram(name, kind, *deps):
+    """Diagram rangkaian (PNG) sebagai node graf"""
+    graph = get_graph()
+    graph.define(name, partial(render_diagram, kind), *deps, cutoff=False)
+    image = graph.get(name)
+    with span("st.image", "streamlit", figure=name):
+        st.image(image)
+
+def create_vi_graph():
+    show_graph_figure("ohm.vi_figure", "vi_figure", "ohm.R")
+
+def create_series_circuit_diagram():
+    show_graph_diagram("series.diagram", "series", "series.resistors")
+
+def create_parallel_circuit_diagram():
+    show_graph_diagram("parallel.diagram", "parallel", "parallel.resistors")
+
+def create_emf_graph():
+    show_graph_figure("emf.figure", "emf_figure", "emf.emf", "emf.r", "emf.I")
+
+def create_power_time_graph():
+    show_graph_figure("power.figure", "power_time_figure", "power.P", "power.tariff", "power.start")
+
+def create_kcl_diagram():
+    show_graph_diagram("kcl.diagram", "kcl", "kcl.I1", "kcl.I2", "kcl.I3")
+
+def create_kvl_diagram():
+    show_graph_diagram("kvl.diagram", "kvl", "kvl.V", "kvl.voltages", "kvl.resistors")
+
+def create_dc_vs_ac_graph():
+    show_graph_figure("acdc.figure", "dc_vs_ac_figure", "acdc.frequency", "acdc.amplitude",
+                      "acdc.dc_voltage", "acdc.window")
+
+@st.cache_resource
+def get_rule_set():
+    """Aturan analisis bawaan, dikompilasi sekali per proses server"""
+    from listrik.rules import default_rules
+    return default_rules()
+
+def analyze_circuit_efficiency(power, voltage, current, ruleset=None):
+    """Analisis efisiensi dan rekomendasi dari semua aturan yang terpicu"""
+    from listrik.cable import minimum_section
+    from listrik.rules import SEVERITY_COLORS
+
+    ruleset = ruleset or get_rule_set()
+    report = ruleset.evaluate({"P": [power], "V": [voltage], "I": [current]})
+    triggered = report.triggered(0)
     analysis = {
         "efficiency": "Optimal",
         "recommendation": "Rangkaian bekerja dengan baik",
         "warning": None,
-        "color": "green"
+        "color": "green",
+        "triggered": triggered,
     }
     
-    if power > 1000:
-        analysis["efficiency"] = "Tinggi"
-        analysis["recommendation"] = "Pertimbangkan penggunaan komponen dengan rating daya lebih tinggi"
-        analysis["warning"] = "⚠️ Konsumsi daya tinggi"
-        analysis["color"] = "orange"
-    
-    if voltage > 240:
-        analysis["efficiency"] = "Overload"
-        analysis["recommendation"] = "Periksa spesifikasi tegangan maksimum komponen"
-        analysis["warning"] = "🚨 Tegangan melebihi batas normal"
-        analysis["color"] = "red"
-    
-    if current > 10:
-        analysis["efficiency"] = "Arus Tinggi"
-        analysis["recommendation"] = "Gunakan kabel dengan diameter lebih besar"
-        analysis["warning"] = "⚠️ Arus tinggi - risiko panas berlebih"
-        analysis["color"] = "orange"
+    if triggered:
+        # Aturan teratas menentukan rating; semua peringatan tetap ditampilkan
+        top = triggered[0]
+        analysis["efficiency"] = top.rating
+        analysis["recommendation"] = top.recommendation
+        messages = [rule.message for rule in triggered]
+        for k, rule in enumerate(triggered):
+            if rule.column == "I":
+                # Hanya syarat KHA; panjang saluran tidak diketahui di sini
+                section = minimum_section(current)
+                if not math.isnan(section):
+                    messages[k] += f" — kabel minimal {section:g} mm² tembaga untuk {current:.1f} A"
+        analysis["warning"] = "<br>".join(messages)
+        analysis["color"] = SEVERITY_COLORS[top.severity]
     
     return analysis
 
-def download_plot_as_png(fig, filename):
-    """Fungsi untuk download grafik sebagai PNG"""
-    img_bytes = fig.to_image(format="png", engine="kaleido")
-    
-    st.download_button(
-        label="📥 Download Grafik PNG",
-        data=img_bytes,
-        file_name=f"{filename}.png",
-        mime="image/png"
-    )
+def cable_schedule():
+    """Susut tegangan, rugi I²R, dan penampang minimum untuk jadwal kabel"""
+    from listrik import cable
+
+    uploaded = st.file_uploader("Unggah jadwal kabel (kolom panjang, arus, penampang, opsional bahan, "
+                                "tegangan, suhu):", type=["csv", "txt", "xlsx"], key="cable_schedule")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        voltage = st.number_input("Tegangan sistem (V):", value=cable.DEFAULT_VOLTAGE, min_value=1.0, key="cable_v")
+    with col2:
+        temperature = st.number_input("Suhu penghantar (°C):", value=cable.DEFAULT_TEMPERATURE, key="cable_t")
+    with col3:
+        limit = st.number_input("Batas susut tegangan (%):", value=cable.DEFAULT_DROP_LIMIT * 100,
+                                min_value=0.1, step=0.5, key="cable_limit")
+    if uploaded is None:
+        st.caption("Bahan: " + ", ".join(f"{cable.MATERIAL_NAMES[m]} ({m})" for m in cable.MATERIALS)
+                   + f" · penampang standar {cable.SECTIONS[0]:g}–{cable.SECTIONS[-1]:g} mm²")
+        return
+    
+    key = (uploaded.name, uploaded.size, voltage, temperature, limit)
+    if st.session_state.get("cable_key") != key:
+        try:
+            started = time.perf_counter()
+            result = cable.analyze_schedule(cable.load_schedule(uploaded, uploaded.name), voltage, temperature,
+                                            limit / 100)
+        except (ValueError, ImportError) as e:
+            st.error(f"Analisis jadwal kabel gagal: {e}")
+            return
+        st.session_state.cable_key = key
+        st.session_state.cable_result = (result, time.perf_counter() - started)
+    result, elapsed = st.session_state.cable_result
+    
+    summary = cable.summarize(result)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        result_box(f'Saluran<br>{summary["runs"]:,}')
+    with col2:
+        result_box(f'Kurang Besar<br>{summary["undersized"]:,}')
+    with col3:
+        result_box(f'Rugi Total<br>{summary["loss_w"] / 1000:,.2f} kW')
+    with col4:
+        result_box(f'Susut Terburuk<br>{summary["worst_drop_pct"]:.2f}%')
+    if summary["unsized"]:
+        st.warning(f"{summary['unsized']:,} saluran melebihi penampang terbesar di tabel ({cable.SECTIONS[-1]:g} mm²)")
+    if summary["invalid"]:
+        st.warning(f"{summary['invalid']:,} saluran berstatus \"{cable.STATUS_INVALID}\": panjang, arus, penampang, "
+                   "atau tegangan tidak terbaca sebagai angka yang valid")
+    st.caption(f"{summary['runs']:,} saluran dianalisis dalam {elapsed * 1000:.0f} ms")
+    worst = result.sort_values("drop_pct", ascending=False).head(500)
+    st.dataframe(worst.rename(columns={
+        "name": "Saluran", "length": "Panjang (m)", "current": "Arus (A)", "material": "Bahan",
+        "section": "Penampang (mm²)", "resistance": "R loop (Ω)", "drop_v": "Susut (V)", "drop_pct": "Susut (%)",
+        "loss_w": "Rugi (W)", "ampacity": "KHA (A)", "min_section": "Penampang Min (mm²)",
+        "min_drop_pct": "Susut Min (%)", "status": "Status",
+    }), hide_index=True, use_container_width=True)
+    st.download_button("📥 Hasil Lengkap (CSV)", data=result.to_csv(index=False), file_name="jadwal_kabel.csv",
+                       mime="text/csv")
+
+def fleet_analysis():
+    """Evaluasi aturan atas berkas pembacaan banyak rangkaian"""
+    from listrik import rules
+
+    uploaded = st.file_uploader("Unggah pembacaan (kolom V, I, opsional P):", type=["csv", "txt", "xlsx"],
+                                key="fleet_readings")
+    rule_file = st.file_uploader("Aturan khusus (opsional):", type=["json", "yaml", "yml"], key="fleet_rules")
+    budget = st.number_input("Batas waktu evaluasi (detik):", value=10.0, min_value=0.5, step=0.5)
+    if uploaded is None:
+        st.caption("Aturan bawaan: " + ", ".join(repr(rule) for rule in get_rule_set().rules))
+        return
+    
+    key = (uploaded.name, uploaded.size, rule_file and (rule_file.name, rule_file.size), budget)
+    if st.session_state.get("fleet_report_key") != key:
+        try:
+            ruleset = get_rule_set()
+            if rule_file is not None:
+                ruleset = rules.loads_rules(rule_file.getvalue().decode("utf-8"), "." + rule_file.name.rsplit(".", 1)[-1])
+            bar = st.progress(0.0, text="Mengevaluasi aturan...")
+            
+            def progress(fraction, rows):
+                if fraction is not None:
+                    bar.progress(min(fraction, 1.0), text=f"Mengevaluasi aturan... {rows:,} baris")
+            
+            started = time.perf_counter()
+            report = rules.evaluate_log(uploaded, uploaded.name, ruleset, budget_s=budget, progress=progress)
+            bar.empty()
+        except (ValueError, ImportError) as e:
+            st.error(f"Evaluasi aturan gagal: {e}")
+            return
+        st.session_state.fleet_report_key = key
+        st.session_state.fleet_report = (report, time.perf_counter() - started)
+    report, elapsed = st.session_state.fleet_report
+    
+    severity = report.severity_counts()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        result_box(f'Baris<br>{report.rows:,}')
+    with col2:
+        result_box(f'Kritis<br>{severity["critical"]:,}')
+    with col3:
+        result_box(f'Peringatan<br>{severity["warning"]:,}')
+    with col4:
+        result_box(f'Normal<br>{severity["ok"]:,}')
+    if not report.complete:
+        st.warning("Batas waktu habis; sebagian berkas belum dievaluasi.")
+    st.caption(f"{report.rows:,} baris dievaluasi dalam {elapsed:.2f} s")
+    st.dataframe(pd.DataFrame({"Baris terpicu": report.counts()}), use_container_width=True)
+    st.dataframe(report.to_frame(), use_container_width=True)
+
+@st.cache_resource
+def get_job_runner():
+    """Pool job latar dan cache hasilnya, bersama untuk semua sesi"""
+    from listrik.jobs import JobRunner
+    return JobRunner()
+
+def run_job(state_key, name, func, *args, **kwargs):
+    """Mulai job latar; ID-nya disimpan di sesi agar ditemukan lagi setelah rerun"""
+    job = get_job_runner().submit(name, func, *args, **kwargs)
+    st.session_state[state_key] = job.id
+    return job
+
+def job_result(state_key, label):
+    """Job selesai milik ``state_key``; selama berjalan tampilkan progres dan tombol batal"""
+    from listrik.jobs import CANCELLED, FAILED
+    
+    job = get_job_runner().get(st.session_state.get(state_key))
+    if job is None:
+        return None
+    if not job.done:
+        job_status(state_key, label)
+        return None
+    if job.status == FAILED:
+        st.error(f"{label} gagal: {job.error}")
+        return None
+    if job.status == CANCELLED:
+        st.caption(f"⏹️ {label} dibatalkan.")
+        return None
+    return job
+
+@st.fragment(run_every=0.5)
+def job_status(state_key, label):
+    """Progres job tanpa memblokir halaman; rerun penuh sekali saat job selesai"""
+    job = get_job_runner().get(st.session_state.get(state_key))
+    if job is None:
+        return
+    if job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"{label}... {job.message}")
+    if st.button("⏹️ Batalkan", key=f"{state_key}_cancel"):
+        job.cancel()
+
+@st.cache_resource
+def get_exporter():
+    """Worker kaleido persisten dan cache gambar di disk, bersama untuk semua sesi"""
+    from listrik.export import Exporter
+    return Exporter()
+
+def export_job_status():
+    """Hasil job ekspor latar; selama berjalan hanya fragmen progres yang diperbarui"""
+    job = st.session_state.get("export_job")
+    if job is None:
+        return
+    if not job.done:
+        export_job_progress()
+        return
+    if job.error is not None:
+        st.error(f"Ekspor gagal: {job.error}")
+        return
+    st.caption(f"{job.total} gambar dalam {job.elapsed:.1f} s")
+    st.download_button("📥 Download ZIP", data=job.data, file_name="grafik_listrik.zip",
+                       mime="application/zip", key="export_download")
+
+@st.fragment(run_every=1.0)
+def export_job_progress():
+    """Pantau job ekspor tanpa memblokir halaman; berhenti (rerun penuh) begitu job selesai"""
+    job = st.session_state.get("export_job")
+    if job is None:
+        return
+    if job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"Mengekspor {job.completed}/{job.total} gambar...")
+    if st.button("⏹️ Batalkan", key="export_cancel"):
+        job.cancel()
+
+def export_panel():
+    """Ekspor semua grafik sesi ke ZIP di thread latar"""
+    from listrik.export import FORMATS, ExportJob, check_available
+    
+    figures = st.session_state.get("session_figures", {})
+    st.caption(f"{len(figures)} grafik tercatat di sesi ini")
+    formats = st.multiselect("Format:", FORMATS, default=["png"], key="export_formats")
+    scale = st.select_slider("Skala:", [1.0, 2.0, 3.0], value=1.0, key="export_scale")
+    job = st.session_state.get("export_job")
+    busy = job is not None and not job.done
+    if st.button("📦 Ekspor semua ke ZIP", disabled=busy or not figures or not formats):
+        try:
+            check_available()
+        except ImportError as e:
+            st.error(str(e))
+        else:
+            st.session_state.export_job = ExportJob(get_exporter(), figures, formats, scale=scale)
+    if st.session_state.get("export_job") is not None:
+        export_job_status()
+    stats = get_exporter().stats()
+    st.caption(f"🖼️ Cache gambar: {stats['hits']} hit / {stats['misses']} miss, {stats['renders']} render")
+
+def build_report(include_figures):
+    """Laporan dari semua halaman, sapuan, dan grafik yang dibuka di sesi ini"""
+    from listrik.report import Report
+    
+    report = Report()
+    for page, (inputs, results) in st.session_state.get("report_values", {}).items():
+        report.add_values(f"{page} — Masukan", inputs)
+        report.add_values(f"{page} — Hasil", results)
+    for name, result in st.session_state.get("report_sweeps", {}).items():
+        report.add_table(name, result.columns, result.rows, int(np.prod(result.shape)))
+    skipped = None
+    if include_figures:
+        exporter = get_exporter()
+        for name, fig in st.session_state.get("session_figures", {}).items():
+            try:
+                report.add_image(name, exporter.render(fig, "png"))
+            except (ImportError, TimeoutError) as e:
+                skipped = e
+                break
+    return report, skipped
+
+def report_panel():
+    """Laporan XLSX/PDF sekali klik"""
+    pages = st.session_state.get("report_values", {})
+    st.caption(f"{len(pages)} kalkulator, {len(st.session_state.get('report_sweeps', {}))} sapuan tercatat")
+    include_figures = st.checkbox("Sertakan grafik", value=False, key="report_figures")
+    if st.button("📄 Buat laporan", disabled=not pages):
+        with st.spinner("Menyusun laporan..."):
+            report, skipped = build_report(include_figures)
+            st.session_state.report_files = (report.to_xlsx_bytes(), report.to_pdf_bytes())
+        if skipped is not None:
+            st.warning(f"Grafik tidak disertakan: {skipped}")
+    if "report_files" in st.session_state:
+        xlsx, pdf = st.session_state.report_files
+        stamp = datetime.datetime.now().strftime("%Y%m%d")
+        st.download_button("📥 Download XLSX", data=xlsx, file_name=f"laporan_listrik_{stamp}.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        st.download_button("📥 Download PDF", data=pdf, file_name=f"laporan_listrik_{stamp}.pdf",
+                           mime="application/pdf")
 
 # Main app logic
 def main():
+    graph = get_graph()
+    graph.begin_run()
+    
     # Pilihan kalkulator berdasarkan input sidebar
-    if calc_type == "Hukum Ohm (V = I × R)":
-        ohm_law_calculator()
+    with span(calc_type, "halaman"):
+        if calc_type == "Hukum Ohm (V = I × R)":
+            ohm_law_calculator()
         
-    elif calc_type == "Hambatan Seri":
-        series_resistance()
+        elif calc_type == "Hambatan Seri":
+            series_resistance()
         
-    elif calc_type == "Hambatan Paralel":
-        parallel_resistance()
+        elif calc_type == "Hambatan Paralel":
+            parallel_resistance()
         
-    elif calc_type == "GGL dan Tegangan Jepit":
-        emf_terminal_voltage()
+        elif calc_type == "Jaringan Seri-Paralel":
+            series_parallel_network()
         
-    elif calc_type == "Daya dan Energi Listrik":
-        power_energy_calculator()
+        elif calc_type == "GGL dan Tegangan Jepit":
+            emf_terminal_voltage()
         
-    elif calc_type == "Hukum Kirchhoff I (KCL)":
-        kirchhoff_current_law()
+        elif calc_type == "Daya dan Energi Listrik":
+            power_energy_calculator()
         
-    elif calc_type == "Hukum Kirchhoff II (KVL)":
-        kirchhoff_voltage_law()
+        elif calc_type == "Hukum Kirchhoff I (KCL)":
+            kirchhoff_current_law()
         
-    elif calc_type == "Analisis DC vs AC":
-        dc_vs_ac_analysis()
+        elif calc_type == "Hukum Kirchhoff II (KVL)":
+            kirchhoff_voltage_law()
+        
+        elif calc_type == "Analisis DC vs AC":
+            dc_vs_ac_analysis()
     
     # Panel analisis otomatis
-    st.markdown("---")
-    st.subheader("🔍 Analisis Otomatis & Rekomendasi")
-    
-    # Simulasi analisis berdasarkan input terakhir
-    if calc_type == "Daya dan Energi Listrik":
-        try:
-            # Ambil nilai dari session state jika ada
-            sample_power = 500  # Default value
-            sample_voltage = 220
-            sample_current = 2.3
-            
-            analysis = analyze_circuit_efficiency(sample_power, sample_voltage, sample_current)
+    with span("analisis otomatis"):
+        st.markdown("---")
+        st.subheader("🔍 Analisis Otomatis & Rekomendasi")
+    
+        # Analisis dari titik kerja terakhir yang benar-benar dihitung
+        if "op.point" in graph:
+            try:
+                graph.define("op.analysis", lambda point: analyze_circuit_efficiency(*point[1:]), "op.point")
+                analysis = graph.get("op.analysis")
+                page, power, voltage, current = graph.value("op.point")
+                st.caption(f"Titik kerja dari **{page}**: P = {power:.2f} W, V = {voltage:.2f} V, I = {current:.2f} A")
             
-            col1, col2 = st.columns(2)
+                col1, col2 = st.columns(2)
             
-            with col1:
-                st.markdown(f"""
-                <div class="physics-card" style="border-left-color: {analysis['color']};">
-                    <h4>📊 Status Efisiensi</h4>
-                    <p><strong>Rating:</strong> {analysis['efficiency']}</p>
-                    <p><strong>Rekomendasi:</strong> {analysis['recommendation']}</p>
-                    {f"<p style='color: {analysis['color']};'>{analysis['warning']}</p>" if analysis['warning'] else ""}
-                </div>
-                """, unsafe_allow_html=True)
+                with col1:
+                    physics_card(f"""
+                        <h4>📊 Status Efisiensi</h4>
+                        <p><strong>Rating:</strong> {analysis['efficiency']}</p>
+                        <p><strong>Rekomendasi:</strong> {analysis['recommendation']}</p>
+                        {f"<p style='color: {analysis['color']};'>{analysis['warning']}</p>" if analysis['warning'] else ""}
+                    """, style=f"border-left-color: {analysis['color']};")
             
-            with col2:
-                # Tips hemat energi
-                st.markdown("""
-                <div class="physics-card">
-                    <h4>💡 Tips Hemat Energi</h4>
-                    <ul>
-                        <li>Gunakan perangkat dengan efisiensi tinggi</li>
-                        <li>Matikan perangkat saat tidak digunakan</li>
-                        <li>Periksa isolasi kabel secara berkala</li>
-                        <li>Gunakan stabilizer untuk perangkat sensitif</li>
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
+                with col2:
+                    # Tips hemat energi
+                    physics_card("""
+                        <h4>💡 Tips Hemat Energi</h4>
+                        <ul>
+                            <li>Gunakan perangkat dengan efisiensi tinggi</li>
+                            <li>Matikan perangkat saat tidak digunakan</li>
+                            <li>Periksa isolasi kabel secara berkala</li>
+                            <li>Gunakan stabilizer untuk perangkat sensitif</li>
+                        </ul>
+                    """)
                 
-        except Exception as e:
+            except Exception as e:
+                st.info("Masukkan nilai pada kalkulator untuk melihat analisis otomatis")
+        else:
             st.info("Masukkan nilai pada kalkulator untuk melihat analisis otomatis")
     
-    # Footer dengan informasi tambahan
-    st.markdown("---")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        <div class="physics-card">
-            <h5>📚 Materi Terkait</h5>
-            <p>• Hukum Ohm dan Kirchhoff<br>
-            • Rangkaian DC<br>
-            • Analisis Node dan Loop<br>
-            • Daya dan Efisiensi</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="physics-card">
-            <h5>🎯 Fitur Aplikasi</h5>
-            <p>• Kalkulator Interaktif<br>
-            • Visualisasi Rangkaian<br>
-            • Grafik Real-time<br>
-            • Analisis Otomatis</p>
-        </div>
-        """, unsafe_allow_html=True)
+        with st.expander("🏭 Analisis Armada Rangkaian"):
+            fleet_analysis()
+        with st.expander("🔌 Jadwal Kabel: Susut Tegangan dan Penampang"):
+            cable_schedule()
+    
+    # Statistik cache grafik dan graf dependensi
+    with span("sidebar"):
+        cache_stats = get_figure_cache().stats()
+        st.sidebar.caption(
+            f"📦 Cache grafik: {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+            f"({cache_stats['size']}/{cache_stats['maxsize']})"
+        )
+        graph_stats = graph.stats()
+        st.sidebar.caption(
+            f"🧮 Graf dependensi: {graph_stats['recomputed']} dihitung ulang / "
+            f"{graph_stats['reused']} dipakai ulang ({graph_stats['nodes']} node)"
+        )
+        asset_stats = assets.stats()
+        st.sidebar.caption(
+            f"🎨 CSS v{asset_stats['version']}: {asset_stats['bytes'] / 1024:.1f} KB "
+            f"(asli {asset_stats['raw_bytes'] / 1024:.1f} KB)"
+        )
+        job_stats = get_job_runner().stats()
+        st.sidebar.caption(
+            f"⚙️ Job latar: {job_stats['running']} berjalan, {job_stats['queued']} antre · "
+            f"cache {job_stats['cached']} hasil ({job_stats['hits']} hit / {job_stats['misses']} miss)"
+        )
+        with st.sidebar.expander("📤 Ekspor Grafik"):
+            export_panel()
+        with st.sidebar.expander("📄 Laporan"):
+            report_panel()
     
-    with col3:
-        st.markdown("""
-        <div class="physics-card">
-            <h5>⚡ Aplikasi Praktis</h5>
-            <p>• Desain Rangkaian<br>
-            • Analisis Efisiensi<br>
-            • Troubleshooting<br>
-            • Optimasi Daya</p>
-        </div>
-        """, unsafe_allow_html=True)
+    # Footer dengan informasi tambahan
+    with span("footer"):
+        st.markdown("---")
+        col1, col2, col3 = st.columns(3)
+    
+        with col1:
+            physics_card("""
+                <h5>📚 Materi Terkait</h5>
+                <p>• Hukum Ohm dan Kirchhoff<br>
+                • Rangkaian DC<br>
+                • Analisis Node dan Loop<br>
+                • Daya dan Efisiensi</p>
+            """)
+    
+        with col2:
+            physics_card("""
+                <h5>🎯 Fitur Aplikasi</h5>
+                <p>• Kalkulator Interaktif<br>
+                • Visualisasi Rangkaian<br>
+                • Grafik Real-time<br>
+                • Analisis Otomatis</p>
+            """)
+    
+        with col3:
+            physics_card("""
+                <h5>⚡ Aplikasi Praktis</h5>
+                <p>• Desain Rangkaian<br>
+                • Analisis Efisiensi<br>
+                • Troubleshooting<br>
+                • Optimasi Daya</p>
+            """)
+
+def timing_panel(tracer):
+    """Rincian waktu rerun di sidebar, trace Chrome, dan cProfile opsional"""
+    with st.sidebar.expander(f"⏱️ Waktu Rerun ({tracer.elapsed * 1000:.0f} ms)"):
+        rows = tracer.summary()
+        if rows:
+            st.dataframe(pd.DataFrame(
+                [(name, category, count, total * 1000, own * 1000) for name, category, count, total, own in rows],
+                columns=["Tahap", "Kategori", "Panggilan", "Total (ms)", "Self (ms)"],
+            ).round(2), hide_index=True, use_container_width=True)
+        st.download_button("📥 Trace Chrome (JSON)", data=json.dumps(tracer.chrome_trace()),
+                           file_name="listrik_trace.json", mime="application/json", key="trace_download")
+        if st.button("🔬 Profil rerun berikutnya (cProfile)", key="profile_next"):
+            st.session_state.profile_next_rerun = True
+            st.rerun()
+        stats = tracer.profile_stats()
+        if stats:
+            st.caption("cProfile rerun ini (urut waktu kumulatif):")
+            st.code(stats, language=None)
 
 if __name__ == "__main__":
-    main()
+    try:
+        with span("main"):
+            main()
+    finally:
+        rerun_tracer.stop()
+    timing_panel(rerun_tracer)
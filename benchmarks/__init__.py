@@ -0,0 +1,14 @@
+"""Benchmark listrik dengan skenario tetap dan riwayat hasil.
+
+Setiap berkas ``bench_*.py`` berisi kelas ``Time*`` bergaya asv: atribut
+``params`` (daftar nilai per parameter), ``setup(*param)`` opsional, dan
+metode ``time_*(*param)`` yang diukur. Jalankan dari akar repositori::
+
+    python -m benchmarks                 # semua skenario, simpan riwayat
+    python -m benchmarks -k diagram      # hanya yang namanya memuat "diagram"
+    python -m benchmarks --threshold 0.1 --no-save
+
+Hasil disimpan di ``.benchmarks/history.jsonl`` per mesin; median tiap
+skenario dibandingkan dengan median beberapa run terakhir di mesin yang
+sama dan yang melambat di atas ambang ditandai sebagai regresi.
+"""
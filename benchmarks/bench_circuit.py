@@ -0,0 +1,36 @@
+"""Penyelesaian MNA untuk jaringan hambatan besar."""
+
+import numpy as np
+
+from listrik.circuit import Circuit
+
+
+def mesh_circuit(side, seed=0):
+    """Grid ``side × side`` hambatan acak; sumber 1 V di pojok, pojok seberang ke ground"""
+    rng = np.random.default_rng(seed)
+    circuit = Circuit()
+    node = np.arange(side * side).reshape(side, side).astype(str)
+    node = np.char.add("n", node)
+    a = np.concatenate([node[:, :-1].ravel(), node[:-1, :].ravel()])
+    b = np.concatenate([node[:, 1:].ravel(), node[1:, :].ravel()])
+    circuit.add_resistors(a, b, rng.uniform(1, 100, a.size))
+    circuit.add_voltage_source("V", node[0, 0], "0", 1.0)
+    circuit.add_resistor("R_ground", node[-1, -1], "0", 1.0)
+    return circuit
+
+
+class TimeMeshSolve:
+    params = [[20, 100, 300], ["auto"]]
+
+    def setup(self, side, method):
+        self.circuit = mesh_circuit(side)
+
+    def time_solve(self, side, method):
+        self.circuit.solve(method)
+
+
+class TimeMeshBuild:
+    params = [[100, 300]]
+
+    def time_build(self, side):
+        mesh_circuit(side).build()
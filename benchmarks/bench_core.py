@@ -0,0 +1,82 @@
+"""Kalkulator skalar dan versi tervektorisasinya."""
+
+import numpy as np
+
+from listrik import cable, core
+from listrik.battery import Pack
+from listrik.circuit import junction_circuit, loop_circuit
+from listrik.synthesis import synthesize
+
+
+class TimeScalar:
+    def time_ohm(self):
+        core.voltage(2.0, 10.0)
+        core.current(12.0, 10.0)
+        core.resistance(12.0, 1.2)
+
+    def time_series_parallel(self):
+        core.series_resistance([10.0, 20.0, 30.0, 40.0, 50.0])
+        core.parallel_resistance([10.0, 20.0, 30.0, 40.0, 50.0])
+
+    def time_emf(self):
+        core.terminal_voltage(12.0, 0.5, 2.0)
+        core.source_efficiency(12.0, 0.5, 2.0)
+
+    def time_power_energy(self):
+        core.power_energy(220.0, 5.0, 44.0, 8.0)
+
+    def time_kcl_mna(self):
+        junction_circuit([5.0], [2.0]).solve().current("I_sisa")
+
+    def time_kvl_mna(self):
+        loop_circuit(12.0, [4.0, 6.0, 2.0]).solve().resistor_voltages
+
+
+class TimeVectorized:
+    params = [[10_000, 1_000_000]]
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.V = rng.uniform(1, 240, n)
+        self.I = rng.uniform(0.1, 10, n)
+        self.R = rng.uniform(1, 1000, (n, 5))
+
+    def time_power_energy(self, n):
+        core.power_energy(self.V, self.I, self.V / self.I, 8.0)
+
+    def time_parallel_resistance(self, n):
+        core.parallel_resistance(self.R)
+
+
+class TimeSynthesis:
+    params = [["E24", "E96"], [3, 4]]
+
+    def setup(self, series, parts):
+        synthesize(1000.0, series, parts)
+
+    def time_synthesize(self, series, parts):
+        synthesize(1234.5, series, parts)
+
+
+class TimeCableSchedule:
+    params = [[100_000]]
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.length = rng.uniform(1, 200, n)
+        self.current = rng.uniform(0.5, 150, n)
+        self.material = rng.choice(["cu", "al"], n)
+        self.section = rng.choice(cable.SECTIONS, n)
+
+    def time_analyze_runs(self, n):
+        cable.analyze_runs(self.length, self.current, self.material, self.section)
+
+
+class TimeBatteryPack:
+    params = [[(100, 10)]]
+
+    def setup(self, shape):
+        self.pack = Pack.random(*shape, seed=0)
+
+    def time_discharge_10k_steps(self, shape):
+        self.pack.discharge(5.0, dt=1.0, steps=10_000)
@@ -0,0 +1,43 @@
+"""Diagram rangkaian matplotlib (kerangka di-cache oleh DiagramRenderer)."""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from listrik.diagrams import DiagramRenderer
+
+
+class TimeDiagrams:
+    params = [[2, 3, 4, 5, 1000]]
+
+    def setup(self, n):
+        self.renderer = DiagramRenderer()
+        self.resistors = [10.0 * (i + 1) for i in range(n)]
+
+    def time_series(self, n):
+        self.renderer.series(self.resistors)
+
+    def time_parallel(self, n):
+        self.renderer.parallel(self.resistors)
+
+
+class TimeDiagramsCold:
+    """Termasuk menggambar kerangka statis (cache kosong)"""
+    params = [[3, 1000]]
+
+    def setup(self, n):
+        self.resistors = [10.0 * (i + 1) for i in range(n)]
+
+    def time_series(self, n):
+        DiagramRenderer().series(self.resistors)
+
+
+class TimeKirchhoffDiagrams:
+    def setup(self):
+        self.renderer = DiagramRenderer()
+
+    def time_kcl(self):
+        self.renderer.kcl(5.0, 2.0, 3.0)
+
+    def time_kvl(self):
+        self.renderer.kvl(12.0, [4.0, 6.0, 2.0], [4.0, 6.0, 2.0])
@@ -0,0 +1,67 @@
+"""Pembuat grafik Plotly untuk setiap halaman."""
+
+import numpy as np
+
+from listrik import figures, spectrum, sweep, tolerance
+from listrik.network import parse_expression
+from listrik.tariff import default_tariffs
+
+
+class TimePageFigures:
+    def setup(self):
+        self.tariff = next(iter(default_tariffs().values()))
+
+    def time_vi(self):
+        figures.vi_figure(10.0)
+
+    def time_emf(self):
+        figures.emf_figure(12.0, 0.5, 2.0)
+
+    def time_power_time(self):
+        figures.power_time_figure(1100.0, self.tariff, "08:00")
+
+    def time_dc_vs_ac(self):
+        figures.dc_vs_ac_figure(50, 12, 12)
+
+
+class TimeSpectrum:
+    params = [[100_000, 1_000_000]]
+
+    def setup(self, n):
+        fs = 10_000.0
+        t = np.arange(n) / fs
+        self.spectrum = spectrum.periodogram(12 * np.sin(2 * np.pi * 50 * t) + 0.5 * np.sin(2 * np.pi * 150 * t), fs)
+        self.harmonics = self.spectrum.harmonics()
+
+    def time_spectrum_figure(self, n):
+        figures.spectrum_figure(self.spectrum, self.harmonics)
+
+
+class TimeWaveform:
+    params = [[10_000, 1_000_000]]
+
+    def setup(self, n):
+        self.time = np.linspace(0, 0.1, n)
+        self.values = np.column_stack([1 - np.exp(-self.time / 0.01), np.exp(-self.time / 0.01)])
+
+    def time_waveform_figure(self, n):
+        figures.waveform_figure(self.time, self.values, ["V_C", "I"])
+
+
+class TimeAnalysisFigures:
+    def setup(self):
+        network = parse_expression("(R1 + R2) || R3", {"R1": 10.0, "R2": 4.7, "R3": 22.0})
+        self.result = tolerance.monte_carlo(network, trials=100_000, seed=1, workers=1)
+        self.edges, self.counts = self.result.histogram(self.result.names[0])
+        self.percentiles = dict(zip((1, 50, 99), self.result.percentile([1, 50, 99])[0]))
+        calculator = sweep.CALCULATORS["kvl"]
+        self.sweep = sweep.grid(calculator, {"V": 12.0, "R1": 4.0, "R2": 6.0, "R3": 2.0},
+                                [sweep.Axis("R1", 1, 10), sweep.Axis("V", 1, 24)], points=201)
+        self.labels = {**calculator.inputs, **calculator.outputs}
+
+    def time_tolerance_histogram(self):
+        figures.tolerance_histogram_figure(self.edges, self.counts, self.result.names[0], self.result.nominal[0],
+                                           self.percentiles, self.result.spec)
+
+    def time_sweep_contour(self):
+        figures.sweep_figure(self.sweep, "I", self.labels, "contour")
@@ -0,0 +1,229 @@
+"""Penemuan, pengukuran, riwayat, dan deteksi regresi benchmark."""
+
+import argparse
+import datetime
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+DEFAULT_HISTORY = os.path.join(ROOT, ".benchmarks", "history.jsonl")
+
+# Satu sampel diukur minimal selama ini (detik); fungsi cepat diulang
+MIN_SAMPLE_S = 0.05
+
+# Perubahan median relatif terhadap baseline yang dianggap bermakna
+DEFAULT_THRESHOLD = 0.20
+
+# Baseline = median dari sekian run terakhir di mesin yang sama
+BASELINE_RUNS = 5
+
+
+class Benchmark:
+    """Satu metode ``time_*`` dengan satu kombinasi parameter"""
+
+    def __init__(self, module, cls, method, params):
+        self.cls = cls
+        self.method = method
+        self.params = params
+        suffix = f"({', '.join(repr(p) for p in params)})" if params else ""
+        self.name = f"{module}.{cls.__name__}.{method}{suffix}"
+
+    def prepare(self):
+        instance = self.cls()
+        if hasattr(instance, "setup"):
+            instance.setup(*self.params)
+        method = getattr(instance, self.method)
+        return lambda: method(*self.params)
+
+
+def discover(pattern=None):
+    """Semua :class:`Benchmark` dari ``benchmarks/bench_*.py`` (difilter ``pattern``)"""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    found = []
+    for filename in sorted(os.listdir(HERE)):
+        if not (filename.startswith("bench_") and filename.endswith(".py")):
+            continue
+        stem = filename[:-3]
+        module = importlib.import_module(f"benchmarks.{stem}")
+        for cls_name, cls in vars(module).items():
+            if not (isinstance(cls, type) and cls_name.startswith("Time")):
+                continue
+            params = getattr(cls, "params", [])
+            combos = list(itertools.product(*params)) if params else [()]
+            for method in sorted(m for m in vars(cls) if m.startswith("time_")):
+                for combo in combos:
+                    bench = Benchmark(stem[len("bench_"):], cls, method, combo)
+                    if pattern is None or pattern in bench.name:
+                        found.append(bench)
+    return found
+
+
+def measure(func, repeat=5, min_sample=MIN_SAMPLE_S):
+    """Daftar waktu per panggilan (detik), satu nilai per sampel"""
+    func()  # pemanasan: impor malas, cache, alokasi pertama
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    number = max(1, int(min_sample / once)) if once > 0 else 1000
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def machine_id():
+    """Sidik mesin: hasil hanya dibandingkan dengan run di mesin yang sama"""
+    info = [platform.machine(), platform.processor(), platform.python_version(), str(os.cpu_count())]
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            info += sorted({line.split(":", 1)[1].strip() for line in f if line.startswith("model name")})
+    except OSError:
+        pass
+    return hashlib.sha1("|".join(info).encode()).hexdigest()[:12]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path, machine=None):
+    if not os.path.exists(path):
+        return []
+    runs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            run = json.loads(line)
+            if machine is None or run.get("machine") == machine:
+                runs.append(run)
+    return runs
+
+
+def save_run(path, run):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, sort_keys=True) + "\n")
+
+
+def baseline(history, name, runs=BASELINE_RUNS):
+    """Median dari ``runs`` hasil terakhir untuk skenario ``name`` (None bila belum ada)"""
+    values = [run["results"][name] for run in history if name in run.get("results", {})][-runs:]
+    return statistics.median(values) if values else None
+
+
+def compare(results, history, threshold=DEFAULT_THRESHOLD):
+    """Daftar ``(nama, median, baseline, rasio, status)`` untuk setiap skenario"""
+    rows = []
+    for name, median in results.items():
+        base = baseline(history, name)
+        if base is None or base <= 0:
+            rows.append((name, median, base, None, "baru"))
+            continue
+        ratio = median / base
+        if ratio > 1 + threshold:
+            status = "REGRESI"
+        elif ratio < 1 - threshold:
+            status = "lebih cepat"
+        else:
+            status = "ok"
+        rows.append((name, median, base, ratio, status))
+    return rows
+
+
+def _format_time(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def run(benchmarks, repeat=5, out=None):
+    """Ukur semua benchmark; kembalikan ``({nama: median}, {nama: galat})``"""
+    out = out or sys.stdout
+    results = {}
+    errors = {}
+    for bench in benchmarks:
+        try:
+            samples = measure(bench.prepare(), repeat)
+        except Exception as e:
+            errors[bench.name] = f"{type(e).__name__}: {e}"
+            print(f"  {bench.name}: GAGAL ({errors[bench.name]})", file=out)
+            continue
+        results[bench.name] = statistics.median(samples)
+        print(f"  {bench.name}: {_format_time(results[bench.name])} "
+              f"(min {_format_time(min(samples))}, {len(samples)} sampel)", file=out)
+    return results, errors
+
+
+def main(argv=None, out=None):
+    out = out or sys.stdout
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark listrik")
+    parser.add_argument("-k", dest="pattern", help="Hanya skenario yang namanya memuat teks ini")
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah sampel per skenario")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Ambang regresi relatif (0.2 = 20%%)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="Berkas riwayat JSONL")
+    parser.add_argument("--no-save", action="store_true", help="Jangan tambahkan run ini ke riwayat")
+    parser.add_argument("--list", action="store_true", help="Tampilkan daftar skenario saja")
+    args = parser.parse_args(argv)
+
+    benchmarks = discover(args.pattern)
+    if args.list:
+        for bench in benchmarks:
+            print(bench.name, file=out)
+        return 0
+    if not benchmarks:
+        print("Tidak ada skenario yang cocok", file=out)
+        return 1
+
+    machine = machine_id()
+    history = load_history(args.history, machine)
+    print(f"Menjalankan {len(benchmarks)} skenario (mesin {machine}, {len(history)} run sebelumnya)", file=out)
+    results, errors = run(benchmarks, args.repeat, out)
+
+    rows = compare(results, history, args.threshold)
+    width = max((len(name) for name, *_ in rows), default=10)
+    print(file=out)
+    print(f"{'Skenario'.ljust(width)}  {'Median':>10}  {'Baseline':>10}  {'Rasio':>6}  Status", file=out)
+    for name, median, base, ratio, status in rows:
+        ratio_text = f"{ratio:.2f}" if ratio is not None else "-"
+        print(f"{name.ljust(width)}  {_format_time(median):>10}  {_format_time(base):>10}  {ratio_text:>6}  {status}",
+              file=out)
+
+    if not args.no_save and results:
+        save_run(args.history, {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "machine": machine,
+            "python": platform.python_version(),
+            "results": results,
+        })
+
+    regressions = [name for name, *_, status in rows if status == "REGRESI"]
+    if regressions:
+        print(f"\n{len(regressions)} regresi di atas {args.threshold:.0%}", file=out)
+    if errors:
+        print(f"{len(errors)} skenario gagal", file=out)
+    return 1 if regressions or errors else 0
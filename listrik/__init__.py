@@ -0,0 +1,7 @@
+"""Mesin perhitungan rangkaian listrik DC untuk aplikasi Kalkulator Listrik.
+
+Paket ini sengaja tidak mengimpor Streamlit maupun pustaka grafik agar dapat
+dipakai ulang dalam skrip batch.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,535 @@
+"""Layanan HTTP JSON asyncio untuk semua kalkulator (tanpa dependensi tambahan).
+
+Server HTTP/1.1 minimal di atas ``asyncio.start_server`` (keep-alive,
+badan ``Content-Length``). Setiap endpoint ``POST`` menerima *batch* titik
+kerja dalam salah satu bentuk::
+
+    {"points": [{"V": 12, "R": 4}, {"V": 5, "R": 10}]}
+    {"V": [12, 5], "R": [4, 10]}
+
+dan menjawab secara kolumnar: ``{"count": n, "results": {"I": [...], ...}}``.
+Perhitungan memakai fungsi tervektorisasi :mod:`listrik.core`, sehingga satu
+permintaan berisi ribuan titik tetap satu panggilan NumPy.
+
+Pekerjaan berat (netlist MNA, sintesis, jadwal kabel, simulasi baterai,
+badan di atas :data:`INLINE_BODY_BYTES`, atau batch di atas
+:data:`INLINE_POINTS` titik) dijalankan di ``ProcessPoolExecutor`` agar
+event loop tetap melayani permintaan lain. Pekerja menerima badan mentah dan
+mengembalikan JSON terkode, jadi parsing dan serialisasi batch besar juga
+tidak berjalan di thread event loop.
+``GET /metrics`` melaporkan jumlah permintaan, p50/p99 latensi sisi server
+(parsing, perhitungan, dan serialisasi JSON), dan throughput per endpoint;
+:mod:`listrik.loadgen` adalah pembangkit beban untuk mengukurnya dari sisi
+klien.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from . import __version__, core
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Batch di atas jumlah titik ini dikirim ke process pool
+INLINE_POINTS = 20_000
+
+# Badan di atas ukuran ini langsung di-decode di process pool, bukan di event loop
+INLINE_BODY_BYTES = 256 * 1024
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# Jumlah latensi terakhir per endpoint untuk persentil
+LATENCY_WINDOW = 10_000
+
+KEEPALIVE_TIMEOUT_S = 30
+
+
+def _columns(payload, names, required=()):
+    """Ambil kolom ``names`` dari payload kolumnar atau ``points``; hasil array float"""
+    if not isinstance(payload, dict):
+        raise ValueError("Payload harus berupa objek JSON")
+    if "points" in payload:
+        points = payload["points"]
+        if not isinstance(points, list) or not all(isinstance(p, dict) for p in points):
+            raise ValueError("'points' harus berupa daftar objek")
+        source = {name: [p.get(name) for p in points] for name in names if any(name in p for p in points)}
+    else:
+        source = {name: payload[name] for name in names if name in payload}
+    missing = [name for name in required if name not in source]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(missing)}")
+    columns = {}
+    for name, values in source.items():
+        array = np.asarray(values if isinstance(values, list) else [values], dtype=float)
+        columns[name] = array
+    sizes = {a.size for a in columns.values() if a.size != 1}
+    if len(sizes) > 1:
+        raise ValueError("Panjang kolom tidak sama")
+    return columns
+
+
+def _count(columns):
+    return max((a.size for a in columns.values()), default=0)
+
+
+def _out(results, n):
+    return {"count": n, "results": {k: np.broadcast_to(np.asarray(v, dtype=float), (n,)).tolist()
+                                    for k, v in results.items()}}
+
+
+def calc_ohm(payload):
+    """Dua dari V, I, R → besaran ketiga (NaN bila tidak tentu)"""
+    c = _columns(payload, ("V", "I", "R"))
+    n = _count(c)
+    nan = np.full(n, np.nan)
+    V, I, R = (np.broadcast_to(c.get(k, nan), (n,)) for k in ("V", "I", "R"))
+    V = np.where(np.isnan(V), core.voltage(I, R), V)
+    I = np.where(np.isnan(I), core.current(V, R), I)
+    R = np.where(np.isnan(R), core.resistance(V, I), R)
+    return _out({"V": V, "I": I, "R": R, "P": core.power_vi(V, I)}, n)
+
+
+def calc_resistors(payload):
+    """R_seri dan R_paralel; ``resistors`` berupa daftar per titik (panjang boleh berbeda)"""
+    rows = _ragged(payload, "resistors")
+    return _out({"series": core.series_resistance(rows), "parallel": core.parallel_resistance(rows)}, len(rows))
+
+
+def calc_emf(payload):
+    c = _columns(payload, ("emf", "r", "I"), required=("emf", "r", "I"))
+    n = _count(c)
+    V = core.terminal_voltage(c["emf"], c["r"], c["I"])
+    return _out({"V_terminal": V, "P_loss": core.internal_power_loss(c["I"], c["r"]),
+                 "P_load": np.asarray(V) * c["I"], "efficiency": core.source_efficiency(c["emf"], c["r"], c["I"])}, n)
+
+
+def calc_power(payload):
+    c = _columns(payload, ("V", "I", "R", "t_hours", "tariff"), required=("V", "I"))
+    n = _count(c)
+    R = c.get("R", core.resistance(c["V"], c["I"]))
+    t_hours = c.get("t_hours", 1.0)
+    tariff = c.get("tariff", core.TARIFF_RP_PER_KWH)
+    return _out(core.power_energy(c["V"], c["I"], R, t_hours, tariff), n)
+
+
+def calc_kcl(payload):
+    """Arus cabang sisa: ΣI_masuk − ΣI_keluar per titik"""
+    currents_in = _ragged(payload, "currents_in")
+    currents_out = _ragged(payload, "currents_out")
+    if currents_in.shape[0] != currents_out.shape[0]:
+        raise ValueError("Jumlah titik currents_in dan currents_out tidak sama")
+    remaining = currents_in.sum(axis=1) - currents_out.sum(axis=1)
+    return _out({"I_remaining": remaining}, remaining.size)
+
+
+def calc_kvl(payload):
+    """Satu loop sumber ``V`` dengan hambatan seri: arus loop dan tegangan setiap hambatan"""
+    c = _columns(payload, ("V",), required=("V",))
+    rows = _ragged(payload, "resistors")
+    V = np.broadcast_to(c["V"], (rows.shape[0],))
+    total = rows.sum(axis=1)
+    current = np.asarray(core._safe_divide(V, total), dtype=float)
+    drops = current[:, None] * rows
+    out = _out({"I_loop": current, "R_total": total}, rows.shape[0])
+    # Tegangan per hambatan sesuai panjang asli daftar setiap titik
+    lengths = _lengths(payload, "resistors")
+    out["results"]["V_drops"] = [drops[k, :m].tolist() for k, m in enumerate(lengths)]
+    return out
+
+
+def calc_efficiency(payload):
+    """Rating efisiensi dari aturan bawaan atau ``rules`` dalam payload (seperti analisis di aplikasi)"""
+    from .rules import SEVERITY_COLORS, default_rules, parse_rules
+
+    c = _columns(payload, ("P", "V", "I"), required=("V", "I"))
+    n = _count(c)
+    V, I = (np.broadcast_to(c[k], (n,)) for k in ("V", "I"))
+    P = np.broadcast_to(c["P"], (n,)) if "P" in c else V * I
+    ruleset = parse_rules(payload["rules"]) if "rules" in payload else default_rules()
+    report = ruleset.evaluate({"P": P, "V": V, "I": I})
+    # Baris dengan mask aturan sama memberi hasil sama: cukup satu kali per mask unik
+    masks, first, inverse = np.unique(report.mask, return_index=True, return_inverse=True)
+    outcomes = []
+    for row in first:
+        triggered = report.triggered(row)
+        top = triggered[0] if triggered else None
+        outcomes.append((
+            top.rating if top else "Optimal",
+            top.recommendation if top else "Rangkaian bekerja dengan baik",
+            top.severity if top else "ok",
+            SEVERITY_COLORS[top.severity] if top else "green",
+            [rule.message for rule in triggered],
+        ))
+    columns = ("rating", "recommendation", "severity", "color", "messages")
+    return {"count": n, "results": {name: [outcomes[k][i] for k in inverse.reshape(-1)]
+                                    for i, name in enumerate(columns)}}
+
+
+def calc_netlist(payload):
+    """Selesaikan satu atau banyak netlist SPICE dengan MNA"""
+    from .circuit import parse_netlist
+
+    netlists = payload.get("netlists") or [payload.get("netlist")]
+    if not all(isinstance(text, str) for text in netlists):
+        raise ValueError("Berikan 'netlist' (teks) atau 'netlists' (daftar teks)")
+    method = payload.get("method", "auto")
+    solutions = []
+    for text in netlists:
+        circuit = parse_netlist(text)
+        solution = circuit.solve(method=method)
+        solutions.append({
+            "nodes": dict(zip(circuit.nodes, solution.node_voltages.tolist())),
+            "resistors": {r[0]: {"V": v, "I": i} for r, v, i in zip(circuit.resistors,
+                                                                     solution.resistor_voltages.tolist(),
+                                                                     solution.resistor_currents.tolist())},
+            "sources": {s[0]: solution.current(s[0]) for s in circuit.vsources},
+        })
+    return {"count": len(solutions), "results": solutions}
+
+
+def calc_synth(payload):
+    from .synthesis import synthesize
+
+    targets = payload.get("targets", [payload.get("target")])
+    tolerance = payload.get("tolerance")
+    results = []
+    for target in targets:
+        result = synthesize(float(target), payload.get("series", "E24"), int(payload.get("max_parts", 3)),
+                            None if tolerance is None else float(tolerance) / 100)
+        best = result.best
+        results.append({"target": result.target, "expression": best.expression, "value": best.value,
+                        "error_percent": best.error_percent, "parts": best.count})
+    return {"count": len(results), "results": results}
+
+
+def calc_cable(payload):
+    import pandas as pd
+
+    from .cable import analyze_schedule
+
+    runs = payload.get("points", payload.get("runs"))
+    frame = pd.DataFrame(runs if runs is not None else {k: v for k, v in payload.items() if isinstance(v, list)})
+    options = {k: payload[k] for k in ("voltage", "temperature", "material") if k in payload}
+    if "drop_limit" in payload:
+        options["drop_limit"] = float(payload["drop_limit"]) / 100
+    result = analyze_schedule(frame, **options)
+    return {"count": len(result), "results": {k: [None if isinstance(v, float) and v != v else v
+                                                  for v in result[k].tolist()] for k in result.columns}}
+
+
+def calc_battery(payload):
+    from .battery import Pack
+
+    pack = Pack.random(int(payload["series"]), int(payload["parallel"]), float(payload.get("capacity_ah", 3.0)),
+                       float(payload.get("resistance", 0.05)), float(payload.get("emf_spread", 0.01)),
+                       float(payload.get("resistance_spread", 0.1)), seed=payload.get("seed"),
+                       chemistry=payload.get("chemistry", "li-ion"))
+    mode = "power" if "power" in payload else "current"
+    result = pack.discharge(float(payload[mode]), mode, float(payload.get("dt", 1.0)),
+                            int(payload.get("steps", 10_000)), record_cells=False)
+    return {"count": 1, "results": dict(result.summary(), emf=pack.emf,
+                                        internal_resistance=pack.internal_resistance)}
+
+
+def _ragged(payload, name):
+    """Daftar per titik dengan panjang berbeda → matriks berisi nol (nol tidak mengubah jumlah)"""
+    rows = _rows(payload, name)
+    width = max((len(r) for r in rows), default=0)
+    matrix = np.zeros((len(rows), width))
+    for k, row in enumerate(rows):
+        matrix[k, :len(row)] = row
+    return matrix
+
+
+def _lengths(payload, name):
+    return [len(r) for r in _rows(payload, name)]
+
+
+def _rows(payload, name):
+    if "points" in payload:
+        points = payload["points"]
+        if not isinstance(points, list) or not all(isinstance(p, dict) for p in points):
+            raise ValueError("'points' harus berupa daftar objek")
+        rows = [p.get(name, []) for p in points]
+    elif name in payload:
+        rows = payload[name]
+        if rows and not isinstance(rows[0], list):
+            rows = [rows]
+    else:
+        raise ValueError(f"Kolom wajib tidak ada: {name}")
+    return rows
+
+
+ENDPOINTS = {
+    "/ohm": calc_ohm,
+    "/resistors": calc_resistors,
+    "/emf": calc_emf,
+    "/power": calc_power,
+    "/kcl": calc_kcl,
+    "/kvl": calc_kvl,
+    "/efficiency": calc_efficiency,
+    "/netlist": calc_netlist,
+    "/synth": calc_synth,
+    "/cable": calc_cable,
+    "/battery": calc_battery,
+}
+
+# Endpoint yang selalu dijalankan di process pool
+HEAVY = {"/netlist", "/synth", "/cable", "/battery"}
+
+
+def _points(payload):
+    if not isinstance(payload, dict):
+        return 0
+    if isinstance(payload.get("points"), list):
+        return len(payload["points"])
+    return max((len(v) for v in payload.values() if isinstance(v, list)), default=1)
+
+
+class Metrics:
+    """Latensi dan throughput (jendela geser) serta jumlah permintaan/titik per endpoint"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.started = time.perf_counter()
+        self.latencies = {}
+        self.requests = {}
+        self.points = {}
+        self.errors = {}
+
+    def record(self, path, seconds, points, ok):
+        # (waktu mulai, latensi): throughput dihitung dari jendela yang sama dengan persentil
+        started = time.perf_counter() - seconds
+        self.latencies.setdefault(path, deque(maxlen=self.window)).append((started, seconds))
+        self.requests[path] = self.requests.get(path, 0) + 1
+        self.points[path] = self.points.get(path, 0) + points
+        if not ok:
+            self.errors[path] = self.errors.get(path, 0) + 1
+
+    def snapshot(self):
+        """Ringkasan per endpoint; ``requests_per_s`` atas jendela geser yang sama dengan persentil.
+
+        ``requests_per_s`` adalah jumlah permintaan di jendela dibagi selang
+        dari mulainya permintaan tertua hingga selesainya permintaan terbaru,
+        sehingga waktu diam di luar jendela tidak mengencerkan throughput.
+        """
+        uptime = time.perf_counter() - self.started
+        endpoints = {}
+        for path, samples in self.latencies.items():
+            values = np.array(samples, dtype=float).reshape(-1, 2)
+            p50, p99 = np.percentile(values[:, 1], [50, 99]) * 1000
+            span = (values[:, 0] + values[:, 1]).max() - values[:, 0].min()
+            endpoints[path] = {
+                "requests": self.requests[path],
+                "errors": self.errors.get(path, 0),
+                "points": self.points[path],
+                "p50_ms": float(p50),
+                "p99_ms": float(p99),
+                "window": len(values),
+                "requests_per_s": len(values) / span if span > 0 else 0.0,
+            }
+        return {"uptime_s": uptime, "endpoints": endpoints}
+
+
+class ApiServer:
+    """Server HTTP JSON; ``workers`` proses untuk pekerjaan berat (0 = semua inline)"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, inline_points=INLINE_POINTS):
+        self.host = host
+        self.port = port
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.inline_points = inline_points
+        self.metrics = Metrics()
+        self.pool = None
+        self.server = None
+        self._pending = set()
+
+    async def start(self):
+        if self.workers:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            # Executor.shutdown(cancel_futures=...) baru ada sejak Python 3.9
+            for future in list(self._pending):
+                future.cancel()
+            self.pool.shutdown()
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT_S)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                     _encode({"error": "Header terlalu besar"}), False)
+                    return
+                method, path, headers = _parse_head(head)
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                     _encode({"error": "Badan terlalu besar"}), False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, response = await self.handle(method, path, body)
+                await self._send(writer, status, response, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, method, path, body):
+        """``(status, badan JSON terkode)`` untuk satu permintaan.
+
+        Latensi di ``/metrics`` mencakup parsing, perhitungan, dan
+        serialisasi JSON, tetapi tidak waktu kirim di jaringan.
+        """
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if method == "GET":
+            if path in ("/", "/health"):
+                return HTTPStatus.OK, _encode({"status": "ok", "version": __version__,
+                                               "endpoints": sorted(ENDPOINTS)})
+            if path == "/metrics":
+                return HTTPStatus.OK, _encode(self.metrics.snapshot())
+        if path not in ENDPOINTS:
+            return HTTPStatus.NOT_FOUND, _encode({"error": f"Endpoint tidak dikenal: {path}"})
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, _encode({"error": "Gunakan POST"})
+
+        start = time.perf_counter()
+        if self.pool is not None and (path in HEAVY or len(body) > INLINE_BODY_BYTES):
+            status, response, points = await self._offload(path, body)
+        else:
+            inline_points = self.inline_points if self.pool is not None else None
+            status, response, points = _process(path, body, inline_points)
+            if status is None:
+                status, response, points = await self._offload(path, body)
+        self.metrics.record(path, time.perf_counter() - start, points, status == HTTPStatus.OK)
+        return status, response
+
+    async def _offload(self, path, body):
+        """Jalankan :func:`_process` (decode, hitung, encode) di process pool"""
+        future = self.pool.submit(_process, path, body)
+        self._pending.add(future)
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, _encode({"error": f"{type(e).__name__}: {e}"}), 0
+        finally:
+            self._pending.discard(future)
+
+    async def _send(self, writer, status, body, keep_alive):
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def _process(path, body, inline_points=None):
+    """Decode badan, jalankan endpoint ``path``, dan encode jawabannya.
+
+    Mengembalikan ``(status, badan JSON terkode, jumlah titik)``. Dapat
+    dijalankan di process pool. Bila ``inline_points`` diberikan dan batch
+    lebih besar, tidak ada yang dihitung dan status ``None`` dikembalikan
+    agar pemanggil mengirimnya ke pool.
+    """
+    points = 0
+    try:
+        payload = json.loads(body or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("Payload harus berupa objek JSON")
+        points = _points(payload)
+        if inline_points is not None and points > inline_points:
+            return None, None, points
+        return HTTPStatus.OK, _encode(ENDPOINTS[path](payload)), points
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        return HTTPStatus.BAD_REQUEST, _encode({"error": f"{type(e).__name__}: {e}"}), points
+    except Exception as e:
+        return HTTPStatus.INTERNAL_SERVER_ERROR, _encode({"error": f"{type(e).__name__}: {e}"}), points
+
+
+def _encode(payload):
+    """Objek → badan JSON UTF-8; NaN/inf (bukan JSON yang sah) menjadi null"""
+    try:
+        text = json.dumps(payload, allow_nan=False, default=_json_default)
+    except ValueError:
+        text = json.dumps(_nan_to_none(payload), default=_json_default)
+    return text.encode("utf-8")
+
+
+def _parse_head(head):
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        method, target = "", "/"
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), target, headers
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Tidak dapat diubah ke JSON: {type(value).__name__}")
+
+
+def _nan_to_none(value):
+    """NaN/inf bukan JSON yang sah; diganti null"""
+    if isinstance(value, float):
+        return value if np.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _nan_to_none(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_nan_to_none(v) for v in value]
+    return value
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None):
+    """Jalankan server sampai dihentikan (Ctrl+C)"""
+    server = ApiServer(host, port, workers)
+
+    async def main():
+        await server.start()
+        print(f"listrik API di http://{server.host}:{server.port} ({server.workers} proses pekerja)", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
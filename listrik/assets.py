@@ -0,0 +1,193 @@
+"""Aset statis tampilan: stylesheet terminifikasi dan templat kartu HTML.
+
+Stylesheet dibaca, diminifikasi, dan di-hash sekali per proses (bukan sekali
+per rerun). Hash isi menjadi versi aset: tag ``<style>`` membawa
+``data-version`` sehingga perubahan berkas CSS langsung menghasilkan tag
+baru, sedangkan selama berkas tidak berubah setiap rerun mengirim teks yang
+persis sama dan frontend tidak perlu memasang ulang stylesheet.
+
+Tema tidak mengganti stylesheet: :func:`theme_css` hanya menimpa variabel
+warna ``--*-light`` di ``:root`` dengan nilai gelap, cukup beberapa ratus
+byte per rerun.
+"""
+
+import functools
+import hashlib
+import os
+import re
+
+DEFAULT_CSS = "physics_listrik.css"
+
+# CSS cadangan bila berkas stylesheet tidak ditemukan
+FALLBACK_CSS = """
+/* Dark/Light Mode Variables */
+:root {
+    --primary-color: #2E86AB;
+    --secondary-color: #A23B72;
+    --accent-color: #F18F01;
+    --background-light: #F8F9FA;
+    --background-dark: #1E1E1E;
+    --text-light: #2D3748;
+    --text-dark: #E2E8F0;
+    --card-light: #FFFFFF;
+    --card-dark: #2D3748;
+}
+
+.main-header {
+    text-align: center;
+    background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
+    color: white;
+    padding: 20px;
+    border-radius: 15px;
+    margin-bottom: 30px;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+}
+
+.physics-card {
+    background: var(--card-light);
+    padding: 20px;
+    border-radius: 15px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+    margin: 15px 0;
+    border-left: 4px solid var(--accent-color);
+}
+
+.result-box {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 20px;
+    border-radius: 15px;
+    margin: 15px 0;
+    text-align: center;
+}
+
+.formula-box {
+    background: #f8f9fa;
+    border: 2px solid var(--primary-color);
+    border-radius: 10px;
+    padding: 15px;
+    margin: 10px 0;
+    font-family: 'Courier New', monospace;
+    text-align: center;
+}
+
+.watermark {
+    position: fixed;
+    bottom: 10px;
+    right: 10px;
+    font-size: 10px;
+    color: rgba(0,0,0,0.3);
+    z-index: 999;
+}
+
+.stSelectbox > div > div {
+    border-radius: 10px;
+}
+
+.stNumberInput > div > div > input {
+    border-radius: 10px;
+}
+
+[data-testid="stSidebar"] {
+    background: linear-gradient(180deg, var(--primary-color) 0%, var(--secondary-color) 100%);
+}
+
+[data-testid="stSidebar"] .stSelectbox label,
+[data-testid="stSidebar"] .stNumberInput label,
+[data-testid="stSidebar"] .stRadio label {
+    color: white !important;
+    font-weight: bold;
+}
+"""
+
+# Penimpaan variabel per tema; tema gelap merujuk palet --*-dark di stylesheet
+# sehingga warnanya hanya didefinisikan di satu tempat
+THEMES = {
+    "Light Mode": {},
+    "Dark Mode": {
+        "--background-light": "var(--background-dark)",
+        "--background-secondary-light": "var(--background-secondary-dark)",
+        "--text-light": "var(--text-dark)",
+        "--text-secondary-light": "var(--text-secondary-dark)",
+        "--card-light": "var(--card-dark)",
+        "--border-light": "var(--border-dark)",
+        "--shadow-light": "var(--shadow-dark)",
+    },
+}
+
+TEMPLATES = {
+    "result_box": '<div class="result-box"><{tag}>{body}</{tag}></div>',
+    "physics_card": '<div class="physics-card"{attrs}>{body}</div>',
+    "formula_box": '<div class="formula-box">{body}</div>',
+}
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_SPACE = re.compile(r"\s+")
+_PUNCT = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(text):
+    """Buang komentar dan spasi yang tidak bermakna"""
+    text = _PUNCT.sub(r"\1", _SPACE.sub(" ", _COMMENT.sub("", text)))
+    # Spasi sebelum ':' bermakna pada selektor (``.a :hover``); sesudahnya tidak
+    return text.replace(": ", ":").replace(";}", "}").strip()
+
+
+@functools.lru_cache(maxsize=512)
+def minify_html(text):
+    """Rapatkan spasi antar-tag; hasil disimpan untuk isi statis yang berulang"""
+    return _SPACE.sub(" ", re.sub(r">\s+<", "><", text.strip()))
+
+
+def theme_css(mode):
+    """Blok ``:root`` kecil yang menimpa variabel warna untuk tema ``mode``"""
+    overrides = THEMES.get(mode, {})
+    return ":root{" + ";".join(f"{name}:{value}" for name, value in overrides.items()) + "}"
+
+
+class Assets:
+    """Stylesheet terminifikasi, versi (hash isi), dan templat kartu"""
+
+    def __init__(self, css_path=DEFAULT_CSS, fallback=FALLBACK_CSS):
+        self.css_path = css_path
+        try:
+            with open(css_path, encoding="utf-8") as f:
+                source = f.read()
+            self.mtime = os.path.getmtime(css_path)
+            self.source = "file"
+        except FileNotFoundError:
+            source = fallback
+            self.mtime = None
+            self.source = "fallback"
+        self.css = minify_css(source)
+        self.raw_bytes = len(source.encode("utf-8"))
+        self.version = hashlib.sha256(self.css.encode("utf-8")).hexdigest()[:12]
+        self.style_tag = f'<style data-version="{self.version}">{self.css}</style>'
+        self.templates = {name: minify_html(t) for name, t in TEMPLATES.items()}
+        self._theme_tags = {mode: f'<style data-theme="{mode}">{theme_css(mode)}</style>' for mode in THEMES}
+
+    def stale(self):
+        """True bila berkas CSS berubah (atau muncul/hilang) sejak dimuat"""
+        try:
+            mtime = os.path.getmtime(self.css_path)
+        except OSError:
+            mtime = None
+        return mtime != self.mtime
+
+    def theme_tag(self, mode):
+        tag = self._theme_tags.get(mode)
+        if tag is None:
+            tag = f'<style data-theme="{mode}">{theme_css(mode)}</style>'
+        return tag
+
+    def render(self, name, **fields):
+        """Isi templat ``name``; ``body`` disisipkan apa adanya"""
+        return self.templates[name].format(**fields)
+
+    def stats(self):
+        return {
+            "source": self.source,
+            "version": self.version,
+            "raw_bytes": self.raw_bytes,
+            "bytes": len(self.css.encode("utf-8")),
+        }
@@ -0,0 +1,267 @@
+"""Model paket baterai sSpP: GGL, hambatan dalam, pembagian arus, dan simulasi pengosongan.
+
+Paket terdiri dari ``S`` grup seri; setiap grup berisi ``P`` sel paralel.
+Setiap sel punya GGL (kurva OCV terhadap SoC ditambah selisih per sel),
+hambatan dalam, dan kapasitas sendiri, disimpan sebagai array ``(S, P)``.
+
+Sel-sel paralel berbagi tegangan grup ``V_g``::
+
+    I_ij = (ε_ij − V_g) / r_ij,   Σ_j I_ij = I   →   V_g = (Σ ε/r − I) / Σ 1/r
+
+sehingga setiap grup setara sumber Thevenin ``ε_g = Σ(ε/r) / Σ(1/r)``,
+``r_g = 1 / Σ(1/r)``, dan paket adalah jumlah seri semua grup.
+
+Simulasi arus tetap atau daya tetap berjalan per langkah waktu, tetapi
+setiap langkah menghitung semua sel sekaligus sebagai operasi array. SoC
+berkurang menurut hukum Peukert: arus efektif ``|I| (|I| / I_ref)^(k−1)``
+dengan ``I_ref = C / jam_rating``. Simulasi berhenti bila jumlah langkah
+habis, tegangan grup turun di bawah tegangan putus sel, SoC sel habis,
+atau daya tetap tidak lagi dapat dipasok.
+"""
+
+import numpy as np
+
+# Kurva OCV (V) terhadap SoC per kimia sel
+OCV_CURVES = {
+    "li-ion": ((0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+               (3.00, 3.30, 3.45, 3.55, 3.62, 3.67, 3.72, 3.80, 3.89, 3.98, 4.08, 4.20)),
+    "lifepo4": ((0.0, 0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.8, 0.9, 0.95, 1.0),
+                (2.50, 2.95, 3.15, 3.22, 3.26, 3.29, 3.31, 3.33, 3.36, 3.40, 3.60)),
+    "lead-acid": ((0.0, 0.1, 0.2, 0.4, 0.6, 0.8, 1.0),
+                  (1.75, 1.93, 1.96, 2.00, 2.04, 2.08, 2.12)),
+}
+
+# Tegangan putus sel (V), eksponen Peukert, dan jam rating kapasitas
+CHEMISTRY = {
+    "li-ion": {"cutoff": 3.0, "peukert": 1.05, "rated_hours": 1.0},
+    "lifepo4": {"cutoff": 2.5, "peukert": 1.03, "rated_hours": 1.0},
+    "lead-acid": {"cutoff": 1.75, "peukert": 1.25, "rated_hours": 20.0},
+}
+
+MODES = ("current", "power")
+
+STOP_REASONS = {
+    "steps": "langkah habis",
+    "voltage": "tegangan putus",
+    "soc": "SoC sel habis",
+    "power": "daya tidak tercapai",
+}
+
+
+class Pack:
+    """Paket ``series``S``parallel``P dengan parameter per sel berbentuk ``(S, P)``"""
+
+    def __init__(self, series, parallel, capacity_ah=3.0, resistance=0.05, emf_offset=0.0, soc=1.0,
+                 chemistry="li-ion", peukert=None, rated_hours=None, cutoff=None):
+        if chemistry not in OCV_CURVES:
+            raise ValueError(f"Kimia sel tidak dikenal: {chemistry}")
+        if series < 1 or parallel < 1:
+            raise ValueError("Jumlah sel seri dan paralel minimal 1")
+        shape = (int(series), int(parallel))
+        self.series, self.parallel = shape
+        self.chemistry = chemistry
+        self.capacity = np.broadcast_to(np.asarray(capacity_ah, dtype=float), shape).copy()
+        self.resistance = np.broadcast_to(np.asarray(resistance, dtype=float), shape).copy()
+        self.offset = np.broadcast_to(np.asarray(emf_offset, dtype=float), shape).copy()
+        self.soc = np.broadcast_to(np.asarray(soc, dtype=float), shape).copy()
+        if np.any(self.capacity <= 0) or np.any(self.resistance <= 0):
+            raise ValueError("Kapasitas dan hambatan dalam sel harus positif")
+        defaults = CHEMISTRY[chemistry]
+        self.peukert = defaults["peukert"] if peukert is None else float(peukert)
+        self.rated_hours = defaults["rated_hours"] if rated_hours is None else float(rated_hours)
+        self.cutoff = defaults["cutoff"] if cutoff is None else float(cutoff)
+        self._soc_points, self._ocv_points = (np.asarray(a, dtype=float) for a in OCV_CURVES[chemistry])
+
+    @classmethod
+    def random(cls, series, parallel, capacity_ah=3.0, resistance=0.05, emf_spread=0.01, resistance_spread=0.1,
+               capacity_spread=0.03, seed=None, **options):
+        """Paket dengan sebaran antarsel: GGL ±``emf_spread`` V, r dan kapasitas relatif (simpangan baku)"""
+        rng = np.random.default_rng(seed)
+        shape = (series, parallel)
+        return cls(
+            series, parallel,
+            capacity_ah=capacity_ah * np.clip(rng.normal(1.0, capacity_spread, shape), 0.5, 1.5),
+            resistance=resistance * np.clip(rng.normal(1.0, resistance_spread, shape), 0.2, 5.0),
+            emf_offset=rng.normal(0.0, emf_spread, shape),
+            **options,
+        )
+
+    @property
+    def cells(self):
+        return self.series * self.parallel
+
+    @property
+    def capacity_ah(self):
+        """Kapasitas paket (Ah): grup seri terlemah"""
+        return float(self.capacity.sum(axis=1).min())
+
+    def cell_emf(self, soc=None):
+        soc = self.soc if soc is None else soc
+        return np.interp(soc, self._soc_points, self._ocv_points) + self.offset
+
+    def thevenin(self, soc=None):
+        """``(ε_grup, r_grup)`` setiap grup seri, masing-masing array ``(S,)``"""
+        conductance = 1.0 / self.resistance
+        total = conductance.sum(axis=1)
+        return (self.cell_emf(soc) * conductance).sum(axis=1) / total, 1.0 / total
+
+    @property
+    def emf(self):
+        return float(self.thevenin()[0].sum())
+
+    @property
+    def internal_resistance(self):
+        return float((1.0 / (1.0 / self.resistance).sum(axis=1)).sum())
+
+    def share(self, current, soc=None):
+        """Arus setiap sel ``(S, P)`` dan tegangan grup ``(S,)`` untuk arus paket ``current``"""
+        emf = self.cell_emf(soc)
+        group_emf, group_r = self.thevenin(soc)
+        voltage = group_emf - current * group_r
+        return (emf - voltage[:, None]) / self.resistance, voltage
+
+    def discharge(self, value, mode="current", dt=1.0, steps=10_000, record_cells=True, progress=None):
+        """Simulasi pengosongan arus tetap (A) atau daya tetap (W) selama ``steps`` × ``dt`` detik.
+
+        ``progress(fraksi, teks)`` dipanggil kira-kira setiap 1% langkah.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Mode pengosongan tidak dikenal: {mode}")
+        steps = int(steps)
+        S, P = self.series, self.parallel
+        conductance = 1.0 / self.resistance
+        total = conductance.sum(axis=1)
+        group_r = 1.0 / total
+        pack_r = float(group_r.sum())
+        reference = self.capacity / self.rated_hours
+        drain = dt / 3600.0 / self.capacity
+        exponent = self.peukert - 1.0
+        soc = self.soc.copy()
+
+        time = np.arange(steps + 1) * dt
+        voltage = np.full(steps + 1, np.nan)
+        current = np.full(steps + 1, np.nan)
+        emf = np.full(steps + 1, np.nan)
+        min_group = np.full(steps + 1, np.nan)
+        cell_current = np.full((steps + 1, S * P), np.nan, dtype=np.float32) if record_cells else None
+        cell_soc = np.full((steps + 1, S * P), np.nan, dtype=np.float32) if record_cells else None
+        reason = "steps"
+        last = steps
+
+        exhausted = False
+        every = max(1, steps // 100)
+        for k in range(steps + 1):
+            if progress is not None and k % every == 0:
+                progress(k / max(steps, 1), f"{k:,} / {steps:,} langkah")
+            cell_emf = np.interp(soc, self._soc_points, self._ocv_points) + self.offset
+            group_emf = (cell_emf * conductance).sum(axis=1) * group_r
+            pack_emf = group_emf.sum()
+            if mode == "current":
+                I = value
+            else:
+                discriminant = pack_emf * pack_emf - 4.0 * pack_r * value
+                if discriminant < 0:
+                    if k == 0:
+                        raise ValueError(f"Daya {value:g} W melebihi kemampuan paket "
+                                         f"(maks {pack_emf ** 2 / (4 * pack_r):.4g} W)")
+                    reason, last = "power", k - 1
+                    break
+                I = 2.0 * value / (pack_emf + np.sqrt(discriminant))
+            group_v = group_emf - I * group_r
+            cells = (cell_emf - group_v[:, None]) * conductance
+
+            voltage[k] = group_v.sum()
+            current[k] = I
+            emf[k] = pack_emf
+            min_group[k] = group_v.min()
+            if record_cells:
+                cell_current[k] = cells.ravel()
+                cell_soc[k] = soc.ravel()
+            if exhausted or min_group[k] < self.cutoff:
+                reason, last = "soc" if exhausted else "voltage", k
+                break
+            if k == steps:
+                break
+
+            # Peukert: arus efektif |I|·(|I|/I_ref)^(k−1); arus negatif (sel diisi sel lain) apa adanya
+            soc -= cells * (np.abs(cells) / reference) ** exponent * drain
+            if soc.min() <= 0.0:
+                np.maximum(soc, 0.0, out=soc)
+                exhausted = True
+
+        end = last + 1
+        return Discharge(self, mode, value, time[:end], voltage[:end], current[:end], emf[:end], min_group[:end],
+                         None if cell_current is None else cell_current[:end],
+                         None if cell_soc is None else cell_soc[:end], soc, reason)
+
+
+def _integrate(y, x):
+    """Integral trapesium"""
+    return float(((y[1:] + y[:-1]) * 0.5 * np.diff(x)).sum())
+
+
+class Discharge:
+    """Hasil simulasi pengosongan paket"""
+
+    def __init__(self, pack, mode, value, time, voltage, current, emf, min_group, cell_current, cell_soc,
+                 final_soc, reason):
+        self.pack = pack
+        self.mode = mode
+        self.value = value
+        self.time = time
+        self.voltage = voltage
+        self.current = current
+        self.emf = emf
+        self.min_group = min_group
+        self.cell_current = cell_current
+        self.cell_soc = cell_soc
+        self.final_soc = final_soc
+        self.reason = reason
+        self._envelopes = {}
+
+    @property
+    def power(self):
+        return self.voltage * self.current
+
+    @property
+    def duration_s(self):
+        return float(self.time[-1]) if self.time.size else 0.0
+
+    @property
+    def energy_wh(self):
+        return _integrate(self.power, self.time) / 3600.0
+
+    @property
+    def charge_ah(self):
+        return _integrate(self.current, self.time) / 3600.0
+
+    @property
+    def stop_reason(self):
+        return STOP_REASONS[self.reason]
+
+    def cell_envelope(self, values="current"):
+        """Kolom ``min``, ``rata-rata``, ``maks`` antarsel per langkah untuk grafik"""
+        if values in self._envelopes:
+            return self._envelopes[values]
+        data = self.cell_current if values == "current" else self.cell_soc
+        if data is None:
+            raise ValueError("Simulasi dijalankan tanpa record_cells")
+        return np.column_stack([data.min(axis=1), data.mean(axis=1), data.max(axis=1)])
+
+    def drop_cells(self):
+        """Simpan hanya selubung antarsel; array per sel (langkah × sel) dilepas dari memori"""
+        if self.cell_current is not None:
+            self._envelopes = {values: self.cell_envelope(values) for values in ("current", "soc")}
+            self.cell_current = self.cell_soc = None
+        return self
+
+    def summary(self):
+        return {
+            "duration_s": self.duration_s,
+            "energy_wh": self.energy_wh,
+            "charge_ah": self.charge_ah,
+            "final_voltage": float(self.voltage[-1]) if self.voltage.size else float("nan"),
+            "min_soc": float(self.final_soc.min()),
+            "max_soc": float(self.final_soc.max()),
+            "reason": self.stop_reason,
+        }
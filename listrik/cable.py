@@ -0,0 +1,251 @@
+"""Susut tegangan dan pemilihan penampang kabel untuk jadwal instalasi besar.
+
+Setiap baris jadwal adalah satu saluran: panjang (m), arus beban (A), bahan
+penghantar, dan penampang (mm²), opsional tegangan sistem dan suhu
+penghantar. Untuk semua baris sekaligus dihitung hambatan loop, susut
+tegangan, rugi daya I²R, dan penampang standar minimum yang memenuhi batas
+susut tegangan sekaligus kuat hantar arus (KHA).
+
+Tabel penghantar (hambatan per meter pada 20 °C dan KHA per bahan ×
+penampang) dihitung sekali saat modul dimuat. Pencarian penampang minimum
+memakai ``np.searchsorted`` atas tabel tersebut; koreksi suhu
+``R_T = R_20 (1 + α (T − 20))`` diterapkan per baris. Tidak ada perulangan
+Python per baris, sehingga 100 ribu saluran selesai jauh di bawah satu detik.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .profiling import traced
+
+# Resistivitas pada 20 °C (Ω·mm²/m) dan koefisien suhu (1/°C)
+MATERIALS = {
+    "cu": (0.017241, 0.00393),
+    "al": (0.028264, 0.00403),
+}
+
+MATERIAL_ALIASES = {
+    "cu": ("cu", "copper", "tembaga"),
+    "al": ("al", "aluminium", "aluminum"),
+}
+
+MATERIAL_NAMES = {"cu": "Tembaga", "al": "Aluminium"}
+
+# Penampang standar IEC 60228 (mm²)
+SECTIONS = np.array([1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240, 300], dtype=float)
+
+# KHA (A) kabel berisolasi PVC, dua penghantar berbeban, suhu keliling 30 °C;
+# aluminium kira-kira 78% tembaga
+AMPACITY = {
+    "cu": np.array([19.5, 27, 36, 46, 63, 85, 112, 138, 168, 213, 258, 299, 344, 392, 461, 530], dtype=float),
+}
+AMPACITY["al"] = np.round(AMPACITY["cu"] * 0.78, 1)
+
+REFERENCE_TEMPERATURE = 20.0
+
+# Suhu penghantar bawaan: batas kerja isolasi PVC (°C)
+DEFAULT_TEMPERATURE = 70.0
+
+DEFAULT_VOLTAGE = 220.0
+
+DEFAULT_DROP_LIMIT = 0.05
+
+# Penghantar berarus per saluran: pergi dan kembali (DC / satu fase)
+CONDUCTORS = 2
+
+_CODES = tuple(MATERIALS)
+_RHO = np.array([MATERIALS[m][0] for m in _CODES])
+_ALPHA = np.array([MATERIALS[m][1] for m in _CODES])
+
+# Tabel penghantar: hambatan per meter 20 °C dan KHA, baris = bahan
+RESISTANCE_TABLE = _RHO[:, None] / SECTIONS[None, :]
+AMPACITY_TABLE = np.vstack([AMPACITY[m] for m in _CODES])
+
+COLUMN_ALIASES = {
+    "name": ("name", "nama", "run", "saluran", "kabel", "id"),
+    "length": ("length", "panjang", "l", "length_m"),
+    "current": ("current", "arus", "i", "current_a"),
+    "material": ("material", "bahan", "penghantar"),
+    "section": ("section", "penampang", "luas", "area", "mm2"),
+    "voltage": ("voltage", "tegangan", "v"),
+    "temperature": ("temperature", "suhu", "t"),
+}
+
+REQUIRED_COLUMNS = ("length", "current", "section")
+
+STATUS_OK, STATUS_DROP, STATUS_AMPACITY, STATUS_BOTH = "ok", "susut", "kha", "susut+kha"
+# Panjang/arus/tegangan tidak terbaca atau di luar rentang: tidak dinilai
+STATUS_INVALID = "tidak valid"
+
+
+def material_codes(materials):
+    """Indeks bahan (baris tabel penghantar) untuk setiap nilai ``materials``"""
+    lookup = {alias: _CODES.index(code) for code, aliases in MATERIAL_ALIASES.items() for alias in aliases}
+    unique, inverse = np.unique(np.asarray(materials, dtype=str), return_inverse=True)
+    codes = []
+    for value in unique:
+        code = lookup.get(value.strip().lower())
+        if code is None:
+            raise ValueError(f"Bahan penghantar tidak dikenal: {value!r}")
+        codes.append(code)
+    return np.asarray(codes, dtype=np.intp)[inverse.reshape(-1)]
+
+
+def minimum_section(current, length=0.0, material="cu", voltage=DEFAULT_VOLTAGE,
+                    temperature=DEFAULT_TEMPERATURE, drop_limit=DEFAULT_DROP_LIMIT):
+    """Penampang standar minimum (mm²) untuk satu saluran; NaN bila tidak ada"""
+    result = analyze_runs([length], [current], [material], [SECTIONS[0]], voltage, temperature, drop_limit)
+    return float(result["min_section"][0])
+
+
+def analyze_runs(length, current, material, section, voltage=DEFAULT_VOLTAGE, temperature=DEFAULT_TEMPERATURE,
+                 drop_limit=DEFAULT_DROP_LIMIT, conductors=CONDUCTORS):
+    """Hitung semua besaran saluran; argumen berupa array sepanjang jumlah saluran (atau skalar).
+
+    Mengembalikan dict array: ``resistance`` (Ω, seluruh loop), ``drop_v``,
+    ``drop_pct``, ``loss_w``, ``ampacity`` (KHA penampang terpasang),
+    ``min_section`` (mm², NaN bila melebihi tabel), ``min_drop_pct``
+    (susut dengan penampang minimum), dan ``status``.
+
+    Saluran dengan panjang/arus/penampang bukan angka (NaN), panjang
+    negatif, penampang atau tegangan tidak positif berstatus
+    :data:`STATUS_INVALID`; besaran hitungannya NaN.
+    """
+    length = np.atleast_1d(np.asarray(length, dtype=float))
+    current = np.abs(np.atleast_1d(np.asarray(current, dtype=float)))
+    section = np.atleast_1d(np.asarray(section, dtype=float))
+    code = material_codes(np.atleast_1d(material))
+    n = np.broadcast_shapes(length.shape, current.shape, section.shape, code.shape)
+    length, current, section, code = (np.broadcast_to(a, n) for a in (length, current, section, code))
+    voltage = np.broadcast_to(np.asarray(voltage, dtype=float), n)
+    temperature = np.broadcast_to(np.asarray(temperature, dtype=float), n)
+    # Perbandingan dengan NaN selalu salah, jadi baris ini harus ditandai eksplisit
+    invalid = ~(np.isfinite(length) & np.isfinite(current) & (length >= 0) & (voltage > 0)
+                & np.isfinite(temperature) & np.isfinite(section) & (section > 0))
+    # Penampang pengganti agar baris tidak valid tidak membagi dengan nol/NaN; hasilnya dibuang
+    section = np.where(invalid, SECTIONS[0], section)
+
+    # Hambatan loop terkoreksi suhu: ρ_T · k · L / A
+    factor = 1 + _ALPHA[code] * (temperature - REFERENCE_TEMPERATURE)
+    rho_t = _RHO[code] * factor
+    loop_length = conductors * length
+    resistance = rho_t * loop_length / section
+    drop_v = current * resistance
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drop_pct = np.where(voltage > 0, drop_v / voltage * 100, np.nan)
+
+    # KHA penampang terpasang: penampang standar terbesar yang tidak melebihi
+    installed = np.searchsorted(SECTIONS, section, side="right") - 1
+    ampacity = np.where(installed >= 0, AMPACITY_TABLE[code, np.clip(installed, 0, None)], 0.0)
+
+    # Penampang minimum: syarat susut A ≥ ρ_T·k·L·I / ΔV_maks, dan syarat KHA
+    with np.errstate(divide="ignore", invalid="ignore"):
+        required = rho_t * loop_length * current / (drop_limit * voltage)
+    by_drop = np.searchsorted(SECTIONS, required * (1 - 1e-12), side="left")
+    by_ampacity = np.zeros(n, dtype=np.intp)
+    for k in np.unique(code):
+        rows = code == k
+        by_ampacity[rows] = np.searchsorted(AMPACITY_TABLE[k], current[rows], side="left")
+    index = np.maximum(by_drop, by_ampacity)
+    fits = index < SECTIONS.size
+    safe = np.where(fits, index, SECTIONS.size - 1)
+    min_section = np.where(fits, SECTIONS[safe], np.nan)
+    min_resistance = RESISTANCE_TABLE[code, safe] * factor * loop_length
+    with np.errstate(divide="ignore", invalid="ignore"):
+        min_drop_pct = np.where(fits & (voltage > 0), current * min_resistance / voltage * 100, np.nan)
+
+    drop_bad = drop_pct > drop_limit * 100
+    amp_bad = current > ampacity
+    status = np.select([invalid, drop_bad & amp_bad, drop_bad, amp_bad],
+                       [STATUS_INVALID, STATUS_BOTH, STATUS_DROP, STATUS_AMPACITY], STATUS_OK)
+
+    def masked(values):
+        return np.where(invalid, np.nan, values)
+
+    return {
+        "resistance": masked(resistance),
+        "drop_v": masked(drop_v),
+        "drop_pct": masked(drop_pct),
+        "loss_w": masked(current ** 2 * resistance),
+        "ampacity": masked(ampacity),
+        "min_section": masked(min_section),
+        "min_drop_pct": masked(min_drop_pct),
+        "status": status,
+    }
+
+
+def detect_columns(columns):
+    """Petakan nama kolom jadwal ke nama baku (``length``, ``current``, ...)"""
+    lookup = {str(c).strip().lower(): c for c in columns}
+    mapping = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lookup:
+                mapping[lookup[alias]] = key
+                break
+    missing = set(REQUIRED_COLUMNS) - set(mapping.values())
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(sorted(missing))}")
+    return mapping
+
+
+@traced(category="hitung")
+def analyze_schedule(frame, voltage=DEFAULT_VOLTAGE, temperature=DEFAULT_TEMPERATURE,
+                     drop_limit=DEFAULT_DROP_LIMIT, material="cu"):
+    """DataFrame jadwal → DataFrame hasil per saluran.
+
+    Kolom ``voltage``, ``temperature``, dan ``material`` pada jadwal, bila
+    ada, menggantikan nilai bawaan argumen untuk baris tersebut.
+    """
+    frame = frame.rename(columns=detect_columns(frame.columns))
+
+    def column(name, default):
+        if name not in frame:
+            return default
+        values = frame[name]
+        if name == "material":
+            return values.fillna(default).astype(str).to_numpy()
+        return pd.to_numeric(values, errors="coerce").fillna(default).to_numpy(dtype=float)
+
+    result = analyze_runs(
+        pd.to_numeric(frame["length"], errors="coerce").to_numpy(dtype=float),
+        pd.to_numeric(frame["current"], errors="coerce").to_numpy(dtype=float),
+        column("material", material),
+        pd.to_numeric(frame["section"], errors="coerce").to_numpy(dtype=float),
+        column("voltage", voltage),
+        column("temperature", temperature),
+        drop_limit,
+    )
+    out = pd.DataFrame({key: frame[key] for key in ("name", "length", "current", "material", "section")
+                        if key in frame})
+    for key, values in result.items():
+        out[key] = values
+    return out
+
+
+def load_schedule(source, name=""):
+    """Baca jadwal kabel dari CSV atau XLSX"""
+    if str(name or getattr(source, "name", source)).lower().endswith((".xlsx", ".xlsm")):
+        return pd.read_excel(source)
+    return pd.read_csv(source)
+
+
+def summarize(result):
+    """Ringkasan jadwal: jumlah saluran per status, rugi total, susut terburuk.
+
+    Saluran :data:`STATUS_INVALID` hanya dihitung di ``invalid``, tidak di
+    ``undersized`` maupun ``unsized``.
+    """
+    counts = result["status"].value_counts()
+    valid = result["status"] != STATUS_INVALID
+    worst = result["drop_pct"].max()
+    return {
+        "runs": len(result),
+        "status": {s: int(counts.get(s, 0))
+                   for s in (STATUS_OK, STATUS_DROP, STATUS_AMPACITY, STATUS_BOTH, STATUS_INVALID)},
+        "loss_w": float(result["loss_w"].sum()),
+        "worst_drop_pct": float(worst) if np.isfinite(worst) else 0.0,
+        "undersized": int(result["status"].isin((STATUS_DROP, STATUS_AMPACITY, STATUS_BOTH)).sum()),
+        "unsized": int((result["min_section"].isna() & valid).sum()),
+        "invalid": int((~valid).sum()),
+    }
@@ -0,0 +1,413 @@
+"""Analisis rangkaian DC dengan Modified Nodal Analysis (MNA).
+
+Netlist terdiri dari node, hambatan, sumber tegangan, sumber arus, serta
+kapasitor dan induktor. Pada analisis DC kapasitor dianggap terbuka dan
+induktor hubung singkat; perilaku transiennya ada di :mod:`listrik.transient`.
+Konvensi arah mengikuti SPICE: sumber arus ``I a b`` mengalirkan arus dari
+``a`` melalui sumber ke ``b``; arus cabang sumber tegangan positif bila
+mengalir masuk ke terminal ``a``.
+"""
+
+import numpy as np
+
+from .profiling import traced
+from .sparse import DENSE_LIMIT, CSRMatrix, solve
+
+GROUND_NAMES = ("0", "gnd", "GND")
+
+_SUFFIXES = {
+    "t": 1e12, "g": 1e9, "meg": 1e6, "k": 1e3,
+    "m": 1e-3, "u": 1e-6, "n": 1e-9, "p": 1e-12, "f": 1e-15,
+}
+
+
+def parse_value(text):
+    """Ubah nilai gaya SPICE (mis. ``4.7k``, ``10meg``, ``220``) menjadi float"""
+    token = text.strip().lower()
+    for suffix in ("meg", "t", "g", "k", "m", "u", "n", "p", "f"):
+        if token.endswith(suffix):
+            return float(token[: -len(suffix)]) * _SUFFIXES[suffix]
+    return float(token)
+
+
+class Circuit:
+    """Netlist rangkaian DC"""
+
+    def __init__(self):
+        self._nodes = {}
+        self.resistors = []
+        self.vsources = []
+        self.isources = []
+        self.capacitors = []
+        self.inductors = []
+        self._tables = {}
+
+    def table(self, kind):
+        """Komponen ``kind`` (``"resistors"``, ``"vsources"``, ``"isources"``,
+        ``"capacitors"``, ``"inductors"``) sebagai array ``a``, ``b``, ``value``;
+        di-cache sampai ada komponen baru"""
+        elements = getattr(self, kind)
+        cached = self._tables.get(kind)
+        if cached is None or cached[0] != len(elements):
+            cached = self._tables[kind] = (len(elements), _as_table(elements))
+        return cached[1]
+
+    def node_index(self, name):
+        """Indeks node (ground = -1); node baru didaftarkan otomatis"""
+        name = str(name)
+        if name in GROUND_NAMES:
+            return -1
+        index = self._nodes.get(name)
+        if index is None:
+            index = self._nodes[name] = len(self._nodes)
+        return index
+
+    @property
+    def nodes(self):
+        return list(self._nodes)
+
+    def add_resistor(self, name, a, b, resistance):
+        self.resistors.append((name, self.node_index(a), self.node_index(b), float(resistance)))
+
+    def add_voltage_source(self, name, a, b, voltage):
+        self.vsources.append((name, self.node_index(a), self.node_index(b), float(voltage)))
+
+    def add_current_source(self, name, a, b, current):
+        self.isources.append((name, self.node_index(a), self.node_index(b), float(current)))
+
+    def add_capacitor(self, name, a, b, capacitance):
+        self.capacitors.append((name, self.node_index(a), self.node_index(b), float(capacitance)))
+
+    def add_inductor(self, name, a, b, inductance):
+        self.inductors.append((name, self.node_index(a), self.node_index(b), float(inductance)))
+
+    def add_resistors(self, a, b, resistances, prefix="R"):
+        """Tambah banyak hambatan sekaligus dari array node dan nilai"""
+        start = len(self.resistors)
+        for k, (na, nb, r) in enumerate(zip(a, b, resistances)):
+            self.add_resistor(f"{prefix}{start + k + 1}", na, nb, r)
+
+    def build(self, dc=True):
+        """Susun matriks MNA ``A`` (CSR) dan vektor ruas kanan ``z``.
+
+        Hambatan 0 Ω (dan induktor bila ``dc``) diperlakukan sebagai sumber
+        tegangan 0 V (hubung singkat) sehingga konduktansinya tidak menjadi
+        tak hingga. Kapasitor tidak distempel (terbuka).
+        """
+        n = len(self._nodes)
+        res = self.table("resistors")
+        short = res["value"] == 0
+        vs_a, vs_b, vs_v = self._short_circuits(inductors=dc)
+        m = vs_a.size
+        size = n + m
+
+        # Stempel konduktansi
+        ra, rb = res["a"][~short], res["b"][~short]
+        g = 1.0 / res["value"][~short]
+        rows = np.concatenate([ra, rb, ra, rb])
+        cols = np.concatenate([ra, rb, rb, ra])
+        vals = np.concatenate([g, g, -g, -g])
+
+        # Stempel sumber tegangan (blok B dan B^T)
+        k = n + np.arange(m)
+        rows = np.concatenate([rows, vs_a, k, vs_b, k])
+        cols = np.concatenate([cols, k, vs_a, k, vs_b])
+        ones = np.ones(m)
+        vals = np.concatenate([vals, ones, ones, -ones, -ones])
+
+        keep = (rows >= 0) & (cols >= 0)
+        A = CSRMatrix.from_coo(rows[keep], cols[keep], vals[keep], (size, size))
+
+        z = np.zeros(size)
+        cs = self.table("isources")
+        _scatter(z, cs["a"], -cs["value"])
+        _scatter(z, cs["b"], cs["value"])
+        z[n:] = vs_v
+        return A, z
+
+    @traced(category="hitung")
+    def solve(self, method="auto", tol=1e-10):
+        """Selesaikan rangkaian dan kembalikan :class:`Solution`.
+
+        ``method``: ``"direct"`` (LU padat), ``"minres"`` (MNA penuh, iteratif),
+        ``"amg"`` (sistem nodal tereduksi dengan CG + multigrid), atau
+        ``"auto"`` yang memilih LU untuk rangkaian kecil dan AMG bila semua
+        sumber tegangan terhubung ke ground.
+        """
+        n = len(self._nodes)
+        if method == "auto":
+            size = n + len(self.vsources)
+            if size <= DENSE_LIMIT:
+                method = "direct"
+            else:
+                method = "amg" if self._fixed_voltages() is not None else "minres"
+
+        if method == "amg":
+            return self._solve_reduced(tol)
+
+        A, z = self.build()
+        M_inv = _block_jacobi(A, n) if method == "minres" else None
+        x = solve(A, z, method=method, tol=tol, M_inv=M_inv)
+        return Solution(self, x[:n], x[n:])
+
+    def _short_circuits(self, inductors=True):
+        """Gabungan sumber tegangan, hambatan 0 Ω, dan induktor (DC) sebagai tabel (a, b, V)"""
+        res = self.table("resistors")
+        vs = self.table("vsources")
+        ind = self.table("inductors")
+        short = res["value"] == 0
+        if not inductors:
+            ind = {key: value[:0] for key, value in ind.items()}
+        return (
+            np.concatenate([vs["a"], res["a"][short], ind["a"]]),
+            np.concatenate([vs["b"], res["b"][short], ind["b"]]),
+            np.concatenate([vs["value"], np.zeros(short.sum() + ind["value"].size)]),
+        )
+
+    def _fixed_voltages(self):
+        """Tegangan node yang dipatok sumber tegangan dari ground.
+
+        Mengembalikan array (NaN = tidak dipatok) atau ``None`` bila ada sumber
+        tegangan mengambang yang tidak terhubung ke ground.
+        """
+        a, b, v = self._short_circuits()
+        fixed = np.full(len(self._nodes), np.nan)
+        done = np.zeros(a.size, dtype=bool)
+        while not done.all():
+            va = np.where(a >= 0, fixed[np.maximum(a, 0)], 0.0)
+            vb = np.where(b >= 0, fixed[np.maximum(b, 0)], 0.0)
+            set_a = ~done & np.isnan(va) & ~np.isnan(vb)
+            set_b = ~done & ~np.isnan(va) & np.isnan(vb)
+            if not (set_a.any() or set_b.any()):
+                break
+            fixed[a[set_a]] = vb[set_a] + v[set_a]
+            fixed[b[set_b]] = va[set_b] - v[set_b]
+            done |= set_a | set_b
+            done |= ~np.isnan(va) & ~np.isnan(vb)
+        if not done.all():
+            return None
+        return fixed
+
+    def _solve_reduced(self, tol):
+        """Eliminasi node terpatok lalu selesaikan G_uu v_u = i_u dengan CG + AMG"""
+        fixed = self._fixed_voltages()
+        if fixed is None:
+            raise ValueError("Metode 'amg' butuh semua sumber tegangan terhubung ke ground")
+
+        n = len(self._nodes)
+        free = np.isnan(fixed)
+        unknown = np.full(n, -1)
+        unknown[free] = np.arange(free.sum())
+        n_free = int(free.sum())
+
+        res = self.table("resistors")
+        conducting = res["value"] != 0
+        a, b = res["a"][conducting], res["b"][conducting]
+        g = 1.0 / res["value"][conducting]
+        ua = np.where(a >= 0, unknown[np.maximum(a, 0)], -1)
+        ub = np.where(b >= 0, unknown[np.maximum(b, 0)], -1)
+        va = np.where(a >= 0, np.nan_to_num(fixed[np.maximum(a, 0)]), 0.0)
+        vb = np.where(b >= 0, np.nan_to_num(fixed[np.maximum(b, 0)]), 0.0)
+
+        both = (ua >= 0) & (ub >= 0)
+        rows = np.concatenate([ua, ub, ua[both], ub[both]])
+        cols = np.concatenate([ua, ub, ub[both], ua[both]])
+        vals = np.concatenate([g, g, -g[both], -g[both]])
+        keep = rows >= 0
+        G = CSRMatrix.from_coo(rows[keep], cols[keep], vals[keep], (n_free, n_free))
+
+        rhs = np.zeros(n_free)
+        _scatter(rhs, ua, np.where(ub < 0, g * vb, 0.0))
+        _scatter(rhs, ub, np.where(ua < 0, g * va, 0.0))
+        cs = self.table("isources")
+        ca = np.where(cs["a"] >= 0, unknown[np.maximum(cs["a"], 0)], -1)
+        cb = np.where(cs["b"] >= 0, unknown[np.maximum(cs["b"], 0)], -1)
+        _scatter(rhs, ca, -cs["value"])
+        _scatter(rhs, cb, cs["value"])
+
+        voltages = np.nan_to_num(fixed)
+        if n_free:
+            voltages[free] = solve(G, rhs, method="amg", tol=tol)
+        return Solution(self, voltages, self._source_currents(voltages))
+
+    def _source_currents(self, voltages):
+        """Arus sumber tegangan dari KCL, dikupas dari daun hutan sumber ke ground"""
+        n = len(self._nodes)
+        residual = np.zeros(n)
+        cs = self.table("isources")
+        _scatter(residual, cs["a"], -cs["value"])
+        _scatter(residual, cs["b"], cs["value"])
+        res = self.table("resistors")
+        conducting = res["value"] != 0
+        ra, rb = res["a"][conducting], res["b"][conducting]
+        flow = (_voltage_at(voltages, ra) - _voltage_at(voltages, rb)) / res["value"][conducting]
+        _scatter(residual, ra, -flow)
+        _scatter(residual, rb, flow)
+
+        a, b, _v = self._short_circuits()
+        currents = np.zeros(a.size)
+        pending = np.ones(a.size, dtype=bool)
+        while pending.any():
+            degree = np.zeros(n, dtype=np.int64)
+            _scatter(degree, a[pending], np.ones(pending.sum(), dtype=np.int64))
+            _scatter(degree, b[pending], np.ones(pending.sum(), dtype=np.int64))
+            leaf_a = pending & (a >= 0) & (degree[np.maximum(a, 0)] == 1)
+            leaf_b = pending & ~leaf_a & (b >= 0) & (degree[np.maximum(b, 0)] == 1)
+            if not (leaf_a.any() or leaf_b.any()):
+                raise np.linalg.LinAlgError("Loop sumber tegangan tanpa hambatan")
+            currents[leaf_a] = residual[a[leaf_a]]
+            currents[leaf_b] = -residual[b[leaf_b]]
+            _scatter(residual, b[leaf_a], currents[leaf_a])
+            _scatter(residual, a[leaf_b], -currents[leaf_b])
+            pending &= ~(leaf_a | leaf_b)
+        return currents
+
+
+class Solution:
+    """Hasil analisis: tegangan node dan arus cabang"""
+
+    def __init__(self, circuit, node_voltages, source_currents):
+        self.circuit = circuit
+        self.node_voltages = node_voltages
+        self.source_currents = source_currents
+
+        res = circuit.table("resistors")
+        va = _voltage_at(node_voltages, res["a"])
+        vb = _voltage_at(node_voltages, res["b"])
+        self.resistor_voltages = va - vb
+
+        # Arus hambatan 0 Ω diambil dari cabang hubung singkatnya
+        currents = np.zeros(res["value"].size)
+        short = res["value"] == 0
+        currents[~short] = self.resistor_voltages[~short] / res["value"][~short]
+        first_short = len(circuit.vsources)
+        currents[short] = source_currents[first_short:first_short + short.sum()]
+        self.resistor_currents = currents
+        self.inductor_currents = source_currents[first_short + short.sum():]
+
+    def voltage(self, node):
+        index = self.circuit.node_index(node)
+        return 0.0 if index < 0 else float(self.node_voltages[index])
+
+    def current(self, name):
+        """Arus cabang komponen bernama ``name``"""
+        for k, (element, *_rest) in enumerate(self.circuit.vsources):
+            if element == name:
+                return float(self.source_currents[k])
+        for k, (element, *_rest) in enumerate(self.circuit.resistors):
+            if element == name:
+                return float(self.resistor_currents[k])
+        for k, (element, *_rest) in enumerate(self.circuit.inductors):
+            if element == name:
+                return float(self.inductor_currents[k])
+        for element, _a, _b, value in self.circuit.isources:
+            if element == name:
+                return value
+        for element, *_rest in self.circuit.capacitors:
+            if element == name:
+                return 0.0
+        raise KeyError(name)
+
+    def kcl_residual(self):
+        """Jumlah aljabar arus di setiap node (idealnya ≈ 0)"""
+        n = len(self.circuit.nodes)
+        total = np.zeros(n)
+        res = self.circuit.table("resistors")
+        _scatter(total, res["a"], self.resistor_currents)
+        _scatter(total, res["b"], -self.resistor_currents)
+        vs = self.circuit.table("vsources")
+        k = len(self.circuit.vsources)
+        _scatter(total, vs["a"], self.source_currents[:k])
+        _scatter(total, vs["b"], -self.source_currents[:k])
+        ind = self.circuit.table("inductors")
+        _scatter(total, ind["a"], self.inductor_currents)
+        _scatter(total, ind["b"], -self.inductor_currents)
+        cs = self.circuit.table("isources")
+        _scatter(total, cs["a"], cs["value"])
+        _scatter(total, cs["b"], -cs["value"])
+        return total
+
+
+def loop_circuit(v_source, resistances):
+    """Satu loop: sumber ``V`` dari node ``n0`` ke ground lalu hambatan seri ``R1..Rn``"""
+    circuit = Circuit()
+    circuit.add_voltage_source("V", "n0", "0", v_source)
+    for i, r in enumerate(resistances):
+        end = "0" if i == len(resistances) - 1 else f"n{i + 1}"
+        circuit.add_resistor(f"R{i + 1}", f"n{i}", end, r)
+    return circuit
+
+
+def junction_circuit(currents_in, currents_out):
+    """Satu titik cabang ``N`` dengan arus masuk/keluar yang diketahui.
+
+    Arus cabang sisa diukur oleh sumber tegangan 0 V ``I_sisa`` dari ``N`` ke ground.
+    """
+    circuit = Circuit()
+    for k, current in enumerate(currents_in):
+        circuit.add_current_source(f"I_in{k + 1}", "0", "N", current)
+    for k, current in enumerate(currents_out):
+        circuit.add_current_source(f"I_out{k + 1}", "N", "0", current)
+    circuit.add_voltage_source("I_sisa", "N", "0", 0.0)
+    return circuit
+
+
+def parse_netlist(text):
+    """Baca netlist gaya SPICE (baris ``R``/``C``/``L``/``V``/``I``) menjadi :class:`Circuit`"""
+    circuit = Circuit()
+    adders = {
+        "R": circuit.add_resistor,
+        "C": circuit.add_capacitor,
+        "L": circuit.add_inductor,
+        "V": circuit.add_voltage_source,
+        "I": circuit.add_current_source,
+    }
+    for lineno, raw in enumerate(text.splitlines(), start=1):
+        line = raw.split(";")[0].strip()
+        if not line or line.startswith(("*", ".")):
+            continue
+        parts = line.split()
+        adder = adders.get(parts[0][0].upper())
+        if adder is None or len(parts) < 4:
+            raise ValueError(f"Baris {lineno} netlist tidak valid: {raw!r}")
+        # Sumber dapat ditulis "V1 a b DC 12"
+        value = parts[-1]
+        adder(parts[0], parts[1], parts[2], parse_value(value))
+    return circuit
+
+
+def _as_table(elements):
+    if not elements:
+        empty = np.zeros(0, dtype=np.int64)
+        return {"a": empty, "b": empty, "value": np.zeros(0)}
+    _names, a, b, value = zip(*elements)
+    return {
+        "a": np.fromiter(a, dtype=np.int64, count=len(a)),
+        "b": np.fromiter(b, dtype=np.int64, count=len(b)),
+        "value": np.fromiter(value, dtype=float, count=len(value)),
+    }
+
+
+def _scatter(target, index, values):
+    mask = index >= 0
+    np.add.at(target, index[mask], values[mask])
+
+
+def _voltage_at(node_voltages, index):
+    out = np.zeros(index.size)
+    mask = index >= 0
+    out[mask] = node_voltages[index[mask]]
+    return out
+
+
+def _block_jacobi(A, n):
+    """Prakondisi diagonal blok untuk sistem saddle-point MNA"""
+    diag = A.diagonal()
+    g = np.where(diag[:n] > 0, diag[:n], 1.0)
+    # Komplemen Schur B^T diag(G)^-1 B untuk baris sumber tegangan
+    schur = np.zeros(A.shape[0] - n)
+    rows = A.rows
+    mask = (rows >= n) & (A.indices < n)
+    np.add.at(schur, rows[mask] - n, A.data[mask] ** 2 / g[A.indices[mask]])
+    schur = np.where(schur > 0, schur, 1.0)
+    return 1.0 / np.concatenate([g, schur])
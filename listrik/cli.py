@@ -0,0 +1,529 @@
+"""Antarmuka baris perintah ``listrik`` untuk perhitungan tanpa Streamlit.
+
+Contoh::
+
+    listrik ohm -V 12 -R 10
+    listrik kvl --netlist rangkaian.cir
+    listrik energy --csv logger.csv --output hasil.csv
+    listrik meter log_meter.csv --output rekap.xlsx
+    listrik meter log_meter.csv --tariff-file tarif.yaml --tariff-class B-2
+    listrik tolerance "(R1 + R2) || R3" --value R1=10 R2=4.7k R3=22 --tol 5 --seed 1
+    listrik rules pembacaan.csv --rules aturan.yaml --budget 30
+    listrik synth 1234 --series E96 --parts 4 --tol 0.1
+    listrik cable jadwal_kabel.csv --voltage 220 --drop-limit 3 --output hasil.csv
+    listrik battery 96 8 --capacity 3 --current 20 --dt 1 --steps 10000
+    listrik serve --port 8765 --workers 2
+    listrik loadtest --endpoint /ohm --requests 2000 --batch 1000
+    listrik startup
+
+Jalur perhitungan hanya mengimpor NumPy; pustaka grafik tidak pernah dimuat.
+"""
+
+import argparse
+import csv
+import subprocess
+import sys
+import time
+
+# Batas waktu mulai dingin untuk ``import listrik.cli`` + NumPy (detik)
+STARTUP_BUDGET_S = 0.5
+
+
+def _print_table(headers, rows, out):
+    widths = [len(h) for h in headers]
+    text_rows = []
+    for row in rows:
+        cells = [f"{v:.6g}" if isinstance(v, float) else str(v) for v in row]
+        widths = [max(w, len(c)) for w, c in zip(widths, cells)]
+        text_rows.append(cells)
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)), file=out)
+    print("  ".join("-" * w for w in widths), file=out)
+    for cells in text_rows:
+        print("  ".join(c.ljust(w) for c, w in zip(cells, widths)), file=out)
+
+
+def _number(value):
+    """Nilai sel sebagai float; teks yang tidak terbaca ditampilkan apa adanya"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def cmd_ohm(args, out):
+    from . import core
+
+    given = [name for name in ("voltage", "current", "resistance") if getattr(args, name) is not None]
+    if len(given) != 2:
+        raise SystemExit("Berikan tepat dua dari -V, -I, -R")
+
+    if args.voltage is None:
+        print(f"Tegangan = {core.voltage(args.current, args.resistance):.2f} Volt", file=out)
+    elif args.current is None:
+        print(f"Arus = {core.current(args.voltage, args.resistance):.2f} Ampere", file=out)
+    else:
+        print(f"Hambatan = {core.resistance(args.voltage, args.current):.2f} Ohm", file=out)
+    return 0
+
+
+def cmd_kvl(args, out):
+    import numpy as np
+
+    from .circuit import loop_circuit, parse_netlist
+
+    if args.netlist:
+        with open(args.netlist, encoding="utf-8") as f:
+            circuit = parse_netlist(f.read())
+    elif args.source is not None and args.resistors:
+        circuit = loop_circuit(args.source, args.resistors)
+    else:
+        raise SystemExit("Berikan --netlist atau --source beserta --resistors")
+
+    start = time.perf_counter()
+    solution = circuit.solve(method=args.method)
+    elapsed = time.perf_counter() - start
+
+    print(f"Node: {len(circuit.nodes)}, hambatan: {len(circuit.resistors)}, "
+          f"diselesaikan dalam {elapsed * 1000:.1f} ms", file=out)
+    limit = None if args.all else 50
+    _print_table(["Node", "Tegangan (V)"],
+                 list(zip(circuit.nodes, solution.node_voltages.tolist()))[:limit], out)
+    print(file=out)
+    _print_table(["Hambatan", "Tegangan (V)", "Arus (A)"],
+                 list(zip([r[0] for r in circuit.resistors],
+                          solution.resistor_voltages.tolist(),
+                          solution.resistor_currents.tolist()))[:limit], out)
+    for name, *_rest in circuit.vsources:
+        print(f"Arus {name}: {solution.current(name):.6g} A", file=out)
+    print(f"Residu KCL maksimum: {np.abs(solution.kcl_residual()).max(initial=0):.2e} A", file=out)
+    return 0
+
+
+def _read_columns(path, names):
+    """Baca kolom numerik ``names`` dari CSV berheader (tanpa pandas)"""
+    import numpy as np
+
+    with open(path, newline="", encoding="utf-8") as f:
+        header = [h.strip() for h in next(csv.reader(f))]
+    lookup = {h.lower(): i for i, h in enumerate(header)}
+    columns = {}
+    for key, aliases in names.items():
+        for alias in aliases:
+            if alias.lower() in lookup:
+                columns[key] = lookup[alias.lower()]
+                break
+    data = np.loadtxt(path, delimiter=",", skiprows=1, usecols=list(columns.values()), ndmin=2)
+    return {key: data[:, k] for k, key in enumerate(columns)}
+
+
+def cmd_energy(args, out):
+    from . import core
+
+    if args.csv:
+        columns = _read_columns(args.csv, {
+            "V": ("V", "voltage", "tegangan"),
+            "I": ("I", "current", "arus"),
+            "R": ("R", "resistance", "hambatan"),
+            "t": ("t", "hours", "t_hours", "jam", "waktu"),
+        })
+        if "V" not in columns or "I" not in columns:
+            raise SystemExit("CSV harus memiliki kolom V dan I")
+        V, I = columns["V"], columns["I"]
+        R = columns.get("R", core.resistance(V, I))
+        t_hours = columns.get("t", args.hours)
+    else:
+        if args.voltage is None or args.current is None:
+            raise SystemExit("Berikan --csv atau --voltage dan --current")
+        V, I, t_hours = args.voltage, args.current, args.hours
+        R = args.resistance if args.resistance is not None else core.resistance(V, I)
+
+    tariff = args.tariff if args.tariff is not None else core.TARIFF_RP_PER_KWH
+    results = core.power_energy(V, I, R, t_hours, tariff=tariff)
+
+    if args.output:
+        import numpy as np
+
+        names = list(results)
+        table = np.column_stack([np.broadcast_to(results[k], np.shape(V)) for k in names])
+        np.savetxt(args.output, table, delimiter=",", header=",".join(names), comments="", fmt="%.10g")
+
+    total_kwh = float(results["energy_kwh"].sum()) if args.csv else float(results["energy_kwh"])
+    total_cost = float(results["cost"].sum()) if args.csv else float(results["cost"])
+    peak = float(results["P_vi"].max()) if args.csv else float(results["P_vi"])
+    rows = len(V) if args.csv else 1
+    print(f"Baris: {rows}", file=out)
+    print(f"Daya puncak: {peak:.1f} W", file=out)
+    print(f"Energi total: {total_kwh:.3f} kWh", file=out)
+    print(f"Biaya total: Rp {total_cost:.0f}", file=out)
+    return 0
+
+
+def cmd_meter(args, out):
+    from . import core, metering
+
+    def progress(fraction, rows):
+        print(f"\r{fraction * 100:5.1f}%  {rows:,} baris", end="", file=sys.stderr)
+
+    if args.tariff_file or args.tariff_class:
+        from . import tariff as tariffs
+
+        classes = tariffs.load_tariffs(args.tariff_file) if args.tariff_file else tariffs.default_tariffs()
+        name = args.tariff_class or next(iter(classes))
+        if name not in classes:
+            raise SystemExit(f"Golongan tarif {name!r} tidak ada; pilihan: {', '.join(classes)}")
+        tariff = classes[name]
+    else:
+        tariff = args.tariff if args.tariff is not None else core.TARIFF_RP_PER_KWH
+    report = metering.process_meter_log(
+        args.log, chunk_rows=args.chunk_rows, progress=None if args.quiet else progress,
+        demand_interval=args.interval, tariff=tariff, max_gap=args.max_gap,
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    if args.output:
+        if args.output.lower().endswith(".xlsx"):
+            with open(args.output, "wb") as f:
+                f.write(metering.to_excel_bytes({"Rekap": report}))
+        else:
+            report.to_csv(args.output)
+
+    _print_table(["Perangkat", "Baris", "Energi (kWh)", "Biaya (Rp)", "Puncak (W)"],
+                 [(device, int(row.readings), float(row.energy_kwh), float(row.cost), float(row.peak_demand_w))
+                  for device, row in report.iterrows()], out)
+    return 0
+
+
+def cmd_tolerance(args, out):
+    from . import tolerance
+    from .network import parse_expression
+
+    values = {}
+    for item in args.value or []:
+        name, _, value = item.partition("=")
+        if not value:
+            raise SystemExit(f"Format --value harus NAMA=NILAI, diberikan {item!r}")
+        values[name.strip()] = value.strip()
+    try:
+        from .circuit import parse_value
+
+        network = parse_expression(args.expression, {k: parse_value(v) for k, v in values.items()})
+        result = tolerance.monte_carlo(
+            network, args.tol / 100, args.voltage, int(args.trials), args.distribution,
+            series=args.series, seed=args.seed, spec=args.spec / 100, workers=args.workers,
+        )
+    except ValueError as e:
+        raise SystemExit(f"Analisis toleransi gagal: {e}")
+
+    table = result.summary()
+    _print_table(["Besaran", "Nominal", "Rata-rata", "Sigma", "p1", "p50", "p99", "Min", "Maks"],
+                 [(name, float(row.nominal), float(row["mean"]), float(row["std"]), float(row.p1),
+                   float(row.p50), float(row.p99), float(row["min"]), float(row["max"]))
+                  for name, row in table.iterrows()], out)
+    print(f"Percobaan: {result.trials:,}", file=out)
+    print(f"Yield (R_total ±{args.spec:g}%): {result.yield_fraction * 100:.3f}%", file=out)
+    return 0
+
+
+def cmd_rules(args, out):
+    from . import rules
+
+    def progress(fraction, rows):
+        if fraction is not None:
+            print(f"\r{fraction * 100:5.1f}%  {rows:,} baris", end="", file=sys.stderr)
+
+    try:
+        ruleset = rules.load_rules(args.rules) if args.rules else rules.default_rules()
+        start = time.perf_counter()
+        report = rules.evaluate_log(args.readings, ruleset=ruleset, chunk_rows=args.chunk_rows, budget_s=args.budget,
+                                    progress=None if args.quiet else progress)
+    except ValueError as e:
+        raise SystemExit(f"Evaluasi aturan gagal: {e}")
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    if args.output:
+        report.to_frame(report.worst(args.limit)).to_csv(args.output, index=False)
+
+    counts = report.counts()
+    _print_table(["Aturan", "Kolom", "Kondisi", "Keparahan", "Baris"],
+                 [(rule.name, rule.column, f"{rule.op} {rule.threshold:g}", rule.severity, counts[rule.name])
+                  for rule in (ruleset.rules[k] for k in ruleset.ranking)], out)
+    severity = report.severity_counts()
+    print(f"Baris: {report.rows:,} ({elapsed:.2f} s)", file=out)
+    print("Keparahan tertinggi: " + ", ".join(f"{name} {count:,}" for name, count in severity.items()), file=out)
+    if not report.complete:
+        print(f"Batas waktu {args.budget:g} s habis; berkas belum dievaluasi seluruhnya", file=out)
+        return 1
+    return 0
+
+
+def cmd_synth(args, out):
+    from .circuit import parse_value
+    from .synthesis import synthesize
+
+    try:
+        values = [parse_value(v) for v in args.stock] if args.stock else None
+        result = synthesize(parse_value(args.target), args.series, args.parts,
+                            None if args.tol is None else args.tol / 100, values=values)
+    except ValueError as e:
+        raise SystemExit(f"Sintesis gagal: {e}")
+
+    _print_table(["Rangkaian", "Topologi", "Komponen", "R (Ω)", "Galat (%)"],
+                 [(c.expression, c.topology, c.count, c.value, f"{c.error_percent:+.4f}")
+                  for c in result.candidates], out)
+    best = result.best
+    print(f"Terbaik: {best.expression} = {best.value:.6g} Ω ({best.error_percent:+.4f}%, "
+          f"{best.count} komponen) dalam {result.elapsed * 1000:.1f} ms", file=out)
+    if args.tol is not None and not result.within_tolerance:
+        print(f"Tidak ada kombinasi dalam toleransi ±{args.tol:g}%", file=out)
+        return 1
+    return 0
+
+
+def cmd_cable(args, out):
+    from . import cable
+
+    try:
+        start = time.perf_counter()
+        result = cable.analyze_schedule(cable.load_schedule(args.schedule), args.voltage, args.temperature,
+                                        args.drop_limit / 100, args.material)
+    except ValueError as e:
+        raise SystemExit(f"Analisis jadwal kabel gagal: {e}")
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        result.to_csv(args.output, index=False)
+
+    flagged = result[result["status"] != cable.STATUS_OK].sort_values("drop_pct", ascending=False)
+    rows = flagged if args.all else flagged.head(50)
+    _print_table(["Saluran", "Panjang (m)", "Arus (A)", "Penampang", "Susut (%)", "Rugi (W)", "KHA (A)",
+                  "Penampang Min", "Status"],
+                 [(row.get("name", index), _number(row["length"]), _number(row["current"]), _number(row["section"]),
+                   float(row["drop_pct"]), float(row["loss_w"]), float(row["ampacity"]),
+                   float(row["min_section"]), row["status"])
+                  for index, row in rows.iterrows()], out)
+    summary = cable.summarize(result)
+    print(f"Saluran: {summary['runs']:,} ({elapsed * 1000:.0f} ms), kurang besar: {summary['undersized']:,}, "
+          f"rugi total: {summary['loss_w'] / 1000:,.2f} kW", file=out)
+    if summary["unsized"]:
+        print(f"{summary['unsized']:,} saluran melebihi penampang terbesar {cable.SECTIONS[-1]:g} mm²", file=out)
+    if summary["invalid"]:
+        print(f"{summary['invalid']:,} saluran dilewati: panjang, arus, penampang, atau tegangan tidak valid", file=out)
+    return 1 if summary["undersized"] or summary["invalid"] else 0
+
+
+def cmd_battery(args, out):
+    from .battery import Pack
+
+    if (args.current is None) == (args.power is None):
+        raise SystemExit("Berikan tepat satu dari --current atau --power")
+    try:
+        pack = Pack.random(args.series, args.parallel, args.capacity, args.resistance / 1000,
+                           args.emf_spread / 1000, args.r_spread / 100, seed=args.seed, chemistry=args.chemistry)
+        start = time.perf_counter()
+        mode, value = ("current", args.current) if args.current is not None else ("power", args.power)
+        result = pack.discharge(value, mode, args.dt, args.steps, record_cells=False)
+    except ValueError as e:
+        raise SystemExit(f"Simulasi paket gagal: {e}")
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["t_s", "V", "I", "emf", "V_grup_min"])
+            writer.writerows(zip(result.time, result.voltage, result.current, result.emf, result.min_group))
+
+    summary = result.summary()
+    _print_table(["Besaran", "Nilai"], [
+        ("Konfigurasi", f"{args.series}S{args.parallel}P ({pack.cells} sel, {args.chemistry})"),
+        ("GGL paket (V)", pack.emf),
+        ("r paket (mΩ)", pack.internal_resistance * 1000),
+        ("Durasi (jam)", summary["duration_s"] / 3600),
+        ("Energi (Wh)", summary["energy_wh"]),
+        ("Muatan (Ah)", summary["charge_ah"]),
+        ("Tegangan akhir (V)", summary["final_voltage"]),
+        ("SoC sel min–maks (%)", f"{summary['min_soc'] * 100:.1f} – {summary['max_soc'] * 100:.1f}"),
+        ("Berhenti", summary["reason"]),
+    ], out)
+    print(f"{result.time.size:,} langkah dalam {elapsed:.2f} s", file=out)
+    return 0
+
+
+def cmd_serve(args, out):
+    from .api import serve
+
+    serve(args.host, args.port, args.workers)
+    return 0
+
+
+def cmd_loadtest(args, out):
+    import asyncio
+
+    from .loadgen import format_report, run
+
+    try:
+        report = asyncio.run(run(args.host, args.port, args.endpoint, args.requests, args.concurrency, args.batch,
+                                 args.seed))
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Uji beban gagal: {e}")
+    print(format_report(report), file=out)
+    return 0 if report["errors"] == 0 else 1
+
+
+def measure_startup(repeat=5):
+    """Waktu mulai dingin ``import listrik.cli`` di interpreter baru (median, detik)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import listrik.cli, listrik.core, listrik.circuit"],
+                       check=True)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def cmd_startup(args, out):
+    elapsed = measure_startup(args.repeat)
+    heavy = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, listrik.cli, listrik.core, listrik.circuit;"
+         "print(','.join(m for m in ('matplotlib', 'plotly', 'pandas', 'streamlit') if m in sys.modules))"],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+    print(f"Waktu mulai: {elapsed * 1000:.0f} ms (batas {args.budget * 1000:.0f} ms)", file=out)
+    if heavy:
+        print(f"Modul berat ikut dimuat: {heavy}", file=out)
+    return 0 if elapsed <= args.budget and not heavy else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="listrik", description="Kalkulator rangkaian listrik DC")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ohm = sub.add_parser("ohm", help="Hukum Ohm: hitung V, I, atau R dari dua besaran lain")
+    ohm.add_argument("-V", "--voltage", type=float, help="Tegangan (V)")
+    ohm.add_argument("-I", "--current", type=float, help="Arus (A)")
+    ohm.add_argument("-R", "--resistance", type=float, help="Hambatan (Ω)")
+    ohm.set_defaults(handler=cmd_ohm)
+
+    kvl = sub.add_parser("kvl", help="Analisis rangkaian (KVL/KCL) dengan MNA")
+    kvl.add_argument("--netlist", help="Berkas netlist gaya SPICE")
+    kvl.add_argument("--source", type=float, help="Tegangan sumber loop sederhana (V)")
+    kvl.add_argument("--resistors", type=float, nargs="+", help="Hambatan seri dalam loop (Ω)")
+    kvl.add_argument("--method", default="auto", choices=["auto", "direct", "minres", "amg"])
+    kvl.add_argument("--all", action="store_true", help="Tampilkan semua baris, bukan 50 pertama")
+    kvl.set_defaults(handler=cmd_kvl)
+
+    energy = sub.add_parser("energy", help="Daya, energi, dan biaya listrik")
+    energy.add_argument("--csv", help="CSV berkolom V, I, [R], [t] (jam)")
+    energy.add_argument("--voltage", type=float, help="Tegangan (V)")
+    energy.add_argument("--current", type=float, help="Arus (A)")
+    energy.add_argument("--resistance", type=float, help="Hambatan (Ω)")
+    energy.add_argument("--hours", type=float, default=1.0, help="Lama pemakaian (jam)")
+    energy.add_argument("--tariff", type=float, help="Tarif (Rp/kWh), bawaan Rp 1.500")
+    energy.add_argument("--output", help="Simpan hasil per baris ke CSV")
+    energy.set_defaults(handler=cmd_energy)
+
+    meter = sub.add_parser("meter", help="Rekap kWh, biaya, dan beban puncak dari log meter besar")
+    meter.add_argument("log", help="Log CSV/XLSX berkolom timestamp, V, I, [device]")
+    meter.add_argument("--interval", default="15min", help="Selang beban puncak (mis. 15min, 1h)")
+    meter.add_argument("--tariff", type=float, help="Tarif tetap (Rp/kWh), bawaan Rp 1.500")
+    meter.add_argument("--tariff-file", help="Golongan tarif TOU/bertingkat dari berkas JSON/YAML")
+    meter.add_argument("--tariff-class", help="Nama golongan tarif (bawaan: golongan pertama di berkas)")
+    meter.add_argument("--max-gap", help="Selang tanpa data lebih panjang dari ini tidak dihitung (mis. 1h)")
+    meter.add_argument("--chunk-rows", type=int, default=200_000, help="Jumlah baris per potongan")
+    meter.add_argument("--output", help="Simpan rekap ke .csv atau .xlsx")
+    meter.add_argument("--quiet", action="store_true", help="Tanpa laporan progres")
+    meter.set_defaults(handler=cmd_meter)
+
+    tol = sub.add_parser("tolerance", help="Monte Carlo toleransi jaringan hambatan seri-paralel")
+    tol.add_argument("expression", help="Ekspresi jaringan, mis. \"(R1 + R2) || R3\"")
+    tol.add_argument("--value", nargs="+", help="Nilai hambatan NAMA=NILAI (mis. R1=4.7k)")
+    tol.add_argument("--tol", type=float, default=5.0, help="Toleransi (%%), bawaan 5")
+    tol.add_argument("--series", choices=["E6", "E12", "E24", "E48", "E96"],
+                     help="Bulatkan nilai nominal ke deret E")
+    tol.add_argument("--distribution", default="uniform", choices=["uniform", "normal"])
+    tol.add_argument("--voltage", type=float, default=12.0, help="Tegangan sumber (V)")
+    tol.add_argument("--trials", type=float, default=1e6, help="Jumlah percobaan")
+    tol.add_argument("--spec", type=float, default=2.0, help="Batas yield R_total (±%%)")
+    tol.add_argument("--seed", type=int, help="Seed untuk hasil yang dapat diulang")
+    tol.add_argument("--workers", type=int, help="Jumlah proses (bawaan: jumlah inti)")
+    tol.set_defaults(handler=cmd_tolerance)
+
+    rule = sub.add_parser("rules", help="Evaluasi aturan efisiensi atas pembacaan banyak rangkaian")
+    rule.add_argument("readings", help="Pembacaan CSV/XLSX berkolom V, I, [P]")
+    rule.add_argument("--rules", help="Aturan dari berkas JSON/YAML (bawaan: daya, tegangan, arus)")
+    rule.add_argument("--budget", type=float, help="Batas waktu evaluasi (detik)")
+    rule.add_argument("--chunk-rows", type=int, default=1_000_000, help="Jumlah baris per potongan")
+    rule.add_argument("--output", help="Simpan baris terparah ke CSV")
+    rule.add_argument("--limit", type=int, default=1000, help="Jumlah baris terparah yang disimpan")
+    rule.add_argument("--quiet", action="store_true", help="Tanpa laporan progres")
+    rule.set_defaults(handler=cmd_rules)
+
+    synth = sub.add_parser("synth", help="Cari kombinasi resistor standar untuk hambatan target")
+    synth.add_argument("target", help="Hambatan target (Ω), mis. 1234 atau 4.7k")
+    synth.add_argument("--series", default="E24", choices=["E6", "E12", "E24", "E48", "E96"])
+    synth.add_argument("--parts", type=int, default=3, choices=[1, 2, 3, 4], help="Jumlah komponen maksimal")
+    synth.add_argument("--tol", type=float, help="Galat yang diterima (%%); pilih komponen paling sedikit")
+    synth.add_argument("--stock", nargs="+", help="Daftar nilai stok sendiri, menggantikan deret E")
+    synth.set_defaults(handler=cmd_synth)
+
+    cab = sub.add_parser("cable", help="Susut tegangan dan penampang minimum untuk jadwal kabel")
+    cab.add_argument("schedule", help="Jadwal CSV/XLSX berkolom panjang, arus, penampang, [bahan, tegangan, suhu]")
+    cab.add_argument("--voltage", type=float, default=220.0, help="Tegangan sistem (V) bila tidak ada di jadwal")
+    cab.add_argument("--temperature", type=float, default=70.0, help="Suhu penghantar (°C)")
+    cab.add_argument("--drop-limit", type=float, default=5.0, help="Batas susut tegangan (%%)")
+    cab.add_argument("--material", default="cu", help="Bahan bila tidak ada di jadwal (cu/al)")
+    cab.add_argument("--output", help="Simpan hasil per saluran ke CSV")
+    cab.add_argument("--all", action="store_true", help="Tampilkan semua saluran bermasalah, bukan 50 pertama")
+    cab.set_defaults(handler=cmd_cable)
+
+    bat = sub.add_parser("battery", help="Simulasi pengosongan paket baterai sSpP")
+    bat.add_argument("series", type=int, help="Jumlah grup seri (S)")
+    bat.add_argument("parallel", type=int, help="Jumlah sel paralel per grup (P)")
+    bat.add_argument("--chemistry", default="li-ion", choices=["li-ion", "lifepo4", "lead-acid"])
+    bat.add_argument("--capacity", type=float, default=3.0, help="Kapasitas sel (Ah)")
+    bat.add_argument("--resistance", type=float, default=50.0, help="Hambatan dalam sel (mΩ)")
+    bat.add_argument("--emf-spread", type=float, default=10.0, help="Sebaran GGL antarsel σ (mV)")
+    bat.add_argument("--r-spread", type=float, default=10.0, help="Sebaran hambatan dalam σ (%%)")
+    bat.add_argument("--current", type=float, help="Arus tetap (A)")
+    bat.add_argument("--power", type=float, help="Daya tetap (W)")
+    bat.add_argument("--dt", type=float, default=1.0, help="Langkah waktu (s)")
+    bat.add_argument("--steps", type=int, default=10_000, help="Jumlah langkah maksimal")
+    bat.add_argument("--seed", type=int, help="Seed sebaran sel")
+    bat.add_argument("--output", help="Simpan deret waktu paket ke CSV")
+    bat.set_defaults(handler=cmd_battery)
+
+    srv = sub.add_parser("serve", help="Layanan HTTP JSON untuk semua kalkulator")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8765)
+    srv.add_argument("--workers", type=int, help="Proses pekerja untuk endpoint berat (bawaan: jumlah CPU, 0 = inline)")
+    srv.set_defaults(handler=cmd_serve)
+
+    load = sub.add_parser("loadtest", help="Uji beban layanan HTTP: p50/p99 latensi dan throughput")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=8765)
+    load.add_argument("--endpoint", default="/ohm", help="Endpoint yang diuji (bawaan /ohm)")
+    load.add_argument("--requests", type=int, default=1000, help="Jumlah permintaan")
+    load.add_argument("--concurrency", type=int, default=16, help="Jumlah koneksi serentak")
+    load.add_argument("--batch", type=int, default=100, help="Titik kerja per permintaan")
+    load.add_argument("--seed", type=int, default=0)
+    load.set_defaults(handler=cmd_loadtest)
+
+    startup = sub.add_parser("startup", help="Ukur waktu mulai dingin terhadap batas")
+    startup.add_argument("--budget", type=float, default=STARTUP_BUDGET_S, help="Batas (detik)")
+    startup.add_argument("--repeat", type=int, default=5)
+    startup.set_defaults(handler=cmd_startup)
+
+    return parser
+
+
+def main(argv=None, out=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args, out or sys.stdout)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Rumus dasar rangkaian DC dalam bentuk tervektorisasi.
+
+Setiap fungsi menerima skalar, array NumPy, atau kolom pandas dan menghitung
+seluruh elemen sekaligus. Pembagian dengan nol tidak memakai cabang Python:
+hasil pada posisi penyebut nol di-mask menjadi 0, sama seperti perilaku
+kalkulator di aplikasi (``V / R if R != 0 else 0``).
+"""
+
+import numpy as np
+
+# Tarif dasar listrik (Rp/kWh) yang dipakai kalkulator
+TARIFF_RP_PER_KWH = 1500
+
+SECONDS_PER_HOUR = 3600
+
+
+def _is_pandas(x):
+    return type(x).__module__.startswith("pandas") and hasattr(x, "index")
+
+
+def _wrap(result, *inputs):
+    """Kembalikan skalar untuk input skalar, Series/DataFrame berlabel untuk input pandas"""
+    for x in inputs:
+        if _is_pandas(x):
+            import pandas as pd
+            if np.ndim(result) == 2:
+                return pd.DataFrame(result, index=x.index, columns=x.columns)
+            return pd.Series(result, index=x.index)
+    if np.ndim(result) == 0:
+        return result[()]
+    return result
+
+
+def _wrap_reduced(result, R, axis):
+    """Hasil reduksi sepanjang ``axis``; DataFrame menjadi Series berlabel sumbu yang tersisa"""
+    if _is_pandas(R) and np.ndim(R) == 2:
+        import pandas as pd
+        return pd.Series(result, index=R.columns if axis in (0, -2) else R.index)
+    return _wrap(result)
+
+
+def _arr(x):
+    return np.asarray(x, dtype=float)
+
+
+def _safe_divide(numerator, denominator):
+    num = _arr(numerator)
+    den = _arr(denominator)
+    out = np.zeros(np.broadcast_shapes(num.shape, den.shape))
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+# Hukum Ohm
+def voltage(I, R):
+    """V = I × R"""
+    return _wrap(_arr(I) * _arr(R), I, R)
+
+
+def current(V, R):
+    """I = V / R (0 bila R = 0)"""
+    return _wrap(_safe_divide(V, R), V, R)
+
+
+def resistance(V, I):
+    """R = V / I (0 bila I = 0)"""
+    return _wrap(_safe_divide(V, I), V, I)
+
+
+# Daya
+def power_vi(V, I):
+    """P = V × I"""
+    return _wrap(_arr(V) * _arr(I), V, I)
+
+
+def power_i2r(I, R):
+    """P = I² × R"""
+    I_arr = _arr(I)
+    return _wrap(I_arr * I_arr * _arr(R), I, R)
+
+
+def power_v2r(V, R):
+    """P = V² / R (0 bila R = 0)"""
+    V_arr = _arr(V)
+    return _wrap(_safe_divide(V_arr * V_arr, R), V, R)
+
+
+def power_rating(P):
+    """Kategori konsumsi daya: Efisien (< 100 W), Sedang (< 500 W), Tinggi"""
+    P_arr = _arr(P)
+    rating = np.select([P_arr < 100, P_arr < 500], ["Efisien", "Sedang"], "Tinggi")
+    return _wrap(rating, P)
+
+
+# Energi dan biaya
+def energy_joules(P, t_hours):
+    """W = P × t (Joule), t dalam jam"""
+    return _wrap(_arr(P) * _arr(t_hours) * SECONDS_PER_HOUR, P, t_hours)
+
+
+def energy_kwh(P, t_hours):
+    """W = P × t / 1000 (kWh), t dalam jam"""
+    return _wrap(_arr(P) * _arr(t_hours) / 1000, P, t_hours)
+
+
+def energy_cost(kwh, tariff=TARIFF_RP_PER_KWH):
+    """Biaya listrik (Rp) dengan tarif tetap per kWh"""
+    return _wrap(_arr(kwh) * tariff, kwh)
+
+
+# GGL dan tegangan jepit
+def terminal_voltage(emf, r, I):
+    """V_terminal = ε − I × r"""
+    return _wrap(_arr(emf) - _arr(I) * _arr(r), emf, r, I)
+
+
+def internal_power_loss(I, r):
+    """Rugi daya pada hambatan dalam: I² × r"""
+    return power_i2r(I, r)
+
+
+def source_efficiency(emf, r, I):
+    """Efisiensi sumber (%) = V_terminal / ε × 100 (0 bila ε = 0)"""
+    v_terminal = _arr(emf) - _arr(I) * _arr(r)
+    return _wrap(_safe_divide(v_terminal, emf) * 100, emf, r, I)
+
+
+# Kombinasi hambatan
+def series_resistance(R, axis=-1):
+    """R_total = ΣR sepanjang ``axis``"""
+    return _wrap_reduced(np.sum(_arr(R), axis=axis), R, axis)
+
+
+def parallel_resistance(R, axis=-1):
+    """1/R_total = Σ1/R sepanjang ``axis``; hambatan 0 diabaikan seperti di kalkulator"""
+    R_arr = _arr(R)
+    reciprocal_sum = np.sum(_safe_divide(1.0, R_arr), axis=axis)
+    return _wrap_reduced(_safe_divide(1.0, reciprocal_sum), R, axis)
+
+
+def power_energy(V, I, R, t_hours, tariff=TARIFF_RP_PER_KWH):
+    """Semua besaran kalkulator daya & energi sekaligus.
+
+    Mengembalikan dict berisi ``P_vi``, ``P_i2r``, ``P_v2r``, ``energy_j``,
+    ``energy_kwh``, dan ``cost``; energi dan biaya dihitung dari ``P = V × I``.
+    """
+    P = power_vi(V, I)
+    kwh = energy_kwh(P, t_hours)
+    return {
+        "P_vi": P,
+        "P_i2r": power_i2r(I, R),
+        "P_v2r": power_v2r(V, R),
+        "energy_j": energy_joules(P, t_hours),
+        "energy_kwh": kwh,
+        "cost": energy_cost(kwh, tariff),
+    }
@@ -0,0 +1,153 @@
+"""Penjarangan (downsampling) deret waktu sebelum dikirim ke grafik Plotly.
+
+Peramban hanya mampu menampilkan sekitar satu titik per piksel, sehingga
+mengirim jutaan sampel sebagai JSON hanya memperlambat halaman. Setiap
+deret dijarangkan ke lebar grafik:
+
+* **LTTB** (*Largest-Triangle-Three-Buckets*) — satu titik per piksel yang
+  mempertahankan bentuk kurva; dipakai bila jumlah sampel tidak jauh di
+  atas lebar grafik.
+* **Min-max** — titik minimum dan maksimum per ember piksel; selubung
+  sinyal berfrekuensi tinggi tetap utuh. Dipakai untuk deret yang sangat
+  panjang karena sepenuhnya tervektorisasi.
+
+``x_range`` memotong deret ke rentang yang sedang diperbesar lalu
+menjarangkan ulang potongan itu, sehingga detail muncul kembali saat zoom.
+Bila titik yang tersisa masih di atas :data:`GL_THRESHOLD`, jejak dibuat
+sebagai ``go.Scattergl`` (WebGL) alih-alih SVG.
+"""
+
+import numpy as np
+
+# Lebar grafik (piksel) pada tata letak lebar Streamlit
+DEFAULT_WIDTH = 1200
+
+# Di atas rasio sampel/piksel ini LTTB diganti min-max
+MINMAX_RATIO = 8
+
+# Jumlah titik terkirim yang membuat jejak beralih ke WebGL
+GL_THRESHOLD = 5000
+
+
+def _sorted_x(x, n):
+    if x is None:
+        return np.arange(n, dtype=float)
+    return np.asarray(x)
+
+
+def _numeric(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def window_slice(x, x_range):
+    """Indeks ``slice`` untuk ``x`` di dalam ``x_range`` plus satu titik di tiap sisi"""
+    if x_range is None:
+        return slice(0, len(x))
+    lo, hi = x_range
+    start = max(int(np.searchsorted(x, lo, side="left")) - 1, 0)
+    stop = min(int(np.searchsorted(x, hi, side="right")) + 1, len(x))
+    return slice(start, stop)
+
+
+def minmax_indices(x, y, buckets):
+    """Indeks titik min dan maks per ember selebar ``(x_akhir − x_awal) / buckets``"""
+    n = y.size
+    if n <= 2 * buckets:
+        return np.arange(n)
+    xs = _numeric(x)
+    edges = np.searchsorted(xs, np.linspace(xs[0], xs[-1], buckets + 1)[1:-1], side="left")
+    starts = np.unique(np.concatenate([[0], edges]))
+    starts = starts[starts < n]
+    counts = np.diff(np.append(starts, n))
+
+    # Indeks pertama yang mencapai min/maks di setiap ember
+    finite = np.where(np.isfinite(y), y, np.nan)
+    bucket = np.repeat(np.arange(starts.size), counts)
+    picked = [np.array([0, n - 1])]
+    for reduce in (np.fmin, np.fmax):
+        extreme = reduce.reduceat(finite, starts)
+        hits = np.flatnonzero(finite == np.repeat(extreme, counts))
+        _, first = np.unique(bucket[hits], return_index=True)
+        picked.append(hits[first])
+    return np.unique(np.concatenate(picked))
+
+
+def lttb_indices(x, y, threshold):
+    """Indeks ``threshold`` titik hasil LTTB (titik pertama dan terakhir selalu ikut)"""
+    n = y.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    xs = _numeric(x)
+    # Ember di antara titik pertama dan terakhir, beserta rata-rata tiap ember
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(xs[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    mean_x = np.append(mean_x[1:], xs[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Luas segitiga (titik terpilih sebelumnya, kandidat, rata-rata ember berikutnya)
+        area = np.abs((xs[a] - mean_x[i]) * (y[lo:hi] - y[a]) - (xs[a] - xs[lo:hi]) * (mean_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def decimate_indices(x, y, width=DEFAULT_WIDTH, method="auto"):
+    """Indeks sampel yang dikirim ke grafik selebar ``width`` piksel"""
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n <= width:
+        return np.arange(n)
+    x = _sorted_x(x, n)
+    if method == "auto":
+        method = "lttb" if n <= MINMAX_RATIO * width else "minmax"
+    if method == "lttb":
+        return lttb_indices(x, y, width)
+    if method == "minmax":
+        return minmax_indices(x, y, width)
+    raise ValueError(f"Metode penjarangan tidak dikenal: {method}")
+
+
+def decimate(x, y, width=DEFAULT_WIDTH, x_range=None, method="auto"):
+    """Kembalikan ``(x, y)`` terjarang untuk rentang ``x_range`` (None = semua)"""
+    y = np.asarray(y)
+    x = _sorted_x(x, y.size)
+    window = window_slice(x, x_range)
+    x, y = x[window], y[window]
+    keep = decimate_indices(x, y, width, method)
+    return x[keep], y[keep]
+
+
+def decimate_columns(x, columns, width=DEFAULT_WIDTH, x_range=None, method="auto"):
+    """Penjarangan beberapa deret berbagi sumbu ``x`` (gabungan indeks tiap kolom).
+
+    ``columns`` berupa array 2-D ``(n, k)``; hasilnya ``(x, columns)`` dengan
+    baris yang sama untuk semua kolom sehingga cocok untuk satu DataFrame.
+    """
+    columns = np.asarray(columns)
+    x = _sorted_x(x, columns.shape[0])
+    window = window_slice(x, x_range)
+    x, columns = x[window], columns[window]
+    if columns.ndim == 1:
+        columns = columns[:, None]
+    keep = np.unique(np.concatenate(
+        [decimate_indices(x, columns[:, k], width, method) for k in range(columns.shape[1])]))
+    return x[keep], columns[keep]
+
+
+def trace(x, y, width=DEFAULT_WIDTH, x_range=None, method="auto", **kwargs):
+    """``go.Scatter`` terjarang; ``go.Scattergl`` bila titiknya masih di atas :data:`GL_THRESHOLD`"""
+    import plotly.graph_objects as go
+
+    x, y = decimate(x, y, width, x_range, method)
+    cls = go.Scattergl if y.size > GL_THRESHOLD else go.Scatter
+    return cls(x=x, y=y, **kwargs)
@@ -0,0 +1,170 @@
+"""Graf dependensi inkremental: input → besaran turunan → grafik.
+
+Setiap rerun Streamlit menjalankan ulang seluruh skrip. Graf ini disimpan
+di ``st.session_state`` sehingga nilai node bertahan antar-rerun dan hanya
+node yang inputnya benar-benar berubah yang dihitung ulang.
+
+Revisi graf naik setiap kali sebuah input berubah nilai. Setiap node
+mencatat dua revisi: saat nilainya terakhir *berubah* (``changed_at``) dan
+saat terakhir *diperiksa* (``verified_at``). Saat dibaca, node memeriksa
+dependensinya secara rekursif dan baru menghitung ulang bila ada
+dependensi yang berubah setelah perhitungan terakhirnya. Bila hasil baru
+sama dengan yang lama (*early cutoff*), ``changed_at`` tidak naik dan node
+di hilirnya tidak ikut dihitung ulang.
+
+Fungsi node harus murni terhadap dependensinya: semua nilai yang dipakai
+harus datang dari argumen, bukan dari variabel halaman yang ditangkap.
+"""
+
+from functools import partial
+
+from .figcache import normalize_key
+from .profiling import span
+
+
+class _Node:
+    __slots__ = ("func", "signature", "args", "kwargs", "cutoff", "value", "key",
+                 "changed_at", "verified_at", "computed")
+
+    def __init__(self, func=None, signature=None, args=(), kwargs=None, cutoff=True):
+        self.func = func
+        self.signature = signature
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.cutoff = cutoff
+        self.value = None
+        self.key = None
+        self.changed_at = 0
+        self.verified_at = -1
+        self.computed = False
+
+    @property
+    def deps(self):
+        return list(self.args) + list(self.kwargs.values())
+
+
+def _code_key(code):
+    consts = tuple(_code_key(c) if hasattr(c, "co_code") else repr(c) for c in code.co_consts)
+    return (code.co_name, code.co_code, consts)
+
+
+def _func_key(func):
+    if isinstance(func, partial):
+        return ("partial", _func_key(func.func), normalize_key(func.args), normalize_key(func.keywords))
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return repr(func)
+    # Nilai yang ditangkap closure ikut dibandingkan
+    cells = tuple(normalize_key(c.cell_contents) for c in (func.__closure__ or ()))
+    return (func.__qualname__, _code_key(code), cells)
+
+
+def _signature(func, args, kwargs):
+    # Skrip Streamlit dieksekusi ulang setiap rerun sehingga objek fungsi
+    # selalu baru; yang dibandingkan adalah kode dan dependensinya.
+    return (_func_key(func), tuple(args), tuple(sorted(kwargs.items())))
+
+
+class DependencyGraph:
+    """Graf node bernama dengan perhitungan ulang malas dan early cutoff"""
+
+    def __init__(self):
+        self._nodes = {}
+        self.revision = 0
+        self.recomputed = []
+        self.reused = 0
+
+    def __contains__(self, name):
+        return name in self._nodes and self._nodes[name].computed
+
+    def set_input(self, name, value):
+        """Tetapkan nilai input; revisi hanya naik bila nilainya berbeda"""
+        key = normalize_key(value)
+        node = self._nodes.get(name)
+        if node is None:
+            node = self._nodes[name] = _Node()
+        elif node.func is not None:
+            raise ValueError(f"Node {name!r} adalah node turunan, bukan input")
+        elif node.computed and node.key == key:
+            node.value = value
+            return
+        self.revision += 1
+        node.value = value
+        node.key = key
+        node.changed_at = node.verified_at = self.revision
+        node.computed = True
+
+    def set_inputs(self, prefix, **values):
+        """``set_input(f"{prefix}.{nama}", nilai)`` untuk setiap pasangan"""
+        for name, value in values.items():
+            self.set_input(f"{prefix}.{name}", value)
+
+    def define(self, name, func, *args, cutoff=True, **kwargs):
+        """Daftarkan node ``name = func(*args, **kwargs)`` dengan argumen berupa nama node.
+
+        Aman dipanggil setiap rerun: node yang sudah ada dengan kode dan
+        dependensi yang sama tidak diinvalidasi. ``cutoff=False`` untuk
+        nilai yang mahal dibandingkan (mis. objek grafik).
+        """
+        signature = _signature(func, args, kwargs)
+        node = self._nodes.get(name)
+        if node is not None and node.signature == signature:
+            node.func = func
+            return
+        self._nodes[name] = _Node(func, signature, args, kwargs, cutoff)
+        # Definisi baru: node hilir harus melihatnya sebagai perubahan
+        self.revision += 1
+
+    def get(self, name):
+        """Nilai node, dihitung ulang hanya bila ada dependensi yang berubah"""
+        node = self._nodes.get(name)
+        if node is None:
+            raise KeyError(f"Node tidak dikenal: {name}")
+        self._refresh(name, node)
+        return node.value
+
+    def value(self, name, default=None):
+        """Nilai terakhir node tanpa menghitung ulang (``default`` bila belum pernah dihitung)"""
+        node = self._nodes.get(name)
+        return node.value if node is not None and node.computed else default
+
+    def _refresh(self, name, node):
+        if node.verified_at == self.revision:
+            return
+        if node.func is None:
+            if not node.computed:
+                raise KeyError(f"Input belum diisi: {name}")
+            node.verified_at = self.revision
+            return
+        stale = not node.computed
+        for dep in node.deps:
+            dep_node = self._nodes.get(dep)
+            if dep_node is None:
+                raise KeyError(f"Dependensi {dep!r} untuk {name!r} tidak dikenal")
+            self._refresh(dep, dep_node)
+            stale = stale or dep_node.changed_at > node.verified_at
+        if stale:
+            self._compute(name, node)
+        else:
+            self.reused += 1
+        node.verified_at = self.revision
+
+    def _compute(self, name, node):
+        with span(name, "graph"):
+            value = node.func(*[self._nodes[d].value for d in node.args],
+                              **{k: self._nodes[d].value for k, d in node.kwargs.items()})
+        key = normalize_key(value) if node.cutoff else None
+        if not (node.cutoff and node.computed and key == node.key):
+            node.changed_at = self.revision
+        node.value = value
+        node.key = key
+        node.computed = True
+        self.recomputed.append(name)
+
+    def begin_run(self):
+        """Kosongkan statistik; dipanggil sekali di awal setiap rerun"""
+        self.recomputed = []
+        self.reused = 0
+
+    def stats(self):
+        return {"nodes": len(self._nodes), "recomputed": len(self.recomputed), "reused": self.reused}
@@ -0,0 +1,317 @@
+"""Penggambar diagram rangkaian matplotlib dengan kerangka yang dipakai ulang.
+
+Kerangka statis (kabel, kotak hambatan, sumber, judul) digambar sekali per
+jenis diagram dan jumlah hambatan, lalu disimpan sebagai latar belakang.
+Setiap label nilai dirender ke sprite RGBA sendiri yang disimpan bersama
+teksnya; render berikutnya hanya menggambar ulang label yang teksnya berubah
+lalu menumpuk semua sprite di atas latar dengan NumPy. Potongan "tight"
+dihitung per render dari kerangka dan label sehingga label panjang tidak
+terpotong. Gambar tidak didaftarkan ke pyplot dan jumlah kerangka dibatasi
+LRU, sehingga memori tetap stabil walau rerun ribuan kali.
+"""
+
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
+from matplotlib.patches import Circle, Rectangle
+from matplotlib.transforms import Bbox
+
+DPI = 150
+
+
+class _Template:
+    """Satu gambar dengan kerangka statis dan daftar label dinamis"""
+
+    def __init__(self, figsize, draw_static):
+        self.figure = Figure(figsize=figsize, dpi=DPI)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.labels = draw_static(self.ax)
+        for label in self.labels:
+            label.set_animated(True)
+        self.lock = threading.Lock()
+        self._background = None
+        self._static_bbox = None
+        # Sprite terakhir per label: (teks, warna×alfa, 255−alfa, baris awal, kolom awal)
+        self._sprites = [None] * len(self.labels)
+
+    def render(self, texts):
+        """Gambar label ``texts`` di atas kerangka dan kembalikan PNG (bytes)"""
+        with self.lock:
+            if self._background is None:
+                # Gambar penuh sekali; label animated dilewati oleh draw()
+                self.canvas.draw()
+                self._background = np.asarray(self.canvas.buffer_rgba()).copy()
+                self._static_bbox = self._static_extent()
+
+            sprites = [self._sprite(k, text) for k, text in enumerate(texts) if text]
+            rows, cols = self._tight_crop(sprites)
+            image = self._background[rows, cols].copy()
+            for _text, premultiplied, inverse, top, left in sprites:
+                _composite(image, premultiplied, inverse, top - rows.start, left - cols.start)
+
+        buffer = BytesIO()
+        imsave(buffer, image, format="png")
+        return buffer.getvalue()
+
+    def _sprite(self, k, text):
+        """Piksel label ``k`` untuk ``text``; digambar ulang hanya bila teksnya berubah"""
+        cached = self._sprites[k]
+        if cached is not None and cached[0] == text:
+            return cached
+        label = self.labels[k]
+        label.set_text(text)
+        renderer = self.canvas.get_renderer()
+        buffer = np.asarray(self.canvas.buffer_rgba())
+        height, width = buffer.shape[:2]
+        extent = _label_extent(label, renderer)
+        top, bottom, left, right = _pixel_box(extent, height, width, pad=2)
+        # Gambar di atas area transparen: RGB = warna, alfa = cakupan (tanpa premultiply)
+        buffer[top:bottom, left:right] = 0
+        self.ax.draw_artist(label)
+        # Kotak latar (bbox) baru diposisikan saat digambar; ukur ulang sesudahnya
+        if label.get_bbox_patch() is not None:
+            extent = _label_extent(label, renderer)
+        top2, bottom2, left2, right2 = _pixel_box(extent, height, width, pad=2)
+        if (top2, bottom2, left2, right2) != (top, bottom, left, right):
+            top, bottom, left, right = (min(top, top2), max(bottom, bottom2),
+                                        min(left, left2), max(right, right2))
+            buffer[top:bottom, left:right] = 0
+            self.ax.draw_artist(label)
+        sprite = buffer[top:bottom, left:right]
+        # Buang tepi yang seluruhnya transparan
+        ink_rows = np.flatnonzero(sprite[..., 3].any(axis=1))
+        ink_cols = np.flatnonzero(sprite[..., 3].any(axis=0))
+        if ink_rows.size:
+            sprite = sprite[ink_rows[0]:ink_rows[-1] + 1, ink_cols[0]:ink_cols[-1] + 1]
+            top, left = top + int(ink_rows[0]), left + int(ink_cols[0])
+        else:
+            sprite = sprite[:0, :0]
+        alpha = sprite[..., 3:4].astype(np.uint16)
+        cached = (text, sprite[..., :3] * alpha + 127, 255 - alpha, top, left)
+        self._sprites[k] = cached
+        return cached
+
+    def _static_extent(self):
+        """Kotak (inci) kerangka statis tanpa label"""
+        renderer = self.canvas.get_renderer()
+        for label in self.labels:
+            label.set_visible(False)
+        bbox = self.figure.get_tightbbox(renderer)
+        for label in self.labels:
+            label.set_visible(True)
+        return bbox
+
+    def _tight_crop(self, sprites):
+        """Potongan piksel setara ``bbox_inches="tight"`` untuk kerangka dan label render ini"""
+        height, width = self._background.shape[:2]
+        boxes = [self._static_bbox.transformed(self.figure.dpi_scale_trans)]
+        for _text, premultiplied, _inverse, top, left in sprites:
+            h, w = premultiplied.shape[:2]
+            # Baris gambar dari atas, koordinat matplotlib dari bawah
+            boxes.append(Bbox([[left, height - top - h], [left + w, height - top]]))
+        bbox = Bbox.union(boxes).padded(0.2 * DPI)
+        x0 = max(int(bbox.x0), 0)
+        x1 = min(int(np.ceil(bbox.x1)), width)
+        y0 = max(height - int(np.ceil(bbox.y1)), 0)
+        y1 = min(height - int(bbox.y0), height)
+        return slice(y0, y1), slice(x0, x1)
+
+
+def _label_extent(label, renderer):
+    extent = label.get_window_extent(renderer)
+    patch = label.get_bbox_patch()
+    if patch is not None:
+        extent = Bbox.union([extent, patch.get_window_extent(renderer)])
+    return extent
+
+
+def _pixel_box(extent, height, width, pad):
+    """Baris/kolom piksel (atas, bawah, kiri, kanan) dari kotak tampilan matplotlib"""
+    top = max(height - int(np.ceil(extent.y1)) - pad, 0)
+    bottom = min(height - int(extent.y0) + pad, height)
+    left = max(int(extent.x0) - pad, 0)
+    right = min(int(np.ceil(extent.x1)) + pad, width)
+    return top, max(bottom, top), left, max(right, left)
+
+
+def _composite(image, premultiplied, inverse, top, left):
+    """Tumpuk sprite di atas ``image`` yang opak (operator *over*, dibulatkan)"""
+    h, w = inverse.shape[:2]
+    target = image[top:top + h, left:left + w, :3]
+    target[...] = (premultiplied + target * inverse) // 255
+
+
+class DiagramRenderer:
+    """Penggambar diagram seri, paralel, KCL, dan KVL dengan cache kerangka"""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _template(self, key, figsize, draw_static):
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                template = self._templates[key] = _Template(figsize, draw_static)
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+            return template
+
+    def __len__(self):
+        return len(self._templates)
+
+    def series(self, resistors):
+        n = len(resistors)
+        template = self._template(("series", n), (12, 4), lambda ax: _draw_series(ax, n))
+        return template.render([f'R{i+1}\n{r}Ω' for i, r in enumerate(resistors)])
+
+    def parallel(self, resistors):
+        n = len(resistors)
+        template = self._template(("parallel", n), (10, 6), lambda ax: _draw_parallel(ax, n))
+        return template.render([f'R{i+1} = {r}Ω' for i, r in enumerate(resistors)])
+
+    def kcl(self, I1, I2, I3):
+        template = self._template(("kcl",), (8, 6), _draw_kcl)
+        return template.render([
+            f'I₁ = {I1:.1f}A',
+            f'I₂ = {I2:.1f}A',
+            f'I₃ = {I3:.1f}A',
+            f'Verifikasi: {I1:.1f} = {I2:.1f} + {I3:.1f} ✓',
+        ])
+
+    def kvl(self, V_source, voltages, resistances):
+        template = self._template(("kvl",), (10, 6), _draw_kvl)
+        texts = [f'+\n{V_source:.1f}V\n−']
+        for label, V, R in zip(['R₁', 'R₂', 'R₃'], voltages, resistances):
+            texts.append(f'{label}\n{R:.1f}Ω')
+            texts.append(f'{V:.1f}V')
+        return template.render(texts)
+
+
+def _draw_series(ax, n):
+    # Gambar rangkaian seri sederhana
+    y_pos = 0.5
+    x_positions = np.linspace(0.1, 0.9, n)
+
+    # Garis penghubung
+    ax.plot([0, 1], [y_pos, y_pos], 'k-', linewidth=2)
+    ax.plot([0, 0], [0.3, 0.7], 'k-', linewidth=2)
+    ax.plot([1, 1], [0.3, 0.7], 'k-', linewidth=2)
+    ax.plot([0, 1], [0.3, 0.3], 'k-', linewidth=2)
+    ax.plot([0, 1], [0.7, 0.7], 'k-', linewidth=2)
+
+    # Hambatan
+    labels = []
+    for x in x_positions:
+        ax.add_patch(Rectangle((x-0.05, y_pos-0.05), 0.1, 0.1,
+                               fill=True, facecolor='lightblue', edgecolor='blue', linewidth=2))
+        labels.append(ax.text(x, y_pos+0.15, '', ha='center', va='center', fontsize=10, weight='bold'))
+
+    # Sumber tegangan
+    ax.add_patch(Circle((0.05, 0.5), 0.03, fill=True, facecolor='red', edgecolor='darkred'))
+    ax.text(0.05, 0.35, '+', ha='center', va='center', fontsize=12, weight='bold')
+    ax.text(0.05, 0.65, '−', ha='center', va='center', fontsize=12, weight='bold')
+
+    ax.set_xlim(-0.1, 1.1)
+    ax.set_ylim(0, 1)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('🔗 Rangkaian Hambatan Seri', fontsize=14, weight='bold')
+    return labels
+
+
+def _draw_parallel(ax, n):
+    # Garis utama
+    ax.plot([0.1, 0.9], [0.5, 0.5], 'k-', linewidth=3)
+
+    # Cabang paralel
+    labels = []
+    for y in np.linspace(0.7, 0.3, n):
+        # Garis vertikal penghubung
+        ax.plot([0.3, 0.3], [0.5, y], 'k-', linewidth=2)
+        ax.plot([0.7, 0.7], [0.5, y], 'k-', linewidth=2)
+        # Garis horizontal cabang
+        ax.plot([0.3, 0.7], [y, y], 'k-', linewidth=2)
+
+        # Kotak hambatan
+        ax.add_patch(Rectangle((0.45, y-0.03), 0.1, 0.06,
+                               fill=True, facecolor='lightgreen', edgecolor='green', linewidth=2))
+        labels.append(ax.text(0.5, y+0.1, '', ha='center', va='center', fontsize=10, weight='bold'))
+
+    # Sumber tegangan
+    ax.add_patch(Circle((0.15, 0.5), 0.04, fill=True, facecolor='red', edgecolor='darkred'))
+    ax.text(0.15, 0.45, '+', ha='center', va='center', fontsize=12, weight='bold', color='white')
+    ax.text(0.15, 0.55, '−', ha='center', va='center', fontsize=12, weight='bold', color='white')
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0.2, 0.8)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('⚡ Rangkaian Hambatan Paralel', fontsize=14, weight='bold')
+    return labels
+
+
+def _draw_kcl(ax):
+    # Titik cabang
+    center = (0.5, 0.5)
+    ax.plot(center[0], center[1], 'ko', markersize=15)
+    ax.text(center[0], center[1]-0.1, 'Node', ha='center', va='top', fontsize=12, weight='bold')
+
+    # Arus masuk (I1) dan arus keluar (I2, I3)
+    ax.arrow(0.2, 0.5, 0.25, 0, head_width=0.03, head_length=0.03, fc='green', ec='green', linewidth=3)
+    ax.arrow(0.55, 0.5, 0.25, 0, head_width=0.03, head_length=0.03, fc='red', ec='red', linewidth=3)
+    ax.arrow(0.5, 0.45, 0, -0.25, head_width=0.03, head_length=0.03, fc='blue', ec='blue', linewidth=3)
+    labels = [
+        ax.text(0.32, 0.55, '', ha='center', va='bottom', fontsize=11, weight='bold', color='green'),
+        ax.text(0.67, 0.55, '', ha='center', va='bottom', fontsize=11, weight='bold', color='red'),
+        ax.text(0.55, 0.32, '', ha='left', va='center', fontsize=11, weight='bold', color='blue'),
+    ]
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('🔄 Hukum Kirchhoff I (KCL) - Titik Cabang', fontsize=14, weight='bold')
+
+    # Verifikasi KCL
+    labels.append(ax.text(0.5, 0.1, '', ha='center', va='center', fontsize=12,
+                          bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgreen")))
+    return labels
+
+
+def _draw_kvl(ax):
+    # Kotak untuk representasi loop
+    loop_x = [0.2, 0.8, 0.8, 0.2, 0.2]
+    loop_y = [0.3, 0.3, 0.7, 0.7, 0.3]
+    ax.plot(loop_x, loop_y, 'k-', linewidth=3)
+
+    # Sumber tegangan
+    ax.add_patch(Circle((0.2, 0.5), 0.05, fill=True, facecolor='red', edgecolor='darkred'))
+    labels = [ax.text(0.1, 0.5, '', ha='center', va='center', fontsize=10, weight='bold')]
+
+    # Hambatan dan tegangan
+    for x, y in [(0.5, 0.7), (0.8, 0.5), (0.5, 0.3)]:
+        ax.add_patch(Rectangle((x-0.05, y-0.03), 0.1, 0.06,
+                               fill=True, facecolor='lightblue', edgecolor='blue', linewidth=2))
+        labels.append(ax.text(x, y+0.1, '', ha='center', va='center', fontsize=10, weight='bold'))
+        labels.append(ax.text(x, y-0.1, '', ha='center', va='center', fontsize=10, weight='bold', color='red'))
+
+    # Panah arah loop
+    ax.annotate('', xy=(0.4, 0.6), xytext=(0.35, 0.65),
+                arrowprops=dict(arrowstyle='->', lw=2, color='purple'))
+    ax.text(0.25, 0.6, 'Arah Loop', ha='center', va='center', fontsize=10, weight='bold', color='purple')
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0.1, 0.9)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('🔄 Hukum Kirchhoff II (KVL) - Analisis Loop', fontsize=14, weight='bold')
+    return labels
@@ -0,0 +1,350 @@
+"""Ekspor grafik Plotly ke PNG/SVG dengan worker kaleido yang persisten.
+
+``fig.to_image(engine="kaleido")`` memulai proses perender baru pada setiap
+panggilan. Modul ini menjaga satu perender tetap hidup di thread latar:
+
+* kaleido ≥ 1.0 — satu ``kaleido.Kaleido`` (peramban headless) dibuka
+  sekali di event loop milik thread worker,
+* kaleido 0.2 — satu ``PlotlyScope`` yang subprosesnya dipakai ulang.
+
+Hasil render disimpan di cache disk beralamat isi: nama berkas adalah
+SHA-256 dari spesifikasi JSON grafik beserta format dan ukurannya, sehingga
+grafik yang sama tidak pernah dirender dua kali, bahkan antar-proses.
+Ekspor massal ke ZIP berjalan di thread terpisah (:class:`ExportJob`)
+dan hanya dipantau oleh UI.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import zipfile
+
+FORMATS = ("png", "svg")
+
+DEFAULT_WIDTH = 1200
+DEFAULT_HEIGHT = 600
+
+# Batas ukuran cache disk; berkas terlama (mtime) dihapus lebih dulu
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+RENDER_TIMEOUT_S = 120
+
+
+def default_cache_dir():
+    """``$LISTRIK_EXPORT_CACHE`` atau ``~/.cache/listrik/export``"""
+    return os.environ.get("LISTRIK_EXPORT_CACHE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "listrik", "export")
+
+
+def figure_spec(figure):
+    """Spesifikasi JSON grafik (``go.Figure``, dict, atau teks JSON)"""
+    if isinstance(figure, str):
+        return figure
+    if isinstance(figure, dict):
+        return json.dumps(figure, sort_keys=True, default=str)
+    return figure.to_json()
+
+
+def spec_hash(spec, fmt, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, scale=1.0):
+    digest = hashlib.sha256()
+    digest.update(f"{fmt}:{width}x{height}@{float(scale):g}\n".encode())
+    digest.update(spec.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Cache berkas beralamat isi ``<dir>/<hash[:2]>/<hash>.<format>``"""
+
+    def __init__(self, directory=None, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def path(self, key, fmt):
+        return os.path.join(self.directory, key[:2], f"{key}.{fmt}")
+
+    def get(self, key, fmt):
+        try:
+            with open(self.path(key, fmt), "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, fmt, data):
+        path = self.path(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Tulis ke berkas sementara lalu ganti nama agar pembaca lain tidak
+        # pernah melihat berkas setengah jadi
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self.prune()
+
+    def prune(self):
+        """Hapus berkas terlama hingga total ukuran di bawah ``max_bytes``"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class _KaleidoEngine:
+    """kaleido ≥ 1.0: satu instans ``Kaleido`` di event loop thread worker"""
+
+    def __init__(self, kaleido):
+        self._kaleido_module = kaleido
+        self._kaleido = None
+
+    async def start(self):
+        self._kaleido = self._kaleido_module.Kaleido(n=1)
+        await self._kaleido.__aenter__()
+
+    async def render(self, spec, fmt, width, height, scale):
+        opts = {"format": fmt, "width": width, "height": height, "scale": scale}
+        return await self._kaleido.calc_fig(json.loads(spec), opts=opts)
+
+    async def close(self):
+        if self._kaleido is not None:
+            await self._kaleido.__aexit__(None, None, None)
+            self._kaleido = None
+
+
+class _ScopeEngine:
+    """kaleido 0.2: ``PlotlyScope`` menjaga subproses perender tetap hidup"""
+
+    def __init__(self, scope_class):
+        self._scope_class = scope_class
+        self._scope = None
+
+    async def start(self):
+        self._scope = self._scope_class()
+
+    async def render(self, spec, fmt, width, height, scale):
+        return self._scope.transform(json.loads(spec), format=fmt, width=width, height=height, scale=scale)
+
+    async def close(self):
+        self._scope = None
+
+
+def check_available():
+    """ImportError yang jelas bila kaleido belum terpasang"""
+    try:
+        import kaleido
+    except ImportError:
+        raise ImportError("Ekspor gambar membutuhkan paket 'kaleido'") from None
+    return kaleido
+
+
+def _engine():
+    kaleido = check_available()
+    if hasattr(kaleido, "Kaleido"):
+        return _KaleidoEngine(kaleido)
+    from kaleido.scopes.plotly import PlotlyScope
+    return _ScopeEngine(PlotlyScope)
+
+
+class RenderWorker:
+    """Thread latar dengan event loop dan perender yang dibuka sekali"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.renders = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                # Modul kaleido diperiksa di thread pemanggil agar galatnya jelas
+                engine = _engine()
+                self._thread = threading.Thread(target=self._run, args=(engine,), name="listrik-kaleido",
+                                                daemon=True)
+                self._thread.start()
+
+    def _run(self, engine):
+        asyncio.run(self._serve(engine))
+
+    async def _serve(self, engine):
+        loop = asyncio.get_running_loop()
+        started = False
+        try:
+            while True:
+                item = await loop.run_in_executor(None, self._queue.get)
+                if item is None:
+                    return
+                args, result = item
+                try:
+                    if not started:
+                        await engine.start()
+                        started = True
+                    result.put((True, await engine.render(*args)))
+                except BaseException as e:
+                    result.put((False, e))
+        finally:
+            if started:
+                await engine.close()
+
+    def render(self, spec, fmt, width, height, scale, timeout=RENDER_TIMEOUT_S):
+        self._ensure_started()
+        result = queue.Queue(maxsize=1)
+        self._queue.put(((spec, fmt, width, height, scale), result))
+        try:
+            ok, value = result.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Render grafik melebihi {timeout} s") from None
+        if not ok:
+            raise value
+        self.renders += 1
+        return value
+
+    def close(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(None)
+                self._thread.join(timeout=10)
+            self._thread = None
+
+
+class Exporter:
+    """Render grafik lewat cache disk dan satu :class:`RenderWorker` bersama"""
+
+    def __init__(self, cache_dir=None, max_bytes=CACHE_MAX_BYTES):
+        self.cache = DiskCache(cache_dir, max_bytes)
+        self.worker = RenderWorker()
+
+    def render(self, figure, fmt="png", width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, scale=1.0):
+        """Bytes gambar ``fmt`` dari grafik; dari cache bila sudah pernah dirender"""
+        if fmt not in FORMATS:
+            raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+        spec = figure_spec(figure)
+        key = spec_hash(spec, fmt, width, height, scale)
+        data = self.cache.get(key, fmt)
+        if data is None:
+            data = self.worker.render(spec, fmt, width, height, scale)
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            self.cache.put(key, fmt, data)
+        return data
+
+    def stats(self):
+        return dict(self.cache.stats(), renders=self.worker.renders)
+
+    def close(self):
+        self.worker.close()
+
+
+def _safe_name(name):
+    keep = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name))
+    return keep.strip("_") or "grafik"
+
+
+def _unique_names(names):
+    """Nama berkas aman dan unik per grafik; bentrok diberi akhiran ``_2``, ``_3``, ..."""
+    used = set()
+    stems = {}
+    for name in names:
+        base = stem = _safe_name(name)
+        k = 1
+        while stem.lower() in used:
+            k += 1
+            stem = f"{base}_{k}"
+        used.add(stem.lower())
+        stems[name] = stem
+    return stems
+
+
+class ExportJob:
+    """Ekspor massal ``{nama: grafik}`` ke ZIP di thread latar.
+
+    UI cukup membaca ``progress``, ``done``, ``error``, dan ``data`` setiap
+    rerun; ``cancel()`` menghentikan job di antara dua grafik.
+    """
+
+    def __init__(self, exporter, figures, formats=("png",), width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT,
+                 scale=1.0):
+        self.exporter = exporter
+        self.figures = dict(figures)
+        self.formats = tuple(formats)
+        self.size = (width, height, scale)
+        self.total = len(self.figures) * len(self.formats)
+        self.completed = 0
+        self.data = None
+        self.error = None
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="listrik-export", daemon=True)
+        self._thread.start()
+
+    @property
+    def progress(self):
+        return self.completed / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return not self._thread.is_alive()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+    def _run(self):
+        buffer = io.BytesIO()
+        try:
+            stems = _unique_names(self.figures)
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                for name, figure in self.figures.items():
+                    spec = figure_spec(figure)
+                    for fmt in self.formats:
+                        if self._cancel.is_set():
+                            raise InterruptedError("Ekspor dibatalkan")
+                        data = self.exporter.render(spec, fmt, *self.size)
+                        # PNG sudah terkompresi; tidak perlu dikempiskan lagi
+                        compress = zipfile.ZIP_STORED if fmt == "png" else zipfile.ZIP_DEFLATED
+                        archive.writestr(f"{stems[name]}.{fmt}", data, compress_type=compress)
+                        self.completed += 1
+            self.data = buffer.getvalue()
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.elapsed = time.perf_counter() - self.started
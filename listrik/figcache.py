@@ -0,0 +1,94 @@
+"""Cache LRU untuk grafik yang sudah dibangun.
+
+Kunci cache adalah nama fungsi pembuat grafik ditambah tuple argumen yang
+dinormalisasi, sehingga rerun dengan input yang sama (mis. hanya mengganti
+tema) langsung memakai grafik jadi tanpa membangun ulang trace.
+
+Cache dipakai bersama oleh semua sesi, jadi yang disimpan hanya spesifikasi
+JSON (tidak dapat diubah). :meth:`FigureCache.get` selalu mengembalikan
+objek grafik baru sehingga ``update_layout`` di satu sesi tidak bocor ke
+sesi lain.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Jumlah digit signifikan saat menormalkan argumen float
+KEY_PRECISION = 12
+
+
+def normalize_key(value):
+    """Ubah argumen menjadi nilai hashable yang stabil (float dibulatkan)"""
+    if isinstance(value, (bool, str, type(None))):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(f"{float(value):.{KEY_PRECISION}g}")
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_key(v) for v in value)
+    return repr(value)
+
+
+class FigureCache:
+    """Cache LRU berbatas untuk spesifikasi JSON grafik"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, builder, args, kwargs):
+        name = f"{builder.__module__}.{builder.__qualname__}"
+        return (name, normalize_key(args), normalize_key(kwargs))
+
+    def _entry(self, builder, args, kwargs):
+        key = self._key(builder, args, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Bangun di luar lock agar sesi lain tidak ikut menunggu
+        entry = {"json": builder(*args, **kwargs).to_json()}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, builder, *args, **kwargs):
+        """Salinan baru grafik ``builder(*args, **kwargs)`` dari spesifikasi di cache"""
+        import plotly.io as pio
+        return pio.from_json(self.get_json(builder, *args, **kwargs))
+
+    def get_json(self, builder, *args, **kwargs):
+        """Spesifikasi JSON Plotly dari cache, dibangun bila belum ada"""
+        return self._entry(builder, args, kwargs)["json"]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
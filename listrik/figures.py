@@ -0,0 +1,367 @@
+"""Pembuat grafik Plotly untuk setiap kalkulator (tanpa ketergantungan Streamlit)."""
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from . import core
+from .decimate import DEFAULT_WIDTH, decimate_columns, trace
+
+
+def vi_figure(R):
+    """Grafik tegangan vs arus untuk hambatan ``R``"""
+    fig = go.Figure()
+
+    I_range = np.linspace(0, 5, 100)
+    V_range = core.voltage(I_range, R)
+
+    fig.add_trace(go.Scatter(
+        x=I_range,
+        y=V_range,
+        mode='lines',
+        name=f'V = I × {R}Ω',
+        line=dict(color='#2E86AB', width=3)
+    ))
+
+    fig.update_layout(
+        title="📈 Grafik Tegangan vs Arus (Hukum Ohm)",
+        xaxis_title="Arus (A)",
+        yaxis_title="Tegangan (V)",
+        template="plotly_white",
+        height=400
+    )
+
+    return fig
+
+
+def emf_figure(emf, internal_r, current=None):
+    """Karakteristik tegangan terminal terhadap arus; titik operasi pada arus ``current``"""
+    fig = go.Figure()
+
+    # Sampai arus hubung singkat, diperpanjang bila arus operasi melewatinya
+    I_short = emf/internal_r if internal_r else 2 * (current or 1)
+    I_range = np.linspace(0, max(I_short, current or 0), 100)
+    V_terminal = core.terminal_voltage(emf, internal_r, I_range)
+
+    fig.add_trace(go.Scatter(
+        x=I_range,
+        y=V_terminal,
+        mode='lines',
+        name=f'V = {emf} - {internal_r}×I',
+        line=dict(color='#A23B72', width=3)
+    ))
+
+    # Titik operasi
+    I_op = I_range[50] if current is None else current
+    fig.add_trace(go.Scatter(
+        x=[I_op],
+        y=[core.terminal_voltage(emf, internal_r, I_op)],
+        mode='markers',
+        name='Titik Operasi',
+        marker=dict(size=10, color='red')
+    ))
+
+    fig.update_layout(
+        title="🔋 Karakteristik GGL vs Tegangan Terminal",
+        xaxis_title="Arus (A)",
+        yaxis_title="Tegangan (V)",
+        template="plotly_white",
+        height=400
+    )
+
+    return fig
+
+
+def power_time_figure(power, tariff=None, start="00:00"):
+    """Konsumsi energi dan biaya selama 24 jam untuk daya ``power`` mulai pukul ``start``"""
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Konsumsi Energi vs Waktu', 'Estimasi Biaya vs Waktu'),
+        vertical_spacing=0.1
+    )
+
+    # Selang 15 menit agar blok waktu tarif (WBP/LWBP) terlihat pada kurva biaya
+    time_hours = np.linspace(0, 24, 97)
+    energy_kwh = core.energy_kwh(power, time_hours)
+    if tariff is None:
+        cost = core.energy_cost(energy_kwh)
+    else:
+        timestamps = np.datetime64("2024-01-01T" + start) + (time_hours[1:] * 60).astype("timedelta64[m]")
+        cost = np.concatenate([[0.0], np.cumsum(tariff.price(timestamps, np.diff(energy_kwh)))])
+
+    # Grafik energi
+    fig.add_trace(
+        trace(time_hours, energy_kwh, mode='lines', name='Energi (kWh)',
+              line=dict(color='#2E86AB', width=3)),
+        row=1, col=1
+    )
+
+    # Grafik biaya
+    fig.add_trace(
+        trace(time_hours, cost, mode='lines', name='Biaya (Rp)',
+              line=dict(color='#A23B72', width=3)),
+        row=2, col=1
+    )
+
+    fig.update_layout(
+        title="📊 Analisis Konsumsi Energi dan Biaya",
+        height=500,
+        template="plotly_white"
+    )
+
+    fig.update_xaxes(title_text="Waktu (jam)", row=2, col=1)
+    fig.update_yaxes(title_text="Energi (kWh)", row=1, col=1)
+    fig.update_yaxes(title_text="Biaya (Rp)", row=2, col=1)
+
+    return fig
+
+
+def dc_vs_ac_figure(frequency, amplitude, dc_voltage, window="hann"):
+    """Perbandingan sinyal DC dan AC beserta spektrum FFT keduanya"""
+    from . import spectrum
+
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Sinyal DC', 'Sinyal AC', 'Perbandingan Amplitudo', 'Spektrum Frekuensi'),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}],
+               [{"secondary_y": False}, {"secondary_y": False}]]
+    )
+
+    # Parameter waktu; tiap panel selebar setengah grafik
+    t = np.linspace(0, 4/frequency, 1000)
+    panel = DEFAULT_WIDTH // 2
+
+    # Sinyal DC
+    dc_signal = np.full_like(t, dc_voltage)
+    fig.add_trace(
+        trace(t, dc_signal, panel, mode='lines', name='DC Signal',
+              line=dict(color='red', width=3)),
+        row=1, col=1
+    )
+
+    # Sinyal AC
+    ac_signal = amplitude * np.sin(2 * np.pi * frequency * t)
+    fig.add_trace(
+        trace(t, ac_signal, panel, mode='lines', name='AC Signal',
+              line=dict(color='blue', width=3)),
+        row=1, col=2
+    )
+
+    # Perbandingan pada grafik yang sama
+    fig.add_trace(
+        trace(t, dc_signal, panel, mode='lines', name='DC',
+              line=dict(color='red', width=2, dash='dash')),
+        row=2, col=1
+    )
+    fig.add_trace(
+        trace(t, ac_signal, panel, mode='lines', name='AC',
+              line=dict(color='blue', width=2)),
+        row=2, col=1
+    )
+
+    # Spektrum frekuensi dari rfft sinyal yang sama (4 periode, sampling koheren)
+    fs = t.size / (4 / frequency)
+    samples = np.arange(t.size) / fs
+    dc_spectrum = spectrum.periodogram(np.full(t.size, float(dc_voltage)), fs, window)
+    ac_spectrum = spectrum.periodogram(amplitude * np.sin(2 * np.pi * frequency * samples), fs, window)
+    shown = dc_spectrum.freq <= 5 * frequency
+
+    fig.add_trace(
+        go.Bar(x=dc_spectrum.freq[shown], y=dc_spectrum.amplitude[shown], name='DC Spectrum',
+               marker_color='red', opacity=0.7),
+        row=2, col=2
+    )
+    fig.add_trace(
+        go.Bar(x=ac_spectrum.freq[shown], y=ac_spectrum.amplitude[shown], name='AC Spectrum',
+               marker_color='blue', opacity=0.7),
+        row=2, col=2
+    )
+
+    fig.update_layout(
+        title="⚡ Perbandingan Karakteristik DC vs AC",
+        height=600,
+        template="plotly_white",
+        showlegend=True
+    )
+
+    # Update axes labels
+    fig.update_xaxes(title_text="Waktu (s)", row=1, col=1)
+    fig.update_xaxes(title_text="Waktu (s)", row=1, col=2)
+    fig.update_xaxes(title_text="Waktu (s)", row=2, col=1)
+    fig.update_xaxes(title_text="Frekuensi (Hz)", row=2, col=2)
+
+    fig.update_yaxes(title_text="Tegangan (V)", row=1, col=1)
+    fig.update_yaxes(title_text="Tegangan (V)", row=1, col=2)
+    fig.update_yaxes(title_text="Tegangan (V)", row=2, col=1)
+    fig.update_yaxes(title_text="Amplitudo (V)", row=2, col=2)
+
+    return fig
+
+
+def spectrum_figure(spectrum, harmonics=()):
+    """Kerapatan daya (skala log) dengan penanda fundamental dan harmonik"""
+    fig = go.Figure()
+    fig.add_trace(trace(
+        spectrum.freq[1:], spectrum.psd[1:], method="minmax", mode='lines', name='PSD',
+        line=dict(color='#2E86AB', width=1.5)
+    ))
+    if harmonics:
+        orders, freqs, amplitudes = zip(*harmonics)
+        bins = np.clip(np.round(np.array(freqs) / spectrum.df).astype(int), 1, spectrum.psd.size - 1)
+        fig.add_trace(go.Scatter(
+            x=freqs, y=spectrum.psd[bins], mode='markers+text', name='Harmonik',
+            text=[f"H{k}" for k in orders], textposition="top center",
+            marker=dict(color='#A23B72', size=8),
+            customdata=amplitudes, hovertemplate="%{x:.2f} Hz<br>%{customdata:.4g} V<extra></extra>"
+        ))
+    fig.update_layout(
+        title=f"📈 Spektrum Daya (Welch, jendela {spectrum.window_name}, {spectrum.segments} segmen)",
+        xaxis_title="Frekuensi (Hz)",
+        yaxis_title="PSD (V²/Hz)",
+        yaxis_type="log",
+        template="plotly_white",
+        height=450
+    )
+    return fig
+
+
+def waveform_figure(time, values, names, x_range=None, unit="s"):
+    """Bentuk gelombang banyak probe; dijarangkan ulang untuk rentang ``x_range``"""
+    x, columns = decimate_columns(time, values, x_range=x_range)
+    fig = go.Figure()
+    for k, name in enumerate(names):
+        fig.add_trace(trace(x, columns[:, k], width=x.size, mode='lines', name=name))
+    fig.update_layout(
+        xaxis_title=f"Waktu ({unit})",
+        yaxis_title="Nilai (V / A)",
+        template="plotly_white",
+        height=450,
+        hovermode="x unified"
+    )
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    return fig
+
+
+def tolerance_histogram_figure(edges, counts, name, nominal, percentiles, spec=None):
+    """Histogram Monte Carlo dengan garis nominal, persentil, dan batas spesifikasi"""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+        name=name, marker_color='#2E86AB', opacity=0.8
+    ))
+    fig.add_vline(x=nominal, line_dash="solid", line_color="#F18F01", annotation_text="nominal")
+    for q, value in percentiles.items():
+        fig.add_vline(x=value, line_dash="dot", line_color="#A23B72", annotation_text=f"p{q:g}")
+    if spec is not None:
+        for value in spec:
+            fig.add_vline(x=value, line_dash="dash", line_color="red")
+    fig.update_layout(
+        title=f"🎲 Distribusi {name}",
+        xaxis_title=name,
+        yaxis_title="Jumlah percobaan",
+        template="plotly_white",
+        bargap=0,
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+def sweep_figure(result, output, labels, kind="contour", level=None, operating_point=None, show_grid=False):
+    """Hasil sapuan parameter: garis (1 sumbu), kontur, atau permukaan (2 sumbu).
+
+    ``labels`` memetakan nama masukan/keluaran ke label sumbu;
+    ``operating_point`` berupa dict nilai masukan saat ini.
+    """
+    axes = result.axes
+    z = result.values[output]
+    fig = go.Figure()
+    if len(axes) == 1:
+        x = result.coords[0]
+        fig.add_trace(trace(x, z, mode='lines+markers' if show_grid else 'lines', name=labels[output],
+                            line=dict(color='#2E86AB', width=3), marker=dict(size=4)))
+        if level is not None:
+            fig.add_hline(y=level, line_dash="dash", line_color="#F18F01")
+        if operating_point is not None:
+            x_op = operating_point[axes[0].name]
+            fig.add_trace(go.Scatter(x=[x_op], y=[np.interp(x_op, x, z)], mode='markers',
+                                     name='Titik Operasi', marker=dict(size=10, color='red')))
+        fig.update_xaxes(title_text=labels[axes[0].name], type="log" if axes[0].log else None)
+        fig.update_yaxes(title_text=labels[output])
+    elif kind == "surface":
+        fig.add_trace(go.Surface(x=result.coords[0], y=result.coords[1], z=z, colorscale="Viridis",
+                                 colorbar=dict(title=labels[output])))
+        fig.update_layout(scene=dict(
+            xaxis=dict(title=labels[axes[0].name], type="log" if axes[0].log else None),
+            yaxis=dict(title=labels[axes[1].name], type="log" if axes[1].log else None),
+            zaxis=dict(title=labels[output]),
+        ))
+    else:
+        fig.add_trace(go.Contour(x=result.coords[0], y=result.coords[1], z=z, colorscale="Viridis",
+                                 colorbar=dict(title=labels[output]), contours=dict(showlabels=True)))
+        if level is not None:
+            fig.add_trace(go.Contour(x=result.coords[0], y=result.coords[1], z=z, showscale=False,
+                                     contours=dict(type="constraint", operation="=", value=level),
+                                     line=dict(color="#F18F01", width=3), name=f"{labels[output]} = {level:g}"))
+        if show_grid:
+            # Koordinat grid hasil penghalusan sebagai tanda di tepi: rapat di daerah yang diminati
+            x, y = result.coords
+            fig.add_trace(go.Scatter(x=x, y=np.full(x.size, y[0]), mode='markers', name='Grid x',
+                                     marker=dict(symbol='line-ns-open', size=8, color='black')))
+            fig.add_trace(go.Scatter(x=np.full(y.size, x[0]), y=y, mode='markers', name='Grid y',
+                                     marker=dict(symbol='line-ew-open', size=8, color='black')))
+        if operating_point is not None:
+            fig.add_trace(go.Scatter(x=[operating_point[axes[0].name]], y=[operating_point[axes[1].name]],
+                                     mode='markers', name='Titik Operasi',
+                                     marker=dict(size=12, color='red', symbol='x')))
+        fig.update_xaxes(title_text=labels[axes[0].name], type="log" if axes[0].log else None)
+        fig.update_yaxes(title_text=labels[axes[1].name], type="log" if axes[1].log else None)
+    fig.update_layout(
+        title=f"🧭 Sapuan {labels[output]}",
+        template="plotly_white",
+        height=550 if kind == "surface" and len(axes) == 2 else 450
+    )
+    return fig
+
+
+def pack_discharge_figure(time_h, voltage, current, x_range=None):
+    """Tegangan terminal dan arus paket selama pengosongan (dua sumbu y), dijarangkan"""
+    x, columns = decimate_columns(time_h, np.column_stack([voltage, current]), x_range=x_range)
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(trace(x, columns[:, 0], width=x.size, mode='lines', name='Tegangan terminal (V)',
+                        line=dict(color='#2E86AB', width=2)), secondary_y=False)
+    fig.add_trace(trace(x, columns[:, 1], width=x.size, mode='lines', name='Arus (A)',
+                        line=dict(color='#F18F01', width=2)), secondary_y=True)
+    fig.update_layout(
+        title="🔋 Pengosongan Paket Baterai",
+        xaxis_title="Waktu (jam)",
+        template="plotly_white",
+        height=420,
+        hovermode="x unified"
+    )
+    fig.update_yaxes(title_text="Tegangan (V)", secondary_y=False)
+    fig.update_yaxes(title_text="Arus (A)", secondary_y=True)
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    return fig
+
+
+def pack_cells_figure(soc):
+    """Peta panas SoC akhir setiap sel (baris = grup seri, kolom = sel paralel)"""
+    fig = go.Figure(go.Heatmap(
+        z=np.asarray(soc) * 100,
+        colorscale="RdYlGn",
+        zmin=0,
+        zmax=100,
+        colorbar=dict(title="SoC (%)"),
+        hovertemplate="grup %{y}, sel %{x}<br>SoC %{z:.1f}%<extra></extra>"
+    ))
+    fig.update_layout(
+        title="🧩 SoC Akhir per Sel",
+        xaxis_title="Sel paralel",
+        yaxis_title="Grup seri",
+        template="plotly_white",
+        height=420
+    )
+    return fig
@@ -0,0 +1,313 @@
+"""Job perhitungan latar dengan progres, pembatalan, dan cache hasil per input.
+
+Perhitungan berat (Monte Carlo toleransi, simulasi paket baterai, ...) tidak
+lagi berjalan di thread skrip Streamlit. :class:`JobRunner` menjalankannya
+di ``ThreadPoolExecutor`` bersama; NumPy melepas GIL pada operasi besar, dan
+thread (bukan proses) memungkinkan progres dan hasil dibaca langsung tanpa
+serialisasi. Pustaka yang butuh proses (``tolerance.monte_carlo``) tetap
+membuka pool prosesnya sendiri di dalam job.
+
+Setiap job punya ID yang dapat disimpan di ``session_state`` sehingga UI
+menemukannya kembali setelah rerun. Kunci job adalah hash SHA-256 dari nama
+dan argumennya: job dengan input sama yang sedang berjalan dipakai bersama,
+dan hasil yang sudah selesai diambil dari cache LRU tanpa dihitung ulang.
+
+Fungsi job menerima argumen kata kunci ``progress(fraksi, teks=None)``.
+Pembatalan bersifat kooperatif: ``progress`` melempar :class:`Cancelled`
+setelah semua pelanggan memanggil :meth:`Job.cancel`, sehingga perhitungan
+berhenti pada titik lapor progres berikutnya tanpa perubahan lain di
+pustaka. Sesi yang berbagi perhitungan tidak saling membatalkan.
+"""
+
+import hashlib
+import itertools
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "antre", "berjalan", "selesai", "gagal", "dibatalkan"
+
+DEFAULT_WORKERS = 2
+
+# Jumlah hasil selesai yang disimpan (LRU)
+CACHE_ENTRIES = 32
+
+# Job selesai yang masih dapat dicari menurut ID
+HISTORY = 64
+
+# Melindungi jumlah pelanggan per perhitungan
+_SUBSCRIBERS = threading.Lock()
+
+
+class Cancelled(InterruptedError):
+    """Job dibatalkan oleh pengguna"""
+
+
+def input_hash(name, args=(), kwargs=None):
+    """SHA-256 stabil dari nama job dan argumennya; array NumPy di-hash dari isinya"""
+    digest = hashlib.sha256(str(name).encode("utf-8"))
+    _update(digest, args)
+    _update(digest, sorted((kwargs or {}).items()))
+    return digest.hexdigest()
+
+
+def _update(digest, value):
+    if isinstance(value, np.ndarray):
+        digest.update(f"nd{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}(".encode())
+        for item in value:
+            _update(digest, item)
+        digest.update(b")")
+    elif isinstance(value, dict):
+        _update(digest, sorted(value.items()))
+    elif isinstance(value, (str, bytes, int, float, bool, type(None))):
+        digest.update(repr(value).encode("utf-8"))
+    else:
+        # Objek lain (jaringan, paket baterai) di-hash dari isi pickle-nya
+        digest.update(type(value).__qualname__.encode())
+        digest.update(pickle.dumps(value, protocol=4))
+
+
+class _Task:
+    """Satu perhitungan bersama untuk semua :class:`Job` dengan input yang sama"""
+
+    def __init__(self, key, name):
+        self.key = key
+        self.name = name
+        self.status = PENDING
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.submitted = time.perf_counter()
+        self.elapsed = None
+        self.subscribers = 0
+        self.future = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def done(self):
+        return self._finished.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def report(self, fraction, message=None):
+        """Callback progres untuk fungsi job; melempar :class:`Cancelled` bila dibatalkan"""
+        if self._cancel.is_set():
+            raise Cancelled(f"Job {self.name} dibatalkan")
+        if fraction is not None:
+            self.progress = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def _finish(self, status):
+        self.status = status
+        self.elapsed = time.perf_counter() - self.submitted
+        if status == DONE:
+            self.progress = 1.0
+        self._finished.set()
+
+
+class Job:
+    """Pegangan satu pemanggil atas perhitungan bersama.
+
+    UI membaca ``status``, ``progress``, ``message``, ``result``, ``error``.
+    Beberapa sesi dengan input sama berbagi satu perhitungan, tetapi setiap
+    sesi punya pegangannya sendiri: :meth:`cancel` hanya membatalkan
+    pegangan ini, dan perhitungan baru dihentikan setelah semua pelanggannya
+    membatalkan.
+    """
+
+    def __init__(self, job_id, task, cached=False):
+        self.id = job_id
+        self.cached = cached
+        self._task = task
+        self._cancelled = False
+
+    @property
+    def key(self):
+        return self._task.key
+
+    @property
+    def name(self):
+        return self._task.name
+
+    @property
+    def status(self):
+        return CANCELLED if self._cancelled else self._task.status
+
+    @property
+    def progress(self):
+        return self._task.progress
+
+    @property
+    def message(self):
+        return self._task.message
+
+    @property
+    def result(self):
+        return None if self._cancelled else self._task.result
+
+    @property
+    def error(self):
+        return None if self._cancelled else self._task.error
+
+    @property
+    def elapsed(self):
+        return self._task.elapsed
+
+    @property
+    def done(self):
+        return self._cancelled or self._task.done
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """Lepaskan pegangan ini; perhitungan berhenti bila tidak ada pelanggan lain"""
+        task = self._task
+        with _SUBSCRIBERS:
+            if self._cancelled or task.done:
+                return
+            self._cancelled = True
+            task.subscribers -= 1
+            if task.subscribers <= 0:
+                task._cancel.set()
+
+    def wait(self, timeout=None):
+        return self._cancelled or self._task._finished.wait(timeout)
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.name}, {self.status}, {self.progress:.0%})"
+
+
+class JobRunner:
+    """Pool thread bersama, daftar job menurut ID, dan cache hasil menurut hash input"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, cache_entries=CACHE_ENTRIES, history=HISTORY):
+        self.workers = workers
+        self.cache_entries = cache_entries
+        self.history = history
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="listrik-job")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def submit(self, name, func, *args, **kwargs):
+        """Jalankan ``func(*args, progress=..., **kwargs)`` di latar; kembalikan :class:`Job`.
+
+        Bila hasil untuk input yang sama sudah ada di cache, job langsung
+        selesai; bila perhitungan yang sama masih berjalan, pegangan baru
+        ikut berlangganan ke perhitungan itu.
+        """
+        key = input_hash(name, args, kwargs)
+        with self._lock:
+            job_id = f"{next(self._ids):04d}-{key[:8]}"
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                task = _Task(key, name)
+                task.result = self._cache[key]
+                task._finish(DONE)
+                job = Job(job_id, task, cached=True)
+                self._remember(job)
+                return job
+            with _SUBSCRIBERS:
+                task = self._active.get(key)
+                shared = task is not None and not task.cancelled
+                if not shared:
+                    task = _Task(key, name)
+                task.subscribers += 1
+            job = Job(job_id, task)
+            self._remember(job)
+            if shared:
+                return job
+            self.misses += 1
+            self._active[key] = task
+        task.future = self._pool.submit(self._run, task, func, args, kwargs)
+        return job
+
+    def _run(self, task, func, args, kwargs):
+        try:
+            task.report(None)
+            task.status = RUNNING
+            task.result = func(*args, progress=task.report, **kwargs)
+        except Cancelled:
+            task._finish(CANCELLED)
+        except BaseException as e:
+            task.error = e
+            task._finish(FAILED)
+        else:
+            with self._lock:
+                self._cache[task.key] = task.result
+                self._cache.move_to_end(task.key)
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+            task._finish(DONE)
+        finally:
+            with self._lock:
+                if self._active.get(task.key) is task:
+                    del self._active[task.key]
+
+    def _remember(self, job):
+        self._jobs[job.id] = job
+        # Buang job selesai terlama; job yang masih berjalan tidak pernah dibuang
+        for old_id in list(self._jobs):
+            if len(self._jobs) <= self.history:
+                break
+            if self._jobs[old_id].done:
+                del self._jobs[old_id]
+
+    def get(self, job_id):
+        """Job menurut ID (mis. dari ``session_state``); ``None`` bila sudah terbuang"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cached(self, name, *args, **kwargs):
+        """Hasil tersimpan untuk input ini tanpa menjalankan apa pun; ``None`` bila belum ada"""
+        key = input_hash(name, args, kwargs)
+        with self._lock:
+            if key not in self._cache:
+                return None
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def stats(self):
+        with self._lock:
+            running = sum(1 for task in self._active.values() if task.status == RUNNING)
+            return {
+                "workers": self.workers,
+                "running": running,
+                "queued": len(self._active) - running,
+                "cached": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            tasks = list(self._active.values())
+        for task in tasks:
+            task._cancel.set()
+            # Batalkan antrean sendiri; cancel_futures baru ada sejak Python 3.9
+            if task.future is not None and task.future.cancel():
+                task._finish(CANCELLED)
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,145 @@
+"""Pembangkit beban untuk :mod:`listrik.api`.
+
+Membuka ``concurrency`` koneksi keep-alive dan mengirim ``requests``
+permintaan ``POST`` berisi ``batch`` titik kerja acak, lalu melaporkan
+p50/p99 latensi, permintaan per detik, dan titik per detik. Hanya memakai
+asyncio dan soket mentah, sehingga dapat dijalankan tanpa dependensi lain::
+
+    python -m listrik.loadgen --endpoint /ohm --requests 2000 --batch 1000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from .api import DEFAULT_HOST, DEFAULT_PORT
+
+
+def _round(a):
+    return np.round(a, 3).tolist()
+
+
+def make_payload(endpoint, batch, seed=0):
+    """Payload kolumnar acak berisi ``batch`` titik untuk ``endpoint``"""
+    rng = np.random.default_rng(seed)
+    V = rng.uniform(1, 240, batch)
+    I = rng.uniform(0.01, 40, batch)
+    R = rng.uniform(1, 1000, batch)
+    if endpoint == "/ohm":
+        return {"V": _round(V), "R": _round(R)}
+    if endpoint == "/power":
+        return {"V": _round(V), "I": _round(I), "t_hours": 8}
+    if endpoint == "/emf":
+        return {"emf": _round(V), "r": _round(rng.uniform(0.01, 2, batch)), "I": _round(rng.uniform(0, 5, batch))}
+    if endpoint == "/efficiency":
+        return {"V": _round(V), "I": _round(I)}
+    if endpoint in ("/kvl", "/resistors"):
+        payload = {"resistors": _round(rng.uniform(1, 1000, (batch, 3)))}
+        if endpoint == "/kvl":
+            payload["V"] = _round(V)
+        return payload
+    if endpoint == "/kcl":
+        return {"currents_in": _round(rng.uniform(0, 5, (batch, 2))),
+                "currents_out": _round(rng.uniform(0, 5, (batch, 3)))}
+    if endpoint == "/cable":
+        return {"length": _round(rng.uniform(5, 200, batch)), "current": _round(I),
+                "section": rng.choice([1.5, 2.5, 4, 6, 10], batch).tolist()}
+    if endpoint == "/synth":
+        return {"targets": _round(R[:batch]), "series": "E24", "max_parts": 3}
+    raise ValueError(f"Tidak ada payload bawaan untuk {endpoint}")
+
+
+def _request(host, path, body):
+    head = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def run(host=DEFAULT_HOST, port=DEFAULT_PORT, endpoint="/ohm", requests=1000, concurrency=16, batch=100,
+              seed=0):
+    """Jalankan beban dan kembalikan ringkasan latensi dan throughput"""
+    message = _request(host, endpoint, json.dumps(make_payload(endpoint, batch, seed)).encode("utf-8"))
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                writer.write(message)
+                await writer.drain()
+                status = await _read_response(reader)
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start
+    values = np.asarray(latencies) * 1000
+    p50, p99 = np.percentile(values, [50, 99]) if values.size else (np.nan, np.nan)
+    return {
+        "endpoint": endpoint,
+        "requests": len(latencies),
+        "errors": errors,
+        "batch": batch,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "p50_ms": float(p50),
+        "p99_ms": float(p99),
+        "requests_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "points_per_s": len(latencies) * batch / elapsed if elapsed else 0.0,
+    }
+
+
+def format_report(report):
+    return (f"{report['endpoint']}: {report['requests']} permintaan × {report['batch']} titik, "
+            f"{report['concurrency']} koneksi, {report['errors']} galat\n"
+            f"  p50 {report['p50_ms']:.2f} ms  p99 {report['p99_ms']:.2f} ms  "
+            f"{report['requests_per_s']:.1f} permintaan/s  {report['points_per_s']:.0f} titik/s")
+
+
+def add_arguments(parser):
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--endpoint", default="/ohm", help="Endpoint yang diuji (bawaan /ohm)")
+    parser.add_argument("--requests", type=int, default=1000, help="Jumlah permintaan")
+    parser.add_argument("--concurrency", type=int, default=16, help="Jumlah koneksi serentak")
+    parser.add_argument("--batch", type=int, default=100, help="Titik kerja per permintaan")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m listrik.loadgen", description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args.host, args.port, args.endpoint, args.requests, args.concurrency, args.batch,
+                             args.seed))
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
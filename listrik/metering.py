@@ -0,0 +1,260 @@
+"""Pemrosesan log meter energi berukuran besar secara bertahap (streaming).
+
+Log (timestamp, V, I, dan opsional kolom perangkat) dibaca per potongan
+(chunk) sehingga memori tetap terbatas berapa pun ukuran berkasnya. Energi
+diintegrasikan dengan metode trapesium per perangkat; titik terakhir setiap
+perangkat dibawa ke potongan berikutnya agar tidak ada selang yang hilang
+di batas potongan. Beban puncak dihitung sebagai rata-rata daya tertinggi
+dalam selang permintaan (default 15 menit). Biaya dihitung per selang
+dengan :class:`~listrik.tariff.Tariff`, termasuk blok waktu dan tingkat
+kumulatif per periode tagihan yang juga dibawa antarpotongan.
+"""
+
+import os
+
+import pandas as pd
+
+from . import core
+from .profiling import traced
+from .tariff import Tariff
+
+CHUNK_ROWS = 200_000
+
+COLUMN_ALIASES = {
+    "timestamp": ("timestamp", "waktu", "time", "datetime", "tanggal"),
+    "device": ("device", "perangkat", "meter", "meter_id", "id"),
+    "V": ("v", "voltage", "tegangan"),
+    "I": ("i", "current", "arus"),
+}
+
+DEFAULT_DEVICE = "semua"
+
+
+def detect_columns(columns):
+    """Petakan nama kolom berkas ke ``timestamp``, ``device``, ``V``, ``I``"""
+    lookup = {str(c).strip().lower(): c for c in columns}
+    mapping = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lookup:
+                mapping[lookup[alias]] = key
+                break
+    missing = {"timestamp", "V", "I"} - set(mapping.values())
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(sorted(missing))}")
+    return mapping
+
+
+def read_csv_chunks(source, chunk_rows=CHUNK_ROWS):
+    """Generator potongan DataFrame dari CSV beserta perkiraan progres (0–1)"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from read_csv_chunks(f, chunk_rows)
+        return
+    total = _size(source)
+    with pd.read_csv(source, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk, _position(source, total)
+
+
+def read_excel_chunks(source, chunk_rows=CHUNK_ROWS):
+    """Generator potongan DataFrame dari XLSX (openpyxl read-only) beserta progres"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total_rows = max((sheet.max_row or 1) - 1, 1)
+        rows = sheet.iter_rows(values_only=True)
+        header = list(next(rows))
+        batch = []
+        done = 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                done += len(batch)
+                yield pd.DataFrame(batch, columns=header), min(done / total_rows, 1.0)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header), 1.0
+    finally:
+        workbook.close()
+
+
+def read_chunks(source, name="", chunk_rows=CHUNK_ROWS):
+    """Pilih pembaca sesuai ekstensi berkas (``.xlsx`` atau CSV)"""
+    if str(name or getattr(source, "name", source)).lower().endswith((".xlsx", ".xlsm")):
+        return read_excel_chunks(source, chunk_rows)
+    return read_csv_chunks(source, chunk_rows)
+
+
+class MeterAggregator:
+    """Akumulator energi, biaya, dan beban puncak per perangkat"""
+
+    def __init__(self, demand_interval="15min", tariff=core.TARIFF_RP_PER_KWH, max_gap=None):
+        """``tariff`` berupa :class:`Tariff` atau angka Rp/kWh (tarif tetap)"""
+        self.demand_interval = pd.Timedelta(demand_interval)
+        self.tariff = tariff if isinstance(tariff, Tariff) else Tariff.flat(tariff)
+        self.max_gap = pd.Timedelta(max_gap) if max_gap is not None else None
+        self.rows = 0
+        self._mapping = None
+        self._totals = None
+        # Titik terakhir per perangkat dan selang permintaan yang masih terbuka
+        self._last = None
+        self._open_bins = None
+        # Pemakaian kumulatif per (perangkat, periode tagihan) untuk tarif bertingkat
+        self._period_kwh = None
+
+    def update(self, chunk):
+        """Tambahkan satu potongan log mentah"""
+        if self._mapping is None:
+            self._mapping = detect_columns(chunk.columns)
+        df = chunk.rename(columns=self._mapping)[list(self._mapping.values())]
+        if "device" not in df:
+            df["device"] = DEFAULT_DEVICE
+        df["device"] = df["device"].astype(str)
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        df = df.dropna(subset=["timestamp", "V", "I"])
+        df = df.sort_values(["device", "timestamp"], kind="stable")
+        if df.empty:
+            return
+        self.rows += len(df)
+
+        P = core.power_vi(df["V"].astype(float), df["I"].astype(float))
+
+        # Integrasi trapesium; titik pertama tiap perangkat memakai titik terakhir potongan sebelumnya
+        grouped = pd.DataFrame({"device": df["device"], "timestamp": df["timestamp"], "P": P})
+        prev_ts = grouped.groupby("device")["timestamp"].shift(1)
+        prev_P = grouped.groupby("device")["P"].shift(1)
+        if self._last is not None:
+            first = prev_ts.isna()
+            carried = self._last.reindex(grouped.loc[first, "device"])
+            prev_ts[first] = carried["timestamp"].to_numpy()
+            prev_P[first] = carried["P"].to_numpy()
+
+        dt = grouped["timestamp"] - prev_ts
+        hours = dt.dt.total_seconds() / 3600
+        valid = hours.notna() & (hours >= 0)
+        if self.max_gap is not None:
+            valid &= dt <= self.max_gap
+        energy_wh = ((grouped["P"] + prev_P.astype(float)) / 2 * hours).where(valid, 0.0)
+        cost = self._price(grouped, energy_wh / 1000)
+
+        summary = pd.DataFrame({
+            "readings": grouped.groupby("device").size(),
+            "energy_wh": energy_wh.groupby(grouped["device"]).sum(),
+            "cost": cost.groupby(grouped["device"]).sum(),
+            "peak_power_w": grouped.groupby("device")["P"].max(),
+            "first": grouped.groupby("device")["timestamp"].min(),
+            "last": grouped.groupby("device")["timestamp"].max(),
+        })
+        self._merge_totals(summary)
+
+        last_rows = grouped.groupby("device").tail(1).set_index("device")[["timestamp", "P"]]
+        if self._last is not None:
+            last_rows = pd.concat([self._last[~self._last.index.isin(last_rows.index)], last_rows])
+        self._last = last_rows
+
+        self._update_demand(grouped)
+
+    def _merge_totals(self, summary):
+        if self._totals is None:
+            self._totals = summary.assign(peak_demand_w=0.0)
+            return
+        totals = self._totals.reindex(self._totals.index.union(summary.index))
+        summary = summary.reindex(totals.index)
+        self._totals = pd.DataFrame({
+            "readings": totals["readings"].fillna(0) + summary["readings"].fillna(0),
+            "energy_wh": totals["energy_wh"].fillna(0) + summary["energy_wh"].fillna(0),
+            "cost": totals["cost"].fillna(0) + summary["cost"].fillna(0),
+            "peak_power_w": pd.concat([totals["peak_power_w"], summary["peak_power_w"]], axis=1).max(axis=1),
+            "first": pd.concat([totals["first"], summary["first"]], axis=1).min(axis=1),
+            "last": pd.concat([totals["last"], summary["last"]], axis=1).max(axis=1),
+            "peak_demand_w": totals["peak_demand_w"].fillna(0),
+        })
+
+    def _price(self, grouped, kwh):
+        """Biaya tiap selang; kumulatif periode dilanjutkan dari potongan sebelumnya"""
+        timestamps = grouped["timestamp"].to_numpy()
+        by = [grouped["device"].to_numpy(), self.tariff.period_labels(timestamps)]
+        cumulative = kwh.groupby(by).cumsum().to_numpy()
+        totals = kwh.groupby(by).sum()
+        if self._period_kwh is not None:
+            carried = self._period_kwh.reindex(pd.MultiIndex.from_arrays(by))
+            cumulative = cumulative + carried.fillna(0).to_numpy()
+            totals = totals.add(self._period_kwh, fill_value=0)
+        self._period_kwh = totals
+        cost = self.tariff.interval_cost(timestamps, cumulative, kwh.to_numpy())
+        return pd.Series(cost, index=grouped.index)
+
+    def _update_demand(self, grouped):
+        bins = grouped.assign(bin=grouped["timestamp"].dt.floor(self.demand_interval))
+        sums = bins.groupby(["device", "bin"])["P"].agg(["sum", "count"])
+        if self._open_bins is not None:
+            sums = pd.concat([self._open_bins, sums]).groupby(level=[0, 1]).sum()
+
+        # Selang terakhir tiap perangkat mungkin berlanjut di potongan berikutnya
+        latest = sums.reset_index().groupby("device")["bin"].transform("max").to_numpy()
+        is_open = sums.index.get_level_values("bin").to_numpy() == latest
+        closed = sums[~is_open]
+        self._open_bins = sums[is_open]
+        self._record_demand(closed)
+
+    def _record_demand(self, closed):
+        if closed.empty:
+            return
+        demand = (closed["sum"] / closed["count"]).groupby(level="device").max()
+        current = self._totals["peak_demand_w"].reindex(demand.index).fillna(0)
+        self._totals.loc[demand.index, "peak_demand_w"] = pd.concat([current, demand], axis=1).max(axis=1)
+
+    def result(self):
+        """Ringkasan per perangkat: kWh, biaya, daya puncak, dan beban puncak"""
+        if self._totals is None:
+            return pd.DataFrame(columns=["readings", "energy_kwh", "cost", "peak_power_w",
+                                         "peak_demand_w", "first", "last"])
+        if self._open_bins is not None:
+            self._record_demand(self._open_bins)
+            self._open_bins = None
+        totals = self._totals.copy()
+        totals["energy_kwh"] = totals["energy_wh"] / 1000
+        # Abonemen dikenakan sekali per periode tagihan yang muncul di log
+        periods = self._period_kwh.groupby(level=0).size().reindex(totals.index).fillna(0)
+        totals["cost"] = totals["cost"] + periods * self.tariff.fixed_charge
+        totals["readings"] = totals["readings"].astype(int)
+        return totals[["readings", "energy_kwh", "cost", "peak_power_w", "peak_demand_w", "first", "last"]]
+
+
+@traced(category="hitung")
+def process_meter_log(source, name="", chunk_rows=CHUNK_ROWS, progress=None, **options):
+    """Proses seluruh log secara bertahap; ``progress(fraksi, baris)`` dipanggil per potongan"""
+    aggregator = MeterAggregator(**options)
+    for chunk, fraction in read_chunks(source, name, chunk_rows):
+        aggregator.update(chunk)
+        if progress is not None:
+            progress(fraction, aggregator.rows)
+    return aggregator.result()
+
+
+def to_excel_bytes(frames):
+    """Tulis dict ``{nama_sheet: DataFrame}`` ke XLSX dalam memori"""
+    from io import BytesIO
+
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for sheet, frame in frames.items():
+            frame.to_excel(writer, sheet_name=sheet)
+    return buffer.getvalue()
+
+
+def _size(source):
+    if hasattr(source, "size"):
+        return source.size
+    position = source.tell()
+    source.seek(0, 2)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+
+def _position(source, total):
+    return min(source.tell() / total, 1.0) if total else 1.0
@@ -0,0 +1,429 @@
+"""Reduksi jaringan hambatan seri–paralel bertingkat dari ekspresi teks.
+
+Contoh ekspresi: ``(R1 + (R2 || R3 || R4)) || R5``. Operator ``+`` berarti
+seri dan ``||`` paralel (``||`` mengikat lebih kuat daripada ``+``). Daun
+dapat berupa nama hambatan yang nilainya diberikan terpisah atau angka
+langsung (``4.7k``).
+
+Pohon disimpan sebagai array datar (tanpa rekursi) sehingga ekspresi dengan
+jutaan daun tetap dapat diproses. Parsing tervektorisasi: kedalaman kurung
+dari ``cumsum``, lalu setiap operator diberi kunci presedensi dan induknya
+adalah operator lebih lemah terdekat (nearest smaller value lewat sparse
+table). Reduksi bawah-ke-atas per level kedalaman memakai penjumlahan
+terkompensasi (Neumaier / ``math.fsum``), dan pembagian arus atas-ke-bawah
+memakai pointer jumping.
+"""
+
+import itertools
+import math
+import re
+
+import numpy as np
+
+from .circuit import parse_value
+from .profiling import traced
+
+LEAF, SERIES, PARALLEL = 0, 1, 2
+
+# Grup dengan anak lebih banyak dari ini dijumlahkan dengan math.fsum
+FSUM_THRESHOLD = 64
+
+# Bila rata-rata node internal per level di bawah ini, reduksi dilakukan
+# node demi node (lebih murah daripada overhead NumPy per level)
+SEQUENTIAL_WIDTH = 32
+
+_OPERAND_TOKEN = re.compile(r"([A-Za-z_][A-Za-z0-9_]*|[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?[A-Za-z]*)")
+_OPERAND, _OPEN, _CLOSE, _PLUS, _BAR = 0, 1, 2, 3, 4
+# Kerangka ekspresi: operand → "a", "||" → "/"; karakter lain tidak dikenal (-1)
+_SKELETON = {"a": _OPERAND, "(": _OPEN, ")": _CLOSE, "+": _PLUS, "/": _BAR}
+_CLASS_OF_BYTE = np.full(256, -1, dtype=np.int8)
+_CLASS_OF_BYTE[[ord(c) for c in _SKELETON]] = list(_SKELETON.values())
+_SYMBOL = {_OPEN: "(", _CLOSE: ")", _PLUS: "+", _BAR: "||"}
+
+
+class Network:
+    """Pohon jaringan seri–paralel dalam bentuk array datar.
+
+    Node diberi nomor pasca-urut (anak selalu bernomor lebih kecil dari
+    induknya); node terakhir adalah akar.
+    """
+
+    def __init__(self, kind, parent, value, labels, rank=None):
+        self.kind = np.asarray(kind, dtype=np.int8)
+        self.parent = np.asarray(parent, dtype=np.int64)
+        self.value = np.asarray(value, dtype=float)
+        self.labels = labels
+        self.root = self.kind.size - 1
+
+        # Daftar anak format CSR, dikelompokkan per induk sesuai urutan ekspresi
+        has_parent = self.parent >= 0
+        child_ids = np.flatnonzero(has_parent)
+        key = self.parent[child_ids]
+        if rank is not None:
+            rank = np.asarray(rank, dtype=np.int64)[child_ids]
+            key = key * (int(rank.max(initial=0)) + 1) + rank
+        order = np.argsort(key, kind="stable")
+        self.children = child_ids[order]
+        self.child_ptr = np.zeros(self.kind.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.parent[child_ids], minlength=self.kind.size),
+                  out=self.child_ptr[1:])
+
+        self.depth = _depths(self.parent)
+        self.resistance = self._reduce()
+
+    @property
+    def size(self):
+        return self.kind.size
+
+    @property
+    def n_leaves(self):
+        return int(np.count_nonzero(self.kind == LEAF))
+
+    @property
+    def equivalent_resistance(self):
+        return float(self.resistance[self.root])
+
+    def child_nodes(self, node):
+        return self.children[self.child_ptr[node]:self.child_ptr[node + 1]]
+
+    def _reduce(self):
+        """Hambatan ekivalen setiap node, dari level terdalam ke akar"""
+        R = self.value.copy()
+        internal = np.flatnonzero(self.kind != LEAF)
+        if internal.size == 0:
+            return R
+
+        order = internal[np.argsort(self.depth[internal], kind="stable")[::-1]]
+        depths = self.depth[order]
+        bounds = np.flatnonzero(np.diff(depths, prepend=depths[0] + 1)).tolist() + [order.size]
+        if internal.size < SEQUENTIAL_WIDTH * (len(bounds) - 1):
+            return self._reduce_sequential(R, internal)
+
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            groups = order[start:end]
+            series = groups[self.kind[groups] == SERIES]
+            parallel = groups[self.kind[groups] == PARALLEL]
+            if series.size:
+                R[series] = self._group_sums(series, R)
+            if parallel.size:
+                with np.errstate(divide="ignore"):
+                    conductance = self._group_sums(parallel, 1.0 / R)
+                    R[parallel] = 1.0 / conductance
+        return R
+
+    def _reduce_sequential(self, R, internal):
+        """Reduksi node demi node untuk pohon dalam dan sempit (mis. tangga).
+
+        Nomor pasca-urut menjamin semua anak sudah tereduksi sebelum induknya.
+        """
+        R = R.tolist()
+        kind = self.kind.tolist()
+        children = self.children.tolist()
+        ptr = self.child_ptr.tolist()
+        for node in internal.tolist():
+            kids = children[ptr[node]:ptr[node + 1]]
+            if kind[node] == SERIES:
+                R[node] = math.fsum([R[k] for k in kids])
+            else:
+                conductance = math.fsum([1.0 / R[k] for k in kids])
+                R[node] = 1.0 / conductance if conductance else math.inf
+        return np.array(R)
+
+    def _group_sums(self, groups, values):
+        """Jumlah terkompensasi nilai anak untuk setiap grup"""
+        starts = self.child_ptr[groups]
+        counts = self.child_ptr[groups + 1] - starts
+        sums = np.zeros(groups.size)
+
+        big = np.flatnonzero(counts > FSUM_THRESHOLD)
+        for g in big.tolist():
+            sums[g] = math.fsum(values[self.children[starts[g]:starts[g] + counts[g]]])
+
+        # Grup kecil: Neumaier tervektorisasi per urutan anak
+        small = counts <= FSUM_THRESHOLD
+        if not small.any():
+            return sums
+        if small.sum() < 8:
+            for g in np.flatnonzero(small).tolist():
+                sums[g] = math.fsum(values[self.children[starts[g]:starts[g] + counts[g]]])
+            return sums
+
+        comp = np.zeros(groups.size)
+        for rank in range(int(counts[small].max())):
+            g = np.flatnonzero(small & (counts > rank))
+            x = values[self.children[starts[g] + rank]]
+            s = sums[g]
+            t = s + x
+            comp[g] += np.where(np.abs(s) >= np.abs(x), (s - t) + x, (x - t) + s)
+            sums[g] = t
+        return sums + comp
+
+    @traced(category="hitung")
+    def analyze(self, voltage=None, current=None):
+        """Arus, tegangan, dan daya setiap node untuk sumber pada akar.
+
+        Berikan salah satu: ``voltage`` (V) atau ``current`` (A) total.
+        """
+        R_root = self.resistance[self.root]
+        if current is None:
+            if voltage is None:
+                raise ValueError("Berikan tegangan atau arus total")
+            current = voltage / R_root if R_root != 0 else 0.0
+
+        # Rasio arus anak/induk: 1 untuk seri, R_induk / R_anak untuk paralel
+        ratio = np.ones(self.size)
+        has_parent = self.parent >= 0
+        par_child = has_parent.copy()
+        par_child[has_parent] = self.kind[self.parent[has_parent]] == PARALLEL
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio[par_child] = self.resistance[self.parent[par_child]] / self.resistance[par_child]
+        ratio = np.nan_to_num(ratio, nan=0.0, posinf=0.0)
+
+        I = current * _path_products(self.parent, ratio)
+        with np.errstate(invalid="ignore"):
+            V = np.nan_to_num(I * self.resistance)
+        return {"current": I, "voltage": V, "power": V * I}
+
+    def describe(self, node, max_length=60):
+        """Teks ekspresi sub-pohon ``node``, dipotong bila terlalu panjang"""
+        parts = []
+        length = 0
+        stack = [node]
+        while stack and length <= max_length:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+                length += len(item)
+                continue
+            if self.kind[item] == LEAF:
+                parts.append(self.labels[item])
+                length += len(self.labels[item])
+                continue
+            op = " + " if self.kind[item] == SERIES else " || "
+            children = self.child_nodes(item).tolist()
+            sequence = ["("]
+            for k, child in enumerate(children):
+                if k:
+                    sequence.append(op)
+                sequence.append(child)
+            sequence.append(")")
+            stack.extend(reversed(sequence))
+        text = "".join(parts)
+        if node == self.root and text.startswith("(") and not stack:
+            text = text[1:-1]
+        if stack or len(text) > max_length:
+            text = text[:max_length] + "…"
+        return text
+
+
+@traced(category="hitung")
+def parse_expression(expression, values=None):
+    """Ubah ekspresi seri–paralel menjadi :class:`Network`.
+
+    ``values`` memetakan nama daun ke hambatan (Ω); daun berupa angka
+    dibaca langsung. Semua hambatan harus positif.
+    """
+    # Tokenisasi tanpa loop Python: satu kali split memisahkan operand dari
+    # teks di antaranya; operand diganti penanda "a" dan setiap byte kerangka
+    # dipetakan ke kelas token lewat tabel
+    parts = _OPERAND_TOKEN.split(expression)
+    leaf_tokens = parts[1::2]
+    skeleton = "".join("a".join(parts[::2]).replace("||", "/").split())
+    cls = _CLASS_OF_BYTE[np.frombuffer(skeleton.encode("ascii", "replace"), dtype=np.uint8)]
+    if (cls < 0).any():
+        raise ValueError("Ekspresi mengandung karakter yang tidak dikenal")
+    if not cls.size:
+        raise ValueError("Ekspresi kosong atau diakhiri operator")
+    depth = _check_grammar(cls, leaf_tokens)
+    value = _leaf_values(leaf_tokens, values)
+    m = len(leaf_tokens)
+    if m == 1:
+        return Network([LEAF], [-1], value, leaf_tokens)
+
+    # Operator ke-j selalu berada di antara daun j dan j + 1. Kunci presedensi:
+    # makin dalam kurungnya dan || (lebih kuat dari +) → makin jauh dari akar.
+    ops = np.flatnonzero((cls == _PLUS) | (cls == _BAR))
+    op_kind = np.where(cls[ops] == _PLUS, SERIES, PARALLEL).astype(np.int8)
+    key = (2 * depth[ops] + (op_kind == PARALLEL)).astype(np.int32)
+    n_ops = key.size
+    index = np.arange(n_ops)
+
+    left_table = _min_table(key)
+    right_table = _min_table(key[::-1])
+    left_le = _nearest_lower(left_table, key, strict=False)
+    left = _nearest_lower(left_table, key)
+    right = _nearest_lower(right_table, key[::-1])[::-1]
+    right = np.where(right >= 0, n_ops - 1 - right, -1)
+
+    # Operator berkunci sama tanpa operator lebih lemah di antaranya membentuk satu grup n-ary
+    same = (left_le >= 0) & (key[np.maximum(left_le, 0)] == key)
+    group = _jump(np.where(same, left_le, index))
+    first = group == index
+
+    # Induk grup: operator lebih lemah terdekat yang mengikat lebih kuat (kunci lebih besar)
+    key_left = np.where(left >= 0, key[np.maximum(left, 0)], -1)
+    key_right = np.where(right >= 0, key[np.maximum(right, 0)], -1)
+    parent_op = np.where(key_left >= key_right, left, right)
+    parent_group = np.where(parent_op >= 0, group[np.maximum(parent_op, 0)], -1)
+
+    # Grup dengan operator sama seperti induknya digabung ke induk, juga menembus kurung
+    merge = first & (parent_group >= 0) & (op_kind[np.maximum(parent_group, 0)] == op_kind)
+    final = _jump(np.where(merge, parent_group, group))
+    internal = np.flatnonzero(first & ~merge)
+    lo = np.where(left[internal] >= 0, left[internal] + 1, 0)
+    hi = np.where(right[internal] >= 0, right[internal], m - 1)
+
+    node_of_op = np.full(n_ops, -1, dtype=np.int64)
+    node_of_op[internal] = m + np.arange(internal.size)
+    leaf_index = np.arange(m)
+    before = np.clip(leaf_index - 1, 0, n_ops - 1)
+    after = np.minimum(leaf_index, n_ops - 1)
+    leaf_op = np.where(key[before] >= key[after], before, after)
+    leaf_op[0], leaf_op[-1] = 0, n_ops - 1
+    internal_parent = parent_op[internal]
+    parent = np.concatenate([
+        node_of_op[final[leaf_op]],
+        np.where(internal_parent >= 0, node_of_op[final[np.maximum(internal_parent, 0)]], -1),
+    ])
+
+    # Nomor pasca-urut: urut menurut daun terakhir, lalu rentang terpendek (anak sebelum induk)
+    end = np.concatenate([leaf_index, hi])
+    span = np.concatenate([np.ones(m, dtype=np.int64), hi - lo + 1])
+    order = np.lexsort((span, end))
+    new_id = np.empty(order.size, dtype=np.int64)
+    new_id[order] = np.arange(order.size)
+    parent = parent[order]
+    parent = np.where(parent >= 0, new_id[np.maximum(parent, 0)], -1)
+    kind = np.concatenate([np.full(m, LEAF, dtype=np.int8), op_kind[internal]])[order]
+    rank = np.concatenate([leaf_index, lo])[order]
+    value = np.concatenate([value, np.full(internal.size, np.nan)])[order]
+    names = leaf_tokens + ["Seri" if k == SERIES else "Paralel" for k in op_kind[internal].tolist()]
+    labels = [names[k] for k in order.tolist()]
+    return Network(kind, parent, value, labels, rank)
+
+
+def _check_grammar(cls, leaf_tokens):
+    """Validasi urutan token secara tervektorisasi; kembalikan kedalaman kurung per token"""
+    is_open, is_close, is_operand = cls == _OPEN, cls == _CLOSE, cls == _OPERAND
+    is_op = (cls == _PLUS) | (cls == _BAR)
+    # Sesudah operand atau ')' diharapkan operator; selain itu diharapkan operand
+    expect = np.ones(cls.size, dtype=bool)
+    expect[1:] = ~(is_operand | is_close)[:-1]
+    depth = np.cumsum(is_open.astype(np.int64) - is_close)
+    checks = (
+        (is_open & ~expect, lambda t: "Operator hilang sebelum '('"),
+        (is_close & expect, lambda t: "Ekspresi kosong di dalam kurung"),
+        (is_close & (depth < 0), lambda t: "Kurung tutup tanpa pasangan"),
+        (is_op & expect, lambda t: f"Operand hilang sebelum {t!r}"),
+        (is_operand & ~expect, lambda t: f"Operator hilang sebelum {t!r}"),
+    )
+    bad = np.zeros(cls.size, dtype=bool)
+    for mask, _message in checks:
+        bad |= mask
+    if bad.any():
+        k = int(np.argmax(bad))
+        message = next(message for mask, message in checks if mask[k])
+        token = leaf_tokens[int(is_operand[:k].sum())] if is_operand[k] else _SYMBOL[int(cls[k])]
+        raise ValueError(message(token))
+    if is_op[-1] or is_open[-1]:
+        raise ValueError("Ekspresi kosong atau diakhiri operator")
+    if depth[-1] > 0:
+        raise ValueError("Kurung buka tanpa pasangan")
+    return depth
+
+
+def _leaf_values(leaf_tokens, values):
+    """Hambatan setiap daun: dari ``values`` atau dibaca sebagai angka (sekali per token unik)"""
+    values = values or {}
+    count = len(leaf_tokens)
+    value = np.fromiter(map(values.get, leaf_tokens, itertools.repeat(math.nan)), dtype=float, count=count)
+    unresolved = np.flatnonzero(np.isnan(value))
+    if unresolved.size:
+        tokens = [leaf_tokens[k] for k in unresolved.tolist()]
+        parsed = {}
+        for token in dict.fromkeys(tokens):
+            if token in values:
+                parsed[token] = float(values[token])
+            elif token[0].isdigit() or token[0] == ".":
+                parsed[token] = parse_value(token)
+            else:
+                raise ValueError(f"Nilai untuk {token!r} belum didefinisikan")
+        value[unresolved] = np.fromiter(map(parsed.__getitem__, tokens), dtype=float, count=len(tokens))
+    bad = ~(value > 0)
+    if bad.any():
+        k = int(np.argmax(bad))
+        raise ValueError(f"Hambatan {leaf_tokens[k]} harus positif (diberikan {float(value[k])})")
+    return value
+
+
+def _min_table(key):
+    """Sparse table: ``table[l][i] = min(key[i : i + 2**l])``"""
+    table = [key]
+    while 2 ** len(table) <= key.size:
+        half = 2 ** (len(table) - 1)
+        table.append(np.minimum(table[-1][:-half], table[-1][half:]))
+    return table
+
+
+def _nearest_lower(table, key, strict=True):
+    """Indeks terdekat di kiri dengan kunci < (atau ≤ bila ``strict=False``); -1 bila tidak ada"""
+    pos = np.arange(key.size)
+    for level in range(len(table) - 1, -1, -1):
+        width = 2 ** level
+        start = pos - width
+        ok = start >= 0
+        block = table[level][np.maximum(start, 0)]
+        skip = ok & (block >= key if strict else block > key)
+        pos = np.where(skip, start, pos)
+    return pos - 1
+
+
+def _jump(pointer):
+    """Titik tetap rantai ``pointer`` (akar setiap rantai) via pointer jumping"""
+    while True:
+        following = pointer[pointer]
+        if np.array_equal(following, pointer):
+            return pointer
+        pointer = following
+
+
+def parse_definitions(text):
+    """Pisahkan baris ``nama = nilai`` dan baris ekspresi dari teks/berkas"""
+    values = {}
+    expression = []
+    for raw in text.splitlines():
+        line = raw.split("#")[0].strip()
+        if not line:
+            continue
+        if "=" in line:
+            name, value = line.split("=", 1)
+            values[name.strip()] = parse_value(value)
+        else:
+            expression.append(line)
+    return " ".join(expression), values
+
+
+def _depths(parent):
+    """Kedalaman tiap node via pointer jumping (O(n log kedalaman))"""
+    depth = (parent >= 0).astype(np.int64)
+    jump = parent.copy()
+    active = np.flatnonzero(jump >= 0)
+    while active.size:
+        target = jump[active]
+        depth[active] += depth[target]
+        jump[active] = jump[target]
+        active = active[jump[active] >= 0]
+    return depth
+
+
+def _path_products(parent, factor):
+    """Perkalian ``factor`` dari node sampai akar (inklusif), via pointer jumping"""
+    product = factor.copy()
+    jump = parent.copy()
+    active = np.flatnonzero(jump >= 0)
+    while active.size:
+        target = jump[active]
+        product[active] *= product[target]
+        jump[active] = jump[target]
+        active = active[jump[active] >= 0]
+    return product
@@ -0,0 +1,171 @@
+"""Instrumentasi waktu per rerun: rentang bersarang, trace Chrome, dan cProfile.
+
+Sebuah :class:`Tracer` diaktifkan untuk thread yang sedang berjalan (thread
+skrip Streamlit). Selama aktif, setiap :func:`span` atau fungsi berdekorator
+:func:`traced` mencatat waktu mulai, durasi, dan waktu *self* (durasi
+dikurangi rentang anak). Tanpa tracer aktif, ``span`` hanya memeriksa satu
+atribut thread-local sehingga instrumentasi boleh tetap terpasang. Fungsi
+hitung utama di paket ini (``Circuit.solve``, ``synthesize``, ``welch``,
+dll.) berdekorator ``traced`` dengan kategori ``"hitung"`` sehingga waktu
+perhitungan terpisah dari pembuatan grafik dan render Streamlit.
+
+Hasil dapat diringkas per nama rentang atau diekspor sebagai JSON *trace
+event* Chrome (buka di ``chrome://tracing`` atau Perfetto). cProfile dapat
+dipasang untuk satu rerun saja lewat ``Tracer(profile=True)``.
+"""
+
+import functools
+import io
+import os
+import threading
+import time
+
+_local = threading.local()
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "tracer", "start", "child")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.tracer = None
+
+    def __enter__(self):
+        tracer = getattr(_local, "tracer", None)
+        if tracer is not None:
+            self.tracer = tracer
+            self.child = 0
+            tracer._stack.append(self)
+            self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        tracer = self.tracer
+        if tracer is None:
+            return False
+        duration = time.perf_counter_ns() - self.start
+        tracer._stack.pop()
+        if tracer._stack:
+            tracer._stack[-1].child += duration
+        tracer.events.append((self.name, self.category, self.start - tracer.origin, duration,
+                              duration - self.child, len(tracer._stack), self.args))
+        self.tracer = None
+        return False
+
+
+def span(name, category="app", **args):
+    """Context manager yang mencatat rentang ``name`` pada tracer aktif"""
+    return _Span(name, category, args or None)
+
+
+def traced(name=None, category="app"):
+    """Dekorator: setiap panggilan fungsi menjadi satu rentang"""
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "tracer", None) is None:
+                return func(*args, **kwargs)
+            with _Span(label, category, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class Tracer:
+    """Perekam rentang untuk satu rerun (atau satu blok kode)"""
+
+    def __init__(self, profile=False):
+        self.events = []  # (nama, kategori, mulai_ns, durasi_ns, self_ns, kedalaman, args)
+        self._stack = []
+        self.origin = time.perf_counter_ns()
+        self.wall_start = time.time()
+        self.elapsed_ns = None
+        self.thread_id = threading.get_ident()
+        self._previous = None
+        self.profiler = None
+        self.profile = profile
+        self.running = False
+
+    def start(self):
+        self._previous = getattr(_local, "tracer", None)
+        _local.tracer = self
+        self.origin = time.perf_counter_ns()
+        self.wall_start = time.time()
+        self.running = True
+        if self.profile:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        return self
+
+    def stop(self):
+        if not self.running:
+            return self
+        if self.profiler is not None:
+            self.profiler.disable()
+        # Tutup rentang yang masih terbuka (mis. rerun dihentikan pengecualian)
+        while self._stack:
+            self._stack[-1].__exit__(None, None, None)
+        self.elapsed_ns = time.perf_counter_ns() - self.origin
+        _local.tracer = self._previous
+        self.running = False
+        return self
+
+    __enter__ = start
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    @property
+    def elapsed(self):
+        """Durasi total (detik); hingga sekarang bila tracer masih berjalan"""
+        ns = self.elapsed_ns if self.elapsed_ns is not None else time.perf_counter_ns() - self.origin
+        return ns / 1e9
+
+    def summary(self):
+        """Daftar ``(nama, kategori, jumlah, total_s, self_s)`` terurut menurut waktu self"""
+        totals = {}
+        for name, category, _, duration, self_ns, depth, _ in self.events:
+            entry = totals.setdefault((name, category), [0, 0, 0])
+            entry[0] += 1
+            entry[1] += duration
+            entry[2] += self_ns
+        rows = [(name, category, count, total / 1e9, own / 1e9)
+                for (name, category), (count, total, own) in totals.items()]
+        return sorted(rows, key=lambda row: -row[4])
+
+    def chrome_trace(self):
+        """Dict trace-event Chrome (fase ``X``, satuan µs)"""
+        pid = os.getpid()
+        events = [{
+            "name": "rerun", "cat": "rerun", "ph": "X", "ts": 0.0,
+            "dur": self.elapsed * 1e6, "pid": pid, "tid": self.thread_id,
+        }]
+        for name, category, start, duration, _, _, args in self.events:
+            event = {"name": name, "cat": category, "ph": "X", "ts": start / 1e3,
+                     "dur": duration / 1e3, "pid": pid, "tid": self.thread_id}
+            if args:
+                event["args"] = {k: str(v) for k, v in args.items()}
+            events.append(event)
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"wall_start": self.wall_start},
+        }
+
+    def profile_stats(self, limit=40, sort="cumulative"):
+        """Laporan teks pstats (None bila cProfile tidak dipasang)"""
+        if self.profiler is None:
+            return None
+        import pstats
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=buffer)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return buffer.getvalue()
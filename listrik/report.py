@@ -0,0 +1,189 @@
+"""Laporan analisis rangkaian ke XLSX (banyak sheet) dan PDF.
+
+Laporan dikumpulkan dari tiga jenis isi:
+
+* nilai — daftar ``(besaran, nilai, satuan)`` per bagian (masukan, hasil),
+* tabel — header dan baris; baris boleh berupa fungsi yang mengembalikan
+  iterator sehingga ribuan titik sapuan tidak pernah disimpan di memori,
+* gambar — PNG grafik hasil :mod:`listrik.export`.
+
+XLSX ditulis dengan mode *write-only* openpyxl: setiap baris langsung
+dialirkan ke berkas sementara sheet, bukan disimpan sebagai objek sel.
+PDF dibuat dengan ``PdfPages`` matplotlib; tabel panjang hanya dicetak
+sebagian (:data:`PDF_TABLE_ROWS`) dan selebihnya dirujuk ke XLSX.
+"""
+
+import datetime
+import io
+from itertools import islice
+
+PDF_TABLE_ROWS = 40
+
+# Baris teks per halaman ringkasan PDF (A4 potret)
+PDF_LINES_PER_PAGE = 58
+
+A4_INCHES = (8.27, 11.69)
+
+_SHEET_FORBIDDEN = set('[]:*?/\\')
+
+
+def _sheet_title(name, used):
+    title = "".join("_" if c in _SHEET_FORBIDDEN else c for c in str(name)).strip() or "Sheet"
+    title = title[:31]
+    base, n = title, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+def _format(value):
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return "" if value is None else str(value)
+
+
+class Report:
+    """Kumpulan nilai, tabel, dan gambar yang ditulis ke XLSX atau PDF"""
+
+    def __init__(self, title="Laporan Analisis Rangkaian", created=None):
+        self.title = title
+        self.created = created or datetime.datetime.now()
+        self.sections = []  # (judul, [(besaran, nilai, satuan)])
+        self.tables = []    # (nama, header, baris atau fungsi → iterator, jumlah baris)
+        self.images = []    # (nama, bytes PNG)
+
+    def add_values(self, section, rows):
+        self.sections.append((section, [tuple(row) + ("",) * (3 - len(row)) for row in rows]))
+
+    def add_table(self, name, headers, rows, count=None):
+        """``rows`` berupa urutan baris atau fungsi tanpa argumen yang mengembalikan iterator.
+
+        ``count`` (bila diketahui) menghindari iterasi ulang seluruh baris
+        hanya untuk mencetak jumlahnya di PDF.
+        """
+        if count is None and hasattr(rows, "__len__"):
+            count = len(rows)
+        self.tables.append((name, list(headers), rows, count))
+
+    def add_image(self, name, png):
+        self.images.append((name, png))
+
+    @staticmethod
+    def _rows(rows):
+        return rows() if callable(rows) else iter(rows)
+
+    def write_xlsx(self, target):
+        """Tulis workbook ke ``target`` (path atau objek berkas biner)"""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+
+        workbook = Workbook(write_only=True)
+        used = set()
+        bold = Font(bold=True)
+
+        def header(sheet, values):
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(sheet, value=value)
+                cell.font = bold
+                cells.append(cell)
+            sheet.append(cells)
+
+        summary = workbook.create_sheet(_sheet_title("Ringkasan", used))
+        title = WriteOnlyCell(summary, value=self.title)
+        title.font = Font(bold=True, size=14)
+        summary.append([title])
+        summary.append(["Dibuat", self.created.strftime("%Y-%m-%d %H:%M:%S")])
+        for section, rows in self.sections:
+            summary.append([])
+            header(summary, [section, "Nilai", "Satuan"])
+            for label, value, unit in rows:
+                summary.append([label, value, unit])
+
+        for name, headers, rows, _ in self.tables:
+            sheet = workbook.create_sheet(_sheet_title(name, used))
+            header(sheet, headers)
+            for row in self._rows(rows):
+                sheet.append(list(row))
+
+        if self.images:
+            from openpyxl.drawing.image import Image
+
+            sheet = workbook.create_sheet(_sheet_title("Grafik", used))
+            # Judul lalu gambar; satu blok 32 baris (±600 piksel) per grafik
+            for k, (name, png) in enumerate(self.images):
+                image = Image(io.BytesIO(png))
+                image.anchor = f"A{k * 32 + 2}"
+                sheet.add_image(image)
+                sheet.append([name])
+                for _ in range(31):
+                    sheet.append([])
+        workbook.save(target)
+
+    def to_xlsx_bytes(self):
+        buffer = io.BytesIO()
+        self.write_xlsx(buffer)
+        return buffer.getvalue()
+
+    def _summary_lines(self):
+        lines = [(self.title, "title"), (f"Dibuat {self.created:%Y-%m-%d %H:%M:%S}", "text"), ("", "text")]
+        for section, rows in self.sections:
+            lines.append((section, "heading"))
+            width = max((len(str(label)) for label, _, _ in rows), default=0)
+            for label, value, unit in rows:
+                lines.append((f"  {str(label).ljust(width)}  {_format(value)} {unit}".rstrip(), "text"))
+            lines.append(("", "text"))
+        for name, headers, rows, count in self.tables:
+            lines.append((name, "heading"))
+            iterator = self._rows(rows)
+            table = [headers] + [[_format(v) for v in row] for row in islice(iterator, PDF_TABLE_ROWS)]
+            if count is None:
+                count = len(table) - 1 + sum(1 for _ in iterator)
+            widths = [max(len(str(r[i])) for r in table) for i in range(len(headers))]
+            for row in table:
+                lines.append(("  " + "  ".join(str(v).rjust(w) for v, w in zip(row, widths)), "text"))
+            if count > PDF_TABLE_ROWS:
+                lines.append((f"  … {count - PDF_TABLE_ROWS:,} baris lagi; lihat laporan XLSX", "text"))
+            lines.append(("", "text"))
+        return lines
+
+    def write_pdf(self, target):
+        """Tulis PDF ke ``target`` (path atau objek berkas biner)"""
+        # Figure langsung, tanpa pyplot: tidak menyentuh backend global atau state-nya
+        from matplotlib.backends.backend_pdf import PdfPages
+        from matplotlib.figure import Figure
+        from matplotlib.image import imread
+
+        styles = {
+            "title": {"fontsize": 15, "fontweight": "bold"},
+            "heading": {"fontsize": 11, "fontweight": "bold"},
+            "text": {"fontsize": 8, "family": "monospace"},
+        }
+        lines = self._summary_lines()
+        with PdfPages(target) as pdf:
+            for start in range(0, len(lines), PDF_LINES_PER_PAGE):
+                fig = Figure(figsize=A4_INCHES)
+                for k, (text, style) in enumerate(lines[start:start + PDF_LINES_PER_PAGE]):
+                    fig.text(0.07, 0.95 - k * 0.0155, text, va="top", **styles[style])
+                pdf.savefig(fig)
+
+            for name, png in self.images:
+                fig = Figure(figsize=A4_INCHES[::-1])
+                ax = fig.add_axes([0.03, 0.03, 0.94, 0.88])
+                ax.imshow(imread(io.BytesIO(png), format="png"))
+                ax.axis("off")
+                fig.suptitle(name, fontsize=12)
+                pdf.savefig(fig)
+
+            info = pdf.infodict()
+            info["Title"] = self.title
+            info["CreationDate"] = self.created
+
+    def to_pdf_bytes(self):
+        buffer = io.BytesIO()
+        self.write_pdf(buffer)
+        return buffer.getvalue()
@@ -0,0 +1,305 @@
+"""Mesin aturan analisis efisiensi untuk banyak rangkaian sekaligus.
+
+Setiap aturan berupa ambang sederhana (``kolom operator ambang``) dengan
+tingkat keparahan. Kumpulan aturan dikompilasi sekali menjadi daftar
+(kolom, ufunc, ambang, bit) lalu dievaluasi per potongan baris sebagai
+mask boolean NumPy; tidak ada perulangan Python per baris.
+
+Hasil per baris disimpan ringkas:
+
+* ``mask`` — bit ke-``k`` menyala bila aturan ke-``k`` terpicu (semua
+  aturan tercatat, tidak ada yang saling menimpa),
+* ``severity`` — tingkat keparahan tertinggi yang terpicu,
+* ``primary`` — indeks aturan teratas menurut (keparahan, urutan aturan).
+
+Teks aturan baru dibentuk saat baris tertentu ditampilkan, sehingga 10 juta
+baris cukup beberapa array integer. Evaluasi dapat diberi batas waktu;
+potongan yang belum sempat dievaluasi dilaporkan lewat ``complete``.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+from .profiling import traced
+
+SEVERITIES = ("info", "warning", "critical")
+
+SEVERITY_COLORS = {"info": "green", "warning": "orange", "critical": "red"}
+
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+# Kolom turunan yang dihitung bila tidak ada di data
+DERIVED = {
+    "P": (("V", "I"), np.multiply),
+    "R": (("V", "I"), np.divide),
+}
+
+CHUNK_ROWS = 1_000_000
+
+# Batas jumlah aturan: satu bit per aturan pada mask uint64
+MAX_RULES = 64
+
+DEFAULT_RULES = [
+    {"name": "daya_tinggi", "column": "P", "op": ">", "threshold": 1000, "severity": "warning",
+     "rating": "Tinggi", "message": "⚠️ Konsumsi daya tinggi",
+     "recommendation": "Pertimbangkan penggunaan komponen dengan rating daya lebih tinggi"},
+    {"name": "tegangan_lebih", "column": "V", "op": ">", "threshold": 240, "severity": "critical",
+     "rating": "Overload", "message": "🚨 Tegangan melebihi batas normal",
+     "recommendation": "Periksa spesifikasi tegangan maksimum komponen"},
+    {"name": "arus_tinggi", "column": "I", "op": ">", "threshold": 10, "severity": "warning",
+     "rating": "Arus Tinggi", "message": "⚠️ Arus tinggi - risiko panas berlebih",
+     "recommendation": "Gunakan kabel dengan diameter lebih besar"},
+]
+
+
+class Rule:
+    """Satu aturan ambang ``column op threshold``"""
+
+    def __init__(self, name, column, op, threshold, severity="warning", rating="", message="",
+                 recommendation=""):
+        if op not in OPERATORS:
+            raise ValueError(f"Operator tidak dikenal pada aturan {name!r}: {op}")
+        if severity not in SEVERITIES:
+            raise ValueError(f"Keparahan tidak dikenal pada aturan {name!r}: {severity}")
+        self.name = name
+        self.column = column
+        self.op = op
+        self.threshold = float(threshold)
+        self.severity = severity
+        self.rating = rating or name
+        self.message = message or f"{column} {op} {self.threshold:g}"
+        self.recommendation = recommendation
+
+    @property
+    def level(self):
+        return SEVERITIES.index(self.severity)
+
+    @classmethod
+    def from_dict(cls, spec):
+        try:
+            return cls(**spec)
+        except TypeError as e:
+            raise ValueError(f"Spesifikasi aturan tidak valid: {e}") from None
+
+    def __repr__(self):
+        return f"Rule({self.name}: {self.column} {self.op} {self.threshold:g}, {self.severity})"
+
+
+class RuleSet:
+    """Kumpulan aturan terkompilasi yang dievaluasi atas DataFrame pembacaan"""
+
+    def __init__(self, rules):
+        self.rules = [r if isinstance(r, Rule) else Rule.from_dict(r) for r in rules]
+        if len(self.rules) > MAX_RULES:
+            raise ValueError(f"Maksimal {MAX_RULES} aturan, diberikan {len(self.rules)}")
+        # Peringkat: keparahan menurun lalu urutan aturan; dievaluasi dari
+        # peringkat terendah agar ``primary`` akhirnya berisi aturan teratas.
+        self.ranking = sorted(range(len(self.rules)), key=lambda k: (-self.rules[k].level, k))
+        self._compiled = [(k, self.rules[k].column, OPERATORS[self.rules[k].op], self.rules[k].threshold,
+                           np.uint64(1 << k), np.int8(self.rules[k].level))
+                          for k in reversed(self.ranking)]
+        self.columns = sorted({r.column for r in self.rules})
+
+    def _evaluate_chunk(self, frame, mask, severity, primary):
+        cache = {}
+        hit = np.empty(mask.size, dtype=bool)
+        for k, column, ufunc, threshold, bit, level in self._compiled:
+            ufunc(_column(frame, column, cache), threshold, out=hit)
+            np.bitwise_or(mask, bit, out=mask, where=hit)
+            np.maximum(severity, level, out=severity, where=hit)
+            np.copyto(primary, k, where=hit)
+
+    def evaluate(self, frame, budget_s=None, chunk_rows=CHUNK_ROWS):
+        """:class:`RuleReport` untuk setiap baris ``frame`` (DataFrame atau dict array).
+
+        ``budget_s`` membatasi waktu evaluasi; potongan setelah batas waktu
+        habis tidak dievaluasi dan ``report.complete`` bernilai False.
+        """
+        n = len(frame) if hasattr(frame, "columns") else len(next(iter(frame.values())))
+        mask = np.zeros(n, dtype=np.uint64)
+        severity = np.full(n, -1, dtype=np.int8)
+        primary = np.full(n, -1, dtype=np.int16)
+        deadline = None if budget_s is None else time.perf_counter() + budget_s
+        columns = {c: _values(frame, c) for c in self._needed(frame)}
+        evaluated = 0
+        for start in range(0, n, chunk_rows):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            stop = min(start + chunk_rows, n)
+            part = {c: values[start:stop] for c, values in columns.items()}
+            self._evaluate_chunk(part, mask[start:stop], severity[start:stop], primary[start:stop])
+            evaluated = stop
+        return RuleReport(self, mask, severity, primary, evaluated)
+
+    def evaluate_chunks(self, chunks, budget_s=None, progress=None):
+        """Evaluasi iterator potongan DataFrame (mis. dari :func:`listrik.metering.read_chunks`)"""
+        deadline = None if budget_s is None else time.perf_counter() + budget_s
+        reports = []
+        complete = True
+        for item in chunks:
+            chunk, fraction = item if isinstance(item, tuple) else (item, None)
+            if deadline is not None and time.perf_counter() > deadline:
+                complete = False
+                break
+            reports.append(self.evaluate(chunk))
+            if progress is not None:
+                progress(fraction, sum(r.rows for r in reports))
+        return RuleReport.concat(self, reports, complete)
+
+    def _needed(self, frame):
+        needed = set()
+        for column in self.columns:
+            if column in frame or column not in DERIVED:
+                needed.add(column)
+            else:
+                needed.update(DERIVED[column][0])
+        missing = [c for c in needed if c not in frame]
+        if missing:
+            raise ValueError(f"Kolom untuk aturan tidak ditemukan: {', '.join(sorted(missing))}")
+        return needed
+
+
+def _values(frame, column):
+    values = frame[column]
+    return values.to_numpy(dtype=float, copy=False) if hasattr(values, "to_numpy") else np.asarray(values, dtype=float)
+
+
+def _column(part, column, cache):
+    if column in part:
+        return part[column]
+    if column not in cache:
+        (a, b), ufunc = DERIVED[column]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cache[column] = ufunc(part[a], part[b])
+    return cache[column]
+
+
+class RuleReport:
+    """Hasil evaluasi: mask aturan, keparahan, dan aturan utama per baris"""
+
+    def __init__(self, ruleset, mask, severity, primary, evaluated=None):
+        self.ruleset = ruleset
+        self.mask = mask
+        self.severity = severity
+        self.primary = primary
+        self.rows = mask.size
+        self.evaluated = self.rows if evaluated is None else evaluated
+        self.complete = self.evaluated == self.rows
+
+    @classmethod
+    def concat(cls, ruleset, reports, complete=True):
+        if not reports:
+            empty = np.zeros(0, dtype=np.uint64)
+            return cls(ruleset, empty, empty.astype(np.int8), empty.astype(np.int16))
+        report = cls(ruleset, np.concatenate([r.mask for r in reports]),
+                     np.concatenate([r.severity for r in reports]),
+                     np.concatenate([r.primary for r in reports]),
+                     sum(r.evaluated for r in reports))
+        report.complete = complete and all(r.complete for r in reports)
+        return report
+
+    def rule_mask(self, k):
+        """Mask boolean baris yang memicu aturan ke-``k``"""
+        return (self.mask & np.uint64(1 << k)) != 0
+
+    def counts(self):
+        """Jumlah baris yang memicu setiap aturan"""
+        return {rule.name: int(np.count_nonzero(self.rule_mask(k))) for k, rule in enumerate(self.ruleset.rules)}
+
+    def severity_counts(self):
+        """Jumlah baris per keparahan tertinggi (``ok`` = tidak ada aturan terpicu)"""
+        counts = np.bincount(self.severity[:self.evaluated].astype(np.int64) + 1, minlength=len(SEVERITIES) + 1)
+        return dict(zip(("ok",) + SEVERITIES, (int(c) for c in counts)))
+
+    def triggered(self, row):
+        """Aturan terpicu pada baris ``row``, terurut menurut peringkat"""
+        bits = int(self.mask[row])
+        return [self.ruleset.rules[k] for k in self.ruleset.ranking if bits >> k & 1]
+
+    def worst(self, limit=100):
+        """Indeks baris dengan keparahan tertinggi (stabil menurut urutan baris)"""
+        flagged = np.flatnonzero(self.severity >= 0)
+        order = np.argsort(-self.severity[flagged], kind="stable")
+        return flagged[order[:limit]]
+
+    def to_frame(self, rows=None, index=None):
+        """DataFrame ringkas untuk baris ``rows`` (bawaan: :meth:`worst`)"""
+        import pandas as pd
+
+        rows = self.worst() if rows is None else np.asarray(rows)
+        records = []
+        for row in rows:
+            rules = self.triggered(row)
+            records.append({
+                "baris": row if index is None else index[row],
+                "keparahan": rules[0].severity if rules else "ok",
+                "aturan": ", ".join(r.name for r in rules),
+                "rekomendasi": rules[0].recommendation if rules else "",
+            })
+        return pd.DataFrame.from_records(records, columns=["baris", "keparahan", "aturan", "rekomendasi"])
+
+
+def default_rules():
+    return RuleSet(DEFAULT_RULES)
+
+
+def parse_rules(data):
+    """Daftar spesifikasi aturan (opsional di bawah kunci ``rules``) → :class:`RuleSet`"""
+    if isinstance(data, dict):
+        data = data.get("rules")
+    if not isinstance(data, list):
+        raise ValueError("Berkas aturan harus berisi daftar aturan")
+    return RuleSet(data)
+
+
+def load_rules(path):
+    """Muat aturan dari berkas ``.json``, ``.yaml``, atau ``.yml``"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    return loads_rules(text, os.path.splitext(str(path))[1])
+
+
+def loads_rules(text, suffix=".json"):
+    """Seperti :func:`load_rules` tetapi dari teks"""
+    if suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("Berkas YAML membutuhkan paket 'pyyaml'") from None
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    return parse_rules(data)
+
+
+def _readings(chunks):
+    from .metering import COLUMN_ALIASES
+
+    for chunk, fraction in chunks:
+        lookup = {str(c).strip().lower(): c for c in chunk.columns}
+        rename = {}
+        for key in ("V", "I"):
+            for alias in COLUMN_ALIASES[key]:
+                if alias in lookup:
+                    rename[lookup[alias]] = key
+                    break
+        yield chunk.rename(columns=rename), fraction
+
+
+@traced(category="hitung")
+def evaluate_log(source, name="", ruleset=None, chunk_rows=CHUNK_ROWS, budget_s=None, progress=None):
+    """Evaluasi berkas pembacaan CSV/XLSX (kolom V, I, opsional P) per potongan"""
+    from .metering import read_chunks
+
+    ruleset = ruleset or default_rules()
+    return ruleset.evaluate_chunks(_readings(read_chunks(source, name, chunk_rows)), budget_s, progress)
@@ -0,0 +1,293 @@
+"""Matriks jarang (CSR) dan solver linear tanpa SciPy."""
+
+import numpy as np
+
+# Di bawah ukuran ini sistem diselesaikan langsung dengan dekomposisi LU padat
+DENSE_LIMIT = 1500
+
+
+class ConvergenceError(np.linalg.LinAlgError):
+    """Solver iteratif tidak mencapai toleransi dalam batas iterasi"""
+
+
+class CSRMatrix:
+    """Matriks jarang format Compressed Sparse Row"""
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = tuple(shape)
+        # Indeks baris untuk setiap elemen, dipakai oleh matvec berbasis bincount
+        self.rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def from_coo(cls, rows, cols, vals, shape):
+        """Bangun CSR dari triplet (baris, kolom, nilai); duplikat dijumlahkan"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        vals = np.asarray(vals, dtype=float)
+        n_rows, n_cols = shape
+
+        if rows.size == 0:
+            return cls(np.zeros(0), np.zeros(0), np.zeros(n_rows + 1), shape)
+
+        # Gabungkan duplikat lewat kunci linear yang sudah diurutkan
+        keys = rows * n_cols + cols
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        start = np.flatnonzero(np.diff(keys, prepend=-1))
+        unique_keys = keys[start]
+        data = np.add.reduceat(vals[order], start)
+
+        keep = data != 0
+        unique_keys = unique_keys[keep]
+        data = data[keep]
+
+        out_rows = unique_keys // n_cols
+        indices = unique_keys % n_cols
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(out_rows, minlength=n_rows), out=indptr[1:])
+        return cls(data, indices, indptr, shape)
+
+    @property
+    def nnz(self):
+        return self.data.size
+
+    def matvec(self, x):
+        """Hitung A @ x"""
+        return np.bincount(self.rows, weights=self.data * x[self.indices],
+                           minlength=self.shape[0])
+
+    def __matmul__(self, x):
+        return self.matvec(np.asarray(x, dtype=float))
+
+    def diagonal(self):
+        diag = np.zeros(min(self.shape))
+        mask = self.rows == self.indices
+        diag[self.rows[mask]] = self.data[mask]
+        return diag
+
+    def to_dense(self):
+        dense = np.zeros(self.shape)
+        np.add.at(dense, (self.rows, self.indices), self.data)
+        return dense
+
+
+def minres(A, b, M_inv=None, tol=1e-10, maxiter=None):
+    """MINRES berprakondisi untuk sistem simetris (boleh tak-definit).
+
+    ``M_inv`` adalah diagonal invers prakondisi (harus positif).
+    """
+    b = np.asarray(b, dtype=float)
+    n = b.size
+    if maxiter is None:
+        maxiter = 10 * n
+    if M_inv is None:
+        M_inv = np.ones(n)
+
+    x = np.zeros(n)
+    r1 = b.copy()
+    y = M_inv * r1
+    beta1 = np.sqrt(r1 @ y)
+    if beta1 == 0:
+        return x
+
+    oldb = 0.0
+    beta = beta1
+    dbar = 0.0
+    epsln = 0.0
+    phibar = beta1
+    cs = -1.0
+    sn = 0.0
+    w = np.zeros(n)
+    w2 = np.zeros(n)
+    r2 = r1
+    eps = np.finfo(float).eps
+
+    for itn in range(1, maxiter + 1):
+        v = y / beta
+        y = A @ v
+        if itn >= 2:
+            y -= (beta / oldb) * r1
+        alfa = v @ y
+        y -= (alfa / beta) * r2
+        r1 = r2
+        r2 = y
+        y = M_inv * r2
+        oldb = beta
+        beta = np.sqrt(max(r2 @ y, 0.0))
+
+        # Rotasi Givens untuk faktorisasi QR tridiagonal
+        oldeps = epsln
+        delta = cs * dbar + sn * alfa
+        gbar = sn * dbar - cs * alfa
+        epsln = sn * beta
+        dbar = -cs * beta
+        gamma = max(np.hypot(gbar, beta), eps)
+        cs = gbar / gamma
+        sn = beta / gamma
+        phi = cs * phibar
+        phibar = sn * phibar
+
+        w1 = w2
+        w2 = w
+        w = (v - oldeps * w1 - delta * w2) / gamma
+        x += phi * w
+
+        if phibar <= tol * beta1 or beta == 0:
+            return x
+
+    raise ConvergenceError(
+        f"MINRES tidak konvergen dalam {maxiter} iterasi (residu relatif {phibar / beta1:.2e})"
+    )
+
+
+def cg(A, b, M=None, tol=1e-10, maxiter=None):
+    """Conjugate gradient berprakondisi untuk sistem simetris definit positif.
+
+    ``M`` adalah fungsi prakondisi ``r -> M^-1 r`` (mis. :class:`AggregationAMG`).
+    """
+    b = np.asarray(b, dtype=float)
+    if maxiter is None:
+        maxiter = 10 * b.size
+    if M is None:
+        M = _identity
+
+    x = np.zeros_like(b)
+    b_norm = np.linalg.norm(b)
+    if b_norm == 0:
+        return x
+    r = b.copy()
+    z = M(r)
+    p = z.copy()
+    rz = r @ z
+
+    for _ in range(maxiter):
+        Ap = A @ p
+        alpha = rz / (p @ Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        res = np.linalg.norm(r)
+        if res <= tol * b_norm:
+            return x
+        z = M(r)
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+
+    raise ConvergenceError(
+        f"CG tidak konvergen dalam {maxiter} iterasi (residu relatif {res / b_norm:.2e})"
+    )
+
+
+class AggregationAMG:
+    """Prakondisi multigrid aljabar berbasis agregasi untuk matriks konduktansi.
+
+    Node digabung berpasangan lewat pencocokan tetangga terkuat (dua kali per
+    level) sehingga matriks kasar cukup dijumlahkan per agregat. Satu siklus V
+    dengan smoothing Jacobi simetris dipakai sebagai prakondisi CG.
+    """
+
+    def __init__(self, A, max_coarse=400, max_levels=20, omega=2 / 3):
+        self.omega = omega
+        self.levels = []
+        while A.shape[0] > max_coarse and len(self.levels) < max_levels:
+            agg, n_coarse = _pairwise_aggregate(A)
+            coarse = _galerkin(A, agg, n_coarse)
+            agg2, n_coarse2 = _pairwise_aggregate(coarse)
+            agg, n_coarse = agg2[agg], n_coarse2
+            if n_coarse > 0.8 * A.shape[0]:
+                break
+            self.levels.append((A, 1.0 / A.diagonal(), agg, n_coarse))
+            A = _galerkin(A, agg, n_coarse)
+        self.coarse_inverse = np.linalg.inv(A.to_dense())
+
+    def __call__(self, b):
+        return self._cycle(0, b)
+
+    def _cycle(self, level, b):
+        if level == len(self.levels):
+            return self.coarse_inverse @ b
+        A, d_inv, agg, n_coarse = self.levels[level]
+        w = self.omega * d_inv
+        x = w * b
+        x += w * (b - A @ x)
+        coarse = self._cycle(level + 1, np.bincount(agg, weights=b - A @ x, minlength=n_coarse))
+        # Agregasi polos cenderung kurang mengoreksi; faktor 2 mengimbanginya
+        x += 2.0 * coarse[agg]
+        x += w * (b - A @ x)
+        x += w * (b - A @ x)
+        return x
+
+
+def solve(A, b, method="auto", tol=1e-10, maxiter=None, M_inv=None):
+    """Selesaikan A x = b dengan LU padat (kecil), MINRES, atau CG+AMG (SPD besar)"""
+    if method == "auto":
+        method = "direct" if A.shape[0] <= DENSE_LIMIT else "minres"
+
+    if method == "direct":
+        return np.linalg.solve(A.to_dense(), b)
+    if method == "minres":
+        return minres(A, b, M_inv=M_inv, tol=tol, maxiter=maxiter)
+    if method == "amg":
+        return cg(A, b, M=AggregationAMG(A), tol=tol, maxiter=maxiter)
+    raise ValueError(f"Metode solver tidak dikenal: {method}")
+
+
+def _identity(r):
+    return r
+
+
+def _galerkin(A, agg, n_coarse):
+    return CSRMatrix.from_coo(agg[A.rows], agg[A.indices], A.data, (n_coarse, n_coarse))
+
+
+def _strongest_neighbor(rows, cols, weight, n):
+    """Tetangga dengan bobot terbesar per baris (-1 bila tidak ada)"""
+    best = np.full(n, -1)
+    if rows.size == 0:
+        return best
+    # Elemen CSR sudah terurut per baris sehingga maksimum cukup via reduceat
+    start = np.flatnonzero(np.diff(rows, prepend=-1))
+    row_max = np.maximum.reduceat(weight, start)
+    counts = np.diff(np.append(start, rows.size))
+    is_max = weight == np.repeat(row_max, counts)
+    best[rows[is_max]] = cols[is_max]
+    return best
+
+
+def _pairwise_aggregate(A, rounds=3):
+    """Pasangkan node yang saling memilih sebagai tetangga terkuat"""
+    n = A.shape[0]
+    off = (A.rows != A.indices) & (A.data < 0)
+    rows, cols = A.rows[off], A.indices[off]
+    # Gangguan simetris kecil untuk memecah seri bobot yang sama (mis. grid seragam)
+    lo, hi = np.minimum(rows, cols), np.maximum(rows, cols)
+    jitter = ((lo * 2654435761 + hi * 97531) % 1000003) / 1000003.0
+    weight = -A.data[off] * (1.0 + 1e-6 * jitter)
+
+    agg = np.full(n, -1)
+    n_coarse = 0
+    for _ in range(rounds):
+        free = agg < 0
+        mask = free[rows] & free[cols]
+        best = _strongest_neighbor(rows[mask], cols[mask], weight[mask], n)
+        i = np.flatnonzero(best >= 0)
+        j = best[i]
+        mutual = (best[j] == i) & (i < j)
+        i, j = i[mutual], j[mutual]
+        ids = n_coarse + np.arange(i.size)
+        agg[i] = ids
+        agg[j] = ids
+        n_coarse += i.size
+
+    # Node sisa ikut agregat tetangga terkuatnya, atau berdiri sendiri
+    left = np.flatnonzero(agg < 0)
+    neighbor = _strongest_neighbor(rows, cols, weight, n)[left]
+    join = neighbor >= 0
+    join[join] = agg[neighbor[join]] >= 0
+    agg[left[join]] = agg[neighbor[join]]
+    alone = left[~join]
+    agg[alone] = n_coarse + np.arange(alone.size)
+    return agg, n_coarse + alone.size
@@ -0,0 +1,271 @@
+"""Analisis spektrum sinyal dengan FFT riil dan rata-rata Welch bertahap.
+
+Sinyal dipotong menjadi segmen ``nperseg`` sampel yang saling tumpang
+tindih, dikalikan jendela, lalu ``numpy.fft.rfft`` dihitung untuk semua
+segmen sekaligus. Akumulator hanya menyimpan jumlah ``|X|²`` per bin dan
+sisa sampel yang belum membentuk segmen penuh, sehingga rekaman osiloskop
+puluhan juta sampel dapat diproses per potongan dengan memori tetap.
+
+Kerapatan daya (PSD) bersifat satu sisi dalam V²/Hz; RMS diperoleh dari
+teorema Parseval (``Σ PSD × Δf``) dan THD dari daya pita di sekitar
+fundamental serta harmoniknya.
+"""
+
+import os
+
+import numpy as np
+
+from .profiling import traced
+
+# Koefisien jendela kosinus periodik: w[n] = Σ (−1)^k a_k cos(2πkn/N)
+WINDOWS = {
+    "rectangular": (1.0,),
+    "hann": (0.5, 0.5),
+    "hamming": (0.54, 0.46),
+    "blackman": (0.42, 0.5, 0.08),
+    "flattop": (0.21557895, 0.41663158, 0.277263158, 0.083578947, 0.006947368),
+}
+
+# Setengah lebar lobus utama (bin) untuk menjumlahkan daya satu komponen
+_LOBE_BINS = {"rectangular": 1, "hann": 2, "hamming": 2, "blackman": 3, "flattop": 5}
+
+CHUNK_SAMPLES = 1_000_000
+
+
+def window(name, n):
+    """Jendela periodik ``name`` sepanjang ``n`` sampel"""
+    try:
+        coefficients = WINDOWS[name]
+    except KeyError:
+        raise ValueError(f"Jendela tidak dikenal: {name}") from None
+    phase = 2 * np.pi * np.arange(n) / n
+    w = np.zeros(n)
+    for k, a in enumerate(coefficients):
+        w += (-1) ** k * a * np.cos(k * phase)
+    return w
+
+
+class WelchAccumulator:
+    """Rata-rata periodogram Welch yang diberi sampel potongan demi potongan"""
+
+    def __init__(self, fs, nperseg=4096, window_name="hann", overlap=0.5):
+        if not 0 <= overlap < 1:
+            raise ValueError("Tumpang tindih harus di antara 0 dan 1")
+        self.fs = float(fs)
+        self.nperseg = int(nperseg)
+        self.window_name = window_name
+        self.step = max(1, int(round(self.nperseg * (1 - overlap))))
+        self.window = window(window_name, self.nperseg)
+        self._power = np.zeros(self.nperseg // 2 + 1)
+        self._carry = np.zeros(0)
+        self.segments = 0
+        # Statistik domain waktu untuk nilai DC dan pembanding RMS
+        self.samples = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def update(self, samples):
+        samples = np.asarray(samples, dtype=float).ravel()
+        self.samples += samples.size
+        self._sum += float(samples.sum())
+        self._sum_sq += float(np.dot(samples, samples))
+
+        buffer = np.concatenate([self._carry, samples]) if self._carry.size else samples
+        if buffer.size < self.nperseg:
+            self._carry = buffer.copy()
+            return
+        count = (buffer.size - self.nperseg) // self.step + 1
+        segments = np.lib.stride_tricks.sliding_window_view(buffer, self.nperseg)[::self.step][:count]
+        # Segmen diproses bertahap agar matriks FFT sementara tetap kecil
+        batch = max(1, (1 << 22) // self.nperseg)
+        for start in range(0, count, batch):
+            spectra = np.fft.rfft(segments[start:start + batch] * self.window, axis=1)
+            self._power += (spectra.real ** 2 + spectra.imag ** 2).sum(axis=0)
+        self.segments += count
+        self._carry = buffer[count * self.step:].copy()
+
+    def result(self):
+        """:class:`Spectrum` dari semua segmen penuh yang sudah diterima"""
+        if self.segments == 0:
+            raise ValueError(f"Sinyal terlalu pendek: butuh minimal {self.nperseg} sampel")
+        scale = 1.0 / (self.fs * np.sum(self.window ** 2) * self.segments)
+        psd = self._power * scale
+        # Satu sisi: gandakan semua bin kecuali DC (dan Nyquist bila nperseg genap)
+        psd[1:] *= 2
+        if self.nperseg % 2 == 0:
+            psd[-1] /= 2
+        freq = np.fft.rfftfreq(self.nperseg, 1.0 / self.fs)
+        mean = self._sum / self.samples
+        return Spectrum(freq, psd, self.window, self.window_name, self.segments,
+                        self.samples, mean, self._sum_sq / self.samples)
+
+
+class Spectrum:
+    """PSD satu sisi beserta besaran turunan (RMS, DC, fundamental, THD)"""
+
+    def __init__(self, freq, psd, window_values, window_name, segments, samples, mean, mean_square):
+        self.freq = freq
+        self.psd = psd
+        self.window_name = window_name
+        self.segments = segments
+        self.samples = samples
+        self.mean = mean
+        self.mean_square = mean_square
+        self.df = freq[1] - freq[0]
+        # Lebar pita derau ekuivalen (bin) untuk konversi PSD → amplitudo puncak
+        self.enbw = window_values.size * np.sum(window_values ** 2) / np.sum(window_values) ** 2
+        self.lobe = _LOBE_BINS.get(window_name, 2)
+
+    @property
+    def amplitude(self):
+        """Amplitudo puncak per bin (V) untuk nada tepat di tengah bin"""
+        amplitude = np.sqrt(2 * self.psd * self.df * self.enbw)
+        amplitude[0] /= np.sqrt(2)
+        return amplitude
+
+    def rms(self):
+        """RMS total dari spektrum (Parseval), termasuk komponen DC"""
+        return float(np.sqrt(np.sum(self.psd) * self.df))
+
+    def time_rms(self):
+        """RMS langsung dari sampel (pembanding)"""
+        return float(np.sqrt(self.mean_square))
+
+    def band_power(self, frequency):
+        """Daya (V²) lobus utama di sekitar ``frequency``"""
+        center = int(round(frequency / self.df))
+        if center >= self.freq.size:
+            return 0.0
+        lo, hi = max(center - self.lobe, 0), min(center + self.lobe + 1, self.freq.size)
+        return float(np.sum(self.psd[lo:hi]) * self.df)
+
+    def fundamental(self):
+        """Frekuensi puncak terbesar di luar lobus DC (interpolasi parabola)"""
+        start = self.lobe + 1
+        if start >= self.psd.size:
+            return 0.0
+        k = start + int(np.argmax(self.psd[start:]))
+        if 0 < k < self.psd.size - 1:
+            # Interpolasi parabola pada log PSD untuk frekuensi di antara bin
+            a, b, c = np.log(self.psd[k - 1:k + 2] + 1e-300)
+            denominator = a - 2 * b + c
+            offset = 0.5 * (a - c) / denominator if denominator != 0 else 0.0
+            return float((k + np.clip(offset, -0.5, 0.5)) * self.df)
+        return float(k * self.df)
+
+    def harmonics(self, fundamental=None, count=10):
+        """Daftar ``(orde, frekuensi, amplitudo puncak)`` hingga ``count`` harmonik"""
+        f0 = fundamental or self.fundamental()
+        if f0 <= 0:
+            return []
+        nyquist = self.freq[-1]
+        orders = np.arange(1, count + 1)
+        orders = orders[orders * f0 <= nyquist]
+        return [(int(k), float(k * f0), float(np.sqrt(2 * self.band_power(k * f0)))) for k in orders]
+
+    def thd(self, fundamental=None, count=10):
+        """THD (%) = √(Σ daya harmonik ke-2..n) / √(daya fundamental) × 100"""
+        f0 = fundamental or self.fundamental()
+        if f0 <= 0:
+            return 0.0
+        p1 = self.band_power(f0)
+        if p1 <= 0:
+            return 0.0
+        nyquist = self.freq[-1]
+        harmonic = sum(self.band_power(k * f0) for k in range(2, count + 1) if k * f0 <= nyquist)
+        return float(np.sqrt(harmonic / p1) * 100)
+
+    def summary(self, count=10):
+        f0 = self.fundamental()
+        return {
+            "rms": self.rms(),
+            "time_rms": self.time_rms(),
+            "dc": self.mean,
+            "ac_rms": float(np.sqrt(max(self.rms() ** 2 - self.mean ** 2, 0.0))),
+            "fundamental": f0,
+            "thd": self.thd(f0, count),
+            "segments": self.segments,
+            "samples": self.samples,
+        }
+
+
+@traced(category="hitung")
+def periodogram(signal, fs, window_name="hann"):
+    """Spektrum satu segmen penuh (seluruh sinyal) dengan ``rfft``"""
+    signal = np.asarray(signal, dtype=float)
+    accumulator = WelchAccumulator(fs, signal.size, window_name, overlap=0)
+    accumulator.update(signal)
+    return accumulator.result()
+
+
+@traced(category="hitung")
+def welch(chunks, fs, nperseg=4096, window_name="hann", overlap=0.5, progress=None):
+    """Welch dari iterator potongan sampel; ``progress(fraksi, sampel)`` per potongan"""
+    accumulator = WelchAccumulator(fs, nperseg, window_name, overlap)
+    for item in chunks:
+        samples, fraction = item if isinstance(item, tuple) else (item, None)
+        accumulator.update(samples)
+        if progress is not None:
+            progress(fraction, accumulator.samples)
+    return accumulator.result()
+
+
+def read_capture(source, name="", fs=None, column=-1, chunk_samples=CHUNK_SAMPLES):
+    """Buka rekaman osiloskop dan kembalikan ``(fs, generator (sampel, fraksi))``.
+
+    ``.npy`` dibaca lewat memory map; CSV/TXT dibaca per potongan dengan
+    pandas. Bila ``fs`` tidak diberikan, CSV harus punya kolom waktu pertama
+    dan laju sampel dihitung dari selisih waktunya.
+    """
+    filename = str(name or getattr(source, "name", source)).lower()
+    if filename.endswith(".npy"):
+        data = np.load(source, mmap_mode="r") if isinstance(source, (str, os.PathLike)) else np.load(source)
+        if data.ndim == 2:
+            if fs is None and data.shape[1] >= 2:
+                fs = _sample_rate(data[:min(len(data), 10_000), 0])
+            data = data[:, column]
+        elif fs is None:
+            raise ValueError("Laju sampel (fs) wajib diisi untuk rekaman satu kolom")
+
+        def npy_chunks():
+            for start in range(0, data.shape[0], chunk_samples):
+                yield np.asarray(data[start:start + chunk_samples], dtype=float), \
+                    min((start + chunk_samples) / data.shape[0], 1.0)
+        return fs, npy_chunks()
+
+    import pandas as pd
+
+    from .metering import _position, _size
+
+    opened = isinstance(source, (str, os.PathLike))
+    handle = open(source, "rb") if opened else source
+    total = _size(handle)
+    reader = pd.read_csv(handle, chunksize=chunk_samples, comment="#")
+    first = next(reader)
+    numeric = first.apply(pd.to_numeric, errors="coerce").dropna(axis=1, how="all")
+    if numeric.shape[1] == 0:
+        raise ValueError("Rekaman tidak memiliki kolom numerik")
+    if fs is None:
+        if numeric.shape[1] < 2:
+            raise ValueError("Laju sampel (fs) wajib diisi untuk rekaman satu kolom")
+        fs = _sample_rate(numeric.iloc[:, 0].to_numpy())
+    value_column = numeric.columns[column]
+
+    def csv_chunks():
+        try:
+            yield pd.to_numeric(first[value_column], errors="coerce").dropna().to_numpy(), _position(handle, total)
+            for chunk in reader:
+                yield pd.to_numeric(chunk[value_column], errors="coerce").dropna().to_numpy(), \
+                    _position(handle, total)
+        finally:
+            reader.close()
+            if opened:
+                handle.close()
+    return fs, csv_chunks()
+
+
+def _sample_rate(time):
+    step = np.median(np.diff(np.asarray(time, dtype=float)))
+    if not step > 0:
+        raise ValueError("Kolom waktu tidak naik; isi laju sampel (fs) secara manual")
+    return 1.0 / step
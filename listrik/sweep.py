@@ -0,0 +1,279 @@
+"""Sapuan parameter (parameter sweep) untuk semua kalkulator.
+
+Satu atau dua masukan kalkulator disapu pada grid; masukan lain tetap pada
+nilai yang sedang dipakai halaman. Rumus di :mod:`listrik.core` sudah
+tervektorisasi, sehingga seluruh grid dievaluasi dalam satu panggilan
+NumPy dengan broadcasting (``x[None, :]`` dan ``y[:, None]``).
+
+Sapuan adaptif mulai dari grid kasar lalu menyisipkan garis grid baru hanya
+di selang yang perlu:
+
+* selang dengan galat interpolasi linear besar, diperkirakan dari beda
+  terbagi kedua (``|f''| × h² / 8``) relatif terhadap rentang keluaran;
+* selang tempat keluaran memotong ``level`` yang diminati (mis. efisiensi
+  80%), sehingga kontur itu tergambar tajam.
+
+Grid tetap rektilinear tetapi jaraknya tidak seragam. Setiap level hanya
+mengevaluasi baris dan kolom yang baru, dan hasilnya langsung bisa dipakai
+``go.Contour`` atau ``go.Surface``.
+"""
+
+import numpy as np
+
+from . import core
+from .profiling import traced
+
+# Grid awal sapuan adaptif dan batas titik total
+INITIAL_POINTS = 17
+MAX_LEVELS = 10
+MAX_POINTS = 250_000
+
+# Penghalusan di sekitar level berhenti pada jarak (rentang sumbu / nilai ini)
+LEVEL_RESOLUTION = 256
+
+
+class Calculator:
+    """Kalkulator yang dapat disapu: masukan, keluaran, dan fungsi tervektorisasi"""
+
+    def __init__(self, title, inputs, outputs, evaluate):
+        self.title = title
+        self.inputs = inputs      # {nama: label}
+        self.outputs = outputs    # {nama: label}
+        self.evaluate = evaluate  # fungsi(**masukan) -> {nama: array}
+
+
+def _ohm(target):
+    def evaluate(V=None, I=None, R=None):
+        if target == "V":
+            V = core.voltage(I, R)
+        elif target == "I":
+            I = core.current(V, R)
+        else:
+            R = core.resistance(V, I)
+        return {target: {"V": V, "I": I, "R": R}[target], "P": core.power_vi(V, I)}
+    return evaluate
+
+
+def _emf(emf, r, I):
+    v_terminal = core.terminal_voltage(emf, r, I)
+    return {
+        "V_terminal": v_terminal,
+        "P_loss": core.internal_power_loss(I, r),
+        "P_load": v_terminal * np.asarray(I, dtype=float),
+        "efficiency": core.source_efficiency(emf, r, I),
+    }
+
+
+def _power(V, I, R, t_hours):
+    results = core.power_energy(V, I, R, t_hours)
+    return {key: results[key] for key in ("P_vi", "P_i2r", "P_v2r", "energy_kwh", "cost")}
+
+
+def _kvl(V, R1, R2, R3):
+    R_total = np.asarray(R1, dtype=float) + np.asarray(R2, dtype=float) + np.asarray(R3, dtype=float)
+    I = core.current(V, R_total)
+    return {"I": I, "V1": I * R1, "V2": I * R2, "V3": I * R3, "P": core.power_vi(V, I)}
+
+
+CALCULATORS = {
+    "ohm_v": Calculator("Hukum Ohm (V)", {"I": "Arus (A)", "R": "Hambatan (Ω)"},
+                        {"V": "Tegangan (V)", "P": "Daya (W)"}, _ohm("V")),
+    "ohm_i": Calculator("Hukum Ohm (I)", {"V": "Tegangan (V)", "R": "Hambatan (Ω)"},
+                        {"I": "Arus (A)", "P": "Daya (W)"}, _ohm("I")),
+    "ohm_r": Calculator("Hukum Ohm (R)", {"V": "Tegangan (V)", "I": "Arus (A)"},
+                        {"R": "Hambatan (Ω)", "P": "Daya (W)"}, _ohm("R")),
+    "emf": Calculator("GGL dan Tegangan Jepit",
+                      {"emf": "GGL ε (V)", "r": "Hambatan dalam r (Ω)", "I": "Arus (A)"},
+                      {"V_terminal": "Tegangan jepit (V)", "P_loss": "Rugi daya (W)",
+                       "P_load": "Daya ke beban (W)", "efficiency": "Efisiensi (%)"}, _emf),
+    "power": Calculator("Daya dan Energi",
+                        {"V": "Tegangan (V)", "I": "Arus (A)", "R": "Hambatan (Ω)", "t_hours": "Waktu (jam)"},
+                        {"P_vi": "Daya V×I (W)", "P_i2r": "Daya I²R (W)", "P_v2r": "Daya V²/R (W)",
+                         "energy_kwh": "Energi (kWh)", "cost": "Biaya tarif dasar (Rp)"}, _power),
+    "kvl": Calculator("Loop KVL",
+                      {"V": "Tegangan sumber (V)", "R1": "R₁ (Ω)", "R2": "R₂ (Ω)", "R3": "R₃ (Ω)"},
+                      {"I": "Arus loop (A)", "V1": "V₁ (V)", "V2": "V₂ (V)", "V3": "V₃ (V)",
+                       "P": "Daya total (W)"}, _kvl),
+}
+
+
+def resistor_calculator(kind, count):
+    """Kalkulator hambatan seri/paralel dengan ``count`` masukan R1..Rn"""
+    names = [f"R{i + 1}" for i in range(count)]
+
+    def evaluate(**values):
+        stacked = np.stack(np.broadcast_arrays(*[np.asarray(values[n], dtype=float) for n in names]), axis=-1)
+        if kind == "series":
+            return {"R_total": core.series_resistance(stacked)}
+        return {"R_total": core.parallel_resistance(stacked)}
+
+    title = "Hambatan Seri" if kind == "series" else "Hambatan Paralel"
+    return Calculator(title, {n: f"{n} (Ω)" for n in names}, {"R_total": "R total (Ω)"}, evaluate)
+
+
+class Axis:
+    """Masukan yang disapu dari ``lo`` sampai ``hi`` (skala log bila ``log``)"""
+
+    def __init__(self, name, lo, hi, log=False):
+        if not hi > lo:
+            raise ValueError(f"Rentang {name} tidak valid: batas atas harus lebih besar")
+        if log and lo <= 0:
+            raise ValueError(f"Skala log untuk {name} butuh batas bawah positif")
+        self.name = name
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.log = log
+
+    def unit(self, n):
+        """``n`` titik seragam di ruang sapuan (log10 bila skala log)"""
+        if self.log:
+            return np.linspace(np.log10(self.lo), np.log10(self.hi), n)
+        return np.linspace(self.lo, self.hi, n)
+
+    def values(self, u):
+        return 10 ** u if self.log else u
+
+    def __repr__(self):
+        return f"Axis({self.name!r}, {self.lo!r}, {self.hi!r}, log={self.log!r})"
+
+
+class SweepResult:
+    """Hasil sapuan: koordinat tiap sumbu dan array keluaran ``(ny, nx)`` atau ``(nx,)``"""
+
+    def __init__(self, axes, coords, values, evaluations, finest):
+        self.axes = axes
+        self.coords = coords
+        self.values = values
+        self.evaluations = evaluations
+        # Jumlah titik grid seragam dengan jarak terhalus yang sama
+        self.uniform_equivalent = int(np.prod(finest))
+
+    @property
+    def shape(self):
+        return tuple(c.size for c in reversed(self.coords))
+
+    @property
+    def columns(self):
+        return [axis.name for axis in self.axes] + list(self.values)
+
+    def rows(self):
+        """Baris ``(koordinat..., keluaran...)`` per titik, dibangkitkan per baris grid"""
+        names = list(self.values)
+        if len(self.coords) == 1:
+            block = np.column_stack([self.coords[0]] + [self.values[n] for n in names])
+            yield from map(tuple, block.tolist())
+            return
+        x, y = self.coords
+        for j, yj in enumerate(y):
+            block = np.column_stack([x, np.full(x.size, yj)] + [self.values[n][j] for n in names])
+            yield from map(tuple, block.tolist())
+
+
+def _evaluate(calculator, fixed, axes, units):
+    """Evaluasi satu blok grid sekaligus; ``units[k]`` koordinat sumbu ``k``"""
+    values = dict(fixed)
+    if len(axes) == 1:
+        values[axes[0].name] = axes[0].values(units[0])
+    else:
+        values[axes[0].name] = axes[0].values(units[0])[None, :]
+        values[axes[1].name] = axes[1].values(units[1])[:, None]
+    shape = tuple(u.size for u in reversed(units))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        outputs = calculator.evaluate(**values)
+    return {key: np.broadcast_to(np.asarray(value, dtype=float), shape).copy() for key, value in outputs.items()}
+
+
+@traced(category="hitung")
+def grid(calculator, fixed, axes, points=201):
+    """Sapuan grid seragam ``points`` titik per sumbu dalam satu pass"""
+    units = [axis.unit(points) for axis in axes]
+    values = _evaluate(calculator, fixed, axes, units)
+    return SweepResult(axes, [axis.values(u) for axis, u in zip(axes, units)], values,
+                       points ** len(axes), [points] * len(axes))
+
+
+def _interval_error(u, Z, axis, level):
+    """Perkiraan galat tiap selang di sepanjang ``axis`` (maks terhadap sumbu lain)"""
+    Z = np.moveaxis(Z, axis, -1).reshape(-1, u.size)
+    h = np.diff(u)
+    span = np.nanmax(Z) - np.nanmin(Z) if np.isfinite(Z).any() else 0.0
+    error = np.zeros(h.size)
+    if u.size >= 3 and span > 0:
+        slope = np.diff(Z, axis=-1) / h
+        curvature = np.abs(np.diff(slope, axis=-1)) / ((h[:-1] + h[1:]) / 2)
+        node = np.zeros(u.size)
+        node[1:-1] = np.nan_to_num(curvature, nan=0.0, posinf=0.0).max(axis=0)
+        # Ujung grid memakai kelengkungan tetangga dalamnya
+        node[0], node[-1] = node[1], node[-2]
+        error = np.maximum(node[:-1], node[1:]) * h ** 2 / 8 / span
+    if level is not None:
+        crossing = ((Z[..., :-1] - level) * (Z[..., 1:] - level) < 0).any(axis=0)
+        crossing &= h > (u[-1] - u[0]) / LEVEL_RESOLUTION
+        error = np.where(crossing, np.inf, error)
+    return error
+
+
+@traced(category="hitung")
+def adaptive(calculator, fixed, axes, output, tol=0.005, level=None, initial=INITIAL_POINTS,
+             levels=MAX_LEVELS, max_points=MAX_POINTS):
+    """Sapuan adaptif: mulai dari grid ``initial`` lalu sisipkan titik tengah di selang bergalat besar.
+
+    ``tol`` adalah galat interpolasi relatif terhadap rentang ``output``;
+    ``level`` (opsional) memaksa penghalusan di sekitar kontur ``output = level``.
+    """
+    units = [axis.unit(initial) for axis in axes]
+    values = _evaluate(calculator, fixed, axes, units)
+    evaluations = initial ** len(axes)
+
+    for _ in range(levels):
+        candidates = []
+        for k in range(len(axes)):
+            # Sumbu x adalah dimensi terakhir array
+            error = _interval_error(units[k], values[output], len(axes) - 1 - k, level)
+            order = np.argsort(error)[::-1]
+            order = order[error[order] > tol]
+            candidates.append(order)
+        if not any(c.size for c in candidates):
+            break
+        # Batasi total titik: buang kandidat bergalat terkecil pada sumbu yang paling banyak
+        while np.prod([u.size + c.size for u, c in zip(units, candidates)]) > max_points:
+            k = int(np.argmax([c.size for c in candidates]))
+            if candidates[k].size == 0:
+                break
+            candidates[k] = candidates[k][:candidates[k].size // 2]
+        if not any(c.size for c in candidates):
+            break
+
+        new = [(u[c] + u[c + 1]) / 2 for u, c in zip(units, candidates)]
+        values, units, added = _insert(calculator, fixed, axes, units, values, new)
+        evaluations += added
+
+    finest = [int(np.ceil((u[-1] - u[0]) / np.diff(u).min() - 1e-6)) + 1 for u in units]
+    return SweepResult(axes, [axis.values(u) for axis, u in zip(axes, units)], values, evaluations, finest)
+
+
+def _insert(calculator, fixed, axes, units, values, new):
+    """Sisipkan koordinat baru; hanya baris/kolom baru yang dievaluasi"""
+    merged = [np.sort(np.concatenate([u, n])) for u, n in zip(units, new)]
+    old_pos = [np.searchsorted(m, u) for m, u in zip(merged, units)]
+    shape = tuple(m.size for m in reversed(merged))
+    out = {key: np.empty(shape) for key in values}
+
+    if len(axes) == 1:
+        new_pos = np.searchsorted(merged[0], new[0])
+        block = _evaluate(calculator, fixed, axes, [new[0]])
+        for key in out:
+            out[key][old_pos[0]] = values[key]
+            out[key][new_pos] = block[key]
+        return out, merged, new[0].size
+
+    x_new = np.searchsorted(merged[0], new[0])
+    y_new = np.searchsorted(merged[1], new[1])
+    # Kolom baru pada baris lama, lalu baris baru pada semua kolom
+    columns = _evaluate(calculator, fixed, axes, [new[0], units[1]])
+    rows = _evaluate(calculator, fixed, axes, [merged[0], new[1]])
+    for key in out:
+        out[key][np.ix_(old_pos[1], old_pos[0])] = values[key]
+        out[key][np.ix_(old_pos[1], x_new)] = columns[key]
+        out[key][y_new, :] = rows[key]
+    return out, merged, new[0].size * units[1].size + merged[0].size * new[1].size
@@ -0,0 +1,239 @@
+"""Sintesis hambatan target dari kombinasi seri–paralel nilai standar.
+
+Kebalikan :func:`listrik.core.series_resistance`: diberikan R target, cari
+kombinasi hingga ``max_parts`` (≤ 4) resistor deret E (atau daftar stok
+sendiri) yang paling dekat.
+
+Pencarian memakai *meet-in-the-middle*. Semua pasangan ``a + b`` dan
+``a || b`` dihitung sekali per stok lalu diurutkan (tabel ``L2``, ±330 ribu
+entri untuk E96 enam dekade). Setiap topologi 3–4 resistor dipecah menjadi
+"sisi kecil" yang dienumerasi (satu resistor, satu pasangan, atau dua
+resistor) dan satu entri ``L2`` yang dicari dengan ``np.searchsorted``.
+
+* seri ``x + N`` — cari ``N = T − x``,
+* paralel ``x || N`` — cari ``1/N = 1/T − 1/x`` (jumlah kebalikan),
+* ``x + (a || N)`` dan ``x || (a + N)`` — sisa dari pasangan ``(x, a)``.
+
+Setiap jaringan seri–paralel 1–4 resistor termasuk dalam salah satu
+topologi di atas, sehingga hasilnya optimal tanpa enumerasi O(n⁴).
+"""
+
+import functools
+import time
+
+import numpy as np
+
+from .profiling import traced
+from .tolerance import E_SERIES
+
+MAX_PARTS = 4
+
+# Dekade bawaan: 1 Ω sampai 976 kΩ
+DEFAULT_DECADES = (0, 6)
+
+SERIES_OP, PARALLEL_OP = "+", "||"
+
+
+def standard_values(series="E24", decades=DEFAULT_DECADES):
+    """Nilai deret E untuk dekade ``10**decades[0]`` hingga ``10**(decades[1] - 1)``"""
+    if series not in E_SERIES:
+        raise ValueError(f"Deret tidak dikenal: {series}")
+    low, high = decades
+    return tuple(round(base * 10 ** d, 6) for d in range(low, high) for base in E_SERIES[series])
+
+
+def format_ohms(value):
+    """Nilai gaya SPICE (``4.7k``, ``1meg``) yang dapat dibaca :mod:`listrik.network`"""
+    for scale, suffix in ((1e6, "meg"), (1e3, "k")):
+        if value >= scale:
+            return f"{value / scale:.4g}{suffix}"
+    return f"{value:.4g}"
+
+
+@functools.lru_cache(maxsize=8)
+def _tables(values):
+    v = np.unique(np.asarray(values, dtype=float))
+    if v.size == 0 or v[0] <= 0:
+        raise ValueError("Stok hambatan harus berisi nilai positif")
+    i, j = np.triu_indices(v.size)
+    a, b = v[i], v[j]
+    pair = np.concatenate([a + b, a * b / (a + b)])
+    order = np.argsort(pair, kind="stable")
+    kinds = np.repeat(np.array([0, 1], dtype=np.int8), i.size)
+    return v, pair[order], np.tile(i, 2)[order], np.tile(j, 2)[order], kinds[order]
+
+
+class Combination:
+    """Satu kombinasi: pohon ``(op, [anak])`` dengan daun berupa nilai ohm"""
+
+    def __init__(self, tree, target, topology):
+        self.tree = _flatten(tree)
+        self.target = target
+        self.topology = topology
+        self.value = _evaluate(self.tree)
+        self.parts = sorted(_leaves(self.tree))
+        self.count = len(self.parts)
+        self.error = (self.value - target) / target
+
+    @property
+    def error_percent(self):
+        return self.error * 100
+
+    @property
+    def expression(self):
+        """Ekspresi jaringan, mis. ``1k + (2.2k || 4.7k)``"""
+        return _expression(self.tree, top=True)
+
+    def __repr__(self):
+        return f"Combination({self.expression} = {self.value:.6g} Ω, {self.error_percent:+.4f}%)"
+
+
+def _flatten(tree):
+    if not isinstance(tree, tuple):
+        return float(tree)
+    op, children = tree
+    flat = []
+    for child in children:
+        child = _flatten(child)
+        if isinstance(child, tuple) and child[0] == op:
+            flat.extend(child[1])
+        else:
+            flat.append(child)
+    # Daun lebih dulu, lalu urut nilai agar kombinasi setara tampil sama
+    flat.sort(key=lambda c: (isinstance(c, tuple), _evaluate(c)))
+    return op, flat
+
+
+def _evaluate(tree):
+    if not isinstance(tree, tuple):
+        return tree
+    op, children = tree
+    values = [_evaluate(c) for c in children]
+    if op == SERIES_OP:
+        return sum(values)
+    return 1.0 / sum(1.0 / v for v in values)
+
+
+def _leaves(tree):
+    if not isinstance(tree, tuple):
+        return [tree]
+    return [leaf for child in tree[1] for leaf in _leaves(child)]
+
+
+def _expression(tree, top=False):
+    if not isinstance(tree, tuple):
+        return format_ohms(tree)
+    op, children = tree
+    text = f" {op} ".join(_expression(c) for c in children)
+    return text if top else f"({text})"
+
+
+class SynthesisResult:
+    """Kombinasi terbaik per topologi dan pilihan akhirnya"""
+
+    def __init__(self, target, candidates, tolerance, elapsed):
+        self.target = target
+        self.tolerance = tolerance
+        self.elapsed = elapsed
+        self.candidates = sorted(candidates, key=lambda c: (abs(c.error), c.count))
+        within = [c for c in self.candidates if tolerance is not None and abs(c.error) <= tolerance]
+        # Dalam toleransi: komponen paling sedikit; bila tidak ada: galat terkecil
+        self.best = min(within, key=lambda c: (c.count, abs(c.error))) if within else (
+            self.candidates[0] if self.candidates else None)
+
+    @property
+    def within_tolerance(self):
+        return self.best is not None and self.tolerance is not None and abs(self.best.error) <= self.tolerance
+
+
+def _nearest(table, queries, total, target):
+    """Indeks query dan entri tabel dengan total paling dekat ke target"""
+    if queries.size == 0:
+        return None
+    k = np.searchsorted(table, queries)
+    best = None
+    for candidate in (np.clip(k - 1, 0, table.size - 1), np.clip(k, 0, table.size - 1)):
+        error = np.abs(total(table[candidate]) - target)
+        m = int(np.argmin(error))
+        if best is None or error[m] < best[0]:
+            best = (error[m], m, int(candidate[m]))
+    return best[1], best[2]
+
+
+@traced(category="hitung")
+def synthesize(target, series="E24", max_parts=3, tolerance=None, decades=DEFAULT_DECADES, values=None):
+    """Kombinasi seri–paralel hingga ``max_parts`` resistor yang paling dekat ke ``target`` (Ω).
+
+    ``tolerance`` (fraksi) mengubah pilihan akhir menjadi kombinasi dengan
+    komponen paling sedikit yang galatnya masih dalam toleransi; pencarian
+    berhenti di jumlah komponen pertama yang memenuhinya. ``values`` mengganti
+    deret E dengan daftar stok sendiri; setiap nilai boleh dipakai berulang.
+    """
+    start = time.perf_counter()
+    T = float(target)
+    if not T > 0:
+        raise ValueError("Hambatan target harus positif")
+    if not 1 <= max_parts <= MAX_PARTS:
+        raise ValueError(f"Jumlah komponen harus 1–{MAX_PARTS}")
+    v, pair, left, right, kind = _tables(tuple(values) if values is not None else standard_values(series, decades))
+
+    def pair_tree(k):
+        return (SERIES_OP if kind[k] == 0 else PARALLEL_OP, [v[left[k]], v[right[k]]])
+
+    candidates = []
+
+    def add(tree, topology):
+        candidates.append(Combination(tree, T, topology))
+
+    def done(parts):
+        return tolerance is not None and any(c.count <= parts and abs(c.error) <= tolerance for c in candidates)
+
+    hit = _nearest(v, np.array([T]), lambda y: y, T)
+    add(v[hit[1]], "tunggal")
+    if max_parts >= 2 and not done(1):
+        hit = _nearest(pair, np.array([T]), lambda y: y, T)
+        add(pair_tree(hit[1]), "pasangan")
+
+    if max_parts >= 3 and not done(2):
+        x = v[v < T]
+        hit = _nearest(pair, T - x, lambda y: x + y, T)
+        if hit:
+            add((SERIES_OP, [x[hit[0]], pair_tree(hit[1])]), "R + pasangan")
+        x = v[v > T]
+        hit = _nearest(pair, 1 / (1 / T - 1 / x), lambda y: x * y / (x + y), T)
+        if hit:
+            add((PARALLEL_OP, [x[hit[0]], pair_tree(hit[1])]), "R || pasangan")
+
+    if max_parts >= 4 and not done(3):
+        idx = np.flatnonzero(pair < T)
+        x = pair[idx]
+        hit = _nearest(pair, T - x, lambda y: x + y, T)
+        if hit:
+            add((SERIES_OP, [pair_tree(idx[hit[0]]), pair_tree(hit[1])]), "pasangan + pasangan")
+        idx = np.flatnonzero(pair > T)
+        x = pair[idx]
+        hit = _nearest(pair, 1 / (1 / T - 1 / x), lambda y: x * y / (x + y), T)
+        if hit:
+            add((PARALLEL_OP, [pair_tree(idx[hit[0]]), pair_tree(hit[1])]), "pasangan || pasangan")
+
+        # x + (a || N): sisa r = T − x harus dipenuhi a || N, jadi a > r
+        xs, a = np.meshgrid(v[v < T], v, indexing="ij")
+        r = T - xs
+        ok = a > r
+        xs, a, r = xs[ok], a[ok], r[ok]
+        hit = _nearest(pair, 1 / (1 / r - 1 / a), lambda y: xs + a * y / (a + y), T)
+        if hit:
+            m, k = hit
+            add((SERIES_OP, [xs[m], (PARALLEL_OP, [a[m], pair_tree(k)])]), "R + (R || pasangan)")
+
+        # x || (a + N): x || R' = T dengan R' = 1/(1/T − 1/x), lalu N = R' − a
+        xs, a = np.meshgrid(v[v > T], v, indexing="ij")
+        r = 1 / (1 / T - 1 / xs)
+        ok = a < r
+        xs, a, r = xs[ok], a[ok], r[ok]
+        hit = _nearest(pair, r - a, lambda y: 1 / (1 / xs + 1 / (a + y)), T)
+        if hit:
+            m, k = hit
+            add((PARALLEL_OP, [xs[m], (SERIES_OP, [a[m], pair_tree(k)])]), "R || (R + pasangan)")
+
+    return SynthesisResult(T, candidates, tolerance, time.perf_counter() - start)
@@ -0,0 +1,273 @@
+"""Mesin tarif listrik: waktu pemakaian (TOU) dan tarif bertingkat.
+
+Satu golongan tarif terdiri atas:
+
+* ``tiers`` — tingkat harga berdasarkan pemakaian kumulatif dalam satu
+  periode tagihan (mis. 0–50 kWh Rp 1.100, 50–200 kWh Rp 1.450, sisanya
+  Rp 1.700). Biaya kumulatif di setiap batas tingkat dihitung sekali
+  sehingga biaya untuk pemakaian ``x`` kWh cukup ``C[k] + (x − B[k]) × r[k]``
+  dengan ``k`` dari ``searchsorted``.
+* ``blocks`` — blok waktu (mis. WBP 17:00–22:00) dengan pengali harga.
+  Tabel menit-dalam-minggu (10.080 entri) dibangun sekali; penentuan blok
+  untuk jutaan stempel waktu hanya berupa satu pengindeksan array.
+
+Biaya tiap selang adalah ``(F(kumulatif akhir) − F(kumulatif awal)) ×
+pengali blok`` sehingga selang yang melewati batas tingkat terbagi dengan
+tepat. Golongan dapat dimuat dari berkas JSON atau YAML.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .profiling import traced
+
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# 1970-01-01 jatuh pada hari Kamis (Senin = 0)
+_EPOCH_WEEKDAY = 3
+
+PERIODS = ("month", "day", None)
+
+# Kolom meter yang diproses sekaligus; membatasi memori array sementara
+METER_CHUNK = 256
+
+DEFAULT_TARIFFS = {
+    "Flat Rp 1.500": {"rate": 1500},
+    "R-1 Bertingkat": {
+        "tiers": [
+            {"up_to": 50, "rate": 1100},
+            {"up_to": 200, "rate": 1450},
+            {"up_to": None, "rate": 1700},
+        ],
+    },
+    "B-2 WBP/LWBP": {
+        "rate": 1450,
+        "default_block": "LWBP",
+        "blocks": [{"name": "WBP", "start": "17:00", "end": "22:00", "multiplier": 1.6}],
+        "fixed_charge": 40000,
+    },
+}
+
+DEFAULT_TARIFF = "Flat Rp 1.500"
+
+
+def _minutes(clock):
+    """``"HH:MM"`` → menit sejak tengah malam (``"24:00"`` = 1440)"""
+    try:
+        hours, minutes = (int(part) for part in str(clock).split(":"))
+    except ValueError:
+        raise ValueError(f"Format jam tidak valid: {clock!r} (gunakan HH:MM)") from None
+    total = hours * 60 + minutes
+    if not 0 <= total <= MINUTES_PER_DAY:
+        raise ValueError(f"Jam di luar rentang 00:00–24:00: {clock!r}")
+    return total
+
+
+def _as_minutes(timestamps):
+    return np.asarray(timestamps, dtype="datetime64[m]")
+
+
+class Tariff:
+    """Satu golongan tarif dengan tingkat kumulatif dan blok waktu"""
+
+    def __init__(self, name, rate=None, tiers=None, blocks=(), default_block="Normal",
+                 fixed_charge=0.0, period="month"):
+        if tiers is None:
+            if rate is None:
+                raise ValueError(f"Tarif {name!r} membutuhkan 'rate' atau 'tiers'")
+            tiers = [{"up_to": None, "rate": rate}]
+        if period not in PERIODS:
+            raise ValueError(f"Periode tagihan tidak dikenal: {period!r}")
+        self.name = name
+        self.tiers = [{"up_to": t.get("up_to"), "rate": float(t["rate"])} for t in tiers]
+        self.blocks = [dict(b) for b in blocks]
+        self.default_block = default_block
+        self.fixed_charge = float(fixed_charge)
+        self.period = period
+
+        # Tabel tingkat: batas bawah, tarif, dan biaya kumulatif pada batas bawah
+        uppers = [t["up_to"] for t in self.tiers]
+        if any(u is None for u in uppers[:-1]) or uppers[-1] is not None:
+            raise ValueError(f"Hanya tingkat terakhir tarif {name!r} yang boleh tanpa batas")
+        lower = np.array([0.0] + [float(u) for u in uppers[:-1]])
+        if np.any(np.diff(lower) <= 0):
+            raise ValueError(f"Batas tingkat tarif {name!r} harus naik")
+        self._lower = lower
+        self._rates = np.array([t["rate"] for t in self.tiers])
+        self._cumulative = np.concatenate([[0.0], np.cumsum(np.diff(lower) * self._rates[:-1])])
+
+        # Tabel blok: menit-dalam-minggu → indeks blok (0 = blok bawaan)
+        self.block_names = [default_block] + [b["name"] for b in self.blocks]
+        self.multipliers = np.array([1.0] + [float(b.get("multiplier", 1.0)) for b in self.blocks])
+        table = np.zeros(MINUTES_PER_WEEK, dtype=np.int8)
+        for index, block in enumerate(self.blocks, start=1):
+            start, end = _minutes(block["start"]), _minutes(block["end"])
+            # Blok yang melewati tengah malam berlanjut ke hari berikutnya (Minggu → Senin)
+            span = start + np.arange(end - start if start < end else end + MINUTES_PER_DAY - start)
+            for day in block.get("days", range(7)):
+                table[(day * MINUTES_PER_DAY + span) % MINUTES_PER_WEEK] = index
+        self._block_table = table
+
+    @classmethod
+    def flat(cls, rate, name=None):
+        return cls(name or f"Flat Rp {rate:,.0f}".replace(",", "."), rate=rate, period=None)
+
+    @classmethod
+    def from_dict(cls, name, spec):
+        known = {"rate", "tiers", "blocks", "default_block", "fixed_charge", "period"}
+        unknown = set(spec) - known
+        if unknown:
+            raise ValueError(f"Kunci tidak dikenal pada tarif {name!r}: {', '.join(sorted(unknown))}")
+        return cls(name, **spec)
+
+    def to_dict(self):
+        spec = {"tiers": self.tiers, "fixed_charge": self.fixed_charge, "period": self.period}
+        if self.blocks:
+            spec.update(blocks=self.blocks, default_block=self.default_block)
+        return spec
+
+    def __repr__(self):
+        # Deterministik agar bisa dipakai sebagai kunci cache grafik
+        return f"Tariff({self.name!r}, {json.dumps(self.to_dict(), sort_keys=True)})"
+
+    @property
+    def is_flat(self):
+        return len(self.tiers) == 1 and not self.blocks
+
+    @property
+    def base_rate(self):
+        return self.tiers[0]["rate"]
+
+    def cumulative_cost(self, kwh):
+        """Biaya tanpa pengali blok untuk pemakaian kumulatif ``kwh`` dalam satu periode"""
+        x = np.asarray(kwh, dtype=float)
+        k = np.maximum(np.searchsorted(self._lower, x, side="right") - 1, 0)
+        return self._cumulative[k] + (x - self._lower[k]) * self._rates[k]
+
+    def block_index(self, timestamps):
+        """Indeks blok waktu untuk setiap stempel waktu (0 = blok bawaan)"""
+        minutes = _as_minutes(timestamps).astype(np.int64)
+        return self._block_table[(minutes + _EPOCH_WEEKDAY * MINUTES_PER_DAY) % MINUTES_PER_WEEK]
+
+    def period_labels(self, timestamps):
+        """Kode periode tagihan (bulan/hari sejak epoch, atau 0 tanpa periode)"""
+        t = _as_minutes(timestamps)
+        if self.period is None:
+            return np.zeros(t.shape, dtype=np.int64)
+        unit = "datetime64[M]" if self.period == "month" else "datetime64[D]"
+        return t.astype(unit).astype(np.int64)
+
+    def _period_starts(self, t):
+        labels = self.period_labels(t)
+        return np.flatnonzero(np.concatenate([[True], labels[1:] != labels[:-1]]))
+
+    def interval_cost(self, timestamps, cumulative, kwh):
+        """Biaya selang bila pemakaian kumulatif periode di akhir selang sudah diketahui"""
+        multiplier = self.multipliers[self.block_index(timestamps)]
+        return self._interval_cost(np.asarray(cumulative, dtype=float), np.asarray(kwh, dtype=float)) * multiplier
+
+    @traced(category="hitung")
+    def price(self, timestamps, kwh):
+        """Biaya energi (Rp) setiap selang.
+
+        ``kwh`` berbentuk ``(n,)`` atau ``(n, meter)`` dengan ``timestamps``
+        (n,) yang urut naik; tingkat dihitung ulang dari nol tiap periode.
+        Biaya tetap (abonemen) tidak termasuk, lihat :meth:`bill`.
+        """
+        t = _as_minutes(timestamps)
+        energy = np.asarray(kwh, dtype=float)
+        if energy.shape[0] != t.shape[0]:
+            raise ValueError("Jumlah stempel waktu dan baris energi harus sama")
+        if t.size > 1 and np.any(t[1:] < t[:-1]):
+            raise ValueError("Stempel waktu harus urut naik")
+
+        multiplier = self.multipliers[self.block_index(t)][:, None]
+        column = energy.ndim == 1
+        energy2d = energy[:, None] if column else energy
+        if len(self.tiers) == 1:
+            out = energy2d * (self.base_rate * multiplier)
+            return out[:, 0] if column else out
+
+        bounds = np.append(self._period_starts(t), t.size)
+        out = np.empty_like(energy2d)
+        buffer = np.empty((t.size, min(METER_CHUNK, energy2d.shape[1])))
+        for j in range(0, energy2d.shape[1], METER_CHUNK):
+            block = energy2d[:, j:j + METER_CHUNK]
+            cumulative = buffer[:, :block.shape[1]]
+            # Kumulatif dimulai ulang dari nol di awal setiap periode tagihan
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                np.cumsum(block[start:stop], axis=0, out=cumulative[start:stop])
+            out[:, j:j + METER_CHUNK] = self._interval_cost(cumulative, block)
+        out *= multiplier
+        return out[:, 0] if column else out
+
+    def _interval_cost(self, cumulative, energy):
+        """``F(kumulatif) − F(kumulatif − energi)`` tanpa mengevaluasi F dua kali penuh"""
+        end_tier = np.searchsorted(self._lower, cumulative, side="right") - 1
+        np.maximum(end_tier, 0, out=end_tier)
+        before = cumulative - energy
+        start_tier = np.searchsorted(self._lower, before, side="right") - 1
+        np.maximum(start_tier, 0, out=start_tier)
+        cost = self._rates[end_tier] * energy
+        # Hanya selang yang melewati batas tingkat yang perlu dihitung tepat
+        crossing = np.flatnonzero(start_tier != end_tier)
+        if crossing.size:
+            cost.reshape(-1)[crossing] = (self.cumulative_cost(cumulative.reshape(-1)[crossing])
+                                          - self.cumulative_cost(before.reshape(-1)[crossing]))
+        return cost
+
+    def bill(self, timestamps, kwh):
+        """Rekap per periode: dict ``period``, ``energy_kwh``, ``cost`` (termasuk abonemen)"""
+        t = _as_minutes(timestamps)
+        energy = np.asarray(kwh, dtype=float)
+        cost = self.price(t, energy)
+        starts = self._period_starts(t)
+        unit = {"month": "datetime64[M]", "day": "datetime64[D]"}.get(self.period)
+        return {
+            "period": t[starts].astype(unit) if unit else t[starts],
+            "energy_kwh": np.add.reduceat(energy, starts, axis=0),
+            "cost": np.add.reduceat(cost, starts, axis=0) + self.fixed_charge,
+        }
+
+    def cost_for_load(self, power_w, hours, start="00:00", step_minutes=15):
+        """Biaya beban tetap ``power_w`` selama ``hours`` jam mulai pukul ``start``"""
+        steps = max(int(np.ceil(hours * 60 / step_minutes)), 1)
+        t = np.datetime64("2024-01-01T00:00") + np.timedelta64(_minutes(start), "m") \
+            + np.arange(steps) * np.timedelta64(step_minutes, "m")
+        kwh = np.full(steps, float(power_w) / 1000 * hours / steps)
+        return float(self.price(t, kwh).sum())
+
+
+def parse_tariffs(data):
+    """Dict ``{nama: spesifikasi}`` (opsional di bawah kunci ``tariffs``) → dict ``Tariff``"""
+    if not isinstance(data, dict):
+        raise ValueError("Berkas tarif harus berisi pemetaan nama golongan → spesifikasi")
+    classes = data.get("tariffs", data)
+    return {name: Tariff.from_dict(name, spec) for name, spec in classes.items()}
+
+
+def load_tariffs(path):
+    """Muat golongan tarif dari berkas ``.json``, ``.yaml``, atau ``.yml``"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    return loads_tariffs(text, os.path.splitext(str(path))[1])
+
+
+def loads_tariffs(text, suffix=".json"):
+    """Seperti :func:`load_tariffs` tetapi dari teks"""
+    if suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("Berkas YAML membutuhkan paket 'pyyaml'") from None
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    return parse_tariffs(data)
+
+
+def default_tariffs():
+    return parse_tariffs(DEFAULT_TARIFFS)
@@ -0,0 +1,299 @@
+"""Analisis toleransi Monte Carlo untuk jaringan hambatan seri–paralel.
+
+Setiap percobaan mengambil nilai semua hambatan dari distribusi toleransinya
+(seragam atau normal terpotong ±toleransi, opsional dibulatkan dulu ke deret
+E), lalu menghitung R_total, arus, dan daya setiap hambatan. Percobaan
+dijalankan dalam batch tervektorisasi (matriks ``percobaan × node``) dan
+batch dibagi ke beberapa proses.
+
+Setiap batch tidak menyimpan sampel, hanya histogram halus pada rentang
+kasus terburuk (hasil aritmetika interval) beserta jumlah, jumlah kuadrat,
+min, dan maks. Dengan begitu 1e7 percobaan tetap berjalan dengan memori
+kecil. Persentil dibaca dari CDF histogram.
+
+Setiap batch memakai ``SeedSequence`` turunannya sendiri, sehingga hasil
+dengan ``seed`` yang sama identik berapa pun jumlah proses yang dipakai.
+"""
+
+import math
+import os
+
+import numpy as np
+
+from .network import LEAF, SERIES, parse_expression
+
+# Deret E (IEC 60063); E48/E96 mengikuti rumus 10^(i/n) dibulatkan 3 digit
+E_SERIES = {
+    "E6": (1.0, 1.5, 2.2, 3.3, 4.7, 6.8),
+    "E12": (1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2),
+    "E24": (1.0, 1.1, 1.2, 1.3, 1.5, 1.6, 1.8, 2.0, 2.2, 2.4, 2.7, 3.0,
+            3.3, 3.6, 3.9, 4.3, 4.7, 5.1, 5.6, 6.2, 6.8, 7.5, 8.2, 9.1),
+    "E48": tuple(round(10 ** (i / 48), 2) for i in range(48)),
+    "E96": tuple(round(10 ** (i / 96), 2) for i in range(96)),
+}
+
+# Toleransi baku tiap deret (fraksi)
+SERIES_TOLERANCE = {"E6": 0.20, "E12": 0.10, "E24": 0.05, "E48": 0.02, "E96": 0.01}
+
+DISTRIBUTIONS = ("uniform", "normal")
+
+# Jumlah bin histogram halus per besaran (persentil dibaca dari sini)
+FINE_BINS = 4096
+
+# Elemen matriks percobaan × node per batch (~32 MB float64)
+BATCH_BUDGET = 1 << 22
+MAX_BATCH = 200_000
+
+# Hanya sejumlah hambatan pertama yang dicatat arus dan dayanya
+MAX_LEAF_QUANTITIES = 20
+
+
+def nearest_e_value(R, series="E24"):
+    """Nilai deret E terdekat (jarak logaritmik) untuk setiap hambatan ``R``"""
+    try:
+        mantissas = np.array(E_SERIES[series] + (10.0,))
+    except KeyError:
+        raise ValueError(f"Deret tidak dikenal: {series}") from None
+    R = np.asarray(R, dtype=float)
+    decade = np.floor(np.log10(R))
+    scaled = R / 10 ** decade
+    k = np.abs(np.log(scaled[..., None] / mantissas)).argmin(axis=-1)
+    return np.round(mantissas[k] * 10 ** decade, 10)
+
+
+def series_network(values):
+    """:class:`~listrik.network.Network` untuk hambatan ``values`` dirangkai seri"""
+    return _flat_network(values, " + ")
+
+
+def parallel_network(values):
+    """:class:`~listrik.network.Network` untuk hambatan ``values`` dirangkai paralel"""
+    return _flat_network(values, " || ")
+
+
+def _flat_network(values, operator):
+    names = [f"R{i + 1}" for i in range(len(values))]
+    return parse_expression(operator.join(names), dict(zip(names, values)))
+
+
+class _Evaluator:
+    """Evaluasi jaringan untuk banyak set nilai hambatan sekaligus"""
+
+    def __init__(self, network):
+        self.size = network.size
+        self.root = network.root
+        self.leaves = np.flatnonzero(network.kind == LEAF)
+        internal = np.flatnonzero(network.kind != LEAF)
+        # Nomor pasca-urut: anak selalu dievaluasi sebelum induknya
+        self.groups = [(int(node), network.kind[node] == SERIES, network.child_nodes(node))
+                       for node in internal.tolist()]
+        self.tracked = self.leaves[:MAX_LEAF_QUANTITIES]
+        self.names = (["R_total", "I_total", "P_total"]
+                      + [f"I({network.labels[k]})" for k in self.tracked]
+                      + [f"P({network.labels[k]})" for k in self.tracked])
+
+    def resistance(self, leaf_values):
+        R = np.empty((leaf_values.shape[0], self.size))
+        R[:, self.leaves] = leaf_values
+        for node, is_series, kids in self.groups:
+            if is_series:
+                R[:, node] = R[:, kids].sum(axis=1)
+            else:
+                R[:, node] = 1.0 / (1.0 / R[:, kids]).sum(axis=1)
+        return R
+
+    def quantities(self, leaf_values, voltage):
+        """Matriks ``percobaan × besaran`` sesuai urutan :attr:`names`"""
+        R = self.resistance(leaf_values)
+        I = np.empty_like(R)
+        I[:, self.root] = voltage / R[:, self.root]
+        for node, is_series, kids in reversed(self.groups):
+            if is_series:
+                I[:, kids] = I[:, node][:, None]
+            else:
+                I[:, kids] = (I[:, node] * R[:, node])[:, None] / R[:, kids]
+        I_leaf = I[:, self.tracked]
+        return np.column_stack([
+            R[:, self.root], I[:, self.root], voltage * I[:, self.root],
+            I_leaf, I_leaf ** 2 * R[:, self.tracked],
+        ])
+
+    def bounds(self, low, high, voltage):
+        """Rentang kasus terburuk tiap besaran (aritmetika interval)"""
+        # R_total naik monoton terhadap setiap hambatan, jadi rentangnya eksak
+        R_lo = self.resistance(low[None, :])[0]
+        R_hi = self.resistance(high[None, :])[0]
+        I_lo = np.empty(self.size)
+        I_hi = np.empty(self.size)
+        I_lo[self.root] = voltage / R_hi[self.root]
+        I_hi[self.root] = voltage / R_lo[self.root]
+        for node, is_series, kids in reversed(self.groups):
+            if is_series:
+                I_lo[kids], I_hi[kids] = I_lo[node], I_hi[node]
+            else:
+                I_lo[kids] = I_lo[node] * R_lo[node] / R_hi[kids]
+                I_hi[kids] = I_hi[node] * R_hi[node] / R_lo[kids]
+        t = self.tracked
+        lo = np.concatenate([[R_lo[self.root], I_lo[self.root], voltage * I_lo[self.root]],
+                             I_lo[t], I_lo[t] ** 2 * R_lo[t]])
+        hi = np.concatenate([[R_hi[self.root], I_hi[self.root], voltage * I_hi[self.root]],
+                             I_hi[t], I_hi[t] ** 2 * R_hi[t]])
+        # Toleransi nol: beri lebar minimal agar histogram tetap terdefinisi
+        pad = np.maximum(np.abs(hi) * 1e-12, 1e-300) * (hi <= lo)
+        return lo - pad, hi + pad
+
+
+def sample_values(rng, nominal, tolerance, trials, distribution="uniform"):
+    """Nilai hambatan acak ``percobaan × hambatan`` dalam batas ±toleransi"""
+    if distribution == "uniform":
+        deviation = rng.uniform(-1.0, 1.0, (trials, nominal.size))
+    elif distribution == "normal":
+        # Normal dengan toleransi = 3σ, dipotong pada ±3σ (komponen di luar ditolak pabrik)
+        deviation = rng.standard_normal((trials, nominal.size))
+        outside = np.abs(deviation) > 3
+        while outside.any():
+            deviation[outside] = rng.standard_normal(int(outside.sum()))
+            outside = np.abs(deviation) > 3
+        deviation /= 3
+    else:
+        raise ValueError(f"Distribusi tidak dikenal: {distribution}")
+    return nominal * (1 + tolerance * deviation)
+
+
+def _run_batch(evaluator, nominal, tolerance, distribution, voltage, low, high, spec, seed, trials):
+    """Statistik satu batch: histogram halus, jumlah, jumlah kuadrat, min, maks, lolos spesifikasi"""
+    rng = np.random.default_rng(seed)
+    values = evaluator.quantities(sample_values(rng, nominal, tolerance, trials, distribution), voltage)
+    counts = np.empty((values.shape[1], FINE_BINS), dtype=np.int64)
+    for q in range(values.shape[1]):
+        counts[q] = np.histogram(values[:, q], bins=FINE_BINS, range=(low[q], high[q]))[0]
+    R_total = values[:, 0]
+    passed = trials if spec is None else int(np.count_nonzero((R_total >= spec[0]) & (R_total <= spec[1])))
+    return counts, values.sum(axis=0), (values ** 2).sum(axis=0), values.min(axis=0), values.max(axis=0), passed
+
+
+class ToleranceResult:
+    """Ringkasan Monte Carlo per besaran (R_total, arus, daya)"""
+
+    def __init__(self, names, nominal, low, high, counts, sums, sum_sq, mins, maxs, trials, passed, spec):
+        self.names = names
+        self.nominal = nominal
+        self.low = low
+        self.high = high
+        self.counts = counts
+        self.trials = trials
+        self.passed = passed
+        self.spec = spec
+        self.mean = sums / trials
+        self.std = np.sqrt(np.maximum(sum_sq / trials - self.mean ** 2, 0.0))
+        self.min = mins
+        self.max = maxs
+
+    @property
+    def yield_fraction(self):
+        """Fraksi percobaan dengan R_total di dalam batas spesifikasi"""
+        return self.passed / self.trials
+
+    def index(self, name):
+        return self.names.index(name)
+
+    def percentile(self, q):
+        """Persentil ``q`` (0–100) setiap besaran, interpolasi linear di dalam bin"""
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        out = np.empty((len(self.names), q.size))
+        for k in range(len(self.names)):
+            edges = np.linspace(self.low[k], self.high[k], FINE_BINS + 1)
+            cdf = np.concatenate([[0], np.cumsum(self.counts[k])]) / self.trials
+            # Batasi ke min/maks teramati agar ekor tidak melampaui data
+            out[k] = np.clip(np.interp(q / 100, cdf, edges), self.min[k], self.max[k])
+        return out
+
+    def histogram(self, name, bins=80):
+        """``(tepi, jumlah)`` histogram kasar pada rentang nilai teramati"""
+        k = self.index(name)
+        edges = np.linspace(self.low[k], self.high[k], FINE_BINS + 1)
+        occupied = np.flatnonzero(self.counts[k])
+        if occupied.size == 0:
+            return edges[:2], np.zeros(1, dtype=np.int64)
+        counts = self.counts[k, occupied[0]:occupied[-1] + 1]
+        group = max(1, math.ceil(counts.size / bins))
+        padded = np.zeros(math.ceil(counts.size / group) * group, dtype=np.int64)
+        padded[:counts.size] = counts
+        step = (self.high[k] - self.low[k]) / FINE_BINS * group
+        return edges[occupied[0]] + step * np.arange(padded.size // group + 1), padded.reshape(-1, group).sum(axis=1)
+
+    def summary(self, percentiles=(1, 50, 99)):
+        """Tabel per besaran: nominal, rata-rata, σ, persentil, min/maks, kasus terburuk"""
+        import pandas as pd
+
+        table = pd.DataFrame({"nominal": self.nominal, "mean": self.mean, "std": self.std,
+                              "min": self.min}, index=pd.Index(self.names, name="besaran"))
+        for q, column in zip(percentiles, self.percentile(percentiles).T):
+            table[f"p{q:g}"] = column
+        table["max"] = self.max
+        table["worst_low"] = self.low
+        table["worst_high"] = self.high
+        return table
+
+
+def monte_carlo(network, tolerance=0.05, voltage=12.0, trials=1_000_000, distribution="uniform",
+                series=None, seed=None, spec=None, workers=None, progress=None):
+    """Jalankan ``trials`` percobaan Monte Carlo pada ``network``.
+
+    ``tolerance`` berupa fraksi (0.05 = 5%) untuk semua hambatan atau array
+    per hambatan. ``series`` (mis. ``"E24"``) membulatkan nilai nominal ke
+    deret E terdekat lebih dulu. ``spec`` adalah batas relatif R_total
+    (0.02 = ±2% dari nominal) untuk menghitung yield. ``seed`` membuat hasil
+    dapat diulang. ``progress(fraksi)`` dipanggil setiap batch selesai.
+    """
+    evaluator = _Evaluator(network)
+    nominal = network.value[evaluator.leaves]
+    if series is not None:
+        nominal = nearest_e_value(nominal, series)
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=float), nominal.shape)
+    if np.any(tolerance < 0) or np.any(tolerance >= 1):
+        raise ValueError("Toleransi harus di antara 0 dan 1")
+    low, high = evaluator.bounds(nominal * (1 - tolerance), nominal * (1 + tolerance), voltage)
+    nominal_values = evaluator.quantities(nominal[None, :], voltage)[0]
+    R_nominal = nominal_values[0]
+    spec_bounds = None if spec is None else (R_nominal * (1 - spec), R_nominal * (1 + spec))
+
+    trials = int(trials)
+    batch = max(1, min(MAX_BATCH, BATCH_BUDGET // network.size))
+    sizes = [batch] * (trials // batch) + ([trials % batch] if trials % batch else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (evaluator, nominal, tolerance, distribution, voltage, low, high, spec_bounds)
+
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    results = [None] * len(sizes)
+    if workers <= 1:
+        for k, (size, child) in enumerate(zip(sizes, seeds)):
+            results[k] = _run_batch(*args, child, size)
+            if progress is not None:
+                progress((k + 1) / len(sizes))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_batch, *args, child, size): k
+                       for k, (size, child) in enumerate(zip(sizes, seeds))}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    if progress is not None:
+                        progress(done / len(sizes))
+            except BaseException:
+                # Mis. dibatalkan lewat ``progress``: batch yang belum mulai tidak perlu ditunggu
+                for future in futures:
+                    future.cancel()
+                raise
+
+    # Digabung sesuai urutan batch agar jumlah float identik untuk seed yang sama
+    counts = sum(r[0] for r in results)
+    sums = sum(r[1] for r in results)
+    sum_sq = sum(r[2] for r in results)
+    mins = np.min([r[3] for r in results], axis=0)
+    maxs = np.max([r[4] for r in results], axis=0)
+    passed = sum(r[5] for r in results)
+    return ToleranceResult(evaluator.names, nominal_values, low, high, counts, sums, sum_sq,
+                           mins, maxs, trials, passed, spec_bounds)
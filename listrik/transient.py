@@ -0,0 +1,344 @@
+"""Simulasi transien rangkaian RC/RL/RLC saat saklar ditutup (t = 0).
+
+Kapasitor dan induktor diganti model pendamping (companion model)
+backward-Euler atau trapesium: konduktansi ``G`` paralel dengan sumber arus
+riwayat. Untuk langkah ``h`` tertentu matriks MNA tetap, sehingga
+faktorisasinya cukup dilakukan sekali; seluruh rangkaian lalu tereduksi
+menjadi rekurensi linear berdimensi kecil pada variabel keadaan
+(tegangan kapasitor, arus induktor)::
+
+    s[k+1] = M s[k] + c
+
+Rekurensi dijalankan per blok ``K`` langkah sekaligus memakai pangkat
+``M^k`` yang dihitung sekali per ukuran langkah, sehingga jutaan titik waktu
+tidak membutuhkan jutaan penyelesaian sistem linear.
+
+Ukuran langkah adaptif berada pada kisi ``h_max / 2^level``. Setiap blok
+diperiksa dengan penggandaan langkah (blok yang sama dengan ``2h``); bila
+galat Richardson melebihi toleransi, blok diulang dengan langkah setengahnya,
+dan bila jauh di bawah toleransi langkah berikutnya digandakan. Operator
+setiap level di-cache sehingga berpindah level tidak memfaktorkan ulang.
+"""
+
+import math
+
+import numpy as np
+
+from .circuit import Circuit, _block_jacobi
+from .sparse import DENSE_LIMIT, CSRMatrix, solve
+
+METHODS = {"be": 1, "trap": 2}
+
+# Batas elemen blok pangkat ``K × s × s`` (float64) per level
+BLOCK_BUDGET = 1 << 21
+MAX_BLOCK = 4096
+MAX_LEVEL = 24
+# Batas jumlah langkah relatif terhadap ``points`` sebelum simulasi dihentikan
+MAX_STEPS_FACTOR = 256
+
+
+class _StepOperator:
+    """Operator satu ukuran langkah: rekurensi keadaan dan keluaran MNA"""
+
+    def __init__(self, analysis, h):
+        self.h = h
+        method = analysis.method
+        alpha = 2.0 if method == "trap" else 1.0
+        cap, ind = analysis.cap, analysis.ind
+        nc, nl = cap["value"].size, ind["value"].size
+        size = analysis.A.shape[0]
+
+        gc = alpha * cap["value"] / h
+        gl = h / (alpha * ind["value"])
+
+        # Stempel konduktansi pendamping di atas matriks MNA statis
+        a = np.concatenate([cap["a"], ind["a"]])
+        b = np.concatenate([cap["b"], ind["b"]])
+        g = np.concatenate([gc, gl])
+        rows = np.concatenate([analysis.A.rows, a, b, a, b])
+        cols = np.concatenate([analysis.A.indices, a, b, b, a])
+        vals = np.concatenate([analysis.A.data, g, g, -g, -g])
+        keep = (rows >= 0) & (cols >= 0)
+        A = CSRMatrix.from_coo(rows[keep], cols[keep], vals[keep], (size, size))
+
+        # J = H s: arus riwayat tiap elemen; E memetakan J ke ruas kanan MNA
+        s_dim = analysis.state_size
+        H = np.zeros((nc + nl, s_dim))
+        c_idx, l_idx = np.arange(nc), nc + np.arange(nl)
+        if method == "trap":
+            H[c_idx, analysis.v_c] = gc
+            H[c_idx, analysis.i_c] = 1.0
+            H[l_idx, analysis.i_l] = 1.0
+            H[l_idx, analysis.v_l] = gl
+        else:
+            H[c_idx, analysis.v_c] = gc
+            H[l_idx, analysis.i_l] = 1.0
+        E = np.zeros((size, nc + nl))
+        sign = np.concatenate([np.ones(nc), -np.ones(nl)])
+        for k, (na, nb) in enumerate(zip(a, b)):
+            if na >= 0:
+                E[na, k] += sign[k]
+            if nb >= 0:
+                E[nb, k] -= sign[k]
+
+        # Satu faktorisasi per ukuran langkah: x = x_z + W s
+        rhs = np.column_stack([analysis.z, E @ H])
+        solution = _solve_many(A, rhs, analysis.n_nodes)
+        self.x_z, self.W = solution[:, 0], solution[:, 1:]
+
+        # Keadaan baru sebagai fungsi solusi MNA dan keadaan lama
+        D = analysis.difference
+        R_x = np.zeros((s_dim, size))
+        R_s = np.zeros((s_dim, s_dim))
+        R_x[analysis.v_c] = D[c_idx]
+        R_x[analysis.i_l] = gl[:, None] * D[l_idx]
+        R_s[analysis.i_l] = H[l_idx]
+        if method == "trap":
+            R_x[analysis.i_c] = gc[:, None] * D[c_idx]
+            R_s[analysis.i_c] = -H[c_idx]
+            R_x[analysis.v_l] = D[l_idx]
+        self.M = R_x @ self.W + R_s
+        self.c = R_x @ self.x_z
+
+        # Pangkat M^k dan jumlah Σ M^j c untuk k = 1..K
+        K = analysis.block
+        P = np.empty((K, s_dim, s_dim))
+        S = np.empty((K, s_dim))
+        P[0], S[0] = self.M, self.c
+        for k in range(1, K):
+            P[k] = self.M @ P[k - 1]
+            S[k] = self.M @ S[k - 1] + self.c
+        self.P, self.S = P, S
+
+    def advance(self, state, steps):
+        """Keadaan setelah 1..``steps`` langkah dari ``state`` (array ``steps × s``)"""
+        return np.einsum("kij,j->ki", self.P[:steps], state) + self.S[:steps]
+
+
+class TransientAnalysis:
+    """Analisis transien dengan langkah adaptif dan operator yang dipakai ulang.
+
+    Semua sumber bernilai penuh sejak t = 0⁺ dengan kapasitor kosong dan
+    arus induktor nol (saklar baru ditutup). ``probes`` berisi nama node
+    (tegangan ``V(node)``) dan nama sumber tegangan (arus ``I(nama)``);
+    tegangan kapasitor dan arus induktor selalu ikut direkam.
+    """
+
+    def __init__(self, circuit, method="trap", rtol=1e-4, atol=1e-9, probes=None):
+        if method not in METHODS:
+            raise ValueError(f"Metode transien tidak dikenal: {method}")
+        self.circuit = circuit
+        self.method = method
+        self.order = METHODS[method]
+        self.rtol = rtol
+        self.atol = atol
+
+        self.n_nodes = len(circuit.nodes)
+        self.A, self.z = circuit.build(dc=False)
+        self.cap = circuit.table("capacitors")
+        self.ind = circuit.table("inductors")
+        nc, nl = self.cap["value"].size, self.ind["value"].size
+        if np.any(self.cap["value"] <= 0) or np.any(self.ind["value"] <= 0):
+            raise ValueError("Kapasitansi dan induktansi harus positif")
+
+        # Tata letak keadaan: BE [v_C, i_L]; trapesium [v_C, i_C, i_L, v_L]
+        if method == "trap":
+            self.v_c, self.i_c = np.arange(nc), nc + np.arange(nc)
+            self.i_l, self.v_l = 2 * nc + np.arange(nl), 2 * nc + nl + np.arange(nl)
+            self.state_size = 2 * (nc + nl)
+        else:
+            self.v_c, self.i_l = np.arange(nc), nc + np.arange(nl)
+            self.state_size = nc + nl
+        block = BLOCK_BUDGET // max(self.state_size ** 2, 1)
+        self.block = int(min(MAX_BLOCK, max(16, 2 ** int(math.log2(max(block, 1))))))
+
+        # Selisih tegangan node setiap elemen reaktif: v = D x
+        size = self.A.shape[0]
+        a = np.concatenate([self.cap["a"], self.ind["a"]])
+        b = np.concatenate([self.cap["b"], self.ind["b"]])
+        self.difference = np.zeros((nc + nl, size))
+        for k, (na, nb) in enumerate(zip(a, b)):
+            if na >= 0:
+                self.difference[k, na] += 1.0
+            if nb >= 0:
+                self.difference[k, nb] -= 1.0
+
+        self._select_probes(probes)
+        self._operators = {}
+        self.factorizations = 0
+
+    def _select_probes(self, probes):
+        circuit = self.circuit
+        if probes is None:
+            probes = circuit.nodes[:16] + [name for name, *_rest in circuit.vsources]
+        vsource_names = [name for name, *_rest in circuit.vsources]
+        rows, names = [], []
+        for probe in probes:
+            if probe in vsource_names:
+                rows.append(self.n_nodes + vsource_names.index(probe))
+                names.append(f"I({probe})")
+            else:
+                index = circuit.node_index(probe) if probe in circuit.nodes else None
+                if index is None:
+                    raise KeyError(probe)
+                rows.append(index)
+                names.append(f"V({probe})")
+        self.probe_rows = np.array(rows, dtype=np.int64)
+        self.names = names + [f"V({name})" for name, *_rest in circuit.capacitors] \
+            + [f"I({name})" for name, *_rest in circuit.inductors]
+
+    def operator(self, level):
+        """Operator untuk langkah ``h_max / 2^level`` (di-cache per level)"""
+        op = self._operators.get(level)
+        if op is None:
+            op = self._operators[level] = _StepOperator(self, self.h_max / 2.0 ** level)
+            self.factorizations += 1
+        return op
+
+    def initial_point(self):
+        """Keadaan awal dan nilai probe pada t = 0⁺ (kapasitor 0 V, induktor 0 A).
+
+        Kapasitor diganti sumber 0 V dan induktor sumber arus 0 A lalu
+        diselesaikan dengan analisis DC biasa; hasilnya memberi i_C(0⁺) dan
+        v_L(0⁺) yang konsisten sehingga metode trapesium tidak berosilasi.
+        """
+        circuit = self.circuit
+        state = np.zeros(self.state_size)
+        start = Circuit()
+        start._nodes = dict(circuit._nodes)
+        start.resistors = list(circuit.resistors)
+        start.vsources = list(circuit.vsources) + [(name, a, b, 0.0) for name, a, b, _c in circuit.capacitors]
+        start.isources = list(circuit.isources) + [(name, a, b, 0.0) for name, a, b, _l in circuit.inductors]
+        try:
+            solution = start.solve()
+        except (ValueError, np.linalg.LinAlgError):
+            return state, None
+
+        x = np.concatenate([solution.node_voltages, solution.source_currents[:len(circuit.vsources)]])
+        if self.method == "trap":
+            first = len(circuit.vsources)
+            state[self.i_c] = solution.source_currents[first:first + len(circuit.capacitors)]
+            state[self.v_l] = self.difference[len(circuit.capacitors):, :x.size] @ x
+        return state, x[self.probe_rows]
+
+    def _outputs(self, op, previous, states):
+        """Baris keluaran: probe MNA (dari keadaan sebelumnya) dan keadaan reaktif"""
+        mna = previous @ op.W[self.probe_rows].T + op.x_z[self.probe_rows]
+        return np.column_stack([mna, states[:, self.v_c], states[:, self.i_l]])
+
+    def iter_chunks(self, t_stop, points=10_000, adaptive=True):
+        """Generator blok hasil ``(time, values)`` hingga ``t_stop`` detik.
+
+        ``points`` menentukan langkah terbesar ``t_stop / points``; langkah
+        diperkecil otomatis di bagian yang berubah cepat.
+        """
+        self.h_max = t_stop / points
+        self.steps = 0
+        self.rejected = 0
+        state, probes = self.initial_point()
+        if probes is None:
+            # Loop sumber tegangan–kapasitor: muatan melompat seketika pada t = 0
+            if self.method == "trap":
+                raise ValueError("Kapasitor terhubung langsung ke sumber tegangan ideal; "
+                                 "tambahkan hambatan seri atau gunakan metode 'be'")
+            probes = self.operator(0).x_z[self.probe_rows]
+        yield np.zeros(1), np.concatenate([probes, state[self.v_c], state[self.i_l]])[None, :]
+
+        # Waktu dihitung dalam tick bulat h_max / 2^MAX_LEVEL agar tidak ada galat
+        # pembulatan kumulatif; t = tick / total · t_stop tepat sama dengan t_stop di akhir
+        total = int(points) << MAX_LEVEL
+        tick, level = 0, 0
+        while tick < total:
+            span = 1 << (MAX_LEVEL - level)
+            remaining = total - tick
+            if remaining < span:
+                # Sisa lebih pendek dari satu langkah: pindah ke level terhalus yang masih
+                # muat, sehingga langkah terakhir berakhir tepat di t_stop tanpa dipotong
+                level = MAX_LEVEL - (remaining.bit_length() - 1)
+                continue
+            op = self.operator(level)
+            steps = min(self.block, remaining // span)
+            states = op.advance(state, steps)
+
+            error = 0.0
+            if adaptive and steps >= 2:
+                coarse = self.operator(level - 1).advance(state, steps // 2)
+                fine = states[1:2 * (steps // 2):2]
+                scale = self.atol + self.rtol * np.maximum(np.abs(states).max(axis=0), np.abs(state))
+                error = float(np.max(np.abs(fine - coarse) / scale, initial=0.0)) / (2 ** self.order - 1)
+                if error > 1.0 and level < MAX_LEVEL:
+                    level += 1
+                    self.rejected += 1
+                    continue
+
+            previous = np.vstack([state[None, :], states[:-1]])
+            time = (tick + span * np.arange(1, steps + 1)) / total * t_stop
+            yield time, self._outputs(op, previous, states)
+
+            self.steps += steps
+            if self.steps > MAX_STEPS_FACTOR * points:
+                raise ValueError(f"Langkah adaptif terlalu kecil: lebih dari {MAX_STEPS_FACTOR}× "
+                                 f"{points} titik; longgarkan rtol/atol")
+            state = states[-1]
+            tick += steps * span
+            # Galat jauh di bawah toleransi: gandakan langkah (galat naik ~2^order)
+            if error * 2 ** self.order < 0.5 and level > 0:
+                level -= 1
+
+    def run(self, t_stop, points=10_000, adaptive=True):
+        """Jalankan penuh dan kembalikan :class:`TransientResult`"""
+        times, values = [], []
+        for time, block in self.iter_chunks(t_stop, points, adaptive):
+            times.append(time)
+            values.append(block)
+        return TransientResult(np.concatenate(times), np.concatenate(values), self.names, self.stats())
+
+    def stats(self):
+        return {
+            "steps": getattr(self, "steps", 0),
+            "rejected": getattr(self, "rejected", 0),
+            "factorizations": self.factorizations,
+            "block": self.block,
+        }
+
+
+class TransientResult:
+    """Deret waktu hasil simulasi: ``time`` dan kolom ``values`` bernama ``names``"""
+
+    def __init__(self, time, values, names, stats):
+        self.time = time
+        self.values = values
+        self.names = list(names)
+        self.stats = stats
+
+    def __getitem__(self, name):
+        return self.values[:, self.names.index(name)]
+
+    def __len__(self):
+        return self.time.size
+
+
+def rc_circuit(voltage, resistance, capacitance):
+    """Sumber ``V`` → ``R`` → ``C`` ke ground (node ``in`` dan ``out``)"""
+    circuit = Circuit()
+    circuit.add_voltage_source("V", "in", "0", voltage)
+    circuit.add_resistor("R", "in", "out", resistance)
+    circuit.add_capacitor("C", "out", "0", capacitance)
+    return circuit
+
+
+def rl_circuit(voltage, resistance, inductance):
+    """Sumber ``V`` → ``R`` → ``L`` ke ground (node ``in`` dan ``out``)"""
+    circuit = Circuit()
+    circuit.add_voltage_source("V", "in", "0", voltage)
+    circuit.add_resistor("R", "in", "out", resistance)
+    circuit.add_inductor("L", "out", "0", inductance)
+    return circuit
+
+
+def _solve_many(A, rhs, n_nodes):
+    """Selesaikan ``A X = rhs`` untuk banyak kolom dengan satu faktorisasi"""
+    if A.shape[0] <= DENSE_LIMIT:
+        return np.linalg.solve(A.to_dense(), rhs)
+    M_inv = _block_jacobi(A, n_nodes)
+    return np.column_stack([solve(A, rhs[:, k], method="minres", M_inv=M_inv) for k in range(rhs.shape[1])])
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+
+from listrik.api import ApiServer
+
+
+def request(server, method, path, payload=None):
+    body = b"" if payload is None else (payload if isinstance(payload, bytes) else json.dumps(payload).encode())
+    status, response = asyncio.run(server.handle(method, path, body))
+    return status.value, json.loads(response)
+
+
+def test_ohm_batch_points():
+    server = ApiServer(workers=0)
+    status, body = request(server, "POST", "/ohm", {"points": [{"V": 12, "R": 4}, {"I": 2, "R": 5}]})
+    assert status == 200
+    assert body["results"]["I"] == [3.0, 2.0]
+    assert body["results"]["V"] == [12.0, 10.0]
+
+
+def test_non_object_payload_is_rejected_and_recorded():
+    server = ApiServer(workers=0)
+    for path in ("/netlist", "/synth", "/cable", "/battery", "/ohm"):
+        status, body = request(server, "POST", path, b"[1]")
+        assert status == 400, path
+        assert "error" in body
+    status, body = request(server, "POST", "/kvl", {"points": [1, 2]})
+    assert status == 400
+    metrics = server.metrics.snapshot()["endpoints"]
+    assert metrics["/netlist"]["errors"] == 1
+
+
+def test_unexpected_error_is_500_and_recorded(monkeypatch):
+    from listrik import api
+
+    def broken(payload):
+        raise RuntimeError("rusak")
+
+    monkeypatch.setitem(api.ENDPOINTS, "/ohm", broken)
+    server = ApiServer(workers=0)
+    status, body = request(server, "POST", "/ohm", {"V": [1]})
+    assert status == 500
+    assert server.metrics.snapshot()["endpoints"]["/ohm"]["errors"] == 1
+
+
+def test_unknown_endpoint_and_method():
+    server = ApiServer(workers=0)
+    assert request(server, "GET", "/nope")[0] == 404
+    assert request(server, "GET", "/ohm")[0] == 405
+
+
+def test_pooled_requests_decode_and_encode_in_worker():
+    from concurrent.futures import ProcessPoolExecutor
+
+    from listrik import api
+
+    server = ApiServer(workers=1)
+    server.pool = ProcessPoolExecutor(max_workers=1)
+    try:
+        n = 30_000
+        payload = json.dumps({"V": [12.0] * n, "R": [4.0] * n}).encode()
+        assert len(payload) > api.INLINE_BODY_BYTES
+        status, body = request(server, "POST", "/ohm", payload)
+        assert status == 200 and body["count"] == n and body["results"]["I"][-1] == 3.0
+        status, body = request(server, "POST", "/netlist", b"[1]")
+        assert status == 400
+    finally:
+        asyncio.run(server.close())
+    assert server.metrics.snapshot()["endpoints"]["/ohm"]["points"] == n
+
+
+def test_throughput_uses_sliding_window(monkeypatch):
+    from listrik import api
+
+    clock = [1000.0]
+    monkeypatch.setattr(api.time, "perf_counter", lambda: clock[0])
+    metrics = api.Metrics(window=10)
+    clock[0] += 3600  # server lama diam sebelum permintaan pertama
+    for _ in range(20):
+        clock[0] += 0.01
+        metrics.record("/ohm", 0.01, 1, True)
+    endpoint = metrics.snapshot()["endpoints"]["/ohm"]
+    assert endpoint["requests"] == 20 and endpoint["window"] == 10
+    assert endpoint["requests_per_s"] == pytest.approx(100.0)
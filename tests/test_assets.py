@@ -0,0 +1,14 @@
+import os
+import re
+
+from listrik.assets import DEFAULT_CSS, THEMES, theme_css
+
+
+def test_dark_theme_references_stylesheet_palette():
+    with open(os.path.join(os.path.dirname(__file__), "..", DEFAULT_CSS), encoding="utf-8") as f:
+        defined = set(re.findall(r"(--[\w-]+)\s*:", f.read()))
+    css = theme_css("Dark Mode")
+    referenced = re.findall(r"var\((--[\w-]+)\)", css)
+    assert len(referenced) == len(THEMES["Dark Mode"])
+    assert set(referenced) <= defined
+    assert "#" not in css
@@ -0,0 +1,51 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from listrik import cable
+from listrik.cli import main
+
+
+def schedule():
+    return pd.DataFrame({
+        "nama": ["A", "B", "C", "D", "E", "F"],
+        "panjang": [20, "rusak", 30, -5, 25, 25],
+        "arus": [10, 16, "", 10, 10, 10],
+        "penampang": [2.5, 2.5, 2.5, 2.5, "", "2,5mm"],
+    })
+
+
+def test_unparseable_rows_are_invalid():
+    result = cable.analyze_schedule(schedule())
+    assert result["status"].tolist() == [cable.STATUS_OK] + [cable.STATUS_INVALID] * 5
+    assert result.loc[1:, ["drop_pct", "ampacity", "min_section"]].isna().all().all()
+    assert np.isfinite(result.loc[0, "drop_pct"])
+
+
+def test_summary_counts_invalid_separately():
+    summary = cable.summarize(cable.analyze_schedule(schedule()))
+    assert summary["invalid"] == 5
+    assert summary["undersized"] == 0
+    assert summary["unsized"] == 0
+    assert summary["status"][cable.STATUS_INVALID] == 5
+
+
+def test_non_positive_section_is_invalid_not_fatal():
+    result = cable.analyze_runs([10.0, 10.0, 10.0], [5.0, 5.0, 5.0], ["cu"], [0.0, -1.5, 4.0])
+    assert result["status"].tolist() == [cable.STATUS_INVALID, cable.STATUS_INVALID, cable.STATUS_OK]
+    assert np.isnan(result["resistance"][:2]).all()
+
+
+def test_overloaded_run_is_flagged():
+    result = cable.analyze_runs([100.0], [40.0], ["cu"], [1.5])
+    assert result["status"][0] == cable.STATUS_BOTH
+    assert result["min_section"][0] > 1.5
+
+
+def test_cli_reports_invalid_rows(tmp_path):
+    path = tmp_path / "jadwal.csv"
+    schedule().to_csv(path, index=False)
+    out = io.StringIO()
+    assert main(["cable", str(path)], out) == 1
+    assert "5 saluran dilewati" in out.getvalue()
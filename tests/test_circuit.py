@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from listrik.circuit import Circuit, junction_circuit, loop_circuit, parse_netlist, parse_value
+from listrik.sparse import DENSE_LIMIT
+
+
+def mesh_circuit(n, floating=False):
+    """Grid n×n hambatan 1 Ω; sumber 1 V di pojok, beban 1 Ω di pojok seberang"""
+    circuit = Circuit()
+    idx = np.arange(n * n).reshape(n, n)
+    a = np.concatenate([idx[:, :-1].ravel(), idx[:-1, :].ravel()])
+    b = np.concatenate([idx[:, 1:].ravel(), idx[1:, :].ravel()])
+    circuit.add_resistors([f"n{k}" for k in a], [f"n{k}" for k in b], np.ones(a.size))
+    if floating:
+        # Sumber di antara dua node internal: tidak ada ujung di ground
+        circuit.add_voltage_source("V", "n0", f"n{n * n // 2}", 1.0)
+        circuit.add_resistor("Rg", f"n{n * n - 1}", "0", 1.0)
+    else:
+        circuit.add_voltage_source("V", "n0", "0", 1.0)
+        circuit.add_resistor("Rg", f"n{n * n - 1}", "0", 1.0)
+    return circuit
+
+
+@pytest.mark.parametrize("value, expected", [("220", 220.0), ("4.7k", 4700.0), ("10meg", 1e7),
+                                             ("100u", 1e-4), ("2m", 2e-3)])
+def test_parse_value(value, expected):
+    assert parse_value(value) == pytest.approx(expected)
+
+
+def test_loop_circuit_matches_ohm():
+    solution = loop_circuit(12.0, [2.0, 4.0]).solve()
+    assert solution.resistor_currents == pytest.approx([2.0, 2.0])
+    assert solution.resistor_voltages == pytest.approx([4.0, 8.0])
+    assert -solution.current("V") == pytest.approx(2.0)
+
+
+def test_junction_circuit_remaining_current():
+    solution = junction_circuit([3.0, 2.0], [1.5]).solve()
+    assert solution.current("I_sisa") == pytest.approx(3.5)
+
+
+def test_parse_netlist_divider():
+    circuit = parse_netlist("* pembagi\nV1 1 0 DC 10\nR1 1 2 1k\nR2 2 0 1k ; beban\n.end")
+    solution = circuit.solve()
+    assert solution.voltage("2") == pytest.approx(5.0)
+    assert solution.current("R1") == pytest.approx(5e-3)
+
+
+def test_parse_netlist_rejects_unknown_element():
+    with pytest.raises(ValueError):
+        parse_netlist("Q1 1 0 5")
+
+
+def test_zero_ohm_resistor_carries_short_current():
+    circuit = parse_netlist("V1 1 0 6\nR0 1 2 0\nR1 2 0 3")
+    solution = circuit.solve()
+    assert solution.current("R0") == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("method", ["direct", "minres", "amg"])
+def test_methods_agree_on_mesh(method):
+    circuit = mesh_circuit(12)
+    reference = circuit.solve(method="direct")
+    solution = circuit.solve(method=method)
+    assert solution.node_voltages == pytest.approx(reference.node_voltages, abs=1e-7)
+    assert np.abs(solution.kcl_residual()).max() < 1e-7
+
+
+def test_auto_uses_amg_above_dense_limit():
+    n = int(np.ceil(np.sqrt(DENSE_LIMIT))) + 5
+    circuit = mesh_circuit(n)
+    solution = circuit.solve()
+    assert solution.voltage("n0") == pytest.approx(1.0)
+    assert np.abs(solution.kcl_residual()).max() < 1e-7
+
+
+def test_auto_floating_source_uses_minres():
+    n = int(np.ceil(np.sqrt(DENSE_LIMIT))) + 5
+    circuit = mesh_circuit(n, floating=True)
+    solution = circuit.solve()
+    assert solution.voltage("n0") - solution.voltage(f"n{n * n // 2}") == pytest.approx(1.0, abs=1e-6)
+    assert np.abs(solution.kcl_residual()).max() < 1e-6
+
+
+def test_amg_rejects_floating_source():
+    with pytest.raises(ValueError):
+        mesh_circuit(4, floating=True).solve(method="amg")
@@ -0,0 +1,17 @@
+import io
+import json
+
+from listrik.cli import main
+
+
+def test_rules_uses_custom_rule_file(tmp_path):
+    readings = tmp_path / "pembacaan.csv"
+    readings.write_text("V,I\n12,1\n240,3\n5,0.1\n")
+    rule_file = tmp_path / "aturan.json"
+    rule_file.write_text(json.dumps([{"name": "tegangan-tinggi", "column": "V", "op": ">", "threshold": 100,
+                                      "severity": "critical"}]))
+    out = io.StringIO()
+    status = main(["rules", str(readings), "--rules", str(rule_file), "--quiet"], out)
+    assert status == 0
+    row = next(line for line in out.getvalue().splitlines() if line.startswith("tegangan-tinggi"))
+    assert row.split()[-1] == "1"
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from listrik import core
+
+
+def test_scalar_in_scalar_out():
+    assert core.current(12.0, 4.0) == pytest.approx(3.0)
+    assert core.current(12.0, 0.0) == 0.0
+    assert np.ndim(core.power_vi(2.0, 3.0)) == 0
+
+
+def test_dataframe_keeps_labels():
+    df = pd.DataFrame({"V": [1.0, 2.0], "I": [3.0, 0.0]}, index=["a", "b"])
+    result = core.power_vi(df, 2.0)
+    assert isinstance(result, pd.DataFrame)
+    assert list(result.columns) == ["V", "I"]
+    assert list(result.index) == ["a", "b"]
+
+
+def test_row_reduction_of_dataframe_is_series():
+    df = pd.DataFrame({"R1": [10.0, 2.0], "R2": [10.0, 0.0]}, index=["x", "y"])
+    series = core.series_resistance(df)
+    assert isinstance(series, pd.Series)
+    assert series.to_dict() == {"x": 20.0, "y": 2.0}
+    parallel = core.parallel_resistance(df, axis=0)
+    assert list(parallel.index) == ["R1", "R2"]
+    assert parallel["R2"] == pytest.approx(10.0)
+
+
+def test_series_input_keeps_index():
+    V = pd.Series([50.0, 300.0, 900.0], index=[3, 5, 7])
+    rating = core.power_rating(V)
+    assert list(rating.index) == [3, 5, 7]
+    assert rating.tolist() == ["Efisien", "Sedang", "Tinggi"]
@@ -0,0 +1,87 @@
+from listrik.depgraph import DependencyGraph
+
+
+def product(a, b):
+    return a * b
+
+
+def total(a, b):
+    return a + b
+
+
+def define(graph):
+    """a, b → tegangan (a·b) → daya (tegangan²); b → sisi (b + 1); a → tanda → label"""
+    graph.define("tegangan", product, "a", "b")
+    graph.define("daya", lambda v: v ** 2, "tegangan")
+    graph.define("sisi", lambda b: b + 1, "b")
+    graph.define("tanda", lambda a: a > 0, "a")
+    graph.define("label", lambda positif: "positif" if positif else "negatif", "tanda")
+
+
+def build():
+    graph = DependencyGraph()
+    graph.set_input("a", 2.0)
+    graph.set_input("b", 3.0)
+    define(graph)
+    for name in ("daya", "sisi", "label"):
+        graph.get(name)
+    graph.begin_run()
+    return graph
+
+
+def refresh(graph, *names):
+    graph.begin_run()
+    for name in names:
+        graph.get(name)
+    return sorted(graph.recomputed)
+
+
+def test_unchanged_graph_recomputes_nothing():
+    graph = build()
+    graph.set_input("a", 2.0)
+    assert refresh(graph, "daya", "sisi", "label") == []
+
+
+def test_input_change_recomputes_only_downstream():
+    graph = build()
+    graph.set_input("b", 4.0)
+    assert refresh(graph, "daya", "sisi", "label") == ["daya", "sisi", "tegangan"]
+    assert graph.get("daya") == 64.0
+    assert graph.get("sisi") == 5.0
+
+
+def test_unchanged_value_cuts_off_dependents():
+    graph = build()
+    graph.set_input("a", 5.0)
+    # tanda tetap True, jadi label tidak dihitung ulang
+    assert refresh(graph, "label") == ["tanda"]
+    assert graph.get("label") == "positif"
+
+
+def test_cutoff_disabled_always_propagates():
+    graph = build()
+    graph.define("tanda", lambda a: a > 0, "a", cutoff=False)
+    refresh(graph, "label")
+    graph.set_input("a", 5.0)
+    assert refresh(graph, "label") == ["label", "tanda"]
+
+
+def test_rerun_with_same_definitions_keeps_values():
+    graph = build()
+    # Rerun Streamlit: definisi yang sama dengan objek fungsi baru
+    define(graph)
+    assert refresh(graph, "daya", "sisi", "label") == []
+
+
+def test_redefining_code_invalidates_downstream():
+    graph = build()
+    graph.define("tegangan", total, "a", "b")
+    assert refresh(graph, "daya", "sisi", "label") == ["daya", "tegangan"]
+    assert graph.get("daya") == 25.0
+
+
+def test_redefining_dependencies_invalidates_downstream():
+    graph = build()
+    graph.define("tegangan", product, "b", "b")
+    assert refresh(graph, "daya", "sisi", "label") == ["daya", "tegangan"]
+    assert graph.get("daya") == 81.0
@@ -0,0 +1,34 @@
+from io import BytesIO
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+from matplotlib.image import imread
+
+from listrik.diagrams import DiagramRenderer
+
+pytestmark = pytest.mark.filterwarnings("ignore:Glyph")
+
+
+def decode(png):
+    return imread(BytesIO(png))
+
+
+def test_longer_labels_widen_crop():
+    warm = DiagramRenderer()
+    warm.series([1.0, 2.0])
+    image = decode(warm.series([1.0, 123456789012345.0]))
+    cold = decode(DiagramRenderer().series([1.0, 123456789012345.0]))
+    assert image.shape == cold.shape
+    assert np.abs(image - cold).max() <= 1 / 255 + 1e-6
+
+
+def test_repeated_render_is_stable():
+    renderer = DiagramRenderer()
+    first = renderer.kvl(12.0, [4.0, 6.0, 2.0], [4.0, 6.0, 2.0])
+    renderer.kvl(9.0, [3.0, 3.0, 3.0], [1.0, 1.0, 1.0])
+    assert renderer.kvl(12.0, [4.0, 6.0, 2.0], [4.0, 6.0, 2.0]) == first
+    assert len(renderer) == 1
@@ -0,0 +1,22 @@
+import io
+import warnings
+import zipfile
+
+from listrik.export import ExportJob
+
+
+class EchoExporter:
+    def render(self, spec, fmt, width, height, scale):
+        return spec.encode("utf-8")
+
+
+def test_colliding_names_get_unique_zip_members():
+    figures = {"a b": {"data": [1]}, "a_b": {"data": [2]}, "A_B": {"data": [3]}}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        job = ExportJob(EchoExporter(), figures, formats=("png", "svg"))
+        job.wait(10)
+    assert job.error is None
+    names = zipfile.ZipFile(io.BytesIO(job.data)).namelist()
+    assert len(names) == len(set(n.lower() for n in names)) == 6
+    assert {"a_b.png", "a_b_2.png", "A_B_3.png"} <= set(names)
@@ -0,0 +1,19 @@
+from listrik import figures
+from listrik.figcache import FigureCache
+
+
+def test_get_returns_independent_copies():
+    cache = FigureCache(maxsize=4)
+    first = cache.get(figures.vi_figure, 10.0)
+    first.update_layout(title="diubah oleh sesi lain")
+    second = cache.get(figures.vi_figure, 10.0)
+    assert second is not first
+    assert second.layout.title.text != "diubah oleh sesi lain"
+    assert cache.stats()["hits"] == 1
+
+
+def test_float_arguments_share_entry():
+    cache = FigureCache(maxsize=4)
+    cache.get_json(figures.vi_figure, 0.1 + 0.2)
+    cache.get_json(figures.vi_figure, 0.3)
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 4}
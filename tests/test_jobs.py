@@ -0,0 +1,67 @@
+import threading
+
+from listrik.jobs import CANCELLED, DONE, JobRunner
+
+GATES = {}
+
+
+def blocking(value, gate, progress):
+    """Job uji: menunggu ``GATES[gate]`` sambil melapor progres (titik batal)"""
+    while not GATES[gate].wait(0.01):
+        progress(None)
+    return value * 2
+
+
+def test_sessions_share_work_but_cancel_independently():
+    runner = JobRunner(workers=1)
+    GATES["share"] = threading.Event()
+    a = runner.submit("t", blocking, 1, "share")
+    b = runner.submit("t", blocking, 1, "share")
+    assert a is not b and a.key == b.key
+    a.cancel()
+    assert a.status == CANCELLED and a.done
+    assert b.status != CANCELLED and not b.done
+    GATES["share"].set()
+    assert b.wait(5)
+    assert b.status == DONE and b.result == 2
+    assert runner.stats()["misses"] == 1
+    runner.shutdown()
+
+
+def test_work_stops_when_every_subscriber_cancels():
+    runner = JobRunner(workers=1)
+    GATES["stop"] = threading.Event()
+    a = runner.submit("t", blocking, 1, "stop")
+    b = runner.submit("t", blocking, 1, "stop")
+    a.cancel()
+    b.cancel()
+    assert a._task._finished.wait(5)
+    assert a._task.status == CANCELLED
+    # Input yang sama setelah pembatalan memulai perhitungan baru
+    c = runner.submit("t", blocking, 1, "stop")
+    GATES["stop"].set()
+    assert c.wait(5) and c.result == 2
+    assert runner.stats()["misses"] == 2
+    runner.shutdown()
+
+
+def test_finished_result_is_cached():
+    runner = JobRunner(workers=1)
+    GATES["cache"] = threading.Event()
+    GATES["cache"].set()
+    first = runner.submit("t", blocking, 3, "cache")
+    assert first.wait(5)
+    second = runner.submit("t", blocking, 3, "cache")
+    assert second.cached and second.done and second.result == 6
+    assert runner.cached("t", 3, "cache") == 6
+    runner.shutdown()
+
+
+def test_shutdown_cancels_running_and_queued_work():
+    runner = JobRunner(workers=1)
+    GATES["shutdown"] = threading.Event()
+    running = runner.submit("t", blocking, 1, "shutdown")
+    queued = runner.submit("t", blocking, 2, "shutdown")
+    runner.shutdown()
+    assert running.wait(5) and running.status == CANCELLED
+    assert queued.wait(5) and queued.status == CANCELLED
@@ -0,0 +1,66 @@
+import re
+
+import numpy as np
+import pytest
+
+from listrik.network import LEAF, PARALLEL, SERIES, parse_definitions, parse_expression
+
+
+def test_series_parallel_equivalent():
+    net = parse_expression("R1 + (R2 || R3)", {"R1": 10, "R2": 20, "R3": 20})
+    assert net.equivalent_resistance == pytest.approx(20.0)
+    assert net.kind[net.root] == SERIES
+
+
+def test_same_operator_groups_are_flattened_across_parentheses():
+    net = parse_expression("(1k + 2k) + ((3k || 6k) + 4k) || 4k")
+    root_children = net.child_nodes(net.root)
+    assert net.kind[root_children].tolist() == [LEAF, LEAF, PARALLEL]
+    assert [net.labels[c] for c in root_children[:2]] == ["1k", "2k"]
+    parallel = net.child_nodes(root_children[2])
+    assert net.kind[parallel].tolist() == [SERIES, LEAF]
+    assert net.equivalent_resistance == pytest.approx(5400.0)
+
+
+def test_children_numbered_before_parent():
+    net = parse_expression("((1 || 2) + 3) || (4 + (5 || 6 || 7)) + 8")
+    has_parent = net.parent >= 0
+    assert (np.flatnonzero(has_parent) < net.parent[has_parent]).all()
+    assert net.describe(net.root) == "(((1 || 2) + 3) || (4 + (5 || 6 || 7))) + 8"
+
+
+def test_analyze_divides_current():
+    net = parse_expression("2 || 2")
+    result = net.analyze(voltage=10.0)
+    assert result["current"][net.root] == pytest.approx(10.0)
+    assert result["current"][:2] == pytest.approx([5.0, 5.0])
+
+
+def test_single_leaf():
+    net = parse_expression("(R1)", {"R1": 47.0})
+    assert net.size == 1
+    assert net.equivalent_resistance == pytest.approx(47.0)
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("", "kosong atau diakhiri"),
+    ("1 +", "kosong atau diakhiri"),
+    ("(1 + 2", "Kurung buka"),
+    ("1 + 2)", "Kurung tutup"),
+    ("1 + ()", "kosong di dalam kurung"),
+    ("1 2", "Operator hilang sebelum '2'"),
+    ("1 + || 2", "Operand hilang sebelum '||'"),
+    ("1 (2)", "Operator hilang sebelum '('"),
+    ("1 | 2", "tidak dikenal"),
+    ("1 + x", "Nilai untuk 'x'"),
+    ("1 + 0", "harus positif"),
+])
+def test_invalid_expressions(expression, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        parse_expression(expression)
+
+
+def test_parse_definitions():
+    expression, values = parse_definitions("R1 = 1k  # beban\nR2 = 2k\n\nR1 +\nR2\n")
+    assert expression == "R1 + R2"
+    assert parse_expression(expression, values).equivalent_resistance == pytest.approx(3000.0)
@@ -0,0 +1,20 @@
+from listrik.circuit import loop_circuit
+from listrik.profiling import Tracer, span
+from listrik.synthesis import synthesize
+
+
+def test_calculations_are_traced_inside_spans():
+    with Tracer() as tracer:
+        with span("halaman"):
+            loop_circuit(12.0, [100.0, 220.0]).solve()
+            synthesize(330.0)
+    names = {name: (category, depth) for name, category, _, _, _, depth, _ in tracer.events}
+    assert names["Circuit.solve"] == ("hitung", 1)
+    assert names["synthesize"] == ("hitung", 1)
+    assert names["halaman"] == ("app", 0)
+
+
+def test_traced_functions_record_nothing_without_tracer():
+    tracer = Tracer()
+    loop_circuit(12.0, [100.0]).solve()
+    assert tracer.events == []
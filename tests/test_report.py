@@ -0,0 +1,29 @@
+import io
+import sys
+
+import pytest
+
+from listrik.report import Report
+
+pytest.importorskip("matplotlib")
+
+
+def _png():
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(2, 1))
+    fig.add_subplot().plot([0, 1], [0, 1])
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def test_pdf_does_not_touch_pyplot_backend():
+    report = Report()
+    report.add_values("Ringkasan", [("V", 12.0)])
+    report.add_table("Data", ["a", "b"], [(1, 2), (3, 4)])
+    report.add_image("Grafik", _png())
+    sys.modules.pop("matplotlib.pyplot", None)
+    pdf = report.to_pdf_bytes()
+    assert pdf.startswith(b"%PDF")
+    assert "matplotlib.pyplot" not in sys.modules
@@ -0,0 +1,14 @@
+import pytest
+
+from listrik.rules import Rule, loads_rules
+
+
+def test_quoted_threshold_gets_default_message():
+    rule = Rule("suhu", "T", ">", "100")
+    assert rule.threshold == pytest.approx(100.0)
+    assert rule.message == "T > 100"
+
+
+def test_loaded_rules_accept_string_thresholds():
+    ruleset = loads_rules('[{"name": "arus", "column": "I", "op": ">=", "threshold": "12.5"}]')
+    assert ruleset.rules[0].message == "I >= 12.5"
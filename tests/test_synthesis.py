@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from listrik.synthesis import standard_values, synthesize
+
+STOCK = standard_values("E12", (1, 3))
+
+
+def brute_force(stock, max_parts):
+    """Nilai semua jaringan seri–paralel dengan tepat 1…``max_parts`` resistor"""
+    exact = {1: np.unique(np.asarray(stock, dtype=float))}
+    for n in range(2, max_parts + 1):
+        found = []
+        for a in range(1, n // 2 + 1):
+            x, y = np.meshgrid(exact[a], exact[n - a], indexing="ij")
+            found += [(x + y).ravel(), (x * y / (x + y)).ravel()]
+        exact[n] = np.unique(np.concatenate(found))
+    return exact
+
+
+EXACT = brute_force(STOCK, 4)
+
+
+@pytest.mark.parametrize("max_parts", [3, 4])
+@pytest.mark.parametrize("target", [3.3, 57.3, 123.4, 777.0, 1234.5, 4321.0])
+def test_matches_brute_force(target, max_parts):
+    result = synthesize(target, values=STOCK, max_parts=max_parts)
+    best = min(np.abs(EXACT[n] - target).min() for n in range(1, max_parts + 1))
+    assert abs(result.best.value - target) == pytest.approx(best, rel=1e-9, abs=1e-9)
+    assert result.best.count <= max_parts
+    assert set(result.best.parts) <= set(STOCK)
+
+
+@pytest.mark.parametrize("target, tolerance", [
+    (150.0, 0.01),     # satu resistor
+    (250.0, 0.001),    # pasangan
+    (61.7, 0.0005),    # tiga resistor
+    (314.15, 1e-4),    # empat resistor
+])
+def test_tolerance_picks_fewest_parts(target, tolerance):
+    result = synthesize(target, values=STOCK, max_parts=4, tolerance=tolerance)
+    fewest = next(n for n in range(1, 5) if (np.abs(EXACT[n] - target) <= tolerance * target).any())
+    assert result.within_tolerance
+    assert result.best.count == fewest
+    # Pencarian berhenti setelah jumlah komponen yang memenuhi toleransi
+    assert max(c.count for c in result.candidates) <= fewest
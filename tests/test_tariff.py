@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from listrik.metering import MeterAggregator
+from listrik.tariff import Tariff
+
+TIERS = [{"up_to": 50, "rate": 1100}, {"up_to": 200, "rate": 1450}, {"up_to": None, "rate": 1700}]
+
+
+def test_cumulative_cost_at_tier_boundaries():
+    tariff = Tariff("R-1", tiers=TIERS)
+    kwh = [0, 50, 50 + 1e-9, 200, 250]
+    expected = [0, 55_000, 55_000, 55_000 + 150 * 1450, 55_000 + 150 * 1450 + 50 * 1700]
+    assert tariff.cumulative_cost(kwh) == pytest.approx(expected)
+
+
+def test_intervals_ending_on_and_crossing_boundaries():
+    tariff = Tariff("R-1", tiers=TIERS)
+    t = np.datetime64("2024-03-01T00:00") + np.arange(5) * np.timedelta64(1, "h")
+    # Kumulatif 50 dan 200 tepat di batas; 40 → 60 dan 190 → 210 melewati batas
+    assert tariff.price(t[:3], [50, 150, 10]) == pytest.approx([55_000, 150 * 1450, 10 * 1700])
+    assert tariff.price(t[:4], [40, 20, 130, 20]) == pytest.approx(
+        [40 * 1100, 10 * 1100 + 10 * 1450, 130 * 1450, 10 * 1450 + 10 * 1700])
+
+
+def test_tiers_restart_each_period():
+    tariff = Tariff("R-1", tiers=TIERS)
+    t = np.array(["2024-01-31T23:00", "2024-02-01T00:00"], dtype="datetime64[m]")
+    bill = tariff.bill(t, [60, 60])
+    assert bill["cost"] == pytest.approx([55_000 + 10 * 1450] * 2)
+
+
+def test_block_crossing_midnight():
+    tariff = Tariff("Malam", rate=1000, blocks=[{"name": "Malam", "start": "22:00", "end": "06:00",
+                                                  "multiplier": 2}])
+    t = np.array(["2024-01-03T21:59", "2024-01-03T22:00", "2024-01-03T23:59", "2024-01-04T00:00",
+                  "2024-01-04T05:59", "2024-01-04T06:00"], dtype="datetime64[m]")
+    assert tariff.block_index(t).tolist() == [0, 1, 1, 1, 1, 0]
+    assert tariff.price(t, np.ones(6)) == pytest.approx([1000, 2000, 2000, 2000, 2000, 1000])
+
+
+def test_block_wraps_from_sunday_into_monday():
+    # Senin = 0, Minggu = 6; 2024-01-07 adalah hari Minggu
+    tariff = Tariff("Akhir pekan", rate=1000, blocks=[{"name": "Minggu malam", "start": "22:00", "end": "02:00",
+                                                        "multiplier": 0.5, "days": [6]}])
+    t = np.array(["2024-01-07T01:00", "2024-01-07T21:59", "2024-01-07T22:00", "2024-01-08T00:00",
+                  "2024-01-08T01:59", "2024-01-08T02:00", "2024-01-08T23:00"], dtype="datetime64[m]")
+    assert tariff.block_index(t).tolist() == [0, 0, 1, 1, 1, 0, 0]
+
+
+def meter_log():
+    """Dua meter, tiap 30 menit dari 30 Jan hingga 2 Feb, baris perangkat berselang-seling"""
+    rng = np.random.default_rng(8)
+    times = pd.date_range("2024-01-30", "2024-02-02", freq="30min")
+    frames = [pd.DataFrame({"waktu": times, "meter": name, "tegangan": 220.0,
+                            "arus": rng.uniform(0, scale, times.size)})
+              for name, scale in (("M1", 40.0), ("M2", 90.0))]
+    return pd.concat(frames).sort_values("waktu", kind="stable").reset_index(drop=True)
+
+
+def one_shot_cost(log, tariff):
+    """Biaya per meter langsung dari ``Tariff.price`` atas seluruh log sekaligus"""
+    costs = {}
+    for name, rows in log.groupby("meter"):
+        t = rows["waktu"].to_numpy()
+        power = rows["tegangan"].to_numpy() * rows["arus"].to_numpy()
+        hours = np.diff(t).astype("timedelta64[s]").astype(float) / 3600
+        kwh = np.concatenate([[0.0], (power[1:] + power[:-1]) / 2 * hours / 1000])
+        periods = np.unique(tariff.period_labels(t)).size
+        costs[name] = tariff.price(t, kwh).sum() + periods * tariff.fixed_charge
+    return pd.Series(costs)
+
+
+@pytest.mark.parametrize("period", ["month", "day"])
+@pytest.mark.parametrize("chunk_rows", [7, 50, 10_000])
+def test_chunked_metering_matches_one_shot(period, chunk_rows):
+    tariff = Tariff("Uji", tiers=[{"up_to": 20, "rate": 1100}, {"up_to": 60, "rate": 1450},
+                                  {"up_to": None, "rate": 1700}],
+                    blocks=[{"name": "WBP", "start": "17:00", "end": "22:00", "multiplier": 1.6},
+                            {"name": "Malam", "start": "23:00", "end": "01:00", "multiplier": 0.8}],
+                    fixed_charge=5000, period=period)
+    log = meter_log()
+    aggregator = MeterAggregator(tariff=tariff)
+    for start in range(0, len(log), chunk_rows):
+        aggregator.update(log.iloc[start:start + chunk_rows])
+    result = aggregator.result()
+    expected = one_shot_cost(log, tariff)
+    assert result["cost"].to_numpy() == pytest.approx(expected.reindex(result.index).to_numpy(), rel=1e-9)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from listrik.circuit import Circuit
+from listrik.transient import TransientAnalysis, rc_circuit
+
+
+def rlc_circuit():
+    circuit = Circuit()
+    circuit.add_voltage_source("V", "in", "0", 1.0)
+    circuit.add_resistor("R", "in", "a", 1.0)
+    circuit.add_inductor("L", "a", "b", 1e-3)
+    circuit.add_capacitor("C", "b", "0", 1e-6)
+    return circuit
+
+
+@pytest.mark.parametrize("points", [777, 200_000])
+def test_fixed_grid_ends_exactly_at_t_stop(points):
+    t_stop = 5e-3 * 1.37
+    result = TransientAnalysis(rc_circuit(5.0, 1000.0, 1e-6)).run(t_stop, points=points, adaptive=False)
+    assert len(result) == points + 1
+    assert result.time[-1] == t_stop
+    assert (np.diff(result.time) > 0).all()
+    expected = 5.0 * (1 - np.exp(-result.time / 1e-3))
+    assert result["V(C)"] == pytest.approx(expected, abs=1e-4)
+
+
+def test_adaptive_steps_land_on_t_stop():
+    analysis = TransientAnalysis(rlc_circuit())
+    result = analysis.run(2e-3, points=333)
+    assert analysis.rejected > 0
+    assert result.time[-1] == 2e-3
+    assert (np.diff(result.time) > 0).all()
+    reference = TransientAnalysis(rlc_circuit()).run(2e-3, points=100_000, adaptive=False)
+    assert result["V(C)"][-1] == pytest.approx(reference["V(C)"][-1], abs=1e-4)